@@ -91,12 +91,20 @@ def parse_args():
         parser.add_argument(
             '-m', '--module', type=str, action='append', default=None, 
             help='python module to import before parsing config file')
+        parser.add_argument(
+            '-w', '--worker', type=str, action='store', default=None,
+            help=('run as a worker for the FileQueue job backend using the given queue ' +
+                  'directory, rather than processing a config file'))
+        parser.add_argument(
+            '-p', '--profile', action='store_const', default=False, const=True,
+            help=('record the time spent in each stage of the processing and write a ' +
+                  'summary to root_timing.json (equivalent to output.timing=True)'))
         parser.add_argument(
             '--version', action='store_const', default=False, const=True,
             help='show the version of GalSim')
         args = parser.parse_args()
 
-        if args.config_file == None:
+        if args.config_file == None and args.worker is None:
             if args.version:
                 print version_str
             else:
@@ -111,7 +119,7 @@ def parse_args():
 
         # Usage string not automatically generated for optparse, so generate it
         usage = """usage: galsim [-h] [-v {0,1,2,3}] [-l LOG_FILE] [-f {yaml,json}] [-m MODULE]
-              [--version] config_file [variables ...]"""
+              [-w WORKER] [-p] [--version] config_file [variables ...]"""
         # Build the parser
         parser = optparse.OptionParser(usage=usage, epilog=epilog, description=description)
         # optparse only allows string choices, so take verbosity as a string and make it int later
@@ -129,6 +137,14 @@ def parse_args():
         parser.add_option(
             '-m', '--module', type=str, action='append', default=None, 
             help='python module to import before parsing config file')
+        parser.add_option(
+            '-w', '--worker', type=str, action='store', default=None,
+            help=('run as a worker for the FileQueue job backend using the given queue ' +
+                  'directory, rather than processing a config file'))
+        parser.add_option(
+            '-p', '--profile', action='store_const', default=False, const=True,
+            help=('record the time spent in each stage of the processing and write a ' +
+                  'summary to root_timing.json (equivalent to output.timing=True)'))
         parser.add_option(
             '--version', action='store_const', default=False, const=True,
             help='show the version of GalSim')
@@ -138,7 +154,10 @@ def parse_args():
         args.verbosity = int(args.verbosity) 
 
         # Store the positional arguments in the args object as well:
-        if len(posargs) == 0:
+        if len(posargs) == 0 and args.worker is not None:
+            args.config_file = None
+            args.variables = []
+        elif len(posargs) == 0:
             if args.version:
                 print version_str
             else:
@@ -171,6 +190,20 @@ def main():
     else:
         logging.basicConfig(format="%(message)s", level=logging_level, filename=args.log_file)
     logger = logging.getLogger('galsim')
+
+    # Import any modules if requested
+    if args.module:
+        for module in args.module:
+            try:
+                exec('import galsim.'+module)
+            except:
+                exec('import '+module)
+
+    # If we are just a worker for a FileQueue job backend, then there is no config file to read.
+    if args.worker is not None:
+        logger.warn('Running as a worker for the job queue in %s', args.worker)
+        galsim.config.RunFileQueueWorker(args.worker, logger)
+        return
     
     # Determine the file type from the extension if necessary:
     if args.file_type is None:
@@ -261,20 +294,18 @@ def main():
         import os
         base_config['root'] = os.path.splitext(args.config_file)[0]
 
-    # Import any modules if requested
-    if args.module:
-        for module in args.module:
-            try:
-                exec('import galsim.'+module)
-            except:
-                exec('import '+module)
-
     # Process each config document
     for config in all_config:
 
         # Merge the base_config information into this config file.
         MergeConfig(config,base_config)
 
+        # The --profile option turns on the timing of each stage of the processing.
+        if args.profile:
+            if 'output' not in config:
+                config['output'] = {}
+            config['output']['timing'] = True
+
         import pprint
         logger.debug("Process config dict: \n%s", pprint.pformat(config))
 
@@ -45,7 +45,7 @@ import galsim
 import utilities
 
 from . import _galsim
-from ._galsim import GSParams
+from ._galsim import GSParams, FFTWorkspace
 
 class GSObject(object):
     """Base class for all GalSim classes that represent some kind of surface brightness profile.
@@ -201,7 +201,8 @@ class GSObject(object):
                   'shoot_accuracy' : float,
                   'allowed_flux_variation' : float,
                   'range_division_for_extrema' : int,
-                  'small_fraction_of_flux' : float
+                  'small_fraction_of_flux' : float,
+                  'sersic_n_step' : float
                 }
     def __init__(self, obj):
         # This guarantees that all GSObjects have an SBProfile
@@ -757,7 +758,7 @@ class GSObject(object):
     def drawImage(self, image=None, nx=None, ny=None, bounds=None, scale=None, wcs=None, dtype=None,
                   method='auto', gain=1., wmult=1., add_to_image=False, use_true_center=True,
                   offset=None, n_photons=0., rng=None, max_extra_noise=0., poisson_flux=None,
-                  setup_only=False, dx=None):
+                  setup_only=False, dx=None, workspace=None):
         """Draws an Image of the object.
 
         The drawImage() method is used to draw an Image of the current object using one of several
@@ -991,6 +992,10 @@ class GSObject(object):
                             is set up correctly.  This is used internally by GalSim, but there
                             may be cases where the user will want the same functionality.
                             [default: False]
+        @param workspace    An FFTWorkspace to use if the drawing needs an FFT.  Using the same
+                            workspace when drawing many objects lets them share the FFT tables
+                            and plans, rather than making new ones for each object.  See also
+                            drawImages(). [default: None]
 
         @returns the drawn Image.
         """
@@ -1133,8 +1138,10 @@ class GSObject(object):
                     "Unable to draw this GSObject with method='phot'.  Perhaps it is a "+
                     "Deconvolve or is a compound including one or more Deconvolve objects.")
                 raise
-        else:
+        elif workspace is None:
             image.added_flux = prof.SBProfile.draw(imview.image, gain, wmult)
+        else:
+            image.added_flux = prof.SBProfile.draw(imview.image, gain, wmult, workspace)
 
         return image
 
@@ -1294,6 +1301,50 @@ _galsim.SBProfile.__ne__ = lambda self, other: not self.__eq__(other)
 _galsim.SBProfile.__hash__ = lambda self: hash(repr(self))
 
 
+def drawImages(obj_list, image_list=None, workspace=None, **kwargs):
+    """Draw a list of GSObjects, sharing the FFT tables and plans among them.
+
+    This is equivalent to
+
+        >>> images = [ obj.drawImage(im, **kwargs) for obj, im in zip(obj_list, image_list) ]
+
+    except that all of the draws use the same FFTWorkspace, and the objects are drawn in order
+    of the size of their images.  So objects that need the same size FFT are drawn back to back
+    using the same KTable and FFTW plan, rather than each one making its own.  This can save a
+    significant amount of time when drawing many small postage stamps.
+
+    @param obj_list     A list of GSObjects to draw.
+    @param image_list   A list of images to draw onto, one for each object.  Entries may be None
+                        to have drawImage make a new image for that object. [default: None,
+                        which means to make new images for all of the objects]
+    @param workspace    An FFTWorkspace to use.  If you call drawImages several times, using
+                        the same workspace each time lets all of the calls share the same
+                        tables and plans. [default: None, which means to make a new one]
+    @param **kwargs     Any other keyword arguments are passed to drawImage for every object.
+
+    @returns the list of drawn images in the same order as obj_list.
+    """
+    if image_list is None:
+        image_list = [ None ] * len(obj_list)
+    if len(image_list) != len(obj_list):
+        raise ValueError("image_list must be the same length as obj_list")
+    if workspace is None:
+        workspace = FFTWorkspace()
+
+    # Objects drawn onto the same size image almost always use the same size FFT.
+    # (The sort is stable, so objects with the same size image are drawn in their given order.)
+    def image_size(k):
+        im = image_list[k]
+        if im is None: return 0
+        else: return max(im.array.shape)
+    order = sorted(range(len(obj_list)), key=image_size)
+
+    images = [ None ] * len(obj_list)
+    for k in order:
+        images[k] = obj_list[k].drawImage(image_list[k], workspace=workspace, **kwargs)
+    return images
+
+
 # --- Now defining the derived classes ---
 #
 # All derived classes inherit the GSObject method interface, but therefore have a "has a"
@@ -2636,6 +2687,18 @@ range_division_for_extrema  The number of parts into which to split a range to b
 small_fraction_of_flux      When photon shooting, intervals with less than this fraction of
                             probability are considered ok to use with the dominant-sampling
                             algorithm. [default: 1.e-4]
+@param sersic_n_step        If > 0, Sersic profiles use a value of n rounded to the nearest
+                            multiple of `sersic_n_step`.  Sersic profiles need lookup tables that
+                            depend on n, which are expensive to build, so when making many
+                            profiles with continuously distributed n (e.g. from fits to real
+                            galaxies), this lets profiles with nearby n share the same tables.
+                            The flux and half-light radius (or scale radius) are unchanged; only
+                            the shape of the profile changes slightly.  (Truncated profiles also
+                            need tables for each value of trunc/scale_radius, so they only
+                            benefit if that ratio is also repeated.)  Integer values of n,
+                            including the n=4 of DeVaucouleurs profiles, are never rounded, since
+                            the step need not divide them exactly.  A value around 0.01 is
+                            usually a reasonable compromise. [default: 0, which means no rounding]
 """
 
 _galsim.GSParams.__getinitargs__ = lambda self: (
@@ -2645,7 +2708,8 @@ _galsim.GSParams.__getinitargs__ = lambda self: (
         self.realspace_relerr, self.realspace_abserr, 
         self.integration_relerr, self.integration_abserr,
         self.shoot_accuracy, self.allowed_flux_variation,
-        self.range_division_for_extrema, self.small_fraction_of_flux)
+        self.range_division_for_extrema, self.small_fraction_of_flux,
+        self.sersic_n_step)
 _galsim.GSParams.__repr__ = lambda self: \
-        'galsim.GSParams(%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r)'%self.__getinitargs__()
+        'galsim.GSParams(%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r)'%self.__getinitargs__()
 _galsim.GSParams.__hash__ = lambda self: hash(repr(self))
@@ -16,6 +16,8 @@
 #    and/or other materials provided with the distribution.
 #
 from process import *
+from backend import *
+from timing import *
 from image import *
 from stamp import *
 from noise import *
@@ -0,0 +1,442 @@
+# Copyright (c) 2012-2015 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+"""@file backend.py
+The job backends that galsim.config.Process uses to run the file-building jobs when it is
+not simply building each file in turn in the current process.
+
+A job is a tuple `(kwargs, file_num, file_name)`, where `kwargs` holds everything the output
+type's build function needs, including its own copy of the config dict.  The config dict
+already includes the file_num, image_num, obj_num and the random seed sequence for that file, so
+the output of a job does not depend on where or in what order it is run.
+"""
+
+import os
+import galsim
+
+valid_backend_types = {
+    # The values are the name of the JobBackend class to build.  Each class defines
+    # _req_params, _opt_params and _single_params for the parameters that may be given in
+    # config.output.backend, just like the input types.
+    # Other modules can add to this to register a different way to distribute the jobs.
+    'Local' : 'LocalBackend',
+    'FileQueue' : 'FileQueueBackend',
+}
+
+
+def BuildJobBackend(config, nproc, logger=None):
+    """
+    Build the JobBackend to use for running the file-building jobs for config.
+
+    The backend is specified by config.output.backend, which may either be just the type
+    name or a dict with a type and the parameters for that type.  The default is a Local
+    backend, which runs the jobs with nproc processes on this machine.
+
+    @param config       The config dict to process.
+    @param nproc        How many local worker processes to use.
+    @param logger       If given, a logger object (or proxy) to log progress. [default: None]
+
+    @returns the JobBackend object.
+    """
+    output = config['output']
+    if 'backend' in output:
+        if not isinstance(output['backend'], dict):
+            output['backend'] = { 'type' : output['backend'] }
+        field = output['backend']
+    else:
+        field = { 'type' : 'Local' }
+    if 'type' not in field:
+        field['type'] = 'Local'
+    type = field['type']
+
+    if type not in valid_backend_types:
+        raise AttributeError("Invalid output.backend.type=%s."%type)
+    init_func = eval(valid_backend_types[type])
+    kwargs = galsim.config.GetAllParams(field, 'backend', config,
+                                        req = init_func._req_params,
+                                        opt = init_func._opt_params,
+                                        single = init_func._single_params)[0]
+    if logger:
+        logger.debug('Building job backend %s with kwargs %s',type,str(kwargs))
+    return init_func(nproc, logger=logger, **kwargs)
+
+
+class JobBackend(object):
+    """The base class for the objects that run the jobs set up by galsim.config.Process.
+
+    A backend needs to implement three methods:
+
+        backend.submit(job, logger)   Add a job to be run.  `logger` is the logger (or logger
+                                      proxy) that a local worker should use for this job.
+        backend.getResult()           Wait for the next job to finish and return the tuple
+                                      `(t, file_num, file_name, proc, timing)`.  If the job
+                                      raised an exception, `t` is the exception and `proc` is
+                                      the traceback string.  `timing` is the job's timing
+                                      totals from GetTiming (or None).
+        backend.close()               Shut down any workers once all the results are in.
+
+    The results may come back in any order.  Since each job builds a complete file, the order
+    does not affect the output.
+    """
+    _req_params = {}
+    _opt_params = {}
+    _single_params = []
+
+    def __init__(self, nproc, logger=None):
+        self.nproc = nproc
+        self.logger = logger
+
+    def submit(self, job, logger=None):
+        raise NotImplementedError("%s does not implement submit"%self.__class__.__name__)
+
+    def getResult(self):
+        raise NotImplementedError("%s does not implement getResult"%self.__class__.__name__)
+
+    def close(self):
+        pass
+
+
+def _LocalWorker(task_queue, done_queue):
+    """The function run by each of the LocalBackend worker processes.
+    """
+    from multiprocessing import current_process
+    proc = current_process().name
+    for job in iter(task_queue.get, 'STOP'):
+        (kwargs, file_num, file_name, logger) = job
+        try:
+            if logger:
+                logger.debug('%s: Received job to do file %d, %s',proc,file_num,file_name)
+            t = galsim.config.ProcessJob( (kwargs, file_num, file_name), logger)
+            timing = galsim.config.GetTiming(kwargs['config'])
+            done_queue.put( (t, file_num, file_name, proc, timing) )
+        except Exception as e:
+            import traceback
+            tr = traceback.format_exc()
+            if logger:
+                logger.debug('%s: Caught exception %s\n%s',proc,str(e),tr)
+            done_queue.put( (e, file_num, file_name, tr, None) )
+
+
+class LocalBackend(JobBackend):
+    """Run the jobs in a pool of nproc processes on the local machine using multiprocessing.
+    This is the default backend.
+    """
+    def __init__(self, nproc, logger=None):
+        from multiprocessing import Process, Queue
+        JobBackend.__init__(self, nproc, logger)
+        self.task_queue = Queue()
+        self.done_queue = Queue()
+        self.p_list = []
+        for j in range(nproc):
+            p = Process(target=_LocalWorker, args=(self.task_queue, self.done_queue),
+                        name='Process-%d'%(j+1))
+            p.start()
+            self.p_list.append(p)
+
+    def submit(self, job, logger=None):
+        (kwargs, file_num, file_name) = job
+        self.task_queue.put( (kwargs, file_num, file_name, logger) )
+
+    def getResult(self):
+        return self.done_queue.get()
+
+    def close(self):
+        for p in self.p_list:
+            self.task_queue.put('STOP')
+        for p in self.p_list:
+            p.join()
+        self.task_queue.close()
+
+
+class FileQueueBackend(JobBackend):
+    """Run the jobs through a queue of pickle files in a directory.
+
+    Each job is written to `dir/pending`.  A worker claims a job by renaming it into
+    `dir/running` (which is atomic, so each job is only ever claimed once), builds the file,
+    and writes the result to `dir/done`.  The workers may be local processes started by this
+    backend (`nworkers` of them, which defaults to nproc) or processes on other machines that
+    share the directory, started with
+
+        galsim --worker dir
+
+    or equivalently `galsim.config.RunFileQueueWorker(dir)`.  With `nworkers = 0`, all the work
+    is done by such external workers.
+
+    The job files are named with an id that is unique to each backend, so a directory may be
+    reused (or even shared by several runs at once) without picking up results from a
+    different run.
+
+    If a worker on this machine dies while it is running a job, the job is put back in the
+    queue for another worker to try.  If it fails a second time, or if a job has been running
+    for longer than `timeout` seconds, the job is reported as failed.  So is every job that is
+    still outstanding if all of the local workers have died and there cannot be any external
+    workers (because `dir` is a new temporary directory).
+
+    The input objects stored in the config dict are not written to the job files, since they
+    are proxies to objects that only exist in this process.  Each worker reads its own input
+    objects instead.  Likewise, external workers log to their own logger.
+
+    Parameters that may be given in config.output.backend:
+
+        dir         The directory to use for the queue.  [default: a new temporary directory,
+                    which is only useful for local workers]
+        nworkers    The number of local workers to start.  [default: nproc]
+        poll_time   How long (in seconds) to wait between checks for new files. [default: 0.1]
+        timeout     The maximum time (in seconds) that a job may take once a worker has
+                    claimed it.  Since this uses the file modification times, the clocks of any
+                    external workers' machines should agree with this one.
+                    [default: None, which means no limit]
+    """
+    _opt_params = { 'dir' : str, 'nworkers' : int, 'poll_time' : float, 'timeout' : float }
+
+    def __init__(self, nproc, logger=None, dir=None, nworkers=None, poll_time=0.1, timeout=None):
+        from multiprocessing import Process
+        import uuid
+        JobBackend.__init__(self, nproc, logger)
+        if dir is None:
+            import tempfile
+            self.dir = tempfile.mkdtemp(prefix='galsim_jobs_')
+            self.own_dir = True
+        else:
+            self.dir = dir
+            self.own_dir = False
+        for sub in [ 'pending', 'running', 'done' ]:
+            d = os.path.join(self.dir, sub)
+            if not os.path.isdir(d): os.makedirs(d)
+        stop_file = os.path.join(self.dir, 'STOP')
+        if os.path.isfile(stop_file): os.remove(stop_file)
+        self.poll_time = poll_time
+        self.timeout = timeout
+        self.job_prefix = 'job_%s_'%uuid.uuid4().hex[:12]
+        self.njobs = 0
+        # The jobs that we are still waiting for: { name : (file_num, file_name, nrequeue) }
+        self.outstanding = {}
+
+        if nworkers is None: nworkers = nproc
+        self.p_list = []
+        for j in range(nworkers):
+            p = Process(target=RunFileQueueWorker, args=(self.dir, logger, poll_time),
+                        name='Process-%d'%(j+1))
+            p.start()
+            self.p_list.append(p)
+        if logger:
+            logger.debug('FileQueueBackend: dir = %s, nworkers = %d',self.dir,nworkers)
+
+    def submit(self, job, logger=None):
+        import cPickle
+        (kwargs, file_num, file_name) = job
+        kwargs = dict(kwargs)
+        kwargs['config'] = _StripInputs(kwargs['config'])
+        # Write to a temporary name first, so workers never see a partially written job.
+        name = '%s%06d.pkl'%(self.job_prefix, self.njobs)
+        tmp_name = os.path.join(self.dir, name + '.tmp')
+        with open(tmp_name, 'wb') as fout:
+            cPickle.dump( (kwargs, file_num, file_name), fout, cPickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_name, os.path.join(self.dir, 'pending', name))
+        self.outstanding[name] = (file_num, file_name, 0)
+        self.njobs += 1
+
+    def getResult(self):
+        import cPickle
+        import time
+        done_dir = os.path.join(self.dir, 'done')
+        while True:
+            names = sorted([ f for f in os.listdir(done_dir)
+                             if f.startswith(self.job_prefix) and f.endswith('.pkl') ])
+            for name in names:
+                full_name = os.path.join(done_dir, name)
+                with open(full_name, 'rb') as fin:
+                    result = cPickle.load(fin)
+                os.remove(full_name)
+                if name in self.outstanding:
+                    file_num, file_name, nrequeue = self.outstanding.pop(name)
+                    if result[1] is None:
+                        # The worker couldn't read the job, so it doesn't know these.
+                        result = (result[0], file_num, file_name, result[3], result[4])
+                    return result
+                # Otherwise, this is the late result of a job we already gave up on.
+            failed = self._checkRunning()
+            if failed is not None:
+                return failed
+            time.sleep(self.poll_time)
+
+    def _checkRunning(self):
+        """Look for jobs whose workers have died or that have run for longer than the timeout.
+
+        Jobs from dead local workers are put back in the queue the first time.  Otherwise,
+        this returns a failure result for the first such job it finds, or None if there are
+        none.
+        """
+        import time
+        import socket
+        running_dir = os.path.join(self.dir, 'running')
+        host = socket.gethostname()
+        dead_pids = [ p.pid for p in self.p_list if not p.is_alive() ]
+        for claim in os.listdir(running_dir):
+            name, _, proc = claim.partition('.pkl.')
+            name += '.pkl'
+            if name not in self.outstanding: continue
+            if os.path.isfile(os.path.join(self.dir, 'done', name)):
+                # The worker finished it after we listed the done directory.
+                continue
+            file_num, file_name, nrequeue = self.outstanding[name]
+            full_name = os.path.join(running_dir, claim)
+            worker_host, _, pid = proc.rpartition(':')
+            if worker_host == host and _IsDead(int(pid), dead_pids):
+                if nrequeue == 0:
+                    if self.logger:
+                        self.logger.warn('Worker %s died while running file %d.  Requeueing.',
+                                         proc, file_num)
+                    self.outstanding[name] = (file_num, file_name, 1)
+                    os.rename(full_name, os.path.join(self.dir, 'pending', name))
+                    continue
+                e = RuntimeError("Worker %s died while running this job"%proc)
+            else:
+                try:
+                    run_time = time.time() - os.path.getmtime(full_name)
+                except OSError:
+                    # The worker just finished with it.
+                    continue
+                if self.timeout is None or run_time <= self.timeout:
+                    continue
+                e = RuntimeError("Job timed out after %f sec on worker %s"%(run_time,proc))
+            del self.outstanding[name]
+            return (e, file_num, file_name, str(e), None)
+
+        if self.p_list and self.own_dir and len(dead_pids) == len(self.p_list):
+            # Nobody is left to run the remaining jobs.
+            for name in sorted(self.outstanding):
+                if not os.path.isfile(os.path.join(self.dir, 'done', name)):
+                    file_num, file_name, nrequeue = self.outstanding.pop(name)
+                    e = RuntimeError("All of the workers died before running this job")
+                    return (e, file_num, file_name, str(e), None)
+        return None
+
+    def close(self):
+        open(os.path.join(self.dir, 'STOP'), 'w').close()
+        for p in self.p_list:
+            p.join()
+        if self.own_dir:
+            import shutil
+            shutil.rmtree(self.dir, ignore_errors=True)
+        else:
+            # Remove anything left over from this run, such as jobs that were abandoned.
+            for sub in [ 'pending', 'running', 'done' ]:
+                d = os.path.join(self.dir, sub)
+                for f in os.listdir(d):
+                    if f.startswith(self.job_prefix):
+                        try:
+                            os.remove(os.path.join(d, f))
+                        except OSError:
+                            pass
+
+
+def _IsDead(pid, dead_pids):
+    """Check whether the process pid on this machine has died.
+    """
+    import errno
+    if pid in dead_pids:
+        return True
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno != errno.EPERM
+    return False
+
+
+def _StripInputs(config):
+    """Return a shallow copy of config without the (unpicklable) input object proxies.
+    """
+    config = dict(config)
+    for key in galsim.config.valid_input_types:
+        if key in config:
+            del config[key]
+            del config[key+'_safe']
+    if 'input_manager' in config:
+        del config['input_manager']
+    return config
+
+
+def RunFileQueueWorker(dir, logger=None, poll_time=0.1):
+    """
+    Run jobs from the FileQueue backend directory `dir` until the backend signals that
+    there are no more jobs coming.
+
+    This is what each of the FileQueueBackend local workers runs.  It may also be run by hand
+    (e.g. with `galsim --worker dir`) on any machine that can see `dir` to help with the work.
+
+    @param dir          The queue directory used by the FileQueueBackend.
+    @param logger       If given, a logger object to log progress. [default: None]
+    @param poll_time    How long (in seconds) to wait between checks for new jobs. [default: 0.1]
+    """
+    import cPickle
+    import socket
+    import time
+    proc = '%s:%d'%(socket.gethostname(), os.getpid())
+    pending_dir = os.path.join(dir, 'pending')
+    running_dir = os.path.join(dir, 'running')
+    done_dir = os.path.join(dir, 'done')
+    stop_file = os.path.join(dir, 'STOP')
+    while True:
+        if not os.path.isdir(pending_dir):
+            # The backend may not have set up the directory yet.
+            time.sleep(poll_time)
+            continue
+        names = sorted([ f for f in os.listdir(pending_dir) if f.endswith('.pkl') ])
+        if not names:
+            if os.path.isfile(stop_file): break
+            time.sleep(poll_time)
+            continue
+        name = names[0]
+        # The claimed name records which worker is running the job, so the backend can
+        # tell if this process dies.
+        running_name = os.path.join(running_dir, name + '.' + proc)
+        try:
+            os.rename(os.path.join(pending_dir, name), running_name)
+        except OSError:
+            # Some other worker got to it first.
+            continue
+        file_num = file_name = None
+        try:
+            # Mark the time the job was claimed for the backend's timeout.
+            os.utime(running_name, None)
+            with open(running_name, 'rb') as fin:
+                kwargs, file_num, file_name = cPickle.load(fin)
+            if logger:
+                logger.debug('%s: Received job to do file %d, %s',proc,file_num,file_name)
+            t = galsim.config.ProcessJob( (kwargs, file_num, file_name), logger)
+            timing = galsim.config.GetTiming(kwargs['config'])
+            result = (t, file_num, file_name, proc, timing)
+        except Exception as e:
+            import traceback
+            tr = traceback.format_exc()
+            if logger:
+                logger.debug('%s: Caught exception %s\n%s',proc,str(e),tr)
+            try:
+                cPickle.dumps(e)
+            except Exception:
+                e = RuntimeError(repr(e))
+            result = (e, file_num, file_name, tr, None)
+        tmp_name = os.path.join(dir, name + '.done.tmp')
+        with open(tmp_name, 'wb') as fout:
+            cPickle.dump(result, fout, cPickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_name, os.path.join(done_dir, name))
+        try:
+            os.remove(running_name)
+        except OSError:
+            # The backend may have already given up on it.
+            pass
@@ -95,7 +95,10 @@ def BuildGSObject(config, key, base=None, gsparams={}, logger=None):
     type = ck['type']
 
     # If we have previously saved an object and marked it as safe, then use it.
-    if 'current_val' in ck and ck['current_safe']:
+    # (Unless it was built from a safe value that might not be the same each time, or its
+    # parameters have been changed since.)
+    if ( 'current_val' in ck and ck['current_safe'] and ck.get('current_scope') is None
+         and ck['current_signature'] == galsim.config.value._ParamSignature(ck) ):
         if logger:
             logger.debug('obj %d: current is safe: %s',base['obj_num'],str(ck['current_val']))
         return ck['current_val'], True
@@ -113,11 +116,23 @@ def BuildGSObject(config, key, base=None, gsparams={}, logger=None):
                 logger.debug('obj %d: Skipping because field skip=True',base['obj_num'])
             raise SkipThisObject()
 
+    # If the object only depends on things that are the same for the whole file or image
+    # we are building, then we can also use the object we built for an earlier stamp, as long
+    # as its parameters have not been changed since.
+    if ( 'current_val' in ck and galsim.config.InCurrentScope(ck, base)
+         and ck['current_gsparams'] == gsparams
+         and ck['current_signature'] == galsim.config.value._ParamSignature(ck) ):
+        if logger:
+            logger.debug('obj %d: current is valid for this %s: %s',
+                         base['obj_num'],ck['current_scope'],str(ck['current_val']))
+        return ck['current_val'], False
+
     # Set up the initial default list of attributes to ignore while building the object:
     ignore = [ 
         'dilate', 'dilation', 'ellip', 'rotate', 'rotation', 'scale_flux',
         'magnify', 'magnification', 'shear', 'shift', 
-        'gsparams', 'skip', 'current_val', 'current_safe' 
+        'gsparams', 'skip', 'current_val', 'current_safe', 'current_scope',
+        'current_file_num', 'current_image_num', 'current_gsparams', 'current_signature'
     ]
     # There are a few more that are specific to which key we have.
     if key == 'gal':
@@ -162,6 +177,8 @@ def BuildGSObject(config, key, base=None, gsparams={}, logger=None):
     if key == 'psf' and 'flux' not in ck and 'signal_to_noise' not in ck:
         ck['flux'] = 1
 
+    # Keep track of the gsparams we were given, since the saved object is only valid for these.
+    parent_gsparams = gsparams
     if 'gsparams' in ck:
         gsparams = UpdateGSParams(gsparams, ck['gsparams'], 'gsparams', config)
 
@@ -195,10 +212,44 @@ def BuildGSObject(config, key, base=None, gsparams={}, logger=None):
     if 'no_save' not in base:
         ck['current_val'] = gsobject
         ck['current_safe'] = safe
+        ck['current_scope'] = _GetGSObjectScope(ck, base, safe)
+        ck['current_file_num'] = base.get('file_num',0)
+        ck['current_image_num'] = base.get('image_num',0)
+        ck['current_gsparams'] = dict(parent_gsparams)
+        ck['current_signature'] = galsim.config.value._ParamSignature(ck)
 
     return gsobject, safe
 
 
+# The GSObject types whose build functions only use the parameters in the config dict (and
+# the items listed there), so the object's scope is just the narrowest scope of those.
+# Objects built with any other special build function are taken to vary from object to object.
+_composite_gsobject_types = [
+    'None', 'Add', 'Sum', 'Convolve', 'Convolution', 'List', 'OpticalPSF' ]
+
+def _GetGSObjectScope(config, base, safe):
+    """@brief Work out the scope of a GSObject that was just built.  See value_scopes in
+    value.py for the meaning of the scopes.
+    """
+    type = config['type']
+    if safe:
+        # The items are all safe, but a safe value may still be regenerated for each object
+        # (see _IsPureValue in value.py), in which case so is the object.
+        return galsim.config.GetChildScope(config)
+    elif type in _composite_gsobject_types:
+        pass
+    elif type in valid_gsobject_types:
+        return 'obj'
+    elif galsim.__dict__[type]._takes_rng:
+        return 'obj'
+
+    scope = galsim.config.GetChildScope(config)
+    if 'resolution' in config:
+        # Then the size also depends on the psf.
+        scope = galsim.config.MaxScope(scope, base['psf'].get('current_scope','obj'))
+    return scope
+
+
 def UpdateGSParams(gsparams, config, key, base):
     """@brief Add additional items to the `gsparams` dict based on config['gsparams'].
     """
@@ -30,7 +30,8 @@ valid_image_types = {
 
 
 def BuildImages(nimages, config, nproc=1, logger=None, image_num=0, obj_num=0,
-                make_psf_image=False, make_weight_image=False, make_badpix_image=False):
+                make_psf_image=False, make_weight_image=False, make_badpix_image=False,
+                image_func=None):
     """
     Build a number of postage stamp images as specified by the config dict.
 
@@ -43,6 +44,11 @@ def BuildImages(nimages, config, nproc=1, logger=None, image_num=0, obj_num=0,
     @param make_psf_image      Whether to make `psf_image`. [default: False]
     @param make_weight_image   Whether to make `weight_image`. [default: False]
     @param make_badpix_image   Whether to make `badpix_image`. [default: False]
+    @param image_func          If given, a function that is called as `image_func(k, images)`
+                               for each `k = 0 .. nimages-1` in order, as soon as the images
+                               `(image, psf_image, weight_image, badpix_image)` for image k are
+                               finished.  In this case, the images are not kept, so the
+                               returned lists are empty. [default: None]
 
     @returns the tuple `(images, psf_images, weight_images, badpix_images)`.
              All in tuple are lists.
@@ -84,7 +90,7 @@ def BuildImages(nimages, config, nproc=1, logger=None, image_num=0, obj_num=0,
                     if logger:
                         logger.info('%s: Image %d: size = %d x %d, time = %f sec', 
                                     proc, image_num+k, xs, ys, t2-t1)
-                output.put( (results, info, proc) )
+                output.put( (results, info, proc, galsim.config.GetTiming(kwargs['config'])) )
                 if logger:
                     logger.debug('%s: Finished job %d -- %d',proc,image_num,image_num+nim-1)
             except Exception as e:
@@ -92,7 +98,7 @@ def BuildImages(nimages, config, nproc=1, logger=None, image_num=0, obj_num=0,
                 tr = traceback.format_exc()
                 if logger:
                     logger.debug('%s: Caught exception %s\n%s',proc,str(e),tr)
-                output.put( (e, info, tr) )
+                output.put( (e, info, tr, None) )
     
     # The kwargs to pass to BuildImage
     kwargs = {
@@ -130,14 +136,21 @@ def BuildImages(nimages, config, nproc=1, logger=None, image_num=0, obj_num=0,
         from multiprocessing import Process, Queue, current_process
         from multiprocessing.managers import BaseManager
 
-        # Initialize the images list to have the correct size.
-        # This is important here, since we'll be getting back images in a random order,
-        # and we need them to go in the right places (in order to have deterministic
-        # output files).  So we initialize the list to be the right size.
-        images = [ None for i in range(nimages) ]
-        psf_images = [ None for i in range(nimages) ]
-        weight_images = [ None for i in range(nimages) ]
-        badpix_images = [ None for i in range(nimages) ]
+        if image_func is None:
+            # Initialize the images list to have the correct size.
+            # This is important here, since we'll be getting back images in a random order,
+            # and we need them to go in the right places (in order to have deterministic
+            # output files).  So we initialize the list to be the right size.
+            images = [ None for i in range(nimages) ]
+            psf_images = [ None for i in range(nimages) ]
+            weight_images = [ None for i in range(nimages) ]
+            badpix_images = [ None for i in range(nimages) ]
+        else:
+            # Otherwise we only keep the images that finished before some earlier image, until
+            # we can pass them to image_func in order.
+            images = psf_images = weight_images = badpix_images = []
+            done_images = {}
+            next_k = 0
 
         # Number of images to do in each task:
         # At most nimages / nproc.
@@ -202,7 +215,7 @@ def BuildImages(nimages, config, nproc=1, logger=None, image_num=0, obj_num=0,
         # You'll see that these logging statements get printed out as the stamp images are still 
         # being drawn.  
         for i in range(0,nimages,nim_per_task):
-            results, k0, proc = done_queue.get()
+            results, k0, proc, timing = done_queue.get()
             if isinstance(results,Exception):
                 # results is really the exception, e
                 # proc is really the traceback
@@ -213,13 +226,26 @@ def BuildImages(nimages, config, nproc=1, logger=None, image_num=0, obj_num=0,
                 for j in range(nproc):
                     p_list[j].terminate()
                 raise results
+            galsim.config.MergeTiming(config, timing)
             k = k0
             for result in results:
-                images[k] = result[0]
-                psf_images[k] = result[1]
-                weight_images[k] = result[2]
-                badpix_images[k] = result[3]
+                if image_func is None:
+                    images[k] = result[0]
+                    psf_images[k] = result[1]
+                    weight_images[k] = result[2]
+                    badpix_images[k] = result[3]
+                else:
+                    done_images[k] = result[0:4]
                 k += 1
+            if image_func is not None:
+                while next_k in done_images:
+                    try:
+                        image_func(next_k, done_images.pop(next_k))
+                    except:
+                        for j in range(nproc):
+                            p_list[j].terminate()
+                        raise
+                    next_k += 1
             if logger:
                 logger.debug('%s: Successfully returned results for images %d--%d', proc, k0, k-1)
 
@@ -251,16 +277,19 @@ def BuildImages(nimages, config, nproc=1, logger=None, image_num=0, obj_num=0,
             kwargs['obj_num'] = obj_num
             kwargs['logger'] = logger
             result = BuildImage(**kwargs)
-            images += [ result[0] ]
-            psf_images += [ result[1] ]
-            weight_images += [ result[2] ]
-            badpix_images += [ result[3] ]
+            if image_func is None:
+                images += [ result[0] ]
+                psf_images += [ result[1] ]
+                weight_images += [ result[2] ]
+                badpix_images += [ result[3] ]
             t2 = time.time()
             if logger:
                 # Note: numpy shape is y,x
                 ys, xs = result[0].array.shape
                 logger.info('Image %d: size = %d x %d, time = %f sec', image_num+k, xs, ys, t2-t1)
             obj_num += galsim.config.GetNObjForImage(config, image_num+k)
+            if image_func is not None:
+                image_func(k, result)
 
     if logger:
         logger.debug('file %d: Done making images %d--%d',config.get('file_num',0),
@@ -374,7 +403,7 @@ def BuildSingleImage(config, logger=None, image_num=0, obj_num=0,
         config['image']['random_seed'] = { 'type' : 'Sequence', 'first' : first }
 
     ignore = [ 'random_seed', 'draw_method', 'noise', 'pixel_scale', 'wcs', 'nproc', 
-               'sky_level', 'sky_level_pixel',
+               'local_wcs_error', 'sky_level', 'sky_level_pixel',
                'retry_failures', 'n_photons', 'wmult', 'offset', 'gsparams' ]
     opt = { 'size' : int , 'xsize' : int , 'ysize' : int , 'index_convention' : str }
     params = galsim.config.GetAllParams(
@@ -401,7 +430,8 @@ def BuildSingleImage(config, logger=None, image_num=0, obj_num=0,
         logger.debug('image %d: image_origin = %s',image_num,str(config['image_origin']))
         logger.debug('image %d: image_center = %s',image_num,str(config['image_center']))
 
-    wcs = galsim.config.BuildWCS(config, logger)
+    with galsim.config.StageTimer(config, 'wcs'):
+        wcs = galsim.config.BuildWCS(config, logger)
 
     if 'world_pos' in config['image']:
         config['image']['image_pos'] = (0,0)
@@ -448,7 +478,7 @@ def BuildTiledImage(config, logger=None, image_num=0, obj_num=0,
         config['image']['random_seed'] = { 'type' : 'Sequence', 'first' : first }
 
     ignore = [ 'random_seed', 'draw_method', 'noise', 'pixel_scale', 'wcs', 'nproc',
-               'sky_level', 'sky_level_pixel',
+               'local_wcs_error', 'sky_level', 'sky_level_pixel',
                'retry_failures', 'image_pos', 'n_photons', 'wmult', 'offset', 'gsparams' ]
     req = { 'nx_tiles' : int , 'ny_tiles' : int }
     opt = { 'stamp_size' : int , 'stamp_xsize' : int , 'stamp_ysize' : int ,
@@ -508,7 +538,8 @@ def BuildTiledImage(config, logger=None, image_num=0, obj_num=0,
         logger.debug('image %d: image_origin = %s',image_num,str(config['image_origin']))
         logger.debug('image %d: image_center = %s',image_num,str(config['image_center']))
 
-    wcs = galsim.config.BuildWCS(config, logger)
+    with galsim.config.StageTimer(config, 'wcs'):
+        wcs = galsim.config.BuildWCS(config, logger)
 
     # Set the rng to use for image stuff.
     if 'random_seed' in config['image']:
@@ -702,7 +733,7 @@ def BuildScatteredImage(config, logger=None, image_num=0, obj_num=0,
         logger.debug('image %d: nobj = %d',image_num,nobjects)
 
     ignore = [ 'random_seed', 'draw_method', 'noise', 'pixel_scale', 'wcs', 'nproc',
-               'sky_level', 'sky_level_pixel',
+               'local_wcs_error', 'sky_level', 'sky_level_pixel',
                'retry_failures', 'image_pos', 'world_pos', 'n_photons', 'wmult', 'offset', 
                'stamp_size', 'stamp_xsize', 'stamp_ysize', 'gsparams', 'nobjects' ]
     opt = { 'size' : int , 'xsize' : int , 'ysize' : int , 
@@ -743,7 +774,8 @@ def BuildScatteredImage(config, logger=None, image_num=0, obj_num=0,
         logger.debug('image %d: image_origin = %s',image_num,str(config['image_origin']))
         logger.debug('image %d: image_center = %s',image_num,str(config['image_center']))
 
-    wcs = galsim.config.BuildWCS(config, logger)
+    with galsim.config.StageTimer(config, 'wcs'):
+        wcs = galsim.config.BuildWCS(config, logger)
 
     # Set the rng to use for image stuff.
     if 'random_seed' in config['image']:
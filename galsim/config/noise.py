@@ -64,34 +64,35 @@ def AddNoise(config, draw_method, im, weight_im, current_var, logger, add_sky=Tr
     Add noise to an image according to the noise specifications in the noise dict
     appropriate for an image that has been drawn using the specified method.
     """
-    if 'noise' in config['image']:
-        noise = config['image']['noise']
-        if not isinstance(noise, dict):
-            raise AttributeError("image.noise is not a dict.")
-    else:
-        # No noise.  Equivalent to draw_method = skip.
-        draw_method = 'skip'
-    rng = config['rng']
-
-    # Add the overall sky level, if desired
-    if add_sky:
-        sky = _get_sky(config['image'], config, wcs=im.wcs)
-        im += sky
-    else:
-        sky = 0.
+    with galsim.config.StageTimer(config, 'noise'):
+        if 'noise' in config['image']:
+            noise = config['image']['noise']
+            if not isinstance(noise, dict):
+                raise AttributeError("image.noise is not a dict.")
+        else:
+            # No noise.  Equivalent to draw_method = skip.
+            draw_method = 'skip'
+        rng = config['rng']
+
+        # Add the overall sky level, if desired
+        if add_sky:
+            sky = _get_sky(config['image'], config, wcs=im.wcs)
+            im += sky
+        else:
+            sky = 0.
 
-    # Add the noise specified
-    if draw_method is not 'skip':
+        # Add the noise specified
+        if draw_method is not 'skip':
 
-        if 'type' in noise:
-            type = noise['type']
-        else:
-            type = 'Poisson'  # Default is Poisson
-        if type not in valid_noise_types:
-            raise AttributeError("Invalid type %s for noise",type)
+            if 'type' in noise:
+                type = noise['type']
+            else:
+                type = 'Poisson'  # Default is Poisson
+            if type not in valid_noise_types:
+                raise AttributeError("Invalid type %s for noise",type)
 
-        noise_func = eval(valid_noise_types[type][0])
-        noise_func(noise, config, draw_method, rng, im, weight_im, current_var, sky, logger)
+            noise_func = eval(valid_noise_types[type][0])
+            noise_func(noise, config, draw_method, rng, im, weight_im, current_var, sky, logger)
 
 
 def CalculateNoiseVar(config):
@@ -177,8 +178,12 @@ def AddNoisePoisson(noise, config, draw_method, rng, im, weight_im, current_var,
     else:
         opt = {}
         single = [ { 'sky_level' : float , 'sky_level_pixel' : float } ]
+    opt['max_poisson'] = float
+    opt['fast'] = bool
     params = galsim.config.GetAllParams(noise, 'noise', config, opt=opt, single=single,
                                         ignore=noise_ignore)[0]
+    max_poisson = params.get('max_poisson', 1.e5)
+    fast = params.get('fast', False)
     if 'sky_level' in params:
         if 'sky_level_pixel' in params:
             raise AttributeError("Only one of sky_level and sky_level_pixel is allowed for "
@@ -237,7 +242,7 @@ def AddNoisePoisson(noise, config, draw_method, rng, im, weight_im, current_var,
         # Only add in the noise from the sky.
         if isinstance(sky, galsim.Image) or isinstance(extra_sky, galsim.Image):
             noise_im = sky + extra_sky
-            noise_im.addNoise(galsim.PoissonNoise(rng))
+            noise_im.addNoise(galsim.PoissonNoise(rng, max_poisson=max_poisson, fast=fast))
             if sky:
                 noise_im -= sky
             if extra_sky:
@@ -254,7 +259,7 @@ def AddNoisePoisson(noise, config, draw_method, rng, im, weight_im, current_var,
     else:
         im += extra_sky
         # Do the normal PoissonNoise calculation.
-        im.addNoise(galsim.PoissonNoise(rng))
+        im.addNoise(galsim.PoissonNoise(rng, max_poisson=max_poisson, fast=fast))
         im -= extra_sky
 
     if logger:
@@ -276,7 +281,7 @@ def NoiseVarPoisson(noise, config):
         opt = {}
         single = [ { 'sky_level' : float , 'sky_level_pixel' : float } ]
     params = galsim.config.GetAllParams(noise, 'noise', config, opt=opt, single=single,
-                                        ignore=noise_ignore)[0]
+                                        ignore=noise_ignore + ['max_poisson', 'fast'])[0]
     if 'sky_level' in params:
         if 'sky_level_pixel' in params:
             raise AttributeError("Only one of sky_level and sky_level_pixel is allowed for "
@@ -300,7 +305,7 @@ def AddNoiseCCD(noise, config, draw_method, rng, im, weight_im, current_var, sky
     # read noise.
 
     # Get how much extra sky to assume from the image.noise attribute.
-    opt = { 'gain' : float , 'read_noise' : float }
+    opt = { 'gain' : float , 'read_noise' : float , 'max_poisson' : float , 'fast' : bool }
     # The noise sky_level is only required here if the image doesn't have any.
     if sky:
         opt['sky_level'] = float
@@ -312,6 +317,8 @@ def AddNoiseCCD(noise, config, draw_method, rng, im, weight_im, current_var, sky
                                         ignore=noise_ignore)[0]
     gain = params.get('gain',1.0)
     read_noise = params.get('read_noise',0.0)
+    max_poisson = params.get('max_poisson', 1.e5)
+    fast = params.get('fast', False)
     read_noise_var = read_noise**2
     if 'sky_level' in params:
         if 'sky_level_pixel' in params:
@@ -393,7 +400,7 @@ def AddNoiseCCD(noise, config, draw_method, rng, im, weight_im, current_var, sky
         if isinstance(sky, galsim.Image) or isinstance(extra_sky, galsim.Image):
             noise_im = sky + extra_sky
             if gain != 1.0: noise_im *= gain
-            noise_im.addNoise(galsim.PoissonNoise(rng))
+            noise_im.addNoise(galsim.PoissonNoise(rng, max_poisson=max_poisson, fast=fast))
             if gain != 1.0: noise_im /= gain
             if sky:
                 noise_im -= sky
@@ -414,7 +421,8 @@ def AddNoiseCCD(noise, config, draw_method, rng, im, weight_im, current_var, sky
     else:
         # Do the normal CCDNoise calculation.
         im += extra_sky
-        im.addNoise(galsim.CCDNoise(rng, gain=gain, read_noise=read_noise))
+        im.addNoise(galsim.CCDNoise(rng, gain=gain, read_noise=read_noise,
+                                    max_poisson=max_poisson, fast=fast))
         im -= extra_sky
 
     if logger:
@@ -437,7 +445,7 @@ def NoiseVarCCD(noise, config):
     else:
         single = [ { 'sky_level' : float , 'sky_level_pixel' : float } ]
     params = galsim.config.GetAllParams(noise, 'noise', config, opt=opt, single=single,
-                                        ignore=noise_ignore)[0]
+                                        ignore=noise_ignore + ['max_poisson', 'fast'])[0]
     if 'sky_level' in params:
         if 'sky_level_pixel' in params:
             raise AttributeError("Only one of sky_level and sky_level_pixel is allowed for "
@@ -455,6 +463,18 @@ def NoiseVarCCD(noise, config):
 # COSMOS
 #
 
+# The COSMOS noise objects that have been built, keyed by their kwargs.  Reading the file and
+# calculating the power spectrum for each stamp is slow, so we build it once and then use copies
+# with the right rng, which share the stored power spectra.
+def _BuildCOSMOSNoise(key):
+    return galsim.correlatednoise.getCOSMOSNoise(**dict(key))
+
+_cosmos_noise_cache = galsim.utilities.LRU_Cache(_BuildCOSMOSNoise, maxsize=10)
+
+def _GetCOSMOSNoise(rng, kwargs):
+    key = tuple(sorted(kwargs.items()))
+    return _cosmos_noise_cache(key).copy(rng=rng)
+
 def AddNoiseCOSMOS(noise, config, draw_method, rng, im, weight_im, current_var, sky, logger):
     # NB: Identical for fft and phot
 
@@ -465,7 +485,7 @@ def AddNoiseCOSMOS(noise, config, draw_method, rng, im, weight_im, current_var,
                                         ignore=noise_ignore)[0]
 
     # Build the correlated noise 
-    cn = galsim.correlatednoise.getCOSMOSNoise(rng, **kwargs)
+    cn = _GetCOSMOSNoise(rng, kwargs)
     var = cn.getVariance()
 
     # If we are saving the noise level in a weight image, do that now.
@@ -498,7 +518,7 @@ def NoiseVarCOSMOS(noise, config):
     # for default variance: quick and ensures we don't needlessly duplicate code) 
     # Note: the rng being passed here is arbitrary, since we don't need it to calculate the
     # variance.  Building a BaseDeviate with a particular seed is the fastest option.
-    cn = galsim.correlatednoise.getCOSMOSNoise(galsim.BaseDeviate(123), **kwargs)
+    cn = _GetCOSMOSNoise(galsim.BaseDeviate(123), kwargs)
 
     # zero distance correlation function value returned as variance
     return cn.getVariance()
@@ -94,11 +94,11 @@ def RemoveCurrent(config, keep_safe=False, type=None):
           and (type == None or ('type' in config and config['type'] == type)) ):
         del config['current_val']
         del config['current_safe']
-        if 'current_obj_num' in config:
-            del config['current_obj_num']
-            del config['current_image_num']
-            del config['current_file_num']
-            del config['current_value_type']
+        for key in [ 'current_obj_num', 'current_image_num', 'current_file_num',
+                     'current_value_type', 'current_scope', 'current_gsparams',
+                     'current_signature' ]:
+            if key in config:
+                del config[key]
         return True
     else:
         return force
@@ -128,6 +128,11 @@ def CopyConfig(config):
     if 'input_manager' in config1:
         del config1['input_manager']
 
+    # If we are timing the processing, the copy gets its own timing totals, which the worker
+    # sends back along with its results.
+    if 'timing_stats' in config1:
+        config1['timing_stats'] = galsim.config.TimingStats()
+
     # Now deepcopy all the regular config fields to make sure things like current_val don't
     # get clobbered by two processes writing to the same dict.
     if 'gal' in config:
@@ -273,7 +278,8 @@ def ProcessInput(config, file_num=0, logger=None, file_scope_only=False, safe_on
                         continue
 
                     tag = key + str(i)
-                    input_obj = getattr(config['input_manager'],tag)(**kwargs)
+                    with galsim.config.StageTimer(config, 'input'):
+                        input_obj = getattr(config['input_manager'],tag)(**kwargs)
                     if logger:
                         logger.debug('file %d: Built input object %s %d',file_num,key,i)
                         if 'file_name' in kwargs:
@@ -344,6 +350,9 @@ def Process(config, logger=None):
     build and write the specified files.  The input field is processed before
     building each file.
     """
+    import time
+    t_start = time.time()
+
     # First thing to do is deep copy the input config to make sure we don't modify the original.
     import copy
     config = copy.deepcopy(config)
@@ -445,34 +454,15 @@ def Process(config, logger=None):
                 logger.warn("config.output.nproc <= 0, but unable to determine number of cpus.")
             nproc = 1
 
-    def worker(input, output):
-        proc = current_process().name
-        for job in iter(input.get, 'STOP'):
-            try:
-                (kwargs, file_num, file_name, logger) = job
-                if logger:
-                    logger.debug('%s: Received job to do file %d, %s',proc,file_num,file_name)
-                ProcessInput(kwargs['config'], file_num=file_num, logger=logger)
-                if logger:
-                    logger.debug('%s: After ProcessInput for file %d',proc,file_num)
-                kwargs['logger'] = logger
-                t = build_func(**kwargs)
-                if logger:
-                    logger.debug('%s: After %s for file %d',proc,build_func,file_num)
-                output.put( (t, file_num, file_name, proc) )
-            except Exception as e:
-                import traceback
-                tr = traceback.format_exc()
-                if logger:
-                    logger.debug('%s: Caught exception %s\n%s',proc,str(e),tr)
-                output.put( (e, file_num, file_name, tr) )
+    # If requested, record how much time is spent in each stage of the processing.
+    if 'timing' in output and galsim.config.ParseValue(output, 'timing', config, bool)[0]:
+        config['timing_stats'] = galsim.config.TimingStats()
+    elif 'timing_stats' in config:
+        del config['timing_stats']
 
-    # Set up the multi-process task_queue if we're going to need it.
-    if nproc > 1:
-        # NB: See the function BuildStamps for more verbose comments about how
-        # the multiprocessing stuff works.
-        from multiprocessing import Process, Queue, current_process
-        task_queue = Queue()
+    # If we are using more than one process (or the user has asked for a particular job
+    # backend), then each file is a job that we hand off to the backend to run.
+    use_backend = nproc > 1 or 'backend' in output
 
     # The logger is not picklable, so we use the same trick for it as we used for the 
     # input fields in CopyConfig to allow the worker processes to log their progress.
@@ -490,6 +480,9 @@ def Process(config, logger=None):
     else:
         logger_proxy = None
 
+    if use_backend:
+        backend = galsim.config.BuildJobBackend(config, nproc, logger_proxy)
+
     # Now start working on the files.
     image_num = 0
     obj_num = 0
@@ -518,6 +511,7 @@ def Process(config, logger=None):
                 config['image'], 'random_seed', config, int)[0]
 
     nfiles_use = nfiles
+    timing_file_name = None
     for file_num in range(nfiles):
         if logger:
             logger.debug('file_num, image_num, obj_num = %d,%d,%d',file_num,image_num,obj_num)
@@ -573,6 +567,11 @@ def Process(config, logger=None):
         else:
             dir = None
 
+        # The timing summary goes next to the first output file.
+        if timing_file_name is None:
+            timing_file_name = os.path.join(os.path.dirname(file_name),
+                                            os.path.basename(config['root']) + '_timing.json')
+
         # Assign some of the kwargs we know now:
         kwargs = {
             'file_name' : file_name,
@@ -662,9 +661,9 @@ def Process(config, logger=None):
                 kwargs[ extra_key+'_hdu' ] = params['hdu']
 
         # This is where we actually build the file.
-        # If we're doing multiprocessing, we send this information off to the task_queue.
+        # If we're using a job backend, we send this information off to the backend.
         # Otherwise, we just call build_func.
-        if nproc > 1:
+        if use_backend:
             import copy
             # Make new copies of config and kwargs so we can update them without
             # clobbering the versions for other tasks on the queue.
@@ -677,7 +676,7 @@ def Process(config, logger=None):
             # fix the problem.
             ProcessInput(config, file_num=file_num, logger=logger_proxy, safe_only=True)
             kwargs1['config'] = CopyConfig(config)
-            task_queue.put( (kwargs1, file_num, file_name, logger_proxy) )
+            backend.submit( (kwargs1, file_num, file_name), logger_proxy )
         else:
             try:
                 ProcessInput(config, file_num=file_num, logger=logger_proxy)
@@ -697,26 +696,18 @@ def Process(config, logger=None):
                     logger.error('%s',e)
                     logger.error('File %s not written! Continuing on...',file_name)
 
-    # If we're doing multiprocessing, here is the machinery to run through the task_queue
-    # and process the results.
-    if nproc > 1:
+    # If we're using a job backend, here is where we collect the results.
+    if use_backend:
         if logger:
             logger.warn("Using %d processes",nproc)
-        import time
         t1 = time.time()
-        # Run the tasks
-        done_queue = Queue()
-        p_list = []
-        for j in range(nproc):
-            p = Process(target=worker, args=(task_queue, done_queue), name='Process-%d'%(j+1))
-            p.start()
-            p_list.append(p)
 
         # Log the results.
         if logger:
             logger.debug('nfiles_use = %d',nfiles_use)
         for k in range(nfiles_use):
-            t, file_num, file_name, proc = done_queue.get()
+            t, file_num, file_name, proc, timing = backend.getResult()
+            galsim.config.MergeTiming(config, timing)
             if isinstance(t,Exception):
                 # t is really the exception, e
                 # proc is really the traceback
@@ -729,21 +720,49 @@ def Process(config, logger=None):
                 if logger:
                     logger.warn('%s: File %d = %s: time = %f sec', proc, file_num, file_name, t)
 
-        # Stop the processes
-        for j in range(nproc):
-            task_queue.put('STOP')
-        for j in range(nproc):
-            p_list[j].join()
-        task_queue.close()
+        # Stop the workers
+        backend.close()
         t2 = time.time()
         if logger:
             logger.warn('Total time for %d files with %d processes = %f sec', 
                         nfiles_use,nproc,t2-t1)
 
+    if 'timing_stats' in config and timing_file_name is not None:
+        galsim.config.WriteTimingSummary(config, timing_file_name, time.time()-t_start,
+                                         nfiles_use, nproc, logger)
+
     if logger:
         logger.debug('Done building files')
 
 
+def ProcessJob(job, logger=None):
+    """
+    Build a single file from a job set up by Process.  This is what the workers of the
+    various job backends call for each job they are given.
+
+    @param job          A tuple `(kwargs, file_num, file_name)`, where `kwargs` are the
+                        kwargs to pass to the build function for the output type,
+                        including the config dict to use.
+    @param logger       If given, a logger object to log progress. [default: None]
+
+    If the processing is being timed, the timing totals for this job are in the job's config
+    dict afterwards, and may be retrieved with GetTiming(kwargs['config']).
+
+    @returns the time taken to build the file.
+    """
+    (kwargs, file_num, file_name) = job
+    config = kwargs['config']
+    ProcessInput(config, file_num=file_num, logger=logger)
+    if logger:
+        logger.debug('file %d: After ProcessInput',file_num)
+    build_func = eval(valid_output_types[config['output']['type']][0])
+    kwargs['logger'] = logger
+    t = build_func(**kwargs)
+    if logger:
+        logger.debug('file %d: After %s',file_num,build_func)
+    return t
+
+
 # A helper function to retry io commands
 def _retry_io(func, args, ntries, file_name, logger):
     for itry in range(ntries):
@@ -765,6 +784,57 @@ def _retry_io(func, args, ntries, file_name, logger):
             break
     return ret
 
+def _OpenWriters(writer_class, file_names, args, ntries, logger):
+    """Make a writer of the given class (galsim.fits.MultiWriter or CubeWriter) for each of
+    `file_names`, or None where the file name is None.  If any of them fails to open, the ones
+    that were already opened are aborted, so their files are not left behind.
+    """
+    writers = []
+    try:
+        for f in file_names:
+            if f:
+                writers.append(_retry_io(writer_class, (f,) + args, ntries, f, logger))
+            else:
+                writers.append(None)
+    except:
+        for writer in writers:
+            if writer: writer.abort()
+        raise
+    return writers
+
+def _WriteImages(writers, images, ntries, logger):
+    """Write each image with the corresponding writer in `writers`, retrying on an IOError.
+    """
+    for writer, im in zip(writers, images):
+        if writer: _retry_io(writer.write, (im,), ntries, writer.file_name, logger)
+
+def _BuildAndWriteImages(writers, nimages, config, nproc, logger, image_num, obj_num,
+                         make_psf_image, make_weight_image, make_badpix_image, ntries):
+    """Build nimages images and write each one with the corresponding writer in `writers` (one
+    each for the main, psf, weight and badpix images, or None) as soon as it is done.  Then
+    close the writers.  If anything goes wrong, the partially written files are removed.
+    """
+    def write_images(k, images):
+        with galsim.config.StageTimer(config, 'write'):
+            _WriteImages(writers, images, ntries, logger)
+
+    try:
+        if nimages > 0:
+            galsim.config.BuildImages(
+                nimages, config=config, nproc=nproc, logger=logger,
+                image_num=image_num, obj_num=obj_num,
+                make_psf_image=make_psf_image, 
+                make_weight_image=make_weight_image,
+                make_badpix_image=make_badpix_image,
+                image_func=write_images)
+        with galsim.config.StageTimer(config, 'write'):
+            for writer in writers:
+                if writer: _retry_io(writer.close, (), ntries, writer.file_name, logger)
+    except:
+        for writer in writers:
+            if writer: writer.abort()
+        raise
+
 def BuildFits(file_name, config, logger=None, 
               file_num=0, image_num=0, obj_num=0,
               psf_file_name=None, psf_hdu=None,
@@ -864,35 +934,37 @@ def BuildFits(file_name, config, logger=None,
     else:
         ntries = 1
 
-    _retry_io(galsim.fits.writeMulti, (hdulist, file_name), ntries, file_name, logger)
-    if logger:
-        if len(hdus.keys()) == 1:
-            logger.debug('file %d: Wrote image to fits file %r',
-                         config['file_num'],file_name)
-        else:
-            logger.debug('file %d: Wrote image (with extra hdus) to multi-extension fits file %r',
-                         config['file_num'],file_name)
-
-    if psf_file_name:
-        _retry_io(galsim.fits.write, (all_images[1], psf_file_name),
-                  ntries, psf_file_name, logger)
+    with galsim.config.StageTimer(config, 'write'):
+        _retry_io(galsim.fits.writeMulti, (hdulist, file_name), ntries, file_name, logger)
         if logger:
-            logger.debug('file %d: Wrote psf image to fits file %r',
-                         config['file_num'],psf_file_name)
+            if len(hdus.keys()) == 1:
+                logger.debug('file %d: Wrote image to fits file %r',
+                             config['file_num'],file_name)
+            else:
+                logger.debug(
+                    'file %d: Wrote image (with extra hdus) to multi-extension fits file %r',
+                    config['file_num'],file_name)
 
-    if weight_file_name:
-        _retry_io(galsim.fits.write, (all_images[2], weight_file_name),
-                  ntries, weight_file_name, logger)
-        if logger:
-            logger.debug('file %d: Wrote weight image to fits file %r',
-                         config['file_num'],weight_file_name)
+        if psf_file_name:
+            _retry_io(galsim.fits.write, (all_images[1], psf_file_name),
+                      ntries, psf_file_name, logger)
+            if logger:
+                logger.debug('file %d: Wrote psf image to fits file %r',
+                             config['file_num'],psf_file_name)
 
-    if badpix_file_name:
-        _retry_io(galsim.fits.write, (all_images[3], badpix_file_name),
-                  ntries, badpix_file_name, logger)
-        if logger:
-            logger.debug('file %d: Wrote badpix image to fits file %r',
-                         config['file_num'],badpix_file_name)
+        if weight_file_name:
+            _retry_io(galsim.fits.write, (all_images[2], weight_file_name),
+                      ntries, weight_file_name, logger)
+            if logger:
+                logger.debug('file %d: Wrote weight image to fits file %r',
+                             config['file_num'],weight_file_name)
+
+        if badpix_file_name:
+            _retry_io(galsim.fits.write, (all_images[3], badpix_file_name),
+                      ntries, badpix_file_name, logger)
+            if logger:
+                logger.debug('file %d: Wrote badpix image to fits file %r',
+                             config['file_num'],badpix_file_name)
 
     t2 = time.time()
     return t2-t1
@@ -964,18 +1036,6 @@ def BuildMultiFits(file_name, config, nproc=1, logger=None,
                 "nimages=%d.  Reducing nproc to %d."%(nimages,nimages))
         nproc = nimages
 
-    all_images = galsim.config.BuildImages(
-        nimages, config=config, nproc=nproc, logger=logger,
-        image_num=image_num, obj_num=obj_num,
-        make_psf_image=make_psf_image, 
-        make_weight_image=make_weight_image,
-        make_badpix_image=make_badpix_image)
-
-    main_images = all_images[0]
-    psf_images = all_images[1]
-    weight_images = all_images[2]
-    badpix_images = all_images[3]
-
     if 'output' in config and 'retry_io' in config['output']:
         ntries = galsim.config.ParseValue(config['output'],'retry_io',config,int)[0]
         # This is how many _re_-tries.  Do at least 1, so ntries is 1 more than this.
@@ -983,32 +1043,21 @@ def BuildMultiFits(file_name, config, nproc=1, logger=None,
     else:
         ntries = 1
 
-    _retry_io(galsim.fits.writeMulti, (main_images, file_name), ntries, file_name, logger)
-    if logger:
-        logger.debug('file %d: Wrote images to multi-extension fits file %r',
-                     config['file_num'],file_name)
-
-    if psf_file_name:
-        _retry_io(galsim.fits.writeMulti, (psf_images, psf_file_name),
-                  ntries, psf_file_name, logger)
-        if logger:
-            logger.debug('file %d: Wrote psf images to multi-extension fits file %r',
-                         config['file_num'],psf_file_name)
+    # Each image is written to the files as soon as it is built, so we don't need to keep all
+    # the images in memory.
+    file_names = [ file_name, psf_file_name, weight_file_name, badpix_file_name ]
+    with galsim.config.StageTimer(config, 'write'):
+        writers = _OpenWriters(galsim.fits.MultiWriter, file_names, (), ntries, logger)
 
-    if weight_file_name:
-        _retry_io(galsim.fits.writeMulti, (weight_images, weight_file_name),
-                  ntries, weight_file_name, logger)
-        if logger:
-            logger.debug('file %d: Wrote weight images to multi-extension fits file %r',
-                         config['file_num'],weight_file_name)
-
-    if badpix_file_name:
-        _retry_io(galsim.fits.writeMulti, (all_images, badpix_file_name),
-                  ntries, badpix_file_name, logger)
-        if logger:
-            logger.debug('file %d: Wrote badpix images to multi-extension fits file %r',
-                         config['file_num'],badpix_file_name)
+    _BuildAndWriteImages(writers, nimages, config, nproc, logger, image_num, obj_num,
+                         make_psf_image, make_weight_image, make_badpix_image, ntries)
 
+    if logger:
+        for f, name in zip(file_names, [ 'images', 'psf images', 'weight images',
+                                         'badpix images' ]):
+            if f:
+                logger.debug('file %d: Wrote %s to multi-extension fits file %r',
+                             config['file_num'],name,f)
 
     t2 = time.time()
     return t2-t1
@@ -1074,6 +1123,13 @@ def BuildDataCube(file_name, config, nproc=1, logger=None,
     # Enforce this by buliding the first image outside the below loop and setting
     # config['image_force_xsize'] and config['image_force_ysize'] to be the size of the first 
     # image.
+    if 'output' in config and 'retry_io' in config['output']:
+        ntries = galsim.config.ParseValue(config['output'],'retry_io',config,int)[0]
+        # This is how many _re_-tries.  Do at least 1, so ntries is 1 more than this.
+        ntries = ntries + 1
+    else:
+        ntries = 1
+
     t2 = time.time()
     config1 = CopyConfig(config)
     all_images = galsim.config.BuildImage(
@@ -1081,6 +1137,7 @@ def BuildDataCube(file_name, config, nproc=1, logger=None,
             make_psf_image=make_psf_image, 
             make_weight_image=make_weight_image,
             make_badpix_image=make_badpix_image)
+    galsim.config.MergeTiming(config, galsim.config.GetTiming(config1))
     obj_num += galsim.config.GetNObjForImage(config, image_num)
     t3 = time.time()
     if logger:
@@ -1093,10 +1150,18 @@ def BuildDataCube(file_name, config, nproc=1, logger=None,
     config['image_force_xsize'] = image_xsize
     config['image_force_ysize'] = image_ysize
 
-    main_images = [ all_images[0] ]
-    psf_images = [ all_images[1] ]
-    weight_images = [ all_images[2] ]
-    badpix_images = [ all_images[3] ]
+    # Each image is written to the files as soon as it is built, so we don't need to keep all
+    # the images in memory.  The writers write the header for the full cube with the first image.
+    file_names = [ file_name, psf_file_name, weight_file_name, badpix_file_name ]
+    with galsim.config.StageTimer(config, 'write'):
+        writers = _OpenWriters(galsim.fits.CubeWriter, file_names, (nimages,), ntries, logger)
+        try:
+            _WriteImages(writers, all_images, ntries, logger)
+        except:
+            for writer in writers:
+                if writer: writer.abort()
+            raise
+    del all_images
 
     if nimages > 1:
         if nproc > nimages-1:
@@ -1109,57 +1174,22 @@ def BuildDataCube(file_name, config, nproc=1, logger=None,
                     "nimages=%d.  Reducing nproc to %d."%(nimages,nimages-1))
             nproc = nimages-1
 
-        all_images = galsim.config.BuildImages(
-            nimages-1, config=config, nproc=nproc, logger=logger,
-            image_num=image_num+1, obj_num=obj_num,
-            make_psf_image=make_psf_image,
-            make_weight_image=make_weight_image,
-            make_badpix_image=make_badpix_image)
-
-        main_images += all_images[0]
-        psf_images += all_images[1]
-        weight_images += all_images[2]
-        badpix_images += all_images[3]
-
-    if 'output' in config and 'retry_io' in config['output']:
-        ntries = galsim.config.ParseValue(config['output'],'retry_io',config,int)[0]
-        # This is how many _re_-tries.  Do at least 1, so ntries is 1 more than this.
-        ntries = ntries + 1
-    else:
-        ntries = 1
+    _BuildAndWriteImages(writers, nimages-1, config, nproc, logger, image_num+1, obj_num,
+                         make_psf_image, make_weight_image, make_badpix_image, ntries)
 
-    _retry_io(galsim.fits.writeCube, (main_images, file_name), ntries, file_name, logger)
     if logger:
-        logger.debug('file %d: Wrote image to fits data cube %r',
-                     config['file_num'],file_name)
-
-    if psf_file_name:
-        _retry_io(galsim.fits.writeCube, (psf_images, psf_file_name),
-                  ntries, psf_file_name, logger)
-        if logger:
-            logger.debug('file %d: Wrote psf images to fits data cube %r',
-                         config['file_num'],psf_file_name)
-
-    if weight_file_name:
-        _retry_io(galsim.fits.writeCube, (weight_images, weight_file_name),
-                  ntries, weight_file_name, logger)
-        if logger:
-            logger.debug('file %d: Wrote weight images to fits data cube %r',
-                         config['file_num'],weight_file_name)
-
-    if badpix_file_name:
-        _retry_io(galsim.fits.writeCube, (badpix_images, badpix_file_name),
-                  ntries, badpix_file_name, logger)
-        if logger:
-            logger.debug('file %d: Wrote badpix images to fits data cube %r',
-                         config['file_num'],badpix_file_name)
+        for f, name in zip(file_names, [ 'images', 'psf images', 'weight images',
+                                         'badpix images' ]):
+            if f:
+                logger.debug('file %d: Wrote %s to fits data cube %r',
+                             config['file_num'],name,f)
 
     t4 = time.time()
     return t4-t1
 
 def GetNObjForFits(config, file_num, image_num):
     ignore = [ 'file_name', 'dir', 'nfiles', 'psf', 'weight', 'badpix', 'nproc',
-               'skip', 'noclobber', 'retry_io' ]
+               'skip', 'noclobber', 'retry_io', 'backend', 'timing' ]
     galsim.config.CheckAllParams(config['output'], 'output', ignore=ignore)
     try : 
         nobj = [ galsim.config.GetNObjForImage(config, image_num) ]
@@ -1170,7 +1200,7 @@ def GetNObjForFits(config, file_num, image_num):
     
 def GetNObjForMultiFits(config, file_num, image_num):
     ignore = [ 'file_name', 'dir', 'nfiles', 'psf', 'weight', 'badpix', 'nproc', 
-               'skip', 'noclobber', 'retry_io' ]
+               'skip', 'noclobber', 'retry_io', 'backend', 'timing' ]
     req = { 'nimages' : int }
     # Allow nimages to be automatic based on input catalog if image type is Single
     if ( 'nimages' not in config['output'] and 
@@ -1193,7 +1223,7 @@ def GetNObjForMultiFits(config, file_num, image_num):
 
 def GetNObjForDataCube(config, file_num, image_num):
     ignore = [ 'file_name', 'dir', 'nfiles', 'psf', 'weight', 'badpix', 'nproc',
-               'skip', 'noclobber', 'retry_io' ]
+               'skip', 'noclobber', 'retry_io', 'backend', 'timing' ]
     req = { 'nimages' : int }
     # Allow nimages to be automatic based on input catalog if image type is Single
     if ( 'nimages' not in config['output'] and 
@@ -66,7 +66,7 @@ def BuildStamps(nobjects, config, nproc=1, logger=None, obj_num=0,
                     if logger:
                         logger.info('%s: Stamp %d: size = %d x %d, time = %f sec', 
                                     proc, obj_num+k, xs, ys, t)
-                output.put( (results, info, proc) )
+                output.put( (results, info, proc, galsim.config.GetTiming(kwargs['config'])) )
                 if logger:
                     logger.debug('%s: Finished job %d -- %d',proc,obj_num,obj_num+nobj-1)
             except Exception as e:
@@ -74,7 +74,7 @@ def BuildStamps(nobjects, config, nproc=1, logger=None, obj_num=0,
                 tr = traceback.format_exc()
                 if logger:
                     logger.error('%s: Caught exception %s\n%s',proc,str(e),tr)
-                output.put( (e, info, tr) )
+                output.put( (e, info, tr, None) )
         if logger:
             logger.debug('%s: Received STOP',proc)
     
@@ -187,7 +187,7 @@ def BuildStamps(nobjects, config, nproc=1, logger=None, obj_num=0,
         # You'll see that these logging statements get print out as the stamp images are still 
         # being drawn.  
         for i in range(0,nobjects,nobj_per_task):
-            results, k0, proc = done_queue.get()
+            results, k0, proc, timing = done_queue.get()
             if isinstance(results,Exception):
                 # results is really the exception, e
                 # proc is really the traceback
@@ -197,6 +197,7 @@ def BuildStamps(nobjects, config, nproc=1, logger=None, obj_num=0,
                 for j in range(nproc):
                     p_list[j].terminate()
                 raise results
+            galsim.config.MergeTiming(config, timing)
             k = k0
             for result in results:
                 images[k] = result[0]
@@ -409,11 +410,12 @@ def BuildSingleStamp(config, xsize=0, ysize=0,
             try :
                 t4=t3=t2=t1  # in case we throw.
         
-                psf = BuildPSF(config,logger,gsparams)
-                t2 = time.time()
+                with galsim.config.StageTimer(config, 'build'):
+                    psf = BuildPSF(config,logger,gsparams)
+                    t2 = time.time()
 
-                gal = BuildGal(config,logger,gsparams)
-                t4 = time.time()
+                    gal = BuildGal(config,logger,gsparams)
+                    t4 = time.time()
 
                 # Check that we have at least gal or psf.
                 if not (gal or psf):
@@ -459,7 +461,8 @@ def BuildSingleStamp(config, xsize=0, ysize=0,
                 current_var = 0
 
             else:
-                im, current_var = DrawStamp(psf,gal,config,xsize,ysize,offset,method)
+                with galsim.config.StageTimer(config, 'draw'):
+                    im, current_var = DrawStamp(psf,gal,config,xsize,ysize,offset,method)
                 if icenter:
                     im.setCenter(icenter.x, icenter.y)
                 if make_weight_image:
@@ -479,7 +482,8 @@ def BuildSingleStamp(config, xsize=0, ysize=0,
             t5 = time.time()
 
             if make_psf_image:
-                psf_im = DrawPSFStamp(psf,config,im.bounds,offset,method)
+                with galsim.config.StageTimer(config, 'draw'):
+                    psf_im = DrawPSFStamp(psf,config,im.bounds,offset,method)
                 if ('output' in config and 'psf' in config['output'] and 
                         'signal_to_noise' in config['output']['psf'] and
                         'noise' in config['image']):
@@ -543,6 +547,17 @@ def BuildGal(config, logger=None, gsparams={}):
     return gal
 
 
+# The FFTWorkspace used for drawing the stamps in this process.  Consecutive stamps are usually
+# the same size, so they can all share the same FFT tables and plans.  (This is not kept in the
+# config dict, since it cannot be pickled.)
+_fft_workspace = None
+
+def _GetFFTWorkspace():
+    global _fft_workspace
+    if _fft_workspace is None:
+        _fft_workspace = galsim.FFTWorkspace()
+    return _fft_workspace
+
 
 def DrawStamp(psf, gal, config, xsize, ysize, offset, method):
     """
@@ -571,6 +586,8 @@ def DrawStamp(psf, gal, config, xsize, ysize, offset, method):
     kwargs['wcs'] = config['wcs'].local(image_pos = config['image_pos'])
     if method == 'phot':
         kwargs['rng'] = config['rng']
+    else:
+        kwargs['workspace'] = _GetFFTWorkspace()
 
     # Check validity of extra phot options:
     max_extra_noise = None
@@ -698,7 +715,10 @@ def DrawPSFStamp(psf, config, bounds, offset, method):
 
     wcs = config['wcs'].local(config['image_pos'])
     im = galsim.ImageF(bounds, wcs=wcs)
-    im = psf.drawImage(image=im, offset=offset, method=method)
+    if method == 'phot':
+        im = psf.drawImage(image=im, offset=offset, method=method)
+    else:
+        im = psf.drawImage(image=im, offset=offset, method=method, workspace=_GetFFTWorkspace())
 
     if (('output' in config and 'psf' in config['output'] 
             and 'signal_to_noise' in config['output']['psf']) or
@@ -0,0 +1,160 @@
+# Copyright (c) 2012-2015 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+"""@file timing.py
+Optional instrumentation of the config processing, which records how much time is spent in
+each stage of building the output files.
+
+This is turned on with `output.timing = True` (or `galsim --profile`).  Then Process stores a
+TimingStats object in config['timing_stats'], and each stage that is wrapped in a StageTimer adds
+its wall and cpu time to it.  Worker processes get their own empty TimingStats (see CopyConfig)
+and send their totals back along with their results, so the final summary covers all of the
+processes.  The summary is logged and written to a JSON file next to the output files.
+"""
+
+import os
+import time
+
+# The stages that are timed by the standard config processing are:
+#   input   Processing the input fields (reading catalogs, etc.)
+#   wcs     Building the wcs for each image
+#   build   Building the psf and gal profiles for each object
+#   draw    Drawing the profiles onto the postage stamps
+#   noise   Adding the sky and noise to the images
+#   write   Writing the output files
+# Other modules may time their own stages with different names.
+
+
+def _cpu_time():
+    t = os.times()
+    return t[0] + t[1]
+
+
+class TimingStats(object):
+    """Accumulates the total wall time, cpu time and number of calls for each stage.
+    """
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, stage, wall, cpu, ncalls=1):
+        """Add the given times to the totals for `stage`.
+        """
+        if stage in self.stages:
+            s = self.stages[stage]
+            s[0] += wall
+            s[1] += cpu
+            s[2] += ncalls
+        else:
+            self.stages[stage] = [ wall, cpu, ncalls ]
+
+    def merge(self, timing):
+        """Add in the totals from another process, as returned by its getStats() method.
+        """
+        if timing:
+            for stage in timing:
+                s = timing[stage]
+                self.add(stage, s['wall'], s['cpu'], s['ncalls'])
+
+    def getStats(self):
+        """Return the totals as a dict `{ stage : { 'wall' : wall, 'cpu' : cpu, 'ncalls' : n } }`.
+        """
+        stats = {}
+        for stage in self.stages:
+            s = self.stages[stage]
+            stats[stage] = { 'wall' : s[0], 'cpu' : s[1], 'ncalls' : s[2] }
+        return stats
+
+
+class StageTimer(object):
+    """A context manager that times a stage of the processing if timing is turned on.
+
+        with galsim.config.StageTimer(config, 'draw'):
+            im = obj.drawImage(...)
+
+    If config does not have a TimingStats object in config['timing_stats'], this does nothing.
+    """
+    def __init__(self, config, stage):
+        self.stats = config.get('timing_stats', None)
+        self.stage = stage
+
+    def __enter__(self):
+        if self.stats is not None:
+            self.wall = time.time()
+            self.cpu = _cpu_time()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if self.stats is not None:
+            self.stats.add(self.stage, time.time() - self.wall, _cpu_time() - self.cpu)
+        return False
+
+
+def GetTiming(config):
+    """Return the timing totals accumulated in config, or None if timing is not turned on.
+
+    This is what the worker processes send back along with their results.
+    """
+    if 'timing_stats' in config:
+        return config['timing_stats'].getStats()
+    else:
+        return None
+
+
+def MergeTiming(config, timing):
+    """Add the timing totals from a worker process (as returned by GetTiming) into config.
+    """
+    if timing and 'timing_stats' in config:
+        config['timing_stats'].merge(timing)
+
+
+def WriteTimingSummary(config, file_name, total_time, nfiles, nproc, logger=None):
+    """
+    Log the timing totals stored in config['timing_stats'] and write them to a JSON file.
+
+    The JSON file holds a dict with the total wall time, the number of files and processes, and
+    a dict `stages` giving the wall time, cpu time and number of calls for each stage.  The
+    stage times are summed over all processes, so with nproc > 1 they may add up to more than
+    the total wall time.
+
+    @param config       The config dict, which should have a TimingStats in
+                        config['timing_stats'].
+    @param file_name    The name of the JSON file to write.
+    @param total_time   The total wall time for the whole run.
+    @param nfiles       The number of files built.
+    @param nproc        The number of processes used for building the files.
+    @param logger       If given, a logger object to log progress. [default: None]
+    """
+    import json
+    stats = config['timing_stats'].getStats()
+    summary = {
+        'total_wall' : total_time,
+        'nfiles' : nfiles,
+        'nproc' : nproc,
+        'stages' : stats
+    }
+    dir = os.path.dirname(file_name)
+    if dir and not os.path.isdir(dir): os.makedirs(dir)
+    with open(file_name, 'w') as fout:
+        json.dump(summary, fout, indent=2, sort_keys=True)
+
+    if logger:
+        logger.info('Time spent in each stage (summed over all processes):')
+        for stage in sorted(stats, key=lambda s: -stats[s]['wall']):
+            s = stats[stage]
+            logger.info('    %-8s wall = %10.3f sec, cpu = %10.3f sec, ncalls = %d',
+                        stage, s['wall'], s['cpu'], s['ncalls'])
+        logger.warn('Wrote timing summary to %s',file_name)
@@ -16,6 +16,7 @@
 #    and/or other materials provided with the distribution.
 #
 import galsim
+import math
 
 valid_value_types = {
     # The values are tuples with:
@@ -67,7 +68,8 @@ valid_value_types = {
 standard_ignore = [ 
     'type',
     'current_val', 'current_safe', 'current_value_type',
-    'current_obj_num', 'current_image_num', 'current_file_num',
+    'current_obj_num', 'current_image_num', 'current_file_num', 'current_scope',
+    'current_signature',
     '#' # When we read in json files, there represent comments
 ]
 
@@ -118,6 +120,22 @@ def ParseValue(config, param_name, base, value_type):
                 "Attempt to parse %s multiple times with different value types"%param_name)
         #print base['obj_num'],'Using current value of ',param_name,' = ',param['current_val']
         return param['current_val'], param['current_safe']
+    elif ( 'current_val' in param
+           and param.get('current_scope','obj') is None
+           and param['current_value_type'] == value_type
+           and param['current_signature'] == _ParamSignature(param, base) ):
+        # A safe value whose scope is None does not depend on which object, image or file we
+        # are building, so there is no need to walk the rest of this tree again, as long as the
+        # parameters have not been changed since.  (If an input object that it was built from
+        # changes, ProcessInput removes the current_val.)
+        return param['current_val'], True
+    elif ( 'current_val' in param
+           and param['current_value_type'] == value_type
+           and InCurrentScope(param, base)
+           and param['current_signature'] == _ParamSignature(param, base) ):
+        # Likewise, a value that only depends on the file or image we are building can be
+        # reused for the rest of that file or image.
+        return param['current_val'], False
     else:
         # Otherwise, we need to generate the value according to its type
         # (See valid_value_types defined at the top of the file.)
@@ -136,7 +154,7 @@ def ParseValue(config, param_name, base, value_type):
                 "Invalid value_type = %s specified for parameter %s with type = %s."%(
                     value_type, param_name, type))
 
-        generate_func = eval(valid_value_types[type][0])
+        generate_func = _GetGenerateFunc(valid_value_types[type][0])
         #print 'generate_func = ',generate_func
         val, safe = generate_func(param, param_name, base, value_type)
         #print 'returned val, safe = ',val,safe
@@ -152,10 +170,45 @@ def ParseValue(config, param_name, base, value_type):
         param['current_obj_num'] = base.get('obj_num',0)
         param['current_image_num'] = base.get('image_num',0)
         param['current_file_num'] = base.get('file_num',0)
+        if safe and _IsPureValue(param, base):
+            param['current_scope'] = None
+        else:
+            param['current_scope'] = _GetValueScope(param, base)
+        param['current_signature'] = _ParamSignature(param, base)
         #print param_name,' = ',val
         return val, safe
 
 
+def _ParamSignature(param, base=None):
+    """ @brief Make a snapshot of the parameters in param (ignoring the current values stored
+    in it), so we can tell if it has been changed since its current value was generated.
+
+    For Eval items, this includes the eval_variables from base as well.
+    """
+    if isinstance(param, dict):
+        sig = tuple(sorted([ (key, _ParamSignature(param[key])) for key in param
+                             if not (isinstance(key,basestring) and key.startswith('current_')) ]))
+        if base is not None and param.get('type') == 'Eval' and 'eval_variables' in base:
+            sig += (_ParamSignature(base['eval_variables']),)
+        return sig
+    elif isinstance(param, list):
+        return tuple([ _ParamSignature(item) for item in param ])
+    else:
+        return param
+
+
+# The generate functions, keyed by the names given in valid_value_types.  Looking the
+# function up with eval every time is a noticeable part of the cost of simple values.
+_generate_func_cache = {}
+
+def _GetGenerateFunc(name):
+    """ @brief Get the function with the given name (as listed in valid_value_types).
+    """
+    if name not in _generate_func_cache:
+        _generate_func_cache[name] = eval(name)
+    return _generate_func_cache[name]
+
+
 def _GetAngleValue(param, param_name):
     """ @brief Convert a string consisting of a value and an angle unit into an Angle.
     """
@@ -284,6 +337,163 @@ def GetCurrentValue(config, param_name):
         return param
 
 
+# The scopes over which a value (or GSObject) that is not safe might still stay the same,
+# from the broadest to the narrowest.  e.g. a value with scope 'image' only depends on which
+# image we are building, so it only needs to be generated once per image.  A scope of None
+# means the value is safe.
+value_scopes = [ None, 'file', 'image', 'obj' ]
+
+def MaxScope(*scopes):
+    """@brief Return the narrowest of the given scopes.
+    """
+    return value_scopes[max([ value_scopes.index(s) for s in scopes ])]
+
+def InCurrentScope(config, base):
+    """@brief Check whether the current value saved in config is still valid for the file and
+    image that we are building now, given the scope that was saved along with it.
+    """
+    scope = config.get('current_scope', 'obj')
+    if scope is None:
+        return config['current_safe']
+    elif scope == 'file':
+        return config['current_file_num'] == base.get('file_num',0)
+    elif scope == 'image':
+        return ( config['current_file_num'] == base.get('file_num',0)
+                 and config['current_image_num'] == base.get('image_num',0) )
+    else:
+        return False
+
+def GetChildScope(config):
+    """@brief Return the narrowest scope of any of the values (or GSObjects) in config.
+
+    Items that have a type, but no current_scope, were not used for the current value, so
+    they are skipped.
+    """
+    scope = None
+    for key in config:
+        if isinstance(key,basestring) and key.startswith('current_'):
+            continue
+        item = config[key]
+        if isinstance(item,list):
+            items = item
+        else:
+            items = [ item ]
+        for item in items:
+            if not isinstance(item,dict):
+                continue
+            elif 'type' in item:
+                if 'current_scope' in item:
+                    scope = MaxScope(scope, item['current_scope'])
+            else:
+                scope = MaxScope(scope, GetChildScope(item))
+    return scope
+
+# The value types whose value is a function of their parameters and nothing else, so their
+# scope is just the narrowest scope of their parameters.
+_composite_value_types = [
+    'List', 'Sum', 'NumberedFile', 'FormattedStr', 'Rad', 'Radians', 'Deg', 'Degrees',
+    'E1E2', 'EBeta', 'G1G2', 'GBeta', 'Eta1Eta2', 'EtaBeta', 'QBeta', 'XY', 'RTheta' ]
+
+# The value types that read from an input object, which can change from one file to the next.
+_input_value_types = [ 'Catalog', 'Dict', 'FitsHeader' ]
+
+# The scope of the variables that an Eval string may use from the base config dict.
+# Any other variables from there (e.g. image_pos, rng) vary from object to object.
+_eval_variable_scopes = {
+    'file_num' : 'file',
+    'start_obj_num' : 'file',
+    'image_num' : 'image',
+    'image_xsize' : 'image',
+    'image_ysize' : 'image',
+    'image_center' : 'image',
+    'image_origin' : 'image',
+    'pixel_scale' : 'image',
+}
+
+# The names that an Eval string may use without making its value depend on anything other
+# than its variables: the math functions (which are also used as numpy.sqrt, etc.), a few
+# builtins, and the attributes of positions.  Any other name (e.g. numpy.random) might give
+# a different value every time.
+_pure_eval_names = set([ name for name in dir(math) if not name.startswith('_') ] + [
+    'math', 'numpy', 'abs', 'min', 'max', 'sum', 'len', 'range', 'xrange', 'round', 'pow',
+    'int', 'float', 'bool', 'str', 'tuple', 'list', 'zip', 'sorted', 'True', 'False', 'None',
+    'x', 'y' ])
+
+def _IsPureValue(param, base):
+    """@brief Check whether a value that was just generated and reported as safe will really be
+    the same every time it is generated, so it can be reused for all objects.
+
+    This is the case if all the items used to generate it are also pure, except for Current,
+    which depends on another item, and Eval strings that use names not known to be pure.
+    """
+    type = param['type']
+    if type == 'Current':
+        return False
+    elif type == 'Eval':
+        return _GetValueScope(param, base) is None
+    else:
+        return GetChildScope(param) is None
+
+def _GetValueScope(param, base):
+    """@brief Work out the scope of a value that was just generated and is either not safe or
+    not pure.
+
+    Types that are not known to be any broader are taken to vary from object to object.
+    """
+    type = param['type']
+    if type in _composite_value_types:
+        return GetChildScope(param)
+    elif type in _input_value_types:
+        return MaxScope('file', GetChildScope(param))
+    elif type == 'Sequence':
+        index_key = param.get('index_key', base.get('index_key','obj_num'))
+        if isinstance(index_key, dict):
+            index_key = index_key['current_val']
+        if index_key == 'file_num':
+            scope = 'file'
+        elif index_key == 'image_num':
+            scope = 'image'
+        else:
+            scope = 'obj'
+        return MaxScope(scope, GetChildScope(param))
+    elif type == 'Eval':
+        scope = GetChildScope(param)
+        if 'eval_variables' in base:
+            scope = MaxScope(scope, GetChildScope(base['eval_variables']))
+        # The user-defined variables have letter prefixes, which are not part of the name.
+        user_names = [ key[1:] for key in param if key not in standard_ignore + ['str'] ]
+        if 'eval_variables' in base:
+            user_names += [ key[1:] for key in base['eval_variables']
+                            if key not in standard_ignore ]
+        string = GetCurrentValue(param, 'str')
+        for name in _GetCodeNames(_CompileEvalString(string)):
+            if name in user_names or name in _pure_eval_names:
+                pass
+            elif name in _eval_variable_scopes:
+                scope = MaxScope(scope, _eval_variable_scopes[name])
+            elif name in galsim.config.valid_input_types:
+                scope = MaxScope(scope, 'file')
+            else:
+                # e.g. image_pos, obj_num, rng, or anything unknown.
+                scope = 'obj'
+        return scope
+    else:
+        return 'obj'
+
+def _GetCodeNames(code):
+    """@brief Return all the global names used by a code object, including the ones used inside
+    any nested code objects (from generator expressions, comprehensions, lambdas, etc.).
+
+    Names that are local to the nested code (e.g. the loop variable of a generator expression)
+    are not included.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, type(code)):
+            names |= _GetCodeNames(const)
+    return names
+
+
 #
 # Now all the GenerateFrom functions:
 #
@@ -827,23 +1037,16 @@ def _GenerateFromNumberedFile(param, param_name, base, value_type):
     #print base['obj_num'],'NumberedFile = ',s
     return s, safe
 
-def _GenerateFromFormattedStr(param, param_name, base, value_type):
-    """@brief Create a string from a format string
-    """
-    req = { 'format' : str }
-    # Ignore items for now, we'll deal with it differently.
-    ignore = [ 'items' ]
-    params, safe = GetAllParams(param, param_name, base, req=req, ignore=ignore)
-    format = params['format']
+# The list of value types expected by each format string used in a FormattedStr, so each
+# format only needs to be parsed once.
+_format_types_cache = {}
 
-    # Check that items is present and is a list.
-    if 'items' not in param:
-        raise AttributeError("Attribute items is required for %s.type = FormattedStr"%param_name)
-    items = param['items']
-    if not isinstance(items,list):
-        raise AttributeError("items entry for parameter %s is not a list."%param_name)
+def _GetFormatTypes(format):
+    """@brief Return the list of value types expected by a format string
+    """
+    if format in _format_types_cache:
+        return _format_types_cache[format]
 
-    # Figure out what types we are expecting for the list elements:
     tokens = format.split('%')
     val_types = []
     skip = False 
@@ -868,6 +1071,29 @@ def _GenerateFromFormattedStr(param, param_name, base, value_type):
         else:
             raise ValueError("Unable to parse '%s' as a valid format string"%format)
 
+    _format_types_cache[format] = val_types
+    return val_types
+
+
+def _GenerateFromFormattedStr(param, param_name, base, value_type):
+    """@brief Create a string from a format string
+    """
+    req = { 'format' : str }
+    # Ignore items for now, we'll deal with it differently.
+    ignore = [ 'items' ]
+    params, safe = GetAllParams(param, param_name, base, req=req, ignore=ignore)
+    format = params['format']
+
+    # Check that items is present and is a list.
+    if 'items' not in param:
+        raise AttributeError("Attribute items is required for %s.type = FormattedStr"%param_name)
+    items = param['items']
+    if not isinstance(items,list):
+        raise AttributeError("items entry for parameter %s is not a list."%param_name)
+
+    # Figure out what types we are expecting for the list elements:
+    val_types = _GetFormatTypes(format)
+
     if len(val_types) != len(items):
         raise ValueError(
             "Number of items for FormatStr (%d) does not match number expected from "%len(items)+
@@ -1090,6 +1316,17 @@ def _type_by_letter(key):
     else:
         raise AttributeError("Invalid Eval variable: %s (starts with an invalid letter)"%key)
 
+# The compiled code for each Eval string.  Compiling the string is a large part of the cost
+# of evaluating it, and the same few strings are typically evaluated for every object.
+_eval_code_cache = {}
+
+def _CompileEvalString(string):
+    """@brief Return the compiled code object for an Eval string
+    """
+    if string not in _eval_code_cache:
+        _eval_code_cache[string] = compile(string, '<Eval>', 'eval')
+    return _eval_code_cache[string]
+
 def _GenerateFromEval(param, param_name, base, value_type):
     """@brief Evaluate a string as the provided type
     """
@@ -1108,10 +1345,15 @@ def _GenerateFromEval(param, param_name, base, value_type):
     string = params['str']
     #print 'string = ',string
 
+    # We allow the use of math functions
+    import math
+    import numpy
+    import os
+    eval_vars = { 'math' : math, 'numpy' : numpy, 'os' : os }
+
     # Bring the user-defined variables into scope.
     for key in opt.keys():
-        exec(key[1:] + ' = params[key]')
-        #print key[1:],'=',eval(key[1:])
+        eval_vars[key[1:]] = params[key]
 
     # Also bring in any top level eval_variables
     if 'eval_variables' in base:
@@ -1128,56 +1370,38 @@ def _GenerateFromEval(param, param_name, base, value_type):
         #print 'params = ',params
         safe = safe and safe1
         for key in opt.keys():
-            exec(key[1:] + ' = params[key]')
-            #print key[1:],'=',eval(key[1:])
+            eval_vars[key[1:]] = params[key]
 
-    # Also, we allow the use of math functions
-    import math
-    import numpy
-    import os
+    try:
+        code = _CompileEvalString(string)
+    except:
+        raise ValueError("Unable to evaluate string %r as a %s for %s"%(
+                string,value_type,param_name))
 
     # Try evaluating the string as is.
+    # Note: the variables need to be in the globals dict, not a separate locals dict, since
+    # any names used inside a generator expression or lambda are only looked up as globals.
+    eval_globals = dict(globals())
+    eval_globals.update(eval_vars)
     try:
-        val = value_type(eval(string))
+        val = value_type(eval(code, eval_globals))
         #print base['obj_num'],'Simple Eval(%s) = %s'%(string,val)
         return val, safe
     except:
         pass
 
     # Then try bringing in the allowed variables to see if that works:
-    if 'image_pos' in base:
-        image_pos = base['image_pos']
-    if 'world_pos' in base:
-        world_pos = base['world_pos']
-    if 'image_center' in base:
-        image_center = base['image_center']
-    if 'image_origin' in base:
-        image_origin = base['image_origin']
-    if 'image_xsize' in base:
-        image_xsize = base['image_xsize']
-    if 'image_ysize' in base:
-        image_ysize = base['image_ysize']
-    if 'stamp_xsize' in base:
-        stamp_xsize = base['stamp_xsize']
-    if 'stamp_ysize' in base:
-        stamp_ysize = base['stamp_ysize']
-    if 'pixel_scale' in base:
-        pixel_sclae = base['pixel_scale']
-    if 'rng' in base:
-        rng = base['rng']
-    if 'file_num' in base:
-        file_num = base.get('file_num',0)
-    if 'image_num' in base:
-        image_num = base.get('image_num',0)
-    if 'obj_num' in base:
-        obj_num = base['obj_num']
-    if 'start_obj_num' in base:
-        start_obj_num = base.get('start_obj_num',0)
+    for key in [ 'image_pos', 'world_pos', 'image_center', 'image_origin',
+                 'image_xsize', 'image_ysize', 'stamp_xsize', 'stamp_ysize', 'pixel_scale',
+                 'rng', 'file_num', 'image_num', 'obj_num', 'start_obj_num' ]:
+        if key in base:
+            eval_vars[key] = base[key]
     for key in galsim.config.valid_input_types.keys():
         if key in base:
-            exec(key + ' = base[key]')
+            eval_vars[key] = base[key]
+    eval_globals.update(eval_vars)
     try:
-        val = value_type(eval(string))
+        val = value_type(eval(code, eval_globals))
         #print base['obj_num'],'Eval(%s) needed extra variables: val = %s'%(string,val)
         return val, False
     except:
@@ -100,6 +100,19 @@ def BuildWCS(config, logger=None):
             scale = 1.0
         wcs = galsim.PixelScale(scale)
 
+    # If requested, interpolate the local wcs at each object from a grid of Jacobians covering
+    # the full image, rather than calculating it directly for each object.
+    if ('local_wcs_error' in image and not wcs.isUniform() and
+            config.get('image_xsize',0) > 0 and config.get('image_ysize',0) > 0):
+        max_error = galsim.config.ParseValue(image, 'local_wcs_error', config, float)[0]
+        origin = config['image_origin']
+        bounds = galsim.BoundsI(origin.x, origin.x + config['image_xsize'] - 1,
+                                origin.y, origin.y + config['image_ysize'] - 1)
+        wcs = wcs.withLocalGrid(bounds, max_error=max_error)
+        if logger:
+            logger.debug('image %d: Using local wcs grid with estimated error %g',
+                         config['image_num'],wcs.local_grid_error)
+
     # Write it to the config dict and also return it.
     config['wcs'] = wcs
 
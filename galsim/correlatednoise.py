@@ -90,18 +90,20 @@ class _BaseCorrelatedNoise(object):
         self.wcs = wcs
 
         # When applying normal or whitening noise to an image, we normally do calculations.
-        # If _profile_for_stored is profile, then it means that we can use the stored values in
-        # _rootps_store, _rootps_whitening_store, and/or _rootps_symmetrizing_store and avoid having
-        # to redo the calculations.
-        # So for now, we start out with _profile_for_stored = None, and _rootps_store,  
-        # _rootps_whitening_store, _rootps_symmetrizing_store empty.
-        self._profile_for_stored = None
-        self._rootps_store = []
-        self._rootps_whitening_store = []
-        self._rootps_symmetrizing_store = []
-        # Also set up the cache for a stored value of the variance, needed for efficiency once the
-        # noise field can get convolved with other GSObjects making isAnalyticX() False
-        self._variance_stored = None
+        # The sqrt(power spectrum) for each shape and wcs, and the variance, are stored in a
+        # _NoiseFieldGenerator for the profile, which may be shared with other noise objects (e.g.
+        # copies of this one).  If _generator.profile is not _profile, then the profile has changed
+        # and we need a new one.
+        self._generator = None
+        # The whitening and symmetrizing power spectra are stored in a cache shared by all noise
+        # objects (see _kernel_cache below), keyed by a description of the correlation function.
+        # _kernel_key stores this key once it has been calculated for _kernel_key_for.  Noise
+        # objects made from another one by one of the methods below have _kernel_key_source set
+        # to (parent, op, args), so the key can be found from the parent's key without needing
+        # the repr of the whole new profile.
+        self._kernel_key = None
+        self._kernel_key_for = None
+        self._kernel_key_source = None
 
     def getRNG(self): return self._rng
     @property
@@ -140,7 +142,25 @@ class _BaseCorrelatedNoise(object):
         """
         if rng is None:
             rng = self.rng
-        return _BaseCorrelatedNoise(rng, self._profile.copy(), self.wcs)
+        ret = self._derived(self._profile.copy(), 'copy', rng=rng)
+        # The copy has the same correlation function, so it can use our stored power spectra.
+        ret._generator = _NoiseFieldGenerator(ret._profile, self._get_generator())
+        return ret
+
+    def _derived(self, profile, op, *args, **kwargs):
+        """Internal utility function to make a new noise object with the given `profile`, which is
+        the result of applying the operation `op` with the given `args` to our profile.
+
+        The `op` and `args` are used to get the key for the whitening and symmetrizing kernel
+        cache.  With `op='scale'`, `args[0]` is the variance ratio, and with `op='copy'`, the
+        correlation function is unchanged.  Other operations must be linear in the correlation
+        function (as all the transformations here are), so that they commute with scaling.
+        """
+        rng = kwargs.pop('rng', self.rng)
+        ret = _BaseCorrelatedNoise(rng, profile, self.wcs)
+        ret._kernel_key_source = (self, op, args)
+        ret._kernel_key_for = ret._profile
+        return ret
 
     def __repr__(self):
         return "galsim.correlatednoise._BaseCorrelatedNoise(%r,%r,%r)"%(
@@ -213,15 +233,6 @@ class _BaseCorrelatedNoise(object):
         if not image.bounds.isDefined():
             raise ValueError("Input image argument must have defined bounds.")
 
-        # If the profile has changed since last time (or if we have never been here before),
-        # clear out the stored values.
-        if self._profile_for_stored is not self._profile:
-            self._rootps_store = []
-            self._rootps_whitening_store = []
-            self._variance_stored = None
-        # Set profile_for_stored for next time.
-        self._profile_for_stored = self._profile
-
         if image.wcs is not None and not image.wcs.isUniform():
             raise NotImplementedError("Sorry, correlated noise cannot be applied to an "+
                                       "image with a non-uniform WCS.")
@@ -231,16 +242,61 @@ class _BaseCorrelatedNoise(object):
         else:
             wcs = image.wcs
 
-        # Then retrieve or redraw the sqrt(power spectrum) needed for making the noise field
-        rootps = self._get_update_rootps(image.array.shape, wcs)
-
-        # Finally generate a random field in Fourier space with the right PS
-        noise_array = _generate_noise_from_rootps(self.rng, image.array.shape, rootps)
-
-        # Add it to the image
+        # Then generate a random field with the right PS, using the stored sqrt(power spectrum)
+        # if we have it, and add it to the image.
+        noise_array = self._get_generator().generate(self.rng, image.array.shape, wcs)
         image.array[:,:] += noise_array
         return image
 
+    def applyToImages(self, images):
+        """Apply this correlated Gaussian random noise field to each of a list of input Images.
+
+        This is equivalent to calling applyTo() on each image in turn, and gives exactly the same
+        noise values, but it is more efficient when many of the images have the same shape and
+        wcs (e.g. postage stamps of a fixed size).  Each run of consecutive images with the same
+        shape and wcs has its noise fields generated together, using a single batched inverse FFT.
+
+        @param images   A list of Image objects.
+
+        @returns the list of images.
+        """
+        # Check all the images before adding noise to any of them.
+        keys = []
+        for image in images:
+            if not isinstance(image, galsim.Image):
+                raise TypeError("Input image argument must be a galsim.Image.")
+            if not image.bounds.isDefined():
+                raise ValueError("Input image argument must have defined bounds.")
+            if image.wcs is not None and not image.wcs.isUniform():
+                raise NotImplementedError("Sorry, correlated noise cannot be applied to an "+
+                                          "image with a non-uniform WCS.")
+            if image.wcs is None:
+                wcs = self.wcs
+            else:
+                wcs = image.wcs
+            keys.append( (image.array.shape, wcs) )
+
+        batch = []
+        batch_key = None
+        for image, key in zip(images, keys):
+            if batch and key != batch_key:
+                self._apply_to_batch(batch, batch_key)
+                batch = []
+            batch.append(image)
+            batch_key = key
+        if batch:
+            self._apply_to_batch(batch, batch_key)
+        return images
+
+    def _apply_to_batch(self, images, key):
+        """Internal utility function used by applyToImages() to add noise to a list of images
+        that all have the same shape and wcs, given by `key = (shape, wcs)`.
+        """
+        shape, wcs = key
+        noise_arrays = self._get_generator().generate(self.rng, shape, wcs, nfields=len(images))
+        for image, noise_array in zip(images, noise_arrays):
+            image.array[:,:] += noise_array
+
     def applyToView(self, image_view):
         raise RuntimeError(
             "CorrelatedNoise can only be applied to a regular Image, not an ImageView")
@@ -314,15 +370,6 @@ class _BaseCorrelatedNoise(object):
         if not image.bounds.isDefined():
             raise ValueError("Input image argument must have defined bounds.")
 
-        # If the profile has changed since last time (or if we have never been here before),
-        # clear out the stored values.
-        if self._profile_for_stored is not self._profile:
-            self._rootps_store = []
-            self._rootps_whitening_store = []
-            self._variance_stored = None
-        # Set profile_for_stored for next time.
-        self._profile_for_stored = self._profile
-
         if image.wcs is None:
             wcs = self.wcs
         else:
@@ -406,15 +453,6 @@ class _BaseCorrelatedNoise(object):
         if order % 2 != 0 or order <= 2:
             raise ValueError("Order must be an even number >=4!")
 
-        # If the profile has changed since last time (or if we have never been here before),
-        # clear out the stored values.  Note that this cache is not the same as the one used for
-        # whitening.
-        if self._profile_for_stored is not self._profile:
-            self._rootps_store = []
-            self._rootps_symmetrizing_store = []
-        # Set profile_for_stored for next time.
-        self._profile_for_stored = self._profile
-
         if image.wcs is None:
             wcs = self.wcs
         else:
@@ -442,7 +480,7 @@ class _BaseCorrelatedNoise(object):
 
         @returns a new CorrelatedNoise object with the specified expansion.
         """
-        return _BaseCorrelatedNoise(self.rng, self._profile.expand(scale), self.wcs)
+        return self._derived(self._profile.expand(scale), 'expand', scale)
 
     def dilate(self, scale):
         """Apply the appropriate changes to the scale and variance for when the object has
@@ -454,7 +492,7 @@ class _BaseCorrelatedNoise(object):
         """
         # Expansion changes the flux by scale**2, dilate reverses that to conserve flux,
         # so the variance needs to change by scale**-4.
-        return _BaseCorrelatedNoise(self.rng, self._profile.expand(scale) / scale**4, self.wcs)
+        return self._derived(self._profile.expand(scale) / scale**4, 'dilate', scale)
 
     def magnify(self, mu):
         """Apply the appropriate changes to the scale and variance for when the object has
@@ -464,7 +502,7 @@ class _BaseCorrelatedNoise(object):
 
         @returns a new CorrelatedNoise object with the specified magnification.
         """
-        return _BaseCorrelatedNoise(self.rng, self._profile.magnify(mu), self.wcs)
+        return self._derived(self._profile.magnify(mu), 'magnify', mu)
 
     def lens(self, g1, g2, mu):
         """Apply the appropriate changes for when the object has an applied shear and magnification.
@@ -475,7 +513,7 @@ class _BaseCorrelatedNoise(object):
 
         @returns a new CorrelatedNoise object with the specified shear and magnification.
         """
-        return _BaseCorrelatedNoise(self.rng, self._profile.lens(g1,g2,mu), self.wcs)
+        return self._derived(self._profile.lens(g1,g2,mu), 'lens', g1, g2, mu)
 
     def rotate(self, theta):
         """Apply a rotation `theta` to this correlated noise model.
@@ -486,7 +524,7 @@ class _BaseCorrelatedNoise(object):
         """
         if not isinstance(theta, galsim.Angle):
             raise TypeError("Input theta should be an Angle")
-        return _BaseCorrelatedNoise(self.rng, self._profile.rotate(theta), self.wcs)
+        return self._derived(self._profile.rotate(theta), 'rotate', theta)
 
     def shear(self, *args, **kwargs):
         """Apply a shear to this correlated noise model, where arguments are either a Shear,
@@ -500,7 +538,8 @@ class _BaseCorrelatedNoise(object):
 
         @returns a new CorrelatedNoise object with the specified shear.
         """
-        return _BaseCorrelatedNoise(self.rng, self._profile.shear(*args,**kwargs), self.wcs)
+        return self._derived(self._profile.shear(*args,**kwargs), 'shear',
+                             args, sorted(kwargs.items()))
 
     def transform(self, dudx, dudy, dvdx, dvdy):
         """Apply an arbitrary jacobian transformation to this correlated noise model.
@@ -512,8 +551,8 @@ class _BaseCorrelatedNoise(object):
 
         @returns a new CorrelatedNoise object with the specified transformation.
         """
-        return _BaseCorrelatedNoise(self.rng, self._profile.transform(dudx,dudy,dvdx,dvdy),
-                                    self.wcs)
+        return self._derived(self._profile.transform(dudx,dudy,dvdx,dvdy), 'transform',
+                             dudx, dudy, dvdx, dvdy)
 
     def getVariance(self):
         """Return the point variance of this noise field, equal to its correlation function value at
@@ -526,23 +565,8 @@ class _BaseCorrelatedNoise(object):
         if self._profile.isAnalyticX():
             variance = self._profile.xValue(galsim.PositionD(0., 0.))
         else:
-            # If the profile has changed since last time (or if we have never been here before),
-            # clear out the stored values.
-            if self._profile_for_stored is not self._profile:
-                self._rootps_store = []
-                self._rootps_whitening_store = []
-                self._variance_stored = None
-            # Set profile_for_stored for next time.
-            self._profile_for_stored = self._profile
-            # Then use cached version or rebuild if necessary
-            if self._variance_stored is not None:
-                variance = self._variance_stored
-            else:
-                imtmp = galsim.ImageD(1, 1)
-                # GalSim internals handle this correctly w/out folding
-                self.drawImage(imtmp, scale=1.)
-                variance = imtmp(1, 1)
-                self._variance_stored = variance # Store variance for next time
+            # Use the cached version or rebuild if necessary
+            variance = self._get_generator().getVariance()
         return variance
 
     def withVariance(self, variance):
@@ -568,7 +592,15 @@ class _BaseCorrelatedNoise(object):
         @returns a CorrelatedNoise object whose variance and covariances have been scaled up by
                  the given factor.
         """
-        return _BaseCorrelatedNoise(self.rng, self._profile * variance_ratio, self.wcs)
+        if variance_ratio > 0.:
+            # The power spectra just scale with the variance, so we can use scaled versions of
+            # our stored ones rather than drawing the new profile.
+            ret = self._derived(self._profile * variance_ratio, 'scale', variance_ratio)
+            ret._generator = _NoiseFieldGenerator(ret._profile, self._get_generator(),
+                                                  variance_ratio)
+        else:
+            ret = _BaseCorrelatedNoise(self.rng, self._profile * variance_ratio, self.wcs)
+        return ret
 
     def convolvedWith(self, gsobject, gsparams=None):
         """Convolve the correlated noise model with an input GSObject.
@@ -618,7 +650,7 @@ class _BaseCorrelatedNoise(object):
         @returns the new CorrelatedNoise of the convolved profile.
         """
         conv = galsim.Convolve([self._profile, galsim.AutoCorrelate(gsobject)], gsparams=gsparams)
-        return _BaseCorrelatedNoise(self.rng, conv, self.wcs)
+        return self._derived(conv, 'convolve', gsobject, gsparams)
 
     def drawImage(self, image=None, scale=None, wcs=None, dtype=None, wmult=1., add_to_image=False,
                   dx=None):
@@ -667,63 +699,46 @@ class _BaseCorrelatedNoise(object):
             image=image, wcs=wcs, dtype=dtype, method='sb', gain=1., wmult=wmult,
             add_to_image=add_to_image, use_true_center=False)
 
-    def _get_update_rootps(self, shape, wcs):
-        """Internal utility function for querying the `rootps` cache, used by applyTo(),
-        whitenImage(), and symmetrizeImage() methods.
+    def _get_generator(self):
+        """Internal utility function to get the _NoiseFieldGenerator for the current profile,
+        making a new one if the profile has changed since last time (or if we have never been
+        here before).
         """
-        # First check whether we can just use a stored power spectrum (no drawing necessary if so)
-        use_stored = False
-        # Query using the rfft2/irfft2 half-sized shape (shape[0], shape[1] // 2 + 1)
-        half_shape = (shape[0], shape[1] // 2 + 1)
-        for rootps_array, saved_wcs in self._rootps_store:
-            if rootps_array.shape == half_shape and wcs == saved_wcs:
-                use_stored = True
-                rootps = rootps_array
-                break
-
-        # If not, draw the correlation function to the desired size and resolution, then DFT to
-        # generate the required array of the square root of the power spectrum
-        if use_stored is False:
-            # Draw this correlation function into an array.  If this is not done at the same wcs as
-            # the original image from which the CF derives, even if the image is rotated, then this
-            # step requires interpolation and the newcf (used to generate the PS below) is thus
-            # approximate at some level
-            newcf = galsim.ImageD(shape[1], shape[0], wcs=wcs)
-            self.drawImage(newcf)
-
-            # Since we just drew it, save the variance value for posterity.
-            var = newcf(newcf.bounds.center())
-            self._variance_stored = var
-
-            if var <= 0.:
-                raise RuntimeError("CorrelatedNoise found to have negative variance.")
+        if self._generator is None or self._generator.profile is not self._profile:
+            self._generator = _NoiseFieldGenerator(self._profile)
+        return self._generator
 
-            # Then calculate the sqrt(PS) that will be used to generate the actual noise.  First do
-            # the power spectrum (PS)
-            ps = np.fft.rfft2(newcf.array)
+    def _get_kernel_key(self):
+        """Internal utility function to get the key for the current profile in the whitening and
+        symmetrizing kernel cache.
 
-            # The PS we expect should be *purely* +ve, but there are reasons why this is not the
-            # case.  One is that the PS is calculated from a correlation function CF that has not
-            # been rolled to be centred on the [0, 0] array element.  Another reason is due to the
-            # approximate nature of the CF rendered above.  Thus an abs(ps) will be necessary when
-            # calculating the sqrt().
-            # This all means that the performance of correlated noise fields should always be tested
-            # for any given scientific application that requires high precision output.  An example
-            # of such a test is the generation of noise whitened images of sheared RealGalaxies in
-            # Section 9.2 of the GalSim paper (Rowe, Jarvis, Mandelbaum et al. 2014)
-
-            # Given all the above, it might make sense to warn the user if we do detect a PS that
-            # doesn't "look right" (i.e. has strongly negative values where these are not expected).
-            # This is the subject of Issue #587 on GalSim's GitHub repository page (see 
-            # https://github.com/GalSim-developers/GalSim/issues/587)
-
-            # For now we just take the sqrt(abs(PS)):
-            rootps = np.sqrt(np.abs(ps))
-
-            # Then add this and the relevant wcs to the _rootps_store for later use
-            self._rootps_store.append((rootps, newcf.wcs))
+        @returns key, scale, where the correlation function is `scale` times the one that `key`
+                 describes.
+        """
+        if self._kernel_key is None or self._kernel_key_for is not self._profile:
+            if self._kernel_key_source is not None and self._kernel_key_for is self._profile:
+                parent, op, args = self._kernel_key_source
+                key, scale = parent._get_kernel_key()
+                if op == 'scale':
+                    scale *= args[0]
+                elif op != 'copy':
+                    key = _hash_key(key, op, repr(args))
+            else:
+                # Then the profile is not derived from another one (or has been changed in place),
+                # so we need to use the full repr.
+                key = _hash_key(repr(self._profile))
+                scale = 1.
+            self._kernel_key = (key, scale)
+            self._kernel_key_for = self._profile
+            # Don't keep the parent alive any longer than necessary.
+            self._kernel_key_source = None
+        return self._kernel_key
 
-        return rootps
+    def _get_update_rootps(self, shape, wcs):
+        """Internal utility function for querying the `rootps` cache, used by the
+        whitenImage() and symmetrizeImage() methods.
+        """
+        return self._get_generator().getRootPS(shape, wcs)
 
     def _get_update_rootps_whitening(self, shape, wcs, headroom=1.05):
         """Internal utility function for querying the `rootps_whitening` cache, used by the
@@ -731,36 +746,36 @@ class _BaseCorrelatedNoise(object):
 
         @returns rootps_whitening, variance
         """
-        # First check whether we can just use a stored whitening power spectrum
-        use_stored = False
-        # Query using the rfft2/irfft2 half-sized shape (shape[0], shape[1] // 2 + 1)
-        half_shape = (shape[0], shape[1] // 2 + 1)
-        for rootps_whitening_array, saved_wcs, var in self._rootps_whitening_store:
-            if rootps_whitening_array.shape == half_shape and wcs == saved_wcs:
-                use_stored = True
-                rootps_whitening = rootps_whitening_array
-                variance = var
-                break
-
-        # If not, calculate the whitening power spectrum as (almost) the smallest power spectrum
+        key, scale = self._get_kernel_key()
+        rootps_whitening, variance = _kernel_cache(
+            _KernelCacheKey((key, 'whiten', shape, wcs, headroom), self, scale))
+        # The cache holds the values for the unscaled correlation function.  The power spectrum
+        # and variance scale linearly with the correlation function.
+        if scale != 1.:
+            rootps_whitening = rootps_whitening * np.sqrt(scale)
+            variance = variance * scale
+        return rootps_whitening, variance
+
+    def _calculate_rootps_whitening(self, shape, wcs, headroom=1.05):
+        """Internal utility function to calculate the `rootps_whitening` for the given shape
+        and wcs.
+
+        @returns rootps_whitening, variance
+        """
+        # Calculate the whitening power spectrum as (almost) the smallest power spectrum
         # that when added to rootps**2 gives a flat resultant power that is nowhere negative.
         # Note that rootps = sqrt(power spectrum), and this procedure therefore works since power
         # spectra add (rather like variances).  The resulting power spectrum will be all positive
         # (and thus physical).
-        if use_stored is False:
-
-            rootps = self._get_update_rootps(shape, wcs)
-            ps_whitening = -rootps * rootps
-            ps_whitening += np.abs(np.min(ps_whitening)) * headroom # Headroom adds a little extra
-            rootps_whitening = np.sqrt(ps_whitening)                # variance, for "safety"
+        rootps = self._get_update_rootps(shape, wcs)
+        ps_whitening = -rootps * rootps
+        ps_whitening += np.abs(np.min(ps_whitening)) * headroom # Headroom adds a little extra
+        rootps_whitening = np.sqrt(ps_whitening)                # variance, for "safety"
 
-            # Finally calculate the theoretical combined variance to output alongside the image
-            # to be generated with the rootps_whitening.  Note that although we use the [0, 0]
-            # element we could use any as the PS should be flat.
-            variance = rootps[0, 0]**2 + ps_whitening[0, 0]
-
-            # Then add all this and the relevant wcs to the _rootps_whitening_store
-            self._rootps_whitening_store.append((rootps_whitening, wcs, variance))
+        # Finally calculate the theoretical combined variance to output alongside the image
+        # to be generated with the rootps_whitening.  Note that although we use the [0, 0]
+        # element we could use any as the PS should be flat.
+        variance = rootps[0, 0]**2 + ps_whitening[0, 0]
 
         return rootps_whitening, variance
 
@@ -770,45 +785,40 @@ class _BaseCorrelatedNoise(object):
 
         @returns rootps_symmetrizing, variance
         """
-        # First check whether we can just use a stored symmetrizing power spectrum.  In addition for
-        # the considerations for use of cached observations for noise whitening, we need the
-        # requested order of the symmetry to be the same as the stored one.
-        use_stored = False
-        # Query using the rfft2/irfft2 half-sized shape (shape[0], shape[1] // 2 + 1)
-        half_shape = (shape[0], shape[1] // 2 + 1)
-        for (
-            rootps_symmetrizing_array, saved_wcs, var, saved_order
-            ) in self._rootps_symmetrizing_store:
-            if (rootps_symmetrizing_array.shape == half_shape and saved_order == order and
-                    wcs == saved_wcs):
-                use_stored = True
-                rootps_symmetrizing = rootps_symmetrizing_array
-                variance = var
-                break
-
-        # If not, calculate the symmetrizing power spectrum as (almost) the smallest power spectrum
+        # In addition to the considerations for use of cached values for noise whitening, we need
+        # the requested order of the symmetry to be the same as the stored one.
+        key, scale = self._get_kernel_key()
+        rootps_symmetrizing, variance = _kernel_cache(
+            _KernelCacheKey((key, 'symmetrize', shape, wcs, order, headroom), self, scale))
+        if scale != 1.:
+            rootps_symmetrizing = rootps_symmetrizing * np.sqrt(scale)
+            variance = variance * scale
+        return rootps_symmetrizing, variance
+
+    def _calculate_rootps_symmetrizing(self, shape, wcs, order, headroom=1.02):
+        """Internal utility function to calculate the `rootps_symmetrizing` for the given shape,
+        wcs and order.
+
+        @returns rootps_symmetrizing, variance
+        """
+        # Calculate the symmetrizing power spectrum as (almost) the smallest power spectrum
         # that when added to rootps**2 gives a power that has N-fold symmetry, where `N=order`.
         # Note that rootps = sqrt(power spectrum), and this procedure therefore works since power
         # spectra add (rather like variances).  The resulting power spectrum will be all positive
         # (and thus physical).
-        if use_stored is False:
-
-            rootps = self._get_update_rootps(shape, wcs)
-            ps_actual = rootps * rootps
-            # This routine will get a PS that is a symmetrized version of `ps_actual` at the desired
-            # order, that also satisfies the requirement of being >= ps_actual for all k values.
-            ps_symmetrized = self._get_symmetrized_ps(ps_actual, order)
-            ps_symmetrizing = ps_symmetrized * headroom - ps_actual # add a little extra variance
-            rootps_symmetrizing = np.sqrt(ps_symmetrizing)
-
-            # Finally calculate the theoretical combined variance to output alongside the image to
-            # be generated with the rootps_symmetrizing.
-            # Here, unlike in _get_update_rootps_whitening, the final power spectrum is not flat, so
-            # we have to take the mean power instead of just using the [0, 0] element.
-            variance = np.mean(rootps**2 + ps_symmetrizing)
-
-            # Then add all this and the relevant wcs to the _rootps_symmetrizing_store
-            self._rootps_symmetrizing_store.append((rootps_symmetrizing, wcs, variance, order))
+        rootps = self._get_update_rootps(shape, wcs)
+        ps_actual = rootps * rootps
+        # This routine will get a PS that is a symmetrized version of `ps_actual` at the desired
+        # order, that also satisfies the requirement of being >= ps_actual for all k values.
+        ps_symmetrized = self._get_symmetrized_ps(ps_actual, order)
+        ps_symmetrizing = ps_symmetrized * headroom - ps_actual # add a little extra variance
+        rootps_symmetrizing = np.sqrt(ps_symmetrizing)
+
+        # Finally calculate the theoretical combined variance to output alongside the image to
+        # be generated with the rootps_symmetrizing.
+        # Here, unlike in _calculate_rootps_whitening, the final power spectrum is not flat, so
+        # we have to take the mean power instead of just using the [0, 0] element.
+        variance = np.mean(rootps**2 + ps_symmetrizing)
 
         return rootps_symmetrizing, variance
 
@@ -881,7 +891,7 @@ class _BaseCorrelatedNoise(object):
 # Now a standalone utility function for generating noise according to an input (square rooted)
 # Power Spectrum
 #
-def _generate_noise_from_rootps(rng, shape, rootps):
+def _generate_noise_from_rootps(rng, shape, rootps, nfields=None):
     """Utility function for generating a NumPy array containing a Gaussian random noise field with
     a user-specified power spectrum also supplied as a NumPy array.
 
@@ -892,8 +902,12 @@ def _generate_noise_from_rootps(rng, shape, rootps):
     @param rootps   NumPy array containing the square root of the discrete Power Spectrum ordered
                     in two dimensions according to the usual DFT pattern for `np.fft.rfft2` output
                     (see also `np.fft.fftfreq`)
+    @param nfields  If given, make this many noise fields at once, using a single batched
+                    `np.fft.irfft2`.  The fields are the same as those made by `nfields` calls
+                    in turn without this parameter.  [default: None, which means make one field]
 
-    @returns a NumPy array (contiguous) of the requested shape, filled with the noise field.
+    @returns a NumPy array (contiguous) of the requested shape, filled with the noise field,
+             or if `nfields` is given, an array of shape `(nfields, shape[0], shape[1])`.
     """
     # Sanity check on requested shape versus that of rootps
     if len(shape) != 2 or (shape[0], shape[1]/2+1) != rootps.shape:
@@ -904,29 +918,217 @@ def _generate_noise_from_rootps(rng, shape, rootps):
                                                       # <|gaussvec|**2> = product(shape); shape
                                                       # needed because of the asymmetry in the
                                                       # 1/N^2 division in the NumPy FFT/iFFT
-    # Fill a couple of arrays with this noise
-    gvec_real = galsim.utilities.rand_arr((shape[0], shape[1]/2+1), gd)
-    gvec_imag = galsim.utilities.rand_arr((shape[0], shape[1]/2+1), gd)
+    # Fill the real and then the imaginary parts for each field with this noise.  Each field
+    # uses an even number of deviates, so the values are the same as making each field in turn.
+    if nfields is None:
+        gvec_parts = np.empty((2, shape[0], shape[1]/2+1), dtype=float)
+    else:
+        gvec_parts = np.empty((nfields, 2, shape[0], shape[1]/2+1), dtype=float)
+    gd.generate(gvec_parts)
     # Prepare a complex vector upon which to impose Hermitian symmetry
-    gvec = gvec_real + 1J * gvec_imag
+    gvec = gvec_parts[...,0,:,:] + 1J * gvec_parts[...,1,:,:]
     # Now impose requirements of Hermitian symmetry on random Gaussian halfcomplex array, and ensure
     # self-conjugate elements (e.g. [0, 0]) are purely real and multiplied by sqrt(2) to compensate
     # for lost variance, see https://github.com/GalSim-developers/GalSim/issues/563
+    # The leading ... index is over the fields when nfields is given.
     # First do the bits necessary for both odd and even shapes:
-    gvec[-1:shape[0]/2:-1, 0] = np.conj(gvec[1:(shape[0]+1)/2, 0])
+    gvec[...,-1:shape[0]/2:-1, 0] = np.conj(gvec[...,1:(shape[0]+1)/2, 0])
     rt2 = np.sqrt(2.)
-    gvec[0, 0] = rt2 * gvec[0, 0].real
+    gvec[...,0, 0] = rt2 * gvec[...,0, 0].real
     # Then make the changes necessary for even sized arrays
     if shape[1] % 2 == 0: # x dimension even
-        gvec[-1:shape[0]/2:-1, shape[1]/2] = np.conj(gvec[1:(shape[0]+1)/2, shape[1]/2])
-        gvec[0, shape[1]/2] = rt2 * gvec[0, shape[1]/2].real
+        gvec[...,-1:shape[0]/2:-1, shape[1]/2] = np.conj(gvec[...,1:(shape[0]+1)/2, shape[1]/2])
+        gvec[...,0, shape[1]/2] = rt2 * gvec[...,0, shape[1]/2].real
     if shape[0] % 2 == 0: # y dimension even
-        gvec[shape[0]/2, 0] = rt2 * gvec[shape[0]/2, 0].real
+        gvec[...,shape[0]/2, 0] = rt2 * gvec[...,shape[0]/2, 0].real
         # Both dimensions even
         if shape[1] % 2 == 0:
-            gvec[shape[0]/2, shape[1]/2] = rt2 * gvec[shape[0]/2, shape[1]/2].real
-    # Finally generate and return noise using the irfft
-    return np.fft.irfft2(gvec * rootps, s=shape)
+            gvec[...,shape[0]/2, shape[1]/2] = rt2 * gvec[...,shape[0]/2, shape[1]/2].real
+    # Finally generate and return noise using the irfft (over the last two axes)
+    gvec *= rootps
+    return np.fft.irfft2(gvec, s=shape)
+
+
+class _NoiseFieldGenerator(object):
+    """An internal class that generates noise fields for a given correlation function profile.
+
+    This stores the sqrt(power spectrum) for each shape and wcs that noise fields have been
+    generated for, along with the variance, so they only need to be calculated once.  The
+    generator does not depend on the rng, so it can be shared by all copies of a correlated noise
+    object.  A generator may also be made from a `parent` generator for a profile whose variance
+    has been scaled by `variance_ratio`, in which case it uses scaled versions of the parent's
+    power spectra rather than drawing the new profile.
+
+    @param profile          The GSObject representing the correlation function.
+    @param parent           A generator for the same profile, but possibly with a different
+                            variance. [default: None]
+    @param variance_ratio   The ratio of the variance of `profile` to that of the parent's
+                            profile. [default: 1]
+    """
+    def __init__(self, profile, parent=None, variance_ratio=1.):
+        self.profile = profile
+        self._parent = parent
+        self._variance_ratio = variance_ratio
+        self._rootps_store = []
+        self._variance = None
+
+    def addRootPS(self, rootps, wcs):
+        """Add an already calculated sqrt(power spectrum) for the given wcs to the store.
+        """
+        self._rootps_store.append((rootps, wcs))
+
+    def getRootPS(self, shape, wcs):
+        """Get the sqrt(power spectrum) for making noise fields of the given shape and wcs,
+        calculating it if it is not already stored.
+        """
+        # First check whether we can just use a stored power spectrum (no drawing necessary if so)
+        # Query using the rfft2/irfft2 half-sized shape (shape[0], shape[1] // 2 + 1)
+        half_shape = (shape[0], shape[1] // 2 + 1)
+        for rootps, saved_wcs in self._rootps_store:
+            if rootps.shape == half_shape and wcs == saved_wcs:
+                return rootps
+
+        if self._parent is not None:
+            # The power spectrum scales with the variance, so rootps scales as its sqrt.
+            rootps = self._parent.getRootPS(shape, wcs)
+            if self._variance_ratio != 1.:
+                rootps = rootps * np.sqrt(self._variance_ratio)
+        else:
+            # If not, draw the correlation function to the desired size and resolution, then DFT
+            # to generate the required array of the square root of the power spectrum.
+            # If this is not done at the same wcs as the original image from which the CF derives,
+            # even if the image is rotated, then this step requires interpolation and the newcf
+            # (used to generate the PS below) is thus approximate at some level
+            newcf = galsim.ImageD(shape[1], shape[0], wcs=wcs)
+            self.profile.drawImage(newcf, method='sb', gain=1., use_true_center=False)
+
+            # Since we just drew it, save the variance value for posterity.
+            var = newcf(newcf.bounds.center())
+            self._variance = var
+
+            if var <= 0.:
+                raise RuntimeError("CorrelatedNoise found to have negative variance.")
+
+            # Then calculate the sqrt(PS) that will be used to generate the actual noise.  First do
+            # the power spectrum (PS)
+            ps = np.fft.rfft2(newcf.array)
+
+            # The PS we expect should be *purely* +ve, but there are reasons why this is not the
+            # case.  One is that the PS is calculated from a correlation function CF that has not
+            # been rolled to be centred on the [0, 0] array element.  Another reason is due to the
+            # approximate nature of the CF rendered above.  Thus an abs(ps) will be necessary when
+            # calculating the sqrt().
+            # This all means that the performance of correlated noise fields should always be tested
+            # for any given scientific application that requires high precision output.  An example
+            # of such a test is the generation of noise whitened images of sheared RealGalaxies in
+            # Section 9.2 of the GalSim paper (Rowe, Jarvis, Mandelbaum et al. 2014)
+
+            # Given all the above, it might make sense to warn the user if we do detect a PS that
+            # doesn't "look right" (i.e. has strongly negative values where these are not expected).
+            # This is the subject of Issue #587 on GalSim's GitHub repository page (see
+            # https://github.com/GalSim-developers/GalSim/issues/587)
+
+            # For now we just take the sqrt(abs(PS)):
+            rootps = np.sqrt(np.abs(ps))
+
+        # Then add this and the relevant wcs to the _rootps_store for later use
+        self._rootps_store.append((rootps, wcs))
+        return rootps
+
+    def getVariance(self):
+        """Get the variance of the noise fields, i.e. the value of the correlation function at
+        zero distance.
+        """
+        if self._variance is None:
+            if self._parent is not None:
+                self._variance = self._parent.getVariance() * self._variance_ratio
+            else:
+                imtmp = galsim.ImageD(1, 1)
+                # GalSim internals handle this correctly w/out folding
+                self.profile.drawImage(imtmp, scale=1., method='sb', gain=1.,
+                                       use_true_center=False)
+                self._variance = imtmp(1, 1)
+        return self._variance
+
+    def generate(self, rng, shape, wcs, nfields=None):
+        """Generate a noise field of the given shape for an image with the given wcs.
+
+        @param rng      The BaseDeviate to use for generating the random numbers.
+        @param shape    The shape of the noise field.
+        @param wcs      The wcs of the image that the noise is for.
+        @param nfields  If given, make this many noise fields at once. [default: None]
+
+        @returns the noise field as a NumPy array, or if `nfields` is given, an array of shape
+                 `(nfields, shape[0], shape[1])`.
+        """
+        rootps = self.getRootPS(shape, wcs)
+        return _generate_noise_from_rootps(rng, shape, rootps, nfields)
+
+
+###
+# The cache of whitening and symmetrizing power spectra.
+#
+# Calculating these requires drawing the correlation function, which is often the slowest part of
+# whitening the noise in e.g. a RealGalaxy stamp.  The correlation function of such noise is
+# normally one of a small number of noise models convolved with one of a small number of PSFs,
+# possibly with a different variance, so we keep the results in an LRU cache shared by all the
+# noise objects in this process.  The values are stored for the unscaled correlation function
+# described by the key (see _BaseCorrelatedNoise._get_kernel_key), and scaled as needed.
+#
+def _hash_key(*args):
+    """Internal utility function to make a compact key from some (possibly very long) strings.
+    """
+    import hashlib
+    return hashlib.md5('\n'.join(args)).hexdigest()
+
+class _KernelCacheKey(object):
+    """The argument for _kernel_cache.  Only `key` is used for comparisons.  `noise` and `scale`
+    are used to calculate the value when it is not already in the cache.
+    """
+    def __init__(self, key, noise, scale):
+        self.key = key
+        self.noise = noise
+        self.scale = scale
+    def __eq__(self, other):
+        return isinstance(other, _KernelCacheKey) and self.key == other.key
+    def __ne__(self, other): return not self.__eq__(other)
+    def __hash__(self): return hash(self.key)
+
+def _calculate_kernel(cache_key):
+    key = cache_key.key
+    noise = cache_key.noise
+    scale = cache_key.scale
+    # This key is now stored in the cache, so don't keep the noise object alive.
+    cache_key.noise = None
+    if key[1] == 'whiten':
+        rootps, variance = noise._calculate_rootps_whitening(*key[2:])
+    else:
+        rootps, variance = noise._calculate_rootps_symmetrizing(*key[2:])
+    return rootps / np.sqrt(scale), variance / scale
+
+_kernel_cache = utilities.LRU_Cache(_calculate_kernel, maxsize=20)
+
+def getKernelCacheStats():
+    """Get statistics about the reuse of the whitening and symmetrizing power spectra.
+
+    The power spectra of the noise added by CorrelatedNoise.whitenImage() and
+    CorrelatedNoise.symmetrizeImage() are kept in a least recently used cache, which is shared by
+    all the correlated noise objects in the current process.  So when many images are whitened
+    with the same noise model (up to an overall scaling of the variance) and the same image
+    shape, the power spectrum only needs to be calculated once.
+
+    @returns a dict with the number of `hits` and `misses` of the cache so far and its `maxsize`.
+    """
+    return { 'hits' : _kernel_cache.hits, 'misses' : _kernel_cache.misses,
+             'maxsize' : len(_kernel_cache.cache) }
+
+def setKernelCacheSize(maxsize):
+    """Set the maximum number of whitening and symmetrizing power spectra to keep in the cache.
+    See getKernelCacheStats() for more about this cache.  [default: 20]
+
+    @param maxsize      The new maximum size of the cache.
+    """
+    _kernel_cache.resize(maxsize)
 
 
 ###
@@ -1063,6 +1265,13 @@ class CorrelatedNoise(_BaseCorrelatedNoise):
     is used to get the pixel scale of the input image unless this is <= 0, in which case a scale
     of 1 is assumed.
 
+    To add noise to many images (e.g. postage stamps), use
+
+        >>> cn.applyToImages(images)
+
+    which gives the same noise as applying it to each image in turn, but generates the noise for
+    images with the same shape and wcs together.
+
     A number of methods familiar from GSObject instances have also been implemented directly as
     `cn` methods, so that the following commands are all legal:
 
@@ -1217,8 +1426,7 @@ class CorrelatedNoise(_BaseCorrelatedNoise):
         if store_rootps:
             # If it corresponds to the CF above, store useful data as a (rootps, wcs) tuple for
             # efficient later use:
-            self._profile_for_stored = self._profile
-            self._rootps_store.append((np.sqrt(ps_array), cf_image.wcs))
+            self._get_generator().addRootPS(np.sqrt(ps_array), cf_image.wcs)
 
         self._image = image
 
@@ -34,7 +34,7 @@ def CN_applyExpansion(self, scale):
     depr('applyExpansion', 1.1, 'obj = obj.expand(scale)')
     new_obj = self.copy().expand(scale)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_createDilated(self, scale):
@@ -47,7 +47,7 @@ def CN_applyDilation(self, scale):
     depr('applyDilation', 1.1, 'obj = obj.dilate(scale)')
     new_obj = self.copy().dilate(scale)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_createMagnified(self, mu):
@@ -60,7 +60,7 @@ def CN_applyMagnification(self, mu):
     depr('applyMagnification', 1.1, 'obj = obj.magnify(mu)')
     new_obj = self.copy().magnify(mu)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_createLensed(self, g1, g2, mu):
@@ -73,7 +73,7 @@ def CN_applyLensing(self, g1, g2, mu):
     depr('applyLensing', 1.1, 'obj = obj.lens(g1,g2,mu)')
     new_obj = self.copy().lens(g1,g2,mu)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_createRotated(self, theta):
@@ -86,7 +86,7 @@ def CN_applyRotation(self, theta):
     depr('applyRotation', 1.1, 'obj = obj.rotate(theta)')
     new_obj = self.rotate(theta)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_createSheared(self, *args, **kwargs):
@@ -99,7 +99,7 @@ def CN_applyShear(self, *args, **kwargs):
     depr('applyShear', 1.1, 'obj = obj.shear(shear)')
     new_obj = self.copy().shear(*args, **kwargs)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_createTransformed(self, dudx, dudy, dvdx, dvdy):
@@ -112,7 +112,7 @@ def CN_applyTransformation(self, dudx, dudy, dvdx, dvdy):
     depr('applyTransformation', 1.1, 'obj = obj.transform(dudx,dudy,dvdx,dvdy)')
     new_obj = self.copy().transform(dudx,dudy,dvdx,dvdy)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_setVariance(self, variance):
@@ -122,7 +122,7 @@ def CN_setVariance(self, variance):
     depr('setVariance', 1.1, 'obj = obj.withVariance(variance)')
     new_obj = self.copy().withVariance(variance)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_scaleVariance(self, variance_ratio):
@@ -130,7 +130,7 @@ def CN_scaleVariance(self, variance_ratio):
     depr('scaleVariance', 1.1, 'obj = obj * variance_ratio')
     new_obj = self.copy().withScaledVariance(variance_ratio)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_convolveWith(self, gsobject, gsparams=None):
@@ -140,7 +140,7 @@ def CN_convolveWith(self, gsobject, gsparams=None):
     depr('convolveWith', 1.1, 'obj = obj.convolvedWith(gsobject, gsparams)')
     new_obj = self.copy().convolvedWith(gsobject,gsparams)
     self._profile = new_obj._profile
-    self._profile_for_stored = None  # Reset the stored profile as it is no longer up-to-date
+    self._generator = None  # Reset the stored generator as it is no longer up-to-date
     self.__class__ = new_obj.__class__
 
 def CN_draw(self, *args, **kwargs):
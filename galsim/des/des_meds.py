@@ -395,7 +395,8 @@ def BuildMEDS(file_name, config, nproc=1, logger=None, file_num=0, image_num=0,
     config['seq_index'] = file_num
     config['file_num'] = file_num
 
-    ignore = [ 'file_name', 'dir', 'nfiles', 'psf', 'weight', 'badpix', 'nproc' ]
+    ignore = [ 'file_name', 'dir', 'nfiles', 'psf', 'weight', 'badpix', 'nproc', 'backend',
+               'timing' ]
     req = { 'nobjects' : int , 'nstamps_per_object' : int }
     params = galsim.config.GetAllParams(config['output'],'output',config,ignore=ignore,req=req)[0]
 
@@ -426,7 +427,8 @@ def BuildMEDS(file_name, config, nproc=1, logger=None, file_num=0, image_num=0,
     return t2-t1
 
 def GetNObjForMEDS(config, file_num, image_num):
-    ignore = [ 'file_name', 'dir', 'nfiles', 'psf', 'weight', 'badpix', 'nproc' ]
+    ignore = [ 'file_name', 'dir', 'nfiles', 'psf', 'weight', 'badpix', 'nproc', 'backend',
+               'timing' ]
     req = { 'nobjects' : int , 'nstamps_per_object' : int }
     params = galsim.config.GetAllParams(config['output'],'output',config,ignore=ignore,req=req)[0]
     config['seq_index'] = file_num
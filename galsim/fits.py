@@ -25,6 +25,7 @@ routines for handling multiple Images.
 
 import os
 import galsim
+from . import utilities
 
 
 ##############################################################################################
@@ -84,11 +85,16 @@ class _ReadFile:
         import gzip
         from galsim._pyfits import pyfits
         fin = gzip.open(file, 'rb')
-        hdu_list = pyfits.open(fin, 'readonly')
-        # Sometimes this doesn't work.  The symptoms may be that this raises an
-        # exception, or possibly the hdu_list comes back empty, in which case the 
-        # next line will raise an exception.
-        hdu = hdu_list[0]
+        try:
+            hdu_list = pyfits.open(fin, 'readonly')
+            # Sometimes this doesn't work.  The symptoms may be that this raises an
+            # exception, or possibly the hdu_list comes back empty, in which case the 
+            # next line will raise an exception.
+            hdu = hdu_list[0]
+        except:
+            # Don't leave the file open if we are going to try another method.
+            fin.close()
+            raise
         # pyfits doesn't actually read the file yet, so we can't close fin here.
         # Need to pass it back to the caller and let them close it when they are 
         # done with hdu_list.
@@ -133,11 +139,15 @@ class _ReadFile:
         from galsim._pyfits import pyfits
         # This normally works.  But it might not on old versions of pyfits.
         fin = bz2.BZ2File(file, 'rb')
-        hdu_list = pyfits.open(fin, 'readonly')
-        # Sometimes this doesn't work.  The symptoms may be that this raises an
-        # exception, or possibly the hdu_list comes back empty, in which case the 
-        # next line will raise an exception.
-        hdu = hdu_list[0]
+        try:
+            hdu_list = pyfits.open(fin, 'readonly')
+            # Sometimes this doesn't work.  The symptoms may be that this raises an
+            # exception, or possibly the hdu_list comes back empty, in which case the 
+            # next line will raise an exception.
+            hdu = hdu_list[0]
+        except:
+            fin.close()
+            raise
         return hdu_list, fin
 
     def bz2_tmp(self, file):
@@ -171,12 +181,34 @@ class _ReadFile:
         self.gz = self.gz_methods[0]
         self.bz2 = self.bz2_methods[0]
 
-    def __call__(self, file, dir, file_compress):
+    def __call__(self, file, dir, file_compress, memmap=None, lazy=False):
         from galsim._pyfits import pyfits, pyfits_version
         if dir:
             import os
             file = os.path.join(dir,file)
 
+        # If we only want part of the data, it is better to decompress the file as a stream,
+        # so that we don't need to hold the whole decompressed file in memory, even if another
+        # method is usually faster.  So use the *_in_mem method unless it has failed before.
+        # If it fails, go on to the usual methods.
+        # (The *_in_mem methods close the file themselves if they fail.)
+        if lazy and file_compress == 'gzip' and self.gz_index <= 1:
+            try:
+                return self.gzip_in_mem(file)
+            except Exception:
+                pass
+        elif lazy and file_compress == 'bzip2' and self.bz2_index <= 1:
+            try:
+                return self.bz2_in_mem(file)
+            except Exception:
+                pass
+
+        # Only pass memmap if it is given, so we use the pyfits default otherwise.
+        if memmap is None:
+            kwargs = {}
+        else:
+            kwargs = { 'memmap' : memmap }
+
         if not file_compress:
             if pyfits_version < '3.1':
                 # Sometimes early versions of pyfits do weird things with the final hdu when 
@@ -189,9 +221,9 @@ class _ReadFile:
                 import warnings
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore")
-                    hdu_list = pyfits.open(file, 'readonly', ignore_missing_end=True)
+                    hdu_list = pyfits.open(file, 'readonly', ignore_missing_end=True, **kwargs)
             else:
-                hdu_list = pyfits.open(file, 'readonly')
+                hdu_list = pyfits.open(file, 'readonly', **kwargs)
             return hdu_list, None
         elif file_compress == 'gzip':
             while self.gz_index < len(self.gz_methods):
@@ -213,6 +245,108 @@ class _ReadFile:
             raise ValueError("Unknown file_compression")
 _read_file = _ReadFile()
 
+def _gzip_member(data, level):
+    """Compress `data` as a complete gzip member.  A gzip file may consist of any number of
+    members one after the other, which gunzip (and the python gzip module) simply concatenate.
+    """
+    import zlib
+    # wbits = 16 + MAX_WBITS tells zlib to write the gzip header and trailer.
+    c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return c.compress(data) + c.flush()
+
+class _CompressedStream(object):
+    """A write-only file-like object that compresses the data written to it on the fly.
+
+    pyfits writes the HDUs to this one at a time, so only a chunk of the uncompressed file is
+    ever held in memory, rather than the whole thing as for the *_in_mem methods.
+
+    For gzip with `nthreads > 1`, each chunk of `chunk_size` bytes is compressed as a separate
+    gzip member in a pool of threads.  zlib releases the GIL while it compresses, so this runs
+    in parallel.  The members are written in order, and the result is a valid gzip file.
+    Otherwise, the data are compressed as a single stream in the current thread.
+
+    @param file         The name of the file to write.
+    @param file_compress  Either 'gzip' or 'bzip2'.
+    @param nthreads     How many threads to use for gzip compression. [default: 1]
+    @param chunk_size   The size of the uncompressed chunks for the threaded gzip compression.
+                        [default: 4 MB]
+    """
+    def __init__(self, file, file_compress, nthreads=1, chunk_size=4*1024*1024):
+        import zlib
+        self.fout = open(file, 'wb')
+        self.mode = 'wb'
+        self.name = file
+        self.closed = False
+        self.nbytes = 0
+        self.level = zlib.Z_DEFAULT_COMPRESSION
+        self.pool = None
+        if file_compress == 'gzip':
+            if nthreads > 1:
+                from multiprocessing.pool import ThreadPool
+                from collections import deque
+                self.pool = ThreadPool(nthreads)
+                # Limit the number of chunks in flight, so the memory use stays bounded.
+                self.max_pending = 2 * nthreads
+                self.pending = deque()
+                self.chunk_size = chunk_size
+                self.buf = []
+                self.buf_size = 0
+            else:
+                self.comp = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif file_compress == 'bzip2':
+            # Note: python 2.7's bz2 module can only read the first stream of a multi-stream
+            # bzip2 file, so we always compress bzip2 as a single stream.
+            import bz2
+            self.comp = bz2.BZ2Compressor()
+        else:
+            raise ValueError("Unknown file_compression")
+
+    def _submit(self):
+        data = ''.join(self.buf)
+        self.buf = []
+        self.buf_size = 0
+        self.pending.append(self.pool.apply_async(_gzip_member, (data, self.level)))
+        while len(self.pending) > self.max_pending:
+            self.fout.write(self.pending.popleft().get())
+
+    def write(self, data):
+        # pyfits may give us a numpy array or a memoryview rather than a string.
+        if hasattr(data, 'tobytes'): data = data.tobytes()
+        elif hasattr(data, 'tostring'): data = data.tostring()
+        else: data = bytes(data)
+        self.nbytes += len(data)
+        if self.pool is not None:
+            self.buf.append(data)
+            self.buf_size += len(data)
+            if self.buf_size >= self.chunk_size:
+                self._submit()
+        else:
+            self.fout.write(self.comp.compress(data))
+
+    def tell(self):
+        # pyfits uses this to keep track of where each HDU starts in the (uncompressed) file.
+        return self.nbytes
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.closed: return
+        try:
+            if self.pool is not None:
+                if self.buf_size > 0:
+                    self._submit()
+                while self.pending:
+                    self.fout.write(self.pending.popleft().get())
+            else:
+                self.fout.write(self.comp.flush())
+        finally:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool.join()
+            self.fout.close()
+            self.closed = True
+
 # Do the same trick for _write_file(file,hdu_list,clobber,file_compress,pyfits_compress):
 class _WriteFile:
 
@@ -244,6 +378,13 @@ class _WriteFile:
         assert p.returncode == 0 
         fout.close()
  
+    def gzip_stream(self, hdu_list, file, nthreads=1):
+        fout = _CompressedStream(file, 'gzip', nthreads)
+        try:
+            hdu_list.writeto(fout)
+        finally:
+            fout.close()
+
     def gzip_in_mem(self, hdu_list, file):
         import gzip
         import io
@@ -301,6 +442,13 @@ class _WriteFile:
         assert p.returncode == 0 
         fout.close()
  
+    def bz2_stream(self, hdu_list, file):
+        fout = _CompressedStream(file, 'bzip2')
+        try:
+            hdu_list.writeto(fout)
+        finally:
+            fout.close()
+
     def bz2_in_mem(self, hdu_list, file):
         import bz2
         import io
@@ -332,18 +480,23 @@ class _WriteFile:
         # to have the system executables.  Also, some versions of pyfits can't handle writing
         # to the stdin pipe of a subprocess.  So if that fails, the next one, *_call2 is often
         # fastest if the failure was due to pyfits.  If the user does not have gzip or bzip2 (then 
-        # why are they requesting this compression?), we switch to *_in_mem, which is often
-        # almost as good.  (Sometimes it is faster than the call2 option, but when it is slower it
-        # can be much slower.)  And finally, if this fails, which I think may happen for very old 
-        # versions of pyfits, *_tmp is the fallback option.
+        # why are they requesting this compression?), we switch to *_stream, which compresses
+        # the data in python as pyfits writes them, so it doesn't need to hold the whole file in
+        # memory.  *_in_mem is similar, but needs the full uncompressed file in memory.  And
+        # finally, if these fail, which I think may happen for very old versions of pyfits,
+        # *_tmp is the fallback option.
+        # When the user asks for more than one thread, we use gzip_stream with a pool of threads
+        # for gzip, rather than going through the list.
         self.gz_index = 0
         self.bz2_index = 0
-        self.gz_methods = [self.gzip_call, self.gzip_call2, self.gzip_in_mem, self.gzip_tmp]
-        self.bz2_methods = [self.bzip2_call, self.bzip2_call2,  self.bz2_in_mem, self.bz2_tmp]
+        self.gz_methods = [self.gzip_call, self.gzip_call2, self.gzip_stream, self.gzip_in_mem,
+                           self.gzip_tmp]
+        self.bz2_methods = [self.bzip2_call, self.bzip2_call2, self.bz2_stream, self.bz2_in_mem,
+                            self.bz2_tmp]
         self.gz = self.gz_methods[0]
         self.bz2 = self.bz2_methods[0]
 
-    def __call__(self, file, dir, hdu_list, clobber, file_compress, pyfits_compress):
+    def __call__(self, file, dir, hdu_list, clobber, file_compress, pyfits_compress, nthreads=1):
         import os
         from galsim._pyfits import pyfits, pyfits_version
         if dir:
@@ -358,6 +511,12 @@ class _WriteFile:
         if not file_compress:
             hdu_list.writeto(file)
         elif file_compress == 'gzip':
+            if nthreads > 1:
+                try:
+                    return self.gzip_stream(hdu_list, file, nthreads)
+                except:
+                    # Then fall back to the usual single-threaded methods.
+                    pass
             while self.gz_index < len(self.gz_methods):
                 try:
                     return self.gz(hdu_list, file)
@@ -463,6 +622,49 @@ def _get_hdu(hdu_list, hdu, pyfits_compress):
     return hdu
 
 
+def _get_data(hdu, bounds, origin):
+    """Get the data from an image `hdu` whose first pixel is at `origin`, either for the whole
+    image or only for the pixels within `bounds`.  For a data cube, `bounds` applies to each
+    image in the cube.
+
+    For uncompressed HDUs, only the pixels within `bounds` are read from the file.  pyfits can
+    only decompress the full image of a tile-compressed HDU, so for those, we have to decompress
+    everything and then select the pixels within `bounds`.
+
+    @returns data, origin, where the `data` have a valid Image dtype and `origin` is the position
+             of the first pixel in `data`.
+    """
+    from galsim._pyfits import pyfits
+    if bounds is None:
+        data = hdu.data
+    else:
+        if not isinstance(bounds, galsim.BoundsI):
+            raise TypeError("bounds must be a galsim.BoundsI instance")
+        header = hdu.header
+        full_bounds = galsim.BoundsI(origin.x, origin.x + header['NAXIS1'] - 1,
+                                     origin.y, origin.y + header['NAXIS2'] - 1)
+        if not full_bounds.includes(bounds):
+            raise ValueError("bounds %s are not within the image bounds %s"%(bounds,full_bounds))
+        index = (slice(bounds.ymin - origin.y, bounds.ymax - origin.y + 1),
+                 slice(bounds.xmin - origin.x, bounds.xmax - origin.x + 1))
+        if header['NAXIS'] == 3:
+            index = (slice(None),) + index
+        if isinstance(hdu, pyfits.CompImageHDU):
+            data = hdu.data[index]
+        else:
+            data = hdu.section[index]
+        origin = galsim.PositionI(bounds.xmin, bounds.ymin)
+
+    pixel = data.dtype.type
+    if pixel not in galsim.Image.valid_dtypes:
+        import warnings
+        warnings.warn("No C++ Image template instantiation for pixel type %s" % pixel)
+        warnings.warn("   Using numpy.float64 instead.")
+        import numpy
+        data = data.astype(numpy.float64)
+    return data, origin
+
+
 # Unlike the other helpers, this one doesn't start with an underscore, since we make it 
 # available to people who use the function ReadFile.
 def closeHDUList(hdu_list, fin):
@@ -484,10 +686,13 @@ def closeHDUList(hdu_list, fin):
 #    writeCube(image_list, ...)
 #    writeFile(hdu_list, ...)
 #
+# and the classes MultiWriter and CubeWriter for writing the images one at a time.
+#
 ##############################################################################################
 
 
-def write(image, file_name=None, dir=None, hdu_list=None, clobber=True, compression='auto'):
+def write(image, file_name=None, dir=None, hdu_list=None, clobber=True, compression='auto',
+          nthreads=1):
     """Write a single image to a FITS file.
 
     Write the Image instance `image` to a FITS file, with details depending on the arguments.  This
@@ -525,6 +730,10 @@ def write(image, file_name=None, dir=None, hdu_list=None, clobber=True, compress
                                    '*.bz2' => 'bzip2'
                                    otherwise None
                         [default: 'auto']
+    @param nthreads     How many threads to use for gzip compression when writing the file.
+                        The file is compressed in chunks as it is written, with each chunk
+                        compressed in parallel as a separate gzip member.  This is ignored
+                        for the other compression options. [default: 1]
     """
     from galsim._pyfits import pyfits
 
@@ -548,11 +757,11 @@ def write(image, file_name=None, dir=None, hdu_list=None, clobber=True, compress
         image.wcs.writeToFitsHeader(hdu.header, image.bounds)
 
     if file_name:
-        _write_file(file_name, dir, hdu_list, clobber, file_compress, pyfits_compress)
+        _write_file(file_name, dir, hdu_list, clobber, file_compress, pyfits_compress, nthreads)
 
 
 def writeMulti(image_list, file_name=None, dir=None, hdu_list=None, clobber=True,
-               compression='auto'):
+               compression='auto', nthreads=1):
     """Write a Python list of images to a multi-extension FITS file.
 
     The details of how the images are written to file depends on the arguments.
@@ -569,6 +778,7 @@ def writeMulti(image_list, file_name=None, dir=None, hdu_list=None, clobber=True
                         is required.]
     @param clobber      See documentation for this parameter on the galsim.fits.write() method.
     @param compression  See documentation for this parameter on the galsim.fits.write() method.
+    @param nthreads     See documentation for this parameter on the galsim.fits.write() method.
     """
     from galsim._pyfits import pyfits
 
@@ -588,12 +798,12 @@ def writeMulti(image_list, file_name=None, dir=None, hdu_list=None, clobber=True
             image.wcs.writeToFitsHeader(hdu.header, image.bounds)
 
     if file_name:
-        _write_file(file_name, dir, hdu_list, clobber, file_compress, pyfits_compress)
+        _write_file(file_name, dir, hdu_list, clobber, file_compress, pyfits_compress, nthreads)
 
 
 
 def writeCube(image_list, file_name=None, dir=None, hdu_list=None, clobber=True,
-              compression='auto'):
+              compression='auto', nthreads=1):
     """Write a Python list of images to a FITS file as a data cube.
 
     The details of how the images are written to file depends on the arguments.  Unlike for 
@@ -623,6 +833,7 @@ def writeCube(image_list, file_name=None, dir=None, hdu_list=None, clobber=True,
                         is required.]
     @param clobber      See documentation for this parameter on the galsim.fits.write() method.
     @param compression  See documentation for this parameter on the galsim.fits.write() method.
+    @param nthreads     See documentation for this parameter on the galsim.fits.write() method.
     """
     import numpy
     from galsim._pyfits import pyfits
@@ -675,10 +886,10 @@ def writeCube(image_list, file_name=None, dir=None, hdu_list=None, clobber=True,
         wcs.writeToFitsHeader(hdu.header, bounds)
 
     if file_name:
-        _write_file(file_name, dir, hdu_list, clobber, file_compress, pyfits_compress)
+        _write_file(file_name, dir, hdu_list, clobber, file_compress, pyfits_compress, nthreads)
 
 
-def writeFile(file_name, hdu_list, dir=None, clobber=True, compression='auto'):
+def writeFile(file_name, hdu_list, dir=None, clobber=True, compression='auto', nthreads=1):
     """Write a Pyfits hdu_list to a FITS file, taking care of the GalSim compression options.
 
     If you have used the write(), writeMulti() or writeCube() functions with the `hdu_list` option
@@ -706,14 +917,313 @@ def writeFile(file_name, hdu_list, dir=None, clobber=True, compression='auto'):
                         directly are not available at this point.  If you want to use one of them,
                         it must be applied when writing each hdu.
                         [default: 'auto']
+    @param nthreads     See documentation for this parameter on the galsim.fits.write() method.
     """
     file_compress, pyfits_compress = _parse_compression(compression,file_name)
     if pyfits_compress and compression != 'auto':
         # If compression is auto and it determined that it should use rice, then we
         # should presume that the hdus were already rice compressed, so we can ignore it here.
         raise ValueError("Compression %s is invalid for writeFile"%compression)
-    _write_file(file_name, dir, hdu_list, clobber, file_compress, pyfits_compress)
- 
+    _write_file(file_name, dir, hdu_list, clobber, file_compress, pyfits_compress, nthreads)
+
+
+def _hdu_list_bytes(hdu_list):
+    """Return the bytes that pyfits writes to a file for `hdu_list`.
+    """
+    import io
+    buf = io.BytesIO()
+    hdu_list.writeto(buf)
+    return buf.getvalue()
+
+def _padded_size(nbytes):
+    """Return the size of `nbytes` of data once padded to a whole number of FITS blocks.
+    """
+    return -(-nbytes // 2880) * 2880
+
+def _set_header_int(header, key, value):
+    """Change the value of the integer keyword `key` in the raw FITS `header` string.
+    """
+    card_start = key.ljust(8) + '= '
+    for i in range(0, len(header), 80):
+        if header[i:i+10] == card_start:
+            card = header[i:i+80]
+            # Fixed format integers are right justified in columns 11-30.
+            card = card[:10] + '%20d'%value + card[30:]
+            return header[:i] + card + header[i+80:]
+    raise ValueError("Keyword %s not found in header"%key)
+
+
+class _IncrementalWriter(object):
+    """The base class for MultiWriter and CubeWriter, which handles opening, closing and
+    compressing the output file.
+    """
+    def __init__(self, file_name, dir, clobber, compression, nthreads):
+        self.file_compress, self.pyfits_compress = _parse_compression(compression, file_name)
+        if dir:
+            file_name = os.path.join(dir, file_name)
+        if os.path.isfile(file_name) and not clobber:
+            raise IOError('File %r already exists'%file_name)
+        self.file_name = file_name
+        self.compression = compression
+        self.nthreads = nthreads
+        self.nimages_written = 0
+        self.fout = None
+        self.closed = False
+        # The error message, if a write failed in a way that we cannot recover from.
+        self.failed = None
+        # If we can't write this file incrementally, the images are kept here and written
+        # all together when the writer is closed.
+        self.images = None
+
+    def _open(self):
+        if os.path.isfile(self.file_name):
+            os.remove(self.file_name)
+        if self.file_compress:
+            self.fout = _CompressedStream(self.file_name, self.file_compress, self.nthreads)
+        else:
+            self.fout = open(self.file_name, 'wb')
+
+    def _rewindable(self, func, *args):
+        """Call `func`, which writes to the file.  If it raises an IOError, go back to where the
+        file was beforehand, so the same call can be tried again.  Compressed files cannot be
+        rewound, so after such an error the writer cannot be used any more.
+        """
+        if self.failed is not None:
+            raise RuntimeError("Cannot continue writing %s after an error: %s"%(
+                self.file_name, self.failed))
+        rewind = not self.file_compress
+        if rewind:
+            pos = self.fout.tell()
+        try:
+            func(*args)
+            # Make sure any error writing the data happens here rather than later.
+            self.fout.flush()
+        except IOError as e:
+            self.failed = str(e)
+            if rewind:
+                self.fout.seek(pos)
+                self.fout.truncate()
+                self.failed = None
+            raise
+
+    def write(self, image):
+        """Write the next image to the file.
+
+        If this raises an IOError for an uncompressed file, nothing is written, so it is fine to
+        call write() again with the same image.
+
+        @param image        The Image (or NumPy array) to write.
+        """
+        if self.images is not None:
+            self.images.append(image)
+        else:
+            self._rewindable(self._write, image)
+        self.nimages_written += 1
+
+    def close(self):
+        """Finish writing the file and close it.
+
+        As for write(), it is fine to call close() again after an IOError for an uncompressed
+        file.
+        """
+        if self.closed: return
+        if self.images is not None:
+            self._write_all(self.images)
+            self.images = None
+        else:
+            self._rewindable(self._finish)
+            try:
+                self.fout.close()
+            except IOError as e:
+                self.failed = str(e)
+                raise
+            self.fout = None
+        self.closed = True
+
+    def abort(self):
+        """Close the file without finishing it and remove it.  This is useful after an error,
+        so a partially written file is not left behind.
+        """
+        if self.closed: return
+        if self.fout is not None:
+            try:
+                self.fout.close()
+            except Exception:
+                # The file is being removed anyway, e.g. after an earlier error writing to it.
+                pass
+            self.fout = None
+            os.remove(self.file_name)
+        self.images = None
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def _finish(self):
+        pass
+
+
+class MultiWriter(_IncrementalWriter):
+    """A class for writing images to a multi-extension FITS file one at a time.
+
+    Each image is written to the file as soon as it is given to write(), so unlike writeMulti(),
+    the full list of images never needs to be held in memory.  The final file is the same as
+    what writeMulti() would write for the list of all the images.
+
+        with galsim.fits.MultiWriter(file_name) as writer:
+            for k in range(nimages):
+                image = ...
+                writer.write(image)
+
+    Full-file gzip and bzip2 compression are done as the file is written.  Tile compression
+    (e.g. rice) is done for each image in turn, except for pyfits versions before 3.1.2, where
+    the images are kept until the writer is closed and then written with writeMulti().
+
+    If the writer is not used in a `with` statement, you need to call close() when you are done
+    to finish writing the file.  It is an error to close the writer without writing any images,
+    since the file would not be a valid FITS file.
+
+    @param file_name    The name of the file to write to.
+    @param dir          Optionally a directory name can be provided if `file_name` does not 
+                        already include it. [default: None]
+    @param clobber      See documentation for this parameter on the galsim.fits.write() method.
+    @param compression  See documentation for this parameter on the galsim.fits.write() method.
+    @param nthreads     See documentation for this parameter on the galsim.fits.write() method.
+    """
+    def __init__(self, file_name, dir=None, clobber=True, compression='auto', nthreads=1):
+        from galsim._pyfits import pyfits, pyfits_version
+        _IncrementalWriter.__init__(self, file_name, dir, clobber, compression, nthreads)
+        if self.pyfits_compress and pyfits_version < '3.1.2':
+            # These versions need to fix up the TFORM keywords once the whole file is written.
+            self.images = []
+        else:
+            # The length of the blank PrimaryHDU that we skip when writing the extensions.
+            self.primary_len = len(_hdu_list_bytes(pyfits.HDUList([pyfits.PrimaryHDU()])))
+            self._open()
+
+    def _write(self, image):
+        from galsim._pyfits import pyfits
+        hdu_list = pyfits.HDUList()
+        if self.nimages_written > 0 and not self.pyfits_compress:
+            # Make sure the image goes into an ImageHDU rather than the PrimaryHDU.
+            # (_add_hdu adds a blank PrimaryHDU itself for tile-compressed images.)
+            hdu_list.append(pyfits.PrimaryHDU())
+        hdu = _add_hdu(hdu_list, image.array, self.pyfits_compress)
+        if image.wcs:
+            image.wcs.writeToFitsHeader(hdu.header, image.bounds)
+        data = _hdu_list_bytes(hdu_list)
+        if self.nimages_written > 0:
+            data = data[self.primary_len:]
+        self.fout.write(data)
+
+    def close(self):
+        """Finish writing the file and close it.
+        """
+        if not self.closed and self.nimages_written == 0:
+            # Don't leave an empty (invalid) file behind.
+            self.abort()
+            raise IndexError("In MultiWriter: no images were written")
+        _IncrementalWriter.close(self)
+
+    def _write_all(self, images):
+        writeMulti(images, self.file_name, clobber=True, compression=self.compression,
+                   nthreads=self.nthreads)
+
+
+class CubeWriter(_IncrementalWriter):
+    """A class for writing images to a FITS data cube one at a time.
+
+    The header is written for the full cube of `nimages` images when the first image is written,
+    and then each image is written to the file as soon as it is given to write().  So unlike
+    writeCube(), the full cube never needs to be held in memory.  As for writeCube(), all the
+    images need to have the same shape, and the WCS of the first image is the one written to the
+    header.
+
+        with galsim.fits.CubeWriter(file_name, nimages) as writer:
+            for k in range(nimages):
+                image = ...
+                writer.write(image)
+
+    Full-file gzip and bzip2 compression are done as the file is written.  However, tile
+    compression (e.g. rice) needs the full cube, so in that case the images are kept until the
+    writer is closed and then written with writeCube().
+
+    If the writer is not used in a `with` statement, you need to call close() when you are done
+    to finish writing the file.  It is an error to close the writer before all `nimages` images
+    have been written.
+
+    @param file_name    The name of the file to write to.
+    @param nimages      The number of images in the cube.
+    @param dir          Optionally a directory name can be provided if `file_name` does not 
+                        already include it. [default: None]
+    @param clobber      See documentation for this parameter on the galsim.fits.write() method.
+    @param compression  See documentation for this parameter on the galsim.fits.write() method.
+    @param nthreads     See documentation for this parameter on the galsim.fits.write() method.
+    """
+    def __init__(self, file_name, nimages, dir=None, clobber=True, compression='auto', nthreads=1):
+        if nimages <= 0:
+            raise ValueError("In CubeWriter: nimages must be positive")
+        _IncrementalWriter.__init__(self, file_name, dir, clobber, compression, nthreads)
+        self.nimages = nimages
+        if self.pyfits_compress:
+            self.images = []
+        else:
+            self._open()
+
+    def _write(self, image):
+        import numpy
+        from galsim._pyfits import pyfits
+        if self.nimages_written >= self.nimages:
+            raise IndexError("In CubeWriter: trying to write more than %d images"%self.nimages)
+        if isinstance(image, numpy.ndarray):
+            array = image
+            wcs = None
+        else:
+            array = image.array
+            wcs = image.wcs
+        if self.nimages_written == 0:
+            self.dtype = array.dtype
+            self.shape = array.shape
+        elif array.shape != self.shape:
+            # Note: numpy shape is y,x
+            raise IndexError("In CubeWriter: image %d has the wrong shape"%self.nimages_written +
+                "Shape is (%d,%d).  Should be (%d,%d)"%(array.shape[1],array.shape[0],
+                                                        self.shape[1],self.shape[0]))
+
+        # Let pyfits convert the image into the right format for a cube with one image.
+        hdu_list = pyfits.HDUList()
+        plane = numpy.asarray(array, dtype=self.dtype).reshape((1,) + self.shape)
+        hdu = _add_hdu(hdu_list, plane, None)
+        if self.nimages_written == 0 and wcs:
+            wcs.writeToFitsHeader(hdu.header, image.bounds)
+        data = _hdu_list_bytes(hdu_list)
+        self.plane_size = plane.size * abs(hdu.header['BITPIX']) // 8
+        header_size = len(data) - _padded_size(self.plane_size)
+        if self.nimages_written == 0:
+            # The header is for the full cube.
+            self.fout.write(_set_header_int(data[:header_size], 'NAXIS3', self.nimages))
+        self.fout.write(data[header_size:header_size + self.plane_size])
+
+    def _finish(self):
+        if self.nimages_written != self.nimages:
+            self.abort()
+            raise IndexError("In CubeWriter: only %d of %d images were written"%(
+                self.nimages_written, self.nimages))
+        # Pad the data to a whole number of FITS blocks.
+        nbytes = self.nimages * self.plane_size
+        self.fout.write('\0' * (_padded_size(nbytes) - nbytes))
+
+    def _write_all(self, images):
+        writeCube(images, self.file_name, clobber=True, compression=self.compression,
+                  nthreads=self.nthreads)
+
 
 ##############################################################################################
 #
@@ -726,7 +1236,8 @@ def writeFile(file_name, hdu_list, dir=None, clobber=True, compression='auto'):
 ##############################################################################################
 
 
-def read(file_name=None, dir=None, hdu_list=None, hdu=None, compression='auto'):
+def read(file_name=None, dir=None, hdu_list=None, hdu=None, compression='auto', bounds=None,
+         memmap=None):
     """Construct an Image from a FITS file or pyfits HDUList.
 
     The normal usage for this function is to read a fits file and return the image contained
@@ -739,6 +1250,11 @@ def read(file_name=None, dir=None, hdu_list=None, hdu=None, compression='auto'):
     used to initialize the bounding box and WCS.  If not, the bounding box will have `(xmin,ymin)`
     at `(1,1)` and the scale will be set to 1.0.
 
+    If you only need part of a large image, you can give the `bounds` of the part you want, in
+    which case the returned image will only have those pixels.  e.g.
+
+        >>> im = galsim.fits.read(file_name, bounds=galsim.BoundsI(1001,1100,2001,2100))
+
     This function is called as `im = galsim.fits.read(...)`
 
     @param file_name    The name of the file to read in.  [Either `file_name` or `hdu_list` is 
@@ -768,6 +1284,14 @@ def read(file_name=None, dir=None, hdu_list=None, hdu=None, compression='auto'):
                                    '*.bz2' => 'bzip2'
                                    otherwise None
                         [default: 'auto']
+    @param bounds       If given, only read in the pixels within these bounds, which should be
+                        a BoundsI within the bounds of the image in the file.  For uncompressed
+                        or gzip/bzip2 compressed files, only the requested part of the data is
+                        read (or decompressed).  [default: None, which means to read the whole
+                        image]
+    @param memmap       Whether to memory map the file when opening it.  This only applies to
+                        uncompressed files.  [default: None, which means to use the pyfits
+                        default]
 
     @returns the image as an Image instance.
     """
@@ -780,20 +1304,13 @@ def read(file_name=None, dir=None, hdu_list=None, hdu=None, compression='auto'):
         raise TypeError("Must provide either file_name or hdu_list to read()")
 
     if file_name:
-        hdu_list, fin = _read_file(file_name, dir, file_compress)
+        hdu_list, fin = _read_file(file_name, dir, file_compress, memmap=memmap,
+                                   lazy=(bounds is not None))
 
     hdu = _get_hdu(hdu_list, hdu, pyfits_compress)
 
     wcs, origin = galsim.wcs.readFromFitsHeader(hdu.header)
-    pixel = hdu.data.dtype.type
-    if pixel in galsim.Image.valid_dtypes:
-        data = hdu.data
-    else:
-        import warnings
-        warnings.warn("No C++ Image template instantiation for pixel type %s" % pixel)
-        warnings.warn("   Using numpy.float64 instead.")
-        import numpy
-        data = hdu.data.astype(numpy.float64)
+    data, origin = _get_data(hdu, bounds, origin)
 
     image = galsim.Image(array=data)
     image.setOrigin(origin)
@@ -805,7 +1322,8 @@ def read(file_name=None, dir=None, hdu_list=None, hdu=None, compression='auto'):
 
     return image
 
-def readMulti(file_name=None, dir=None, hdu_list=None, compression='auto'):
+def readMulti(file_name=None, dir=None, hdu_list=None, compression='auto', bounds=None,
+              memmap=None):
     """Construct a list of Images from a FITS file or pyfits HDUList.
 
     The normal usage for this function is to read a fits file and return a list of all the images 
@@ -841,6 +1359,14 @@ def readMulti(file_name=None, dir=None, hdu_list=None, compression='auto'):
                                    '*.bz2' => 'bzip2'
                                    otherwise None
                         [default: 'auto']
+    @param bounds       If given, only read in the pixels within these bounds from each image,
+                        which should be a BoundsI within the bounds of the images in the file.
+                        For uncompressed or gzip/bzip2 compressed files, only the requested part
+                        of the data is read (or decompressed).  [default: None, which means to
+                        read the whole images]
+    @param memmap       Whether to memory map the file when opening it.  This only applies to
+                        uncompressed files.  [default: None, which means to use the pyfits
+                        default]
 
     @returns a Python list of Images
     """
@@ -854,7 +1380,8 @@ def readMulti(file_name=None, dir=None, hdu_list=None, compression='auto'):
         raise TypeError("Must provide either file_name or hdu_list to readMulti()")
 
     if file_name:
-        hdu_list, fin = _read_file(file_name, dir, file_compress)
+        hdu_list, fin = _read_file(file_name, dir, file_compress, memmap=memmap,
+                                   lazy=(bounds is not None))
     elif not isinstance(hdu_list, pyfits.HDUList):
         raise TypeError("In readMulti, hdu_list is not an HDUList")
 
@@ -868,7 +1395,8 @@ def readMulti(file_name=None, dir=None, hdu_list=None, compression='auto'):
         if len(hdu_list) < 1:
             raise IOError('Expecting at least one HDU in galsim.readMulti')
     for hdu in range(first,len(hdu_list)):
-        image_list.append(read(hdu_list=hdu_list, hdu=hdu, compression=pyfits_compress))
+        image_list.append(read(hdu_list=hdu_list, hdu=hdu, compression=pyfits_compress,
+                               bounds=bounds))
 
     # If we opened a file, don't forget to close it.
     if file_name:
@@ -876,7 +1404,8 @@ def readMulti(file_name=None, dir=None, hdu_list=None, compression='auto'):
 
     return image_list
 
-def readCube(file_name=None, dir=None, hdu_list=None, hdu=None, compression='auto'):
+def readCube(file_name=None, dir=None, hdu_list=None, hdu=None, compression='auto', bounds=None,
+             memmap=None):
     """Construct a Python list of Images from a FITS data cube.
 
     Not all FITS pixel types are supported (only those with C++ Image template instantiations are:
@@ -913,6 +1442,14 @@ def readCube(file_name=None, dir=None, hdu_list=None, hdu=None, compression='aut
                                    '*.bz2' => 'bzip2'
                                    otherwise None
                         [default: 'auto']
+    @param bounds       If given, only read in the pixels within these bounds for each image,
+                        which should be a BoundsI within the bounds of the images in the file.
+                        For uncompressed or gzip/bzip2 compressed files, only the requested part
+                        of the data is read (or decompressed).  [default: None, which means to
+                        read the whole images]
+    @param memmap       Whether to memory map the file when opening it.  This only applies to
+                        uncompressed files.  [default: None, which means to use the pyfits
+                        default]
 
     @returns a Python list of Images.
     """
@@ -925,25 +1462,18 @@ def readCube(file_name=None, dir=None, hdu_list=None, hdu=None, compression='aut
         raise TypeError("Must provide either file_name or hdu_list to read()")
 
     if file_name:
-        hdu_list, fin = _read_file(file_name, dir, file_compress)
+        hdu_list, fin = _read_file(file_name, dir, file_compress, memmap=memmap,
+                                   lazy=(bounds is not None))
 
     hdu = _get_hdu(hdu_list, hdu, pyfits_compress)
 
     wcs, origin = galsim.wcs.readFromFitsHeader(hdu.header)
-    pixel = hdu.data.dtype.type
-    if pixel in galsim.Image.valid_dtypes:
-        data = hdu.data
-    else:
-        import warnings
-        warnings.warn("No C++ Image template instantiation for pixel type %s" % pixel)
-        warnings.warn("   Using numpy.float64 instead.")
-        import numpy
-        data = hdu.data.astype(numpy.float64)
+    data, origin = _get_data(hdu, bounds, origin)
 
-    nimages = hdu.data.shape[0]
+    nimages = data.shape[0]
     image_list = []
     for k in range(nimages):
-        image = galsim.Image(array=hdu.data[k,:,:])
+        image = galsim.Image(array=data[k,:,:])
         image.setOrigin(origin)
         image.wcs = wcs
         image_list.append(image)
@@ -1010,6 +1540,138 @@ def readFile(file_name, dir=None, hdu=None, compression='auto'):
 ##############################################################################################
 
 
+def _get_header_int(header, key, default=None):
+    """Get the value of the integer keyword `key` in the raw FITS `header` string.
+    """
+    card_start = key.ljust(8) + '= '
+    for i in range(0, len(header), 80):
+        if header[i:i+10] == card_start:
+            return int(header[i+10:i+80].split('/')[0])
+    if default is None:
+        raise IOError("Keyword %s not found in FITS header"%key)
+    return default
+
+def _read_header_string(fin):
+    """Read the header blocks of the next HDU in the open file `fin` up to and including the one
+    with the END card.
+
+    @returns the header as a string, or None if there are no more HDUs in the file.
+    """
+    blocks = []
+    while True:
+        block = fin.read(2880)
+        if len(block) < 2880:
+            if not blocks and not block:
+                return None
+            raise IOError("Found truncated header reading FITS file")
+        blocks.append(block)
+        for i in range(0, 2880, 80):
+            if block[i:i+8] == 'END     ':
+                return ''.join(blocks)
+
+def _data_size(header):
+    """Return the size in bytes of the data for the HDU with the raw FITS `header` string,
+    including the padding to a whole number of FITS blocks.
+    """
+    naxis = _get_header_int(header, 'NAXIS')
+    if naxis == 0:
+        return 0
+    naxes = [ _get_header_int(header, 'NAXIS%d'%n) for n in range(1, naxis+1) ]
+    if naxes[0] == 0:
+        # Random groups (the only valid use of NAXIS1 = 0) don't include NAXIS1.
+        naxes = naxes[1:]
+    npix = 1
+    for n in naxes:
+        npix *= n
+    bitpix = _get_header_int(header, 'BITPIX')
+    pcount = _get_header_int(header, 'PCOUNT', 0)
+    gcount = _get_header_int(header, 'GCOUNT', 1)
+    return _padded_size(abs(bitpix) // 8 * gcount * (pcount + npix))
+
+def _scan_header(file_name, hdu, file_compress):
+    """Read the header of an image HDU in a FITS file without reading any of the data.
+
+    Only the header blocks are parsed.  The data of any earlier HDUs are skipped, which for gzip
+    and bzip2 compressed files means decompressing them, but nothing after the END of the
+    requested header is decompressed.
+    """
+    from galsim._pyfits import pyfits
+    if hdu is None:
+        hdu = 0
+    if file_compress == 'gzip':
+        import gzip
+        fin = gzip.open(file_name, 'rb')
+    elif file_compress == 'bzip2':
+        import bz2
+        fin = bz2.BZ2File(file_name, 'rb')
+    elif not file_compress:
+        fin = open(file_name, 'rb')
+    else:
+        raise ValueError("Unknown file_compression")
+    try:
+        for k in range(hdu+1):
+            header = _read_header_string(fin)
+            if header is None:
+                raise IOError('Expecting at least %d HDUs in galsim.read'%(hdu+1))
+            if k < hdu:
+                fin.seek(_data_size(header), 1)
+    finally:
+        fin.close()
+    if hdu > 0 and (header[:8] != 'XTENSION' or
+                    header[10:80].split('/')[0].strip().strip("'").strip() != 'IMAGE'):
+        raise IOError('Found invalid HDU reading FITS file (expected an ImageHDU)')
+
+    if hasattr(pyfits.Header, 'fromstring'):
+        return pyfits.Header.fromstring(header)
+    else:
+        cards = [ header[i:i+80] for i in range(0, len(header), 80) ]
+        cards = cards[:cards.index('END'.ljust(80))]
+        return pyfits.Header([ pyfits.Card().fromstring(card) for card in cards ])
+
+def _read_file_header(file_name, mtime, size, hdu, file_compress, pyfits_compress, text_file):
+    """Read the header of a file for FitsHeader.  The `mtime` and `size` are not used here,
+    but they are part of the key for the header cache below, so that it doesn't return the
+    header of an older version of the file.
+    """
+    from galsim._pyfits import pyfits
+    if text_file:
+        with open(file_name,"r") as fin:
+            lines = [ line.strip() for line in fin ]
+        if 'END' in lines:  # Don't include END (or later lines)
+            lines = lines[:lines.index('END')]
+        # Later pyfits versions changed this to a class method, so you can write
+        # pyfits.Card.fromstring(text).  But in older pyfits versions, it was
+        # a regular method.  This syntax should work in both cases.
+        cards = [ pyfits.Card().fromstring(line) for line in lines ]
+        return pyfits.Header(cards)
+    elif pyfits_compress:
+        # pyfits translates the header of a tile-compressed HDU into the header of the image,
+        # so let it do the work here.  It only reads the headers until we access the data.
+        import copy
+        hdu_list, fin = _read_file(file_name, None, file_compress)
+        try:
+            header = copy.copy(_get_hdu(hdu_list, hdu, pyfits_compress).header)
+        finally:
+            closeHDUList(hdu_list, fin)
+        return header
+    else:
+        return _scan_header(file_name, hdu, file_compress)
+
+# A cache of the headers read by FitsHeader, since configs often read the same header many times.
+_header_cache = utilities.LRU_Cache(_read_file_header, maxsize=100)
+
+def _get_file_header(file_name, hdu, file_compress, pyfits_compress, text_file):
+    """Get the header for FitsHeader from the header cache, reading it if necessary.
+    The returned header is shared, so it should not be modified.
+    """
+    try:
+        stat = os.stat(file_name)
+    except OSError as e:
+        raise IOError(str(e))
+    return _header_cache(os.path.abspath(file_name), stat.st_mtime, stat.st_size, hdu,
+                         file_compress, pyfits_compress, text_file)
+
+
 class FitsHeader(object):
     """A class storing key/value pairs from a FITS Header
 
@@ -1130,34 +1792,21 @@ class FitsHeader(object):
 
             if text_file:
                 self._tag += ', text_file=True'
-                if dir is not None:
-                    import os
-                    file_name = os.path.join(dir,file_name)
-                with open(file_name,"r") as fin:
-                    lines = [ line.strip() for line in fin ]
-                if 'END' in lines:  # Don't include END (or later lines)
-                    lines = lines[:lines.index('END')]
-                # Later pyfits versions changed this to a class method, so you can write
-                # pyfits.Card.fromstring(text).  But in older pyfits versions, it was
-                # a regular method.  This syntax should work in both cases.
-                cards = [ pyfits.Card().fromstring(line) for line in lines ]
-                header = pyfits.Header(cards)
-            else:
-                hdu_list, fin = _read_file(file_name, dir, file_compress)
+            if dir is not None:
+                file_name = os.path.join(dir,file_name)
+
+            # The headers read from files are cached, so we need to make a copy of the header
+            # in case it is modified.
+            import copy
+            self.header = copy.copy(_get_file_header(file_name, hdu, file_compress,
+                                                     pyfits_compress, text_file))
+            return
 
         if hdu_list:
             hdu = _get_hdu(hdu_list, hdu, pyfits_compress)
             header = hdu.header
 
-        if file_name and not text_file:
-            # If we opened a file, don't forget to close it.
-            # Also need to make a copy of the header to keep it available.
-            # If we construct a FitsHeader from an hdu_list, then we don't want to do this,
-            # since we want the header to remain attached to the original hdu.
-            import copy
-            self.header = copy.copy(header)
-            closeHDUList(hdu_list, fin)
-        elif isinstance(header, pyfits.Header):
+        if isinstance(header, pyfits.Header):
             # If header is a pyfits.Header, then we just use it.
             self.header = header
         else:
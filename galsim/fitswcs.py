@@ -776,13 +776,13 @@ class WcsToolsWCS(galsim.wcs.CelestialWCS):
         x = []
         y = []
         for line in lines:
-            vals = results.split()
+            vals = line.split()
             if len(vals) < 6:
-                raise RuntimeError('wcstools sky2xy returned invalid result for %f,%f'%(ra,dec))
+                raise RuntimeError('wcstools sky2xy returned invalid result: %r'%line)
             if len(vals) > 6:
                 import warnings
-                warnings.warn('wcstools sky2xy indicates that %f,%f is off the image\n'%(ra,dec) +
-                              'output is %r'%results)
+                warnings.warn('wcstools sky2xy indicates that %s,%s is off the image\n'%(
+                              vals[0],vals[1]) + 'output is %r'%line)
             x.append(float(vals[4]))
             y.append(float(vals[5]))
 
@@ -903,6 +903,7 @@ class GSFitsWCS(galsim.wcs.CelestialWCS):
         #       use are intentionally not documented above.
 
         self._tag = None # Write something useful here (see below). This is just used for the str.
+        self._inverse_fits = {} # Approximate inverse distortions used by _xy.
 
         # If _data is given, copy the data and we're done.
         if _data is not None:
@@ -1337,140 +1338,133 @@ class GSFitsWCS(galsim.wcs.CelestialWCS):
             return ra[0], dec[0]
  
     def _xy(self, ra, dec):
-        import numpy, numpy.linalg
+        import numpy
 
-        #print 'ra, dec = ',ra,dec
-        u, v = self.center.project_rad(ra, dec, projection=self.projection)
-        #print 'u,v = ',u,v
+        u, v = self.center.project_rad(numpy.atleast_1d(ra), numpy.atleast_1d(dec),
+                                       projection=self.projection)
 
         # Again, FITS has +u increasing to the east, not west.  Hence the - for u.
         factor = 1. * galsim.arcsec / galsim.degrees
-        u *= -factor
-        v *= factor
-        #print 'u,v => ',u,v
-
-        p2 = numpy.array( [ u, v ] )
-        #print 'p2 = ',p2
+        p2 = numpy.array( [ -u * factor, v * factor ] )
 
         if self.pv is not None:
             # Let (s,t) be the current value of (u,v).  Then we want to find a new (u,v) such that
             #
             #       [ s t ] = [ 1 u u^2 u^3 ] pv [ 1 v v^2 v^3 ]^T
             #
-            # Start with (u,v) = (s,t)
-            #
-            # Then use Newton-Raphson iteration to improve (u,v).  This is extremely fast
-            # for typical PV distortions, since the distortions are generally very small.
-            # Newton-Raphson doubles the number of significant digits in each iteration.
-
-
-            MAX_ITER = 10
-            TOL = 1.e-8 * galsim.arcsec / galsim.degrees   # pv always uses degrees units
-            prev_err = None
-            u = p2[0]
-            v = p2[1]
-            for iter in range(MAX_ITER):
-                usq = u*u
-                vsq = v*v
-                upow = numpy.array([ 1., u, usq, usq*u ])
-                vpow = numpy.array([ 1., v, vsq, vsq*v ])
-
-                diff = numpy.dot(numpy.dot(self.pv, vpow), upow) - p2
-
-                # Check that things are improving...
-                err = numpy.max(numpy.abs(diff))
-                if prev_err:
-                    if err > prev_err:
-                        raise RuntimeError("Unable to solve for image_pos (not improving)")
-                prev_err = err
-
-                # If we are below tolerance, break out of the loop
-                if err < TOL: 
-                    # Update p2 to the new value.
-                    p2 = numpy.array( [ u, v ] )
-                    break
-                else:
-                    dupow = numpy.array([ 0., 1., 2.*u, 3.*usq ])
-                    dvpow = numpy.array([ 0., 1., 2.*v, 3.*vsq ])
-                    j1 = numpy.transpose([ numpy.dot(numpy.dot(self.pv, vpow), dupow) ,
-                                           numpy.dot(numpy.dot(self.pv, dvpow), upow) ])
-                    dp = numpy.linalg.solve(j1, diff)
-                    u -= dp[0]
-                    v -= dp[1]
-            if not err < TOL:
-                raise RuntimeError("Unable to solve for image_pos (max iter reached)")
-            #print 'p2 => ',p2
+            # Start from an approximate inverse polynomial, fit once and then stored, and use
+            # Newton-Raphson iteration to improve (u,v) for all the positions at once.
+            # Newton-Raphson doubles the number of significant digits in each iteration, so
+            # this only takes one or two iterations for typical PV distortions.
+            p2 = self._invert_poly('pv', self.pv, p2, order=3)
 
         p1 = numpy.dot(numpy.linalg.inv(self.cd), p2)
-        #print 'p1 = ',p1
 
         if self.ab is not None:
-            x = p1[0]
-            y = p1[1]
+            # Write the SIP transformation p1 = q + ab(q) as a single polynomial in q.
             order = len(self.ab[0])-1
+            ab = self.ab.copy()
+            ab[0,1,0] += 1.
+            ab[1,0,1] += 1.
             if self.abp is not None:
-                xpow = x ** numpy.arange(order+1)
-                ypow = y ** numpy.arange(order+1)
-                temp = numpy.dot(self.abp, ypow)
-                dp1 = numpy.sum(xpow * temp, axis=1)
-                x += dp1[0]
-                y += dp1[1]
-                #print 'x,y => ',x,y
-
-            # We do this iteration even if we have AP and BP matrices, since the inverse
+                # If we have AP and BP matrices, use them for the initial guess.
+                q = p1 + _eval_poly(self.abp, p1[0], p1[1])
+            else:
+                q = None
+            # We do the iteration even if we have AP and BP matrices, since the inverse
             # transformation is not always very accurate.
-            # The assumption here is that the A adn B matrices are correct and the AP and BP
+            # The assumption here is that the A and B matrices are correct and the AP and BP
             # matrices are estimated from them, and thus are approximate at some level.
             # Of course, in reality the A and B matrices are also approximate, but at least this
             # way the WCS is consistent transforming in the two directions.
-            MAX_ITER = 10
-            TOL = 1.e-8 * galsim.arcsec / galsim.degrees
-            prev_err = None
-            #print 'Start iteration at ',x,y
-            for iter in range(MAX_ITER):
-                # Slightly easier here than in _radec function, since we don't have to worry
-                # about the possibility of doing many x,y at once.
-                xpow = x ** numpy.arange(order+1)
-                ypow = y ** numpy.arange(order+1)
-
-                diff = numpy.dot(numpy.dot(self.ab, ypow), xpow) + numpy.array([x,y]) - p1
-                #print 'diff = ',diff
-
-                # Check that things are improving...
-                err = numpy.max(numpy.abs(diff))
-                #print 'err = ',err
-                if prev_err:
-                    if err > prev_err:
-                        raise RuntimeError("Unable to solve for image_pos (not improving)")
-                prev_err = err
-
-                # If we are below tolerance, break out of the loop
-                if err < TOL: 
-                    # Update p2 to the new value.
-                    p1 = numpy.array( [ x, y ] )
-                    break
-                else:
-                    dxpow = numpy.zeros(order+1)
-                    dypow = numpy.zeros(order+1)
-                    dxpow[1:] = (numpy.arange(order)+1.) * xpow[:-1]
-                    dypow[1:] = (numpy.arange(order)+1.) * ypow[:-1]
-                    j1 = numpy.transpose([ numpy.dot(numpy.dot(self.ab, ypow), dxpow) ,
-                                           numpy.dot(numpy.dot(self.ab, dypow), xpow) ])
-                    j1 += numpy.diag([1,1])
-                    dp = numpy.linalg.solve(j1, diff)
-                    x -= dp[0]
-                    y -= dp[1]
-                    #print 'x,y -> ',x,y
-            if not err < TOL:
-                raise RuntimeError("Unable to solve for image_pos (max iter reached)")
-            #print 'p1 => ',p1
-
-        p1 += self.crpix
-        #print 'p1 => ',p1
+            p1 = self._invert_poly('ab', ab, p1, order=order, guess=q)
 
+        p1 += self.crpix[:,numpy.newaxis]
         x, y = p1
-        #print 'x,y = ',x,y
-        return x, y
+
+        try:
+            len(ra)
+            # If the inputs were numpy arrays, return the same
+            return x, y
+        except:
+            # Otherwise return scalars
+            assert len(x) == 1
+            assert len(y) == 1
+            return x[0], y[0]
+
+    def _invert_poly(self, key, c, p, order, guess=None):
+        # Solve p = sum_ij c[:,i,j] q0^i q1^j for q, where p is a 2xN array.
+        #
+        # If guess is None, the initial guess comes from an approximate inverse polynomial of the
+        # given order, which is fit over a box that covers all the p values.  The fit is stored
+        # in self._inverse_fits[key] and only redone if later p values fall outside of that box.
+        # For just a few positions, it's not worth doing a new fit, so in that case we start
+        # from q = p instead, which is usually close, since the distortions are small.
+        import numpy
+        if p.shape[1] == 0:
+            return p
+        if guess is None:
+            lo = numpy.min(p, axis=1)
+            hi = numpy.max(p, axis=1)
+            g = None
+            if key in self._inverse_fits:
+                fit_lo, fit_hi, fit_g = self._inverse_fits[key]
+                if numpy.all(lo >= fit_lo) and numpy.all(hi <= fit_hi):
+                    lo, hi, g = fit_lo, fit_hi, fit_g
+                else:
+                    # Make the new fit cover the old box as well.
+                    lo = numpy.minimum(lo, fit_lo)
+                    hi = numpy.maximum(hi, fit_hi)
+            if g is None and p.shape[1] < 10:
+                guess = p
+            elif g is None:
+                # Pad the box a bit, so nearby positions can reuse the fit.
+                pad = 0.1 * (hi - lo) + 1.e-3 * (numpy.abs(hi) + numpy.abs(lo)) + 1.e-10
+                lo = lo - pad
+                hi = hi + pad
+                g = _fit_poly_inverse(c, lo, hi, order)
+                self._inverse_fits[key] = (lo, hi, g)
+            if guess is None:
+                center = 0.5 * (hi + lo)
+                scale = 0.5 * (hi - lo)
+                guess = _eval_poly(g, (p[0]-center[0])/scale[0], (p[1]-center[1])/scale[1])
+
+        MAX_ITER = 10
+        TOL = 1.e-8 * galsim.arcsec / galsim.degrees
+        q = guess
+        prev_err = None
+        nc = c.shape[1]
+        n = numpy.arange(nc)[:,numpy.newaxis]
+        for iter in range(MAX_ITER):
+            apow = q[0] ** n
+            bpow = q[1] ** n
+            temp = numpy.dot(c, bpow)
+            diff = numpy.sum(apow * temp, axis=1) - p
+
+            # Check that things are improving...
+            err = numpy.max(numpy.abs(diff))
+            if prev_err:
+                if err > prev_err:
+                    raise RuntimeError("Unable to solve for image_pos (not improving)")
+            prev_err = err
+
+            # If we are below tolerance, we're done.
+            if err < TOL:
+                return q
+
+            dapow = numpy.zeros_like(apow)
+            dbpow = numpy.zeros_like(bpow)
+            dapow[1:] = n[1:] * apow[:-1]
+            dbpow[1:] = n[1:] * bpow[:-1]
+            # The jacobian d(p0,p1)/d(q0,q1) at each position.
+            dpda = numpy.sum(dapow * temp, axis=1)
+            dpdb = numpy.sum(apow * numpy.dot(c, dbpow), axis=1)
+            det = dpda[0] * dpdb[1] - dpdb[0] * dpda[1]
+            dq0 = (dpdb[1] * diff[0] - dpdb[0] * diff[1]) / det
+            dq1 = (dpda[0] * diff[1] - dpda[1] * diff[0]) / det
+            q = q - numpy.array([dq0, dq1])
+
+        raise RuntimeError("Unable to solve for image_pos (max iter reached)")
 
     # Override the version in CelestialWCS, since we can do this more efficiently.
     def _local(self, image_pos, world_pos):
@@ -1662,6 +1656,45 @@ class GSFitsWCS(galsim.wcs.CelestialWCS):
     def __hash__(self): return hash(repr(self))
 
 
+def _eval_poly(c, a, b):
+    """Evaluate the pair of 2-d polynomials sum_ij c[k,i,j] a^i b^j for k=0,1.
+
+    a and b are 1-d arrays of length N, and the result is a 2xN array.
+    """
+    import numpy
+    n = numpy.arange(c.shape[1])[:,numpy.newaxis]
+    return numpy.sum((a ** n) * numpy.dot(c, b ** n), axis=1)
+
+def _fit_poly_inverse(c, lo, hi, order):
+    """Fit an approximate inverse of the polynomial mapping q -> sum_ij c[:,i,j] q0^i q1^j,
+    valid for output values in the box lo <= p <= hi.
+
+    The return value is an array g of the same form as c, with terms up to total order `order`,
+    such that _eval_poly(g, p0', p1') approximately gives q, where p' = (p-center)/scale are
+    the coordinates of p scaled to lie in [-1,1] over the box.  This keeps the fit well
+    conditioned for large values of p (e.g. in pixels).
+    """
+    import numpy
+    # The mappings we use this for are close to the identity, so a grid over the same box in
+    # q covers the box in p well enough for the purpose of an initial guess.
+    ngrid = 4 * (order+1)
+    q0, q1 = numpy.meshgrid(numpy.linspace(lo[0], hi[0], ngrid),
+                            numpy.linspace(lo[1], hi[1], ngrid))
+    q0 = q0.ravel()
+    q1 = q1.ravel()
+    center = 0.5 * (hi + lo)
+    scale = 0.5 * (hi - lo)
+    p = (_eval_poly(c, q0, q1) - center[:,numpy.newaxis]) / scale[:,numpy.newaxis]
+    ij = [ (i,j) for i in range(order+1) for j in range(order+1-i) ]
+    design = numpy.array([ p[0]**i * p[1]**j for i,j in ij ]).T
+    g = numpy.zeros((2, order+1, order+1))
+    for k, q in enumerate([q0, q1]):
+        coef = numpy.linalg.lstsq(design, q, rcond=-1)[0]
+        for (i,j), val in zip(ij, coef):
+            g[k,i,j] = val
+    return g
+
+
 def TanWCS(affine, world_origin, units=galsim.arcsec):
     """This is a function that returns a GSFitsWCS object for a TAN WCS projection.
 
@@ -27,6 +27,222 @@ from ._galsim import Interpolant
 from ._galsim import Nearest, Linear, Cubic, Quintic, Lanczos, SincInterpolant, Delta
 import numpy as np
 
+
+class _ByteLimitedCache(object):
+    """A least recently used cache, which is limited by the (approximate) total memory of the
+    items stored in it rather than by the number of items.
+
+    This is used for the SBInterpolatedImage objects made by InterpolatedImage, keyed by the
+    content of the (padded) image and the other parameters that affect them.  The
+    SBInterpolatedImage holds the padded real-space table, the values of stepK and maxK, and
+    (once it has been needed) the Fourier-space table.  None of these depend on the WCS, flux or
+    offset of the InterpolatedImage, so every InterpolatedImage made from the same image data can
+    share them.  It is also used for the noise fields of the _NoisePadPool.
+    """
+    def __init__(self, max_bytes):
+        from collections import OrderedDict
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        item = self.items.pop(key, None)
+        if item is None:
+            self.misses += 1
+            return None
+        # Put it back at the end, so it is now the most recently used.
+        self.items[key] = item
+        self.hits += 1
+        return item[0]
+
+    def add(self, key, item, nbytes):
+        if nbytes > self.max_bytes: return
+        self.items[key] = (item, nbytes)
+        self.nbytes += nbytes
+        self.trim()
+
+    def trim(self):
+        while self.nbytes > self.max_bytes:
+            item, nbytes = self.items.popitem(last=False)[1]
+            self.nbytes -= nbytes
+
+    def clear(self):
+        self.items.clear()
+        self.nbytes = 0
+
+_sbii_cache = _ByteLimitedCache(max_bytes=200*1024**2)
+
+def _sbii_key(image, x_interpolant, k_interpolant, pad_factor, stepk, maxk, calculate_stepk,
+              calculate_maxk, approximate_maxk, gsparams):
+    """Return the key for the SBInterpolatedImage cache: a hash of the image data along with
+    the other parameters that are used to build the SBInterpolatedImage.
+    """
+    import hashlib
+    array = np.ascontiguousarray(image.array)
+    h = hashlib.md5(array.data)
+    h.update(repr((array.shape, array.dtype.str, x_interpolant, k_interpolant, pad_factor,
+                   stepk, maxk, calculate_stepk, calculate_maxk, approximate_maxk, gsparams)))
+    return h.hexdigest()
+
+def getTableCacheStats():
+    """Get statistics about the reuse of the interpolation tables of InterpolatedImage.
+
+    When `use_cache=True` (the default), InterpolatedImage keeps the tables it builds from the
+    image (including the values of stepK and maxK and the Fourier-space table) in a least recently
+    used cache shared by all the InterpolatedImages in the current process.  Other
+    InterpolatedImages made from the same image data with the same interpolants, pad_factor and
+    gsparams reuse them rather than calculating them again.
+
+    @returns a dict with the number of `hits` and `misses` of the cache so far, the number of
+             tables currently stored (`size`), their approximate memory in bytes (`nbytes`), and the
+             maximum memory allowed (`max_bytes`).
+    """
+    return { 'hits' : _sbii_cache.hits, 'misses' : _sbii_cache.misses,
+             'size' : len(_sbii_cache.items), 'nbytes' : _sbii_cache.nbytes,
+             'max_bytes' : _sbii_cache.max_bytes }
+
+def setTableCacheSize(max_bytes):
+    """Set the maximum memory in bytes used by the cache of InterpolatedImage tables.  See
+    getTableCacheStats() for more about this cache.  Setting it to 0 removes all the stored
+    tables and turns off the cache.  [default: 200 MB]
+
+    @param max_bytes    The new maximum memory of the cache.
+    """
+    _sbii_cache.max_bytes = max_bytes
+    _sbii_cache.trim()
+
+
+class _NoisePadPool(object):
+    """A pool of noise fields to use for noise padding InterpolatedImages, rather than making a
+    new noise field for each one.
+
+    The fields are made in bulk the first time a given kind of noise and size is requested.  Each
+    request then takes one of the fields at random and applies a random cyclic shift (the fields
+    made by CorrelatedNoise are periodic, so this is still a valid realization of the noise) and a
+    random flip.  For uncorrelated Gaussian noise, any rotation by a multiple of 90 degrees or
+    transpose is allowed, but correlated noise may be anisotropic, so it is only ever rotated by
+    180 degrees, which does not change its correlation function.
+
+    The fields are stored for the unscaled noise model (e.g. the correlation function before any
+    withVariance() call) and scaled to the right variance when used, so objects that only differ
+    in their noise variance (as is typical for a RealGalaxyCatalog) use the same fields.  The
+    stored arrays are read-only, so if the pool is filled before forking worker processes, they
+    are shared with the workers.  The fields are kept in a least recently used cache with a limit
+    on their total memory, like the one for the InterpolatedImage tables.
+    """
+    def __init__(self, ntiles, max_bytes):
+        self.ntiles = ntiles
+        self.tiles = _ByteLimitedCache(max_bytes)
+
+    def getField(self, noise, size, rng):
+        """Get a noise field with shape (size,size) for the given noise, using `rng` for the
+        random choices.
+
+        @returns the field, or None if the fields for this size would not fit in the pool.
+        """
+        nbytes = self.ntiles * size * size * np.dtype(float).itemsize
+        if nbytes > self.tiles.max_bytes:
+            return None
+
+        if isinstance(noise, galsim.GaussianNoise):
+            if noise.sigma == 0.:
+                return np.zeros((size,size))
+            key = ('Gaussian', size)
+            noise_scale = noise.sigma**2
+            any_rotation = True
+        else:
+            kernel_key, noise_scale = noise._get_kernel_key()
+            key = (kernel_key, repr(noise.wcs), size)
+            any_rotation = False
+
+        item = self.tiles.get(key)
+        if item is not None:
+            tiles, tile_scale = item
+        else:
+            images = [ galsim.ImageD(size, size) for i in range(self.ntiles) ]
+            if any_rotation:
+                for im in images:
+                    im.addNoise(noise)
+            else:
+                noise.applyToImages(images)
+            tiles = [ im.array for im in images ]
+            for tile in tiles:
+                tile.flags.writeable = False
+            tile_scale = noise_scale
+            self.tiles.add(key, (tiles, tile_scale), nbytes)
+
+        ud = galsim.UniformDeviate(rng)
+        tile = tiles[min(int(ud() * len(tiles)), len(tiles)-1)]
+        dx = int(ud() * size)
+        dy = int(ud() * size)
+        field = np.roll(np.roll(tile, dy, axis=0), dx, axis=1)
+        if any_rotation:
+            k = min(int(ud() * 8), 7)
+            if k >= 4:
+                field = field.T
+            field = np.rot90(field, k % 4)
+        elif ud() < 0.5:
+            field = field[::-1,::-1]
+        if noise_scale != tile_scale:
+            field = field * np.sqrt(noise_scale / tile_scale)
+        return field
+
+    def clear(self):
+        self.tiles.clear()
+
+_noise_pad_pool = _NoisePadPool(ntiles=0, max_bytes=200*1024**2)
+
+def getNoisePadPoolStats():
+    """Get statistics about the use of the pool of noise padding fields.  See
+    setNoisePadPoolSize() for more about this pool.
+
+    @returns a dict with the number of `hits` and `misses` of the pool so far, the number of
+             different kinds of noise currently stored (`size`), the number of fields stored
+             for each one (`ntiles`), their approximate memory in bytes (`nbytes`), and the
+             maximum memory allowed (`max_bytes`).
+    """
+    tiles = _noise_pad_pool.tiles
+    return { 'hits' : tiles.hits, 'misses' : tiles.misses, 'size' : len(tiles.items),
+             'ntiles' : _noise_pad_pool.ntiles, 'nbytes' : tiles.nbytes,
+             'max_bytes' : tiles.max_bytes }
+
+def setNoisePadPoolSize(ntiles, max_bytes=None):
+    """Set the number of noise fields to keep for each kind of noise padding.
+
+    Normally, an InterpolatedImage with `noise_pad_size` makes a new noise field for each object,
+    which for correlated noise means drawing the correlation function and doing an FFT over the
+    whole padded area.  If `ntiles > 0`, `ntiles` fields are made in bulk the first time each kind
+    of noise (and pad size) is needed, and each object then gets one of these chosen at random,
+    with a random shift and flip.  The padding noise of different objects is then not
+    independent, so `ntiles` should be large enough that this doesn't matter for your
+    application.  Setting it to 0 removes all the stored fields and turns off the pool.
+    [default: 0]
+
+    The fields are read-only, so if the pool is filled before forking worker processes (e.g. by
+    building one of the objects first), the workers share the same fields.
+
+    The least recently used fields are removed when their total memory goes above `max_bytes`.
+    Noise pads that are too large for all `ntiles` fields to fit are made in the normal way.
+
+    @param ntiles       The number of noise fields to make for each kind of noise.
+    @param max_bytes    The maximum memory of the stored fields.  [default: None, which means
+                        to keep the current value, initially 200 MB]
+    """
+    _noise_pad_pool.ntiles = ntiles
+    if max_bytes is not None:
+        _noise_pad_pool.tiles.max_bytes = max_bytes
+    _noise_pad_pool.clear()
+
+def clearNoisePadPool():
+    """Remove all the noise fields stored in the pool of noise padding fields, e.g. to free the
+    memory once a set of objects has been built.  See setNoisePadPoolSize() for more about this
+    pool.  New fields are made the next time they are needed, if the pool is still on.
+    """
+    _noise_pad_pool.clear()
+
+
 class InterpolatedImage(GSObject):
     """A class describing non-parametric profiles specified using an Image, which can be
     interpolated for the purpose of carrying out transformations.
@@ -95,7 +311,7 @@ class InterpolatedImage(GSObject):
                 image, x_interpolant=None, k_interpolant=None, normalization='flux', scale=None,
                 wcs=None, flux=None, pad_factor=4., noise_pad_size=0, noise_pad=0., use_cache=True,
                 pad_image=None, rng=None, calculate_stepk=True, calculate_maxk=True,
-                use_true_center=True, offset=None)
+                use_true_center=True, offset=None, approximate_maxk=False)
 
     Initializes `interpolated_image` as an InterpolatedImage instance.
 
@@ -167,11 +383,16 @@ class InterpolatedImage(GSObject):
                             specifying a correlated noise field for padding are (b) or (d).  In the
                             case of (d), if the same file is used repeatedly, then the `use_cache`
                             keyword (see below) can be used to prevent the need for repeated
-                            CorrelatedNoise initializations.
+                            CorrelatedNoise initializations.  If many objects are padded with
+                            the same kind of noise, see also
+                            galsim.interpolatedimage.setNoisePadPoolSize().
                             [default: 0, i.e., pad with zeros]
     @param use_cache        Specify whether to cache `noise_pad` read in from a file to save having
                             to build a CorrelatedNoise object repeatedly from the same image.
-                            [default: True]
+                            This also turns on the cache of the interpolation tables and the
+                            values of stepK and maxK, which are shared with other
+                            InterpolatedImages made from the same image data (see
+                            galsim.interpolatedimage.getTableCacheStats()).  [default: True]
     @param rng              If padding by noise, the user can optionally supply the random noise
                             generator to use for drawing random numbers as `rng` (may be any kind of
                             BaseDeviate object).  Such a user-input random number generator
@@ -221,6 +442,14 @@ class InterpolatedImage(GSObject):
                             center if `use_true_center=False`).  [default: None]
     @param gsparams         An optional GSParams argument.  See the docstring for GSParams for
                             details. [default: None]
+    @param approximate_maxk Whether to use a faster, approximate calculation of `maxk` when
+                            `calculate_maxk` is set.  The exact calculation needs the Fourier
+                            transform of the padded image, which for large images with the default
+                            `pad_factor` can take longer than drawing the object.  The approximate
+                            calculation instead uses the Fourier transform of the unpadded image,
+                            which samples the same function more coarsely, along with a safety
+                            factor, so the resulting `maxk` is usually somewhat larger than the
+                            exact value.  [default: False]
 
     Methods
     -------
@@ -240,6 +469,7 @@ class InterpolatedImage(GSObject):
         'pad_image' : str ,
         'calculate_stepk' : bool ,
         'calculate_maxk' : bool ,
+        'approximate_maxk' : bool ,
         'use_true_center' : bool
     }
     _single_params = []
@@ -251,7 +481,7 @@ class InterpolatedImage(GSObject):
                  scale=None, wcs=None, flux=None, pad_factor=4., noise_pad_size=0, noise_pad=0.,
                  rng=None, pad_image=None, calculate_stepk=True, calculate_maxk=True,
                  use_cache=True, use_true_center=True, offset=None, gsparams=None, dx=None,
-                 _force_stepk=0., _force_maxk=0.):
+                 approximate_maxk=False, _force_stepk=0., _force_maxk=0.):
 
         # Check for obsolete dx parameter
         if dx is not None and scale is None:
@@ -425,23 +655,43 @@ class InterpolatedImage(GSObject):
         self._pad_factor = pad_factor
         self._gsparams = gsparams
 
-        # Make the SBInterpolatedImage out of the image.
-        sbii = galsim._galsim.SBInterpolatedImage(
-                pad_image.image, self.x_interpolant, self.k_interpolant, pad_factor,
-                _force_stepk, _force_maxk, gsparams)
+        # If we have already made an SBInterpolatedImage from the same image data, we can use
+        # that one rather than calculating the tables and stepk, maxk again.
+        sbii = None
+        if use_cache:
+            key = _sbii_key(pad_image, self.x_interpolant, self.k_interpolant, pad_factor,
+                            _force_stepk, _force_maxk, calculate_stepk, calculate_maxk,
+                            approximate_maxk, gsparams)
+            sbii = _sbii_cache.get(key)
+
+        if sbii is None:
+            # Make the SBInterpolatedImage out of the image.
+            sbii = galsim._galsim.SBInterpolatedImage(
+                    pad_image.image, self.x_interpolant, self.k_interpolant, pad_factor,
+                    _force_stepk, _force_maxk, gsparams)
+
+            if calculate_stepk:
+                if calculate_stepk is True:
+                    sbii.calculateStepK()
+                else:
+                    # If not a bool, then value is max_stepk
+                    sbii.calculateStepK(max_stepk=calculate_stepk)
+            if calculate_maxk:
+                if calculate_maxk is True:
+                    max_maxk = 0.
+                else:
+                    # If not a bool, then value is max_maxk
+                    max_maxk = calculate_maxk
+                if approximate_maxk:
+                    sbii.estimateMaxK(max_maxk=max_maxk)
+                else:
+                    sbii.calculateMaxK(max_maxk=max_maxk)
 
-        if calculate_stepk:
-            if calculate_stepk is True:
-                sbii.calculateStepK()
-            else:
-                # If not a bool, then value is max_stepk
-                sbii.calculateStepK(max_stepk=calculate_stepk)
-        if calculate_maxk:
-            if calculate_maxk is True:
-                sbii.calculateMaxK()
-            else:
-                # If not a bool, then value is max_maxk
-                sbii.calculateMaxK(max_maxk=calculate_maxk)
+            if use_cache:
+                # The padded real-space table and the Fourier-space table are each about
+                # (pad_factor * N)^2 * 8 bytes.
+                nbytes = 16 * int(pad_factor * max(pad_image.array.shape))**2
+                _sbii_cache.add(key, sbii, nbytes)
 
         # Save this intermediate profile
         self._sbii = sbii
@@ -512,7 +762,13 @@ class InterpolatedImage(GSObject):
                 "Input noise_pad must be a float/int, a CorrelatedNoise, Image, or filename "+
                 "containing an image to use to make a CorrelatedNoise!")
         # Add the noise
-        pad_image.addNoise(noise)
+        field = None
+        if _noise_pad_pool.ntiles > 0:
+            field = _noise_pad_pool.getField(noise, noise_pad_size, rng)
+        if field is not None:
+            pad_image.array[:,:] = field
+        else:
+            pad_image.addNoise(noise)
 
         return pad_image
 
@@ -535,15 +791,22 @@ class InterpolatedImage(GSObject):
         del d['_sbii']
         del d['image']
         del d['SBProfile']
+        # If the Fourier-space table has already been calculated, include it, so it doesn't need
+        # to be calculated again on the other side.
+        if self._sbii._hasKData():
+            d['_kdata'] = self._sbii._getKData().array.copy()
         return d
 
     def __setstate__(self, d):
+        kdata = d.pop('_kdata', None)
         self.__dict__ = d
         self.__init__(self._pad_image,
                       x_interpolant=self.x_interpolant, k_interpolant=self.k_interpolant,
                       pad_factor=self._pad_factor, flux=self._flux,
                       offset=self._offset, use_true_center=False, gsparams=self._gsparams,
                       _force_stepk=self._stepk, _force_maxk=self._maxk)
+        if kdata is not None and not self._sbii._hasKData():
+            self._sbii._setKData(galsim._galsim.ConstImageViewD(kdata))
 
 
 class InterpolatedKImage(GSObject):
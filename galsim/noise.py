@@ -231,6 +231,13 @@ Parameters:
 @param rng          A BaseDeviate instance to use for generating the random numbers.
 @param sky_level    The sky level in electrons per pixel that was originally in the input image, 
                     but which is taken to have already been subtracted off. [default: 0.]
+@param max_poisson  Above this many electrons in a pixel, use the Gaussian approximation to the
+                    Poisson distribution. [default: 1.e5]
+@param fast         Whether to use a faster algorithm, which draws runs of pixels with the same
+                    mean (e.g. blank sky) from a lookup table and uses an independent random
+                    number stream for each row, so the rows can be done in parallel if GalSim
+                    was compiled with OpenMP.  The noise has the same distribution either way,
+                    but the values for a given seed are different. [default: False]
 
 Methods
 -------
@@ -242,6 +249,8 @@ Attributes
 
     noise.rng           # The internal random number generator (read-only)
     noise.sky_level     # The value of the constructor parameter sky_level (read-only)
+    noise.max_poisson   # The value of the constructor parameter max_poisson (read-only)
+    noise.fast          # The value of the constructor parameter fast (read-only)
 """
 
 def PoissonNoise_applyTo(self, image):
@@ -262,6 +271,9 @@ def PoissonNoise_applyTo(self, image):
 _galsim.PoissonNoise.applyTo = PoissonNoise_applyTo
 
 _galsim.PoissonNoise.getSkyLevel.__func__.__doc__ = "Get sky level in current noise model."
+_galsim.PoissonNoise.getMaxPoisson.__func__.__doc__ = \
+        "Get the number of electrons above which the Gaussian approximation is used."
+_galsim.PoissonNoise.getFast.__func__.__doc__ = "Get whether the faster algorithm is used."
 
 def PoissonNoise_copy(self, rng=None):
     """Returns a copy of the Poisson noise model.
@@ -272,7 +284,7 @@ def PoissonNoise_copy(self, rng=None):
         >>> noise_copy = noise.copy(rng=new_rng)
     """
     if rng is None: rng = self.rng
-    return _galsim.PoissonNoise(rng, self.getSkyLevel())
+    return _galsim.PoissonNoise(rng, self.getSkyLevel(), self.getMaxPoisson(), self.getFast())
 
 _galsim.PoissonNoise.copy = PoissonNoise_copy
 
@@ -307,6 +319,11 @@ Parameters:
                     being in units of ADU rather than electrons. [default: 1.]
 @param read_noise   The read noise on each pixel in electrons (gain > 0.) or ADU (gain <= 0.).
                     Setting `read_noise=0`. will shut off the Gaussian noise. [default: 0.]
+@param max_poisson  Above this many electrons in a pixel, use the Gaussian approximation to the
+                    Poisson distribution. [default: 1.e5]
+@param fast         Whether to use a faster algorithm, which gives noise with the same
+                    distribution, but different values for a given seed.  See PoissonNoise
+                    for details. [default: False]
 
 Methods
 -------
@@ -320,6 +337,8 @@ Attributes
     noise.sky_level     # The value of the constructor parameter sky_level (read-only)
     noise.gain          # The value of the constructor parameter gain (read-only)
     noise.read_noise    # The value of the constructor parameter read_noise (read-only)
+    noise.max_poisson   # The value of the constructor parameter max_poisson (read-only)
+    noise.fast          # The value of the constructor parameter fast (read-only)
 """
 
 def CCDNoise_applyTo(self, image):
@@ -342,6 +361,9 @@ _galsim.CCDNoise.applyTo = CCDNoise_applyTo
 _galsim.CCDNoise.getSkyLevel.__func__.__doc__ = "Get sky level in current noise model."
 _galsim.CCDNoise.getGain.__func__.__doc__ = "Get gain in current noise model."
 _galsim.CCDNoise.getReadNoise.__func__.__doc__ = "Get read noise in current noise model."
+_galsim.CCDNoise.getMaxPoisson.__func__.__doc__ = \
+        "Get the number of electrons above which the Gaussian approximation is used."
+_galsim.CCDNoise.getFast.__func__.__doc__ = "Get whether the faster algorithm is used."
 
 def CCDNoise_copy(self, rng=None):
     """Returns a copy of the CCD noise model.
@@ -352,7 +374,8 @@ def CCDNoise_copy(self, rng=None):
         >>> noise_copy = noise.copy(rng=new_rng)
     """
     if rng is None: rng = self.rng
-    return _galsim.CCDNoise(rng, self.getSkyLevel(), self.getGain(), self.getReadNoise())
+    return _galsim.CCDNoise(rng, self.getSkyLevel(), self.getGain(), self.getReadNoise(),
+                            self.getMaxPoisson(), self.getFast())
 
 _galsim.CCDNoise.copy = CCDNoise_copy
 
@@ -521,9 +544,11 @@ class VariableGaussianNoise(_galsim.BaseNoise):
 
 # Enable pickling of the boost-python wrapped classes
 _galsim.GaussianNoise.__getinitargs__ = lambda self: (self.rng, self.sigma)
-_galsim.PoissonNoise.__getinitargs__ = lambda self: (self.rng, self.sky_level)
+_galsim.PoissonNoise.__getinitargs__ = \
+        lambda self: (self.rng, self.sky_level, self.max_poisson, self.fast)
 _galsim.CCDNoise.__getinitargs__ = \
-        lambda self: (self.rng, self.sky_level, self.gain, self.read_noise)
+        lambda self: (self.rng, self.sky_level, self.gain, self.read_noise, self.max_poisson,
+                      self.fast)
 _galsim.DeviateNoise.__getinitargs__ = lambda self: (self.rng, )
 _galsim.VarGaussianNoise.__getinitargs__ = lambda self: (self.rng, self.var_image)
 
@@ -531,10 +556,12 @@ _galsim.VarGaussianNoise.__getinitargs__ = lambda self: (self.rng, self.var_imag
 _galsim.GaussianNoise.__repr__ = \
         lambda self: 'galsim.GaussianNoise(rng=%r, sigma=%r)'%(self.rng, self.sigma)
 _galsim.PoissonNoise.__repr__ = \
-        lambda self: 'galsim.PoissonNoise(rng=%r, sky_level=%r)'%(self.rng, self.sky_level)
+        lambda self: 'galsim.PoissonNoise(rng=%r, sky_level=%r, max_poisson=%r, fast=%r)'%(
+            self.rng, self.sky_level, self.max_poisson, self.fast)
 _galsim.CCDNoise.__repr__ = \
-        lambda self: 'galsim.CCDNoise(rng=%r, sky_level=%r, gain=%r, read_noise=%r)'%(
-            self.rng, self.sky_level, self.gain, self.read_noise)
+        lambda self: ('galsim.CCDNoise(rng=%r, sky_level=%r, gain=%r, read_noise=%r, '+
+                      'max_poisson=%r, fast=%r)')%(
+            self.rng, self.sky_level, self.gain, self.read_noise, self.max_poisson, self.fast)
 _galsim.DeviateNoise.__repr__ = \
         lambda self: 'galsim.DeviateNoise(dev=%r)'%(self.rng)
 _galsim.VarGaussianNoise.__repr__ = \
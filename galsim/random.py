@@ -84,6 +84,11 @@ There are a few methods that are common to all BaseDeviate classes, so we descri
     dev.clearCache()    Clear the internal cache of the Deviate, if there is any.
     dev.duplicate()     Create a duplicate of the current Deviate, which will produce an identical
                         series of values as the original.
+    dev.generate(array) Fill a NumPy array with random values from the Deviate.  This is much
+                        faster than calling dev() for each element.
+    dev.split(*keys)    Make a new BaseDeviate with an independent counter-based random number
+                        stream, which only depends on the seed of dev and the given keys.
+    dev.discard(n)      Skip ahead n values in the random number stream.
 """
 
 _galsim.BaseDeviate.seed.__func__.__doc__ = """
@@ -133,6 +138,94 @@ GaussianDeviate, since it generates two values at a time, saving the second one
 next output value.
 """
 
+def _fill_array(array, func):
+    """Helper function to call func on a contiguous 1-d float64 version of array, and then
+    copy the results back into array if that had to be a copy.
+    """
+    import numpy
+    if array.dtype == numpy.float64 and array.flags.c_contiguous:
+        func(array.reshape(-1))
+    else:
+        array1 = numpy.ascontiguousarray(array, dtype=numpy.float64)
+        func(array1.reshape(-1))
+        array[...] = array1
+
+def BaseDeviate_generate(self, array):
+    """
+    Generate many pseudo-random values, filling in the values of a NumPy array.
+
+    This is equivalent to setting each element of the array in turn (in C order) to dev(), so
+    the values and the subsequent state of the random number generator are the same as for the
+    repeated single calls.  However, the loop is done in C++, so it is much faster.
+
+    Example
+    _______
+
+        >>> u = galsim.UniformDeviate(31415926)
+        >>> a = numpy.empty(3)
+        >>> u.generate(a)
+        >>> a
+        array([ 0.1710077 ,  0.49095048,  0.1030667 ])
+
+    @param array        A NumPy array to fill with random values.
+    """
+    _fill_array(array, self._generate)
+
+_galsim.BaseDeviate.generate = BaseDeviate_generate
+
+def BaseDeviate_split(self, *keys):
+    """
+    Make a new BaseDeviate with an independent, counter-based random number stream.
+
+    The new stream only depends on the seed of this Deviate and the given keys, not on how many
+    values have been drawn from this Deviate or in what order the streams are split off.  So
+    each combination of keys gets its own reproducible stream, which is useful for parallel
+    code, where the order in which things are done may vary.  e.g.
+
+        >>> rng = galsim.BaseDeviate(1234)
+        >>> gd = galsim.GaussianDeviate(rng.split(file_num, image_num, obj_num, 'psf'))
+
+    The keys may be integers or strings.  Giving several keys is the same as calling split
+    repeatedly with one key at a time.
+
+    The new stream uses the counter-based Philox4x32-10 generator rather than the usual
+    Mersenne Twister, so skipping ahead in it with `discard` is fast.  Note that the returned
+    object is always a BaseDeviate, which may be used to seed any of the other Deviates.
+
+    @param keys         One or more integer or string keys for the new stream.
+
+    @returns a new BaseDeviate using the new stream.
+    """
+    if len(keys) == 0:
+        raise TypeError("split requires at least one key")
+    rng = self
+    for key in keys:
+        if isinstance(key, basestring):
+            # Use a hash that is the same in every process, unlike the built-in hash.
+            import hashlib
+            key = int(hashlib.md5(key).hexdigest()[:16], 16)
+        # Wrap to the range of a signed 64-bit integer.
+        key = (int(key) + 2**63) % 2**64 - 2**63
+        rng = rng._split(key)
+    return rng
+
+_galsim.BaseDeviate.split = BaseDeviate_split
+
+_galsim.BaseDeviate.discard.__func__.__doc__ = """
+Skip ahead n values in the random number stream.
+
+This skips n values of the underlying 32-bit random number generator.  For a UniformDeviate,
+this is the same as drawing n values, but other Deviates may use more than one of these per
+value.  For a counter-based stream (see `split`), this takes the same time for any n, but it is
+O(n) for the default Mersenne Twister generator.
+
+@param n            The number of values to skip.
+"""
+
+_galsim.BaseDeviate.isCounterBased.__func__.__doc__ = """
+Return whether this Deviate uses a counter-based random number stream, as made by `split`.
+"""
+
 # Quick and dirty.  Just check reprs are equal.
 _galsim.BaseDeviate.__eq__ = lambda self, other: repr(self) == repr(other)
 _galsim.BaseDeviate.__ne__ = lambda self, other: not self.__eq__(other)
@@ -147,14 +240,19 @@ def permute(rng, *args):
     @param rng    The random number generator to use. (This will be converted to a UniformDeviate.)
     @param args   Any number of lists to be permuted.
     """
+    import numpy
     ud = _galsim.UniformDeviate(rng)
     if len(args) == 0: return
 
     # We use an algorithm called the Knuth shuffle, which is based on the Fisher-Yates shuffle.
     # See http://en.wikipedia.org/wiki/Fisher-Yates_shuffle for more information.
     n = len(args[0])
-    for i in range(n-1,1,-1):
-        j = int((i+1) * ud())
+    if n <= 2: return
+    # Draw all the uniform deviates we need at once.
+    u = numpy.empty(n-2)
+    ud.generate(u)
+    for k, i in enumerate(range(n-1,1,-1)):
+        j = int((i+1) * u[k])
         if j == i+1: j = i  # I'm not sure if this is possible, but just in case...
         for list in args:
             list[i], list[j] = list[j], list[i]
@@ -174,6 +272,12 @@ class DistDeviate(_galsim.BaseDeviate):
     keyword `npoints`, which sets the number of points DistDeviate creates for its internal table
     of CDF(x).  To prevent errors due to non-monotonicity, the interpolant for this internal table
     is always linear.
+
+    The table lookups are done in C++ and take O(1) time on average, regardless of `npoints`.
+    With `use_alias=True`, the interval of the table is instead chosen with Walker's alias
+    method, which is O(1) even in the worst case.  The values have the same distribution either
+    way, but the alias method does not map each uniform deviate to the same value as the
+    inverse CDF, so the sequence of values for a given seed is different.
     
     Two keywords, `x_min` and `x_max`, define the support of the function.  They must be passed if
     a callable function is given to DistDeviate, unless the function is a LookupTable, which has its
@@ -224,6 +328,8 @@ class DistDeviate(_galsim.BaseDeviate):
                         documentation for LookupTable. [default: 'linear']
     @param npoints      Number of points DistDeviate should create for its internal interpolation
                         tables. [default: 256]
+    @param use_alias    Whether to use the alias method to draw from the table, rather than
+                        inverting the CDF. [default: False]
 
     Calling
     -------
@@ -235,9 +341,13 @@ class DistDeviate(_galsim.BaseDeviate):
     -0.4151921102709466
     >>> d()
     -0.00909781188974034
+
+    Many values can be drawn at once with d.generate(array), which is much faster than calling
+    d() for each one.
     """    
     def __init__(self, seed=0, function=None, x_min=None, 
-                 x_max=None, interpolant=None, npoints=256, _init=True, lseed=None):
+                 x_max=None, interpolant=None, npoints=256, use_alias=False, _init=True,
+                 lseed=None):
         # lseed is an obsolete synonym for seed
         # I think this was the only place that the name lseed was actually used in the docs.
         # so we keep it for now for backwards compatibility.
@@ -265,6 +375,7 @@ class DistDeviate(_galsim.BaseDeviate):
         self._npoints = npoints
         self._xmin = x_min
         self._xmax = x_max
+        self._use_alias = use_alias
 
         # Figure out if a string is a filename or something we should be using in an eval call
         if isinstance(function, str):
@@ -313,7 +424,7 @@ class DistDeviate(_galsim.BaseDeviate):
         xarray = x_min+(1.*x_max-x_min)/(npoints-1)*numpy.array(range(npoints),float)
         # cdf is the cumulative distribution function--just easier to type!
         dcdf = [galsim.integ.int1d(function, xarray[i], xarray[i+1]) for i in range(npoints - 1)]
-        cdf = [sum(dcdf[0:i]) for i in range(npoints)]
+        cdf = numpy.concatenate(([0.], numpy.cumsum(dcdf)))
         # Quietly renormalize the probability if it wasn't already normalized
         totalprobability = cdf[-1]
         cdf = numpy.array(cdf)/totalprobability
@@ -350,7 +461,7 @@ class DistDeviate(_galsim.BaseDeviate):
                 raise RuntimeError(
                     'Cumulative probability in DistDeviate is too flat for program to fix')
                         
-        self._inverseprobabilitytable = galsim.LookupTable(cdf, xarray, interpolant='linear')
+        self._table = _galsim._DistDeviateTable(xarray, cdf, use_alias)
         self.x_min = x_min
         self.x_max = x_max
         
@@ -362,15 +473,26 @@ class DistDeviate(_galsim.BaseDeviate):
         if p<0 or p>1:
             raise ValueError('Cannot request cumulative probability value from DistDeviate for '
                              'p<0 or p>1!  You entered: %f'%p)
-        return self._inverseprobabilitytable(p)
+        return self._table.val(p)
     
     # This is the private function that is required to make DistDeviate work as a derived 
     # class of BaseDeviate.  See pysrc/Random.cpp.
     def _val(self):
-        return self.val(self._ud())
+        return self._table(self._ud)
 
     def __call__(self):
-        return self._val()
+        return self._table(self._ud)
+
+    def generate(self, array):
+        """
+        Generate many pseudo-random values, filling in the values of a NumPy array.
+
+        This is equivalent to setting each element of the array in turn (in C order) to d(),
+        but it is much faster.
+
+        @param array        A NumPy array to fill with random values.
+        """
+        _fill_array(array, lambda a: self._table._generate(self._ud, a))
 
     def seed(self, seed=0):
         _galsim.BaseDeviate.seed(self,seed)
@@ -393,17 +515,21 @@ class DistDeviate(_galsim.BaseDeviate):
 
     def __repr__(self):
         return ('galsim.DistDeviate(seed=%r, function=%r, x_min=%r, x_max=%r, interpolant=%r, '+
-                'npoints=%r)')%(self._ud.serialize(), self._function, self._xmin, self._xmax, 
-                                self._interpolant, self._npoints)
+                'npoints=%r, use_alias=%r)')%(self._ud.serialize(), self._function, self._xmin,
+                                              self._xmax, self._interpolant, self._npoints,
+                                              self._use_alias)
     def __str__(self):
-        return 'galsim.DistDeviate(function="%s", x_min=%s, x_max=%s, interpolant=%s, npoints=%s)'%(
+        s = 'galsim.DistDeviate(function="%s", x_min=%s, x_max=%s, interpolant=%s, npoints=%s'%(
                 self._function, self._xmin, self._xmax, self._interpolant, self._npoints)
+        if self._use_alias:
+            s += ', use_alias=True'
+        return s + ')'
 
     # Functions aren't picklable, so for pickling, we reinitialize the DistDeviate using the
     # original function parameter, which may be a string or a file name.
     def __getinitargs__(self):
         return (self._ud.serialize(), self._function, self._xmin, self._xmax, 
-                self._interpolant, self._npoints)
+                self._interpolant, self._npoints, self._use_alias)
 
 
 
@@ -468,6 +594,24 @@ Returns a Gaussian deviate with current `mean` and `sigma`.
 _galsim.GaussianDeviate.getMean.__func__.__doc__ = "Get current distribution `mean`."
 _galsim.GaussianDeviate.getSigma.__func__.__doc__ = "Get current distribution `sigma`."
 
+def GaussianDeviate_generate_from_variance(self, array):
+    """
+    Generate many Gaussian deviate values using the existing array values as the variance for
+    each.
+
+    Each element of the array is replaced by a value drawn from a Gaussian with mean 0 and
+    variance equal to its current value.  The current `mean` and `sigma` of the deviate are not
+    used.  This is equivalent to (but much faster than)
+
+        >>> g1 = galsim.GaussianDeviate(g)
+        >>> for i in range(len(array)): array[i] = g1() * numpy.sqrt(array[i])
+
+    @param array        A NumPy array with the variance to use for each element.
+    """
+    _fill_array(array, self._generate_from_variance)
+
+_galsim.GaussianDeviate.generate_from_variance = GaussianDeviate_generate_from_variance
+
 
 # BinomialDeviate docstrings
 _galsim.BinomialDeviate.__doc__ = """
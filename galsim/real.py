@@ -61,7 +61,7 @@ class RealGalaxy(GSObject):
         >>> real_galaxy = galsim.RealGalaxy(real_galaxy_catalog, index=None, id=None, random=False, 
         ...                                 rng=None, x_interpolant=None, k_interpolant=None,
         ...                                 flux=None, pad_factor=4, noise_pad_size=0,
-        ...                                 gsparams=None)
+        ...                                 cache_kimage=False, gsparams=None)
 
     This initializes `real_galaxy` with three InterpolatedImage objects (one for the deconvolved
     galaxy, and saved versions of the original HST image and PSF). Note that there are multiple
@@ -118,6 +118,15 @@ class RealGalaxy(GSObject):
                             should make sure that the padded image is larger than the postage
                             stamp onto which you are drawing this object.
                             [default: None]
+    @param cache_kimage     Whether to store the deconvolved galaxy as a k-space image, shared by
+                            all RealGalaxy objects made with the same catalog, index, interpolants,
+                            pad_factor and gsparams.  This is useful when the same galaxy is drawn
+                            many times (e.g. with different shears and rotations in a ring test),
+                            since later RealGalaxy objects for that index don't need to read the
+                            images or build the InterpolatedImages again, and drawing only needs
+                            to interpolate a single k-space image rather than evaluate both the
+                            galaxy and the PSF.  This is not used with `noise_pad_size`, since
+                            each noise-padded galaxy is different.  [default: False]
     @param gsparams         An optional GSParams argument.  See the docstring for GSParams for
                             details. [default: None]
     @param logger           A logger object for output of progress statements if the user wants
@@ -135,6 +144,7 @@ class RealGalaxy(GSObject):
                     "flux_rescale" : float ,
                     "pad_factor" : float,
                     "noise_pad_size" : float,
+                    "cache_kimage" : bool,
                   }
     _single_params = [ { "index" : int , "id" : str } ]
     _takes_rng = True
@@ -142,7 +152,8 @@ class RealGalaxy(GSObject):
 
     def __init__(self, real_galaxy_catalog, index=None, id=None, random=False,
                  rng=None, x_interpolant=None, k_interpolant=None, flux=None, flux_rescale=None,
-                 pad_factor=4, noise_pad_size=0, gsparams=None, logger=None):
+                 pad_factor=4, noise_pad_size=0, cache_kimage=False, gsparams=None,
+                 logger=None):
 
         import numpy as np
 
@@ -158,6 +169,9 @@ class RealGalaxy(GSObject):
         if flux is not None and flux_rescale is not None:
             raise TypeError("Cannot supply a flux and a flux rescaling factor!")
 
+        # If we use the stored k-space image, this is the (unscaled) deconvolved profile.
+        deconvolved = None
+
         if isinstance(real_galaxy_catalog, tuple):
             # Special (undocumented) way to build a RealGalaxy without needing the rgc directly
             # by providing the things we need from it.  Used by COSMOSGalaxy.
@@ -184,14 +198,23 @@ class RealGalaxy(GSObject):
             if logger:
                 logger.debug('RealGalaxy %d: Start RealGalaxy constructor.',use_index)
 
-            # Read in the galaxy, PSF images; for now, rely on pyfits to make I/O errors.
-            self.gal_image = real_galaxy_catalog.getGal(use_index)
-            if logger:
-                logger.debug('RealGalaxy %d: Got gal_image',use_index)
+            if cache_kimage and not noise_pad_size:
+                # Get the images and profiles from the cache, making them if necessary.
+                cache_key = _RealGalaxyCacheKey(real_galaxy_catalog, use_index, x_interpolant,
+                                                k_interpolant, pad_factor, gsparams)
+                (self.gal_image, self.psf_image, self.original_psf, self.original_gal,
+                 deconvolved) = _real_galaxy_cache(cache_key)
+                if logger:
+                    logger.debug('RealGalaxy %d: Got stored deconvolved profile',use_index)
+            else:
+                # Read in the galaxy, PSF images; for now, rely on pyfits to make I/O errors.
+                self.gal_image = real_galaxy_catalog.getGal(use_index)
+                if logger:
+                    logger.debug('RealGalaxy %d: Got gal_image',use_index)
 
-            self.psf_image = real_galaxy_catalog.getPSF(use_index)
-            if logger:
-                logger.debug('RealGalaxy %d: Got psf_image',use_index)
+                self.psf_image = real_galaxy_catalog.getPSF(use_index)
+                if logger:
+                    logger.debug('RealGalaxy %d: Got psf_image',use_index)
 
             #self.noise = real_galaxy_catalog.getNoise(use_index, self.rng, gsparams)
             # We need to duplication some of the RealGalaxyCatalog.getNoise() function, since we
@@ -222,34 +245,22 @@ class RealGalaxy(GSObject):
         self._k_interpolant = k_interpolant
         self._pad_factor = pad_factor
         self._noise_pad_size = noise_pad_size
+        self._cache_kimage = cache_kimage
         self._flux = flux
         self._gsparams = gsparams
 
-        # Convert noise_pad to the right noise to pass to InterpolatedImage
-        if noise_pad_size:
-            noise_pad = self.noise
-        else:
-            noise_pad = 0.
+        if deconvolved is None:
+            # Convert noise_pad to the right noise to pass to InterpolatedImage
+            if noise_pad_size:
+                noise_pad = self.noise
+            else:
+                noise_pad = 0.
 
-        # Build the InterpolatedImage of the PSF.
-        self.original_psf = galsim.InterpolatedImage(
-            self.psf_image, x_interpolant=x_interpolant, k_interpolant=k_interpolant, 
-            flux=1.0, gsparams=gsparams)
-        if logger:
-            logger.debug('RealGalaxy %d: Made original_psf',use_index)
-
-        # Build the InterpolatedImage of the galaxy.
-        # Use the stepK() value of the PSF as a maximum value for stepK of the galaxy.
-        # (Otherwise, low surface brightness galaxies can get a spuriously high stepk, which
-        # leads to problems.)
-        self.original_gal = galsim.InterpolatedImage(
-                self.gal_image, x_interpolant=x_interpolant, k_interpolant=k_interpolant,
-                pad_factor=pad_factor, noise_pad_size=noise_pad_size,
-                calculate_stepk=self.original_psf.stepK(),
-                calculate_maxk=self.original_psf.maxK(),
-                noise_pad=noise_pad, rng=self.rng, gsparams=gsparams)
-        if logger:
-            logger.debug('RealGalaxy %d: Made original_gal',use_index)
+            self.original_psf, self.original_gal = _build_original_profiles(
+                    self.gal_image, self.psf_image, x_interpolant, k_interpolant, pad_factor,
+                    noise_pad_size, noise_pad, self.rng, gsparams)
+            if logger:
+                logger.debug('RealGalaxy %d: Made original_psf and original_gal',use_index)
 
         # If flux is None, leave flux as given by original image
         if flux is not None:
@@ -257,13 +268,19 @@ class RealGalaxy(GSObject):
         if flux_rescale is not None:
             self.original_gal *= flux_rescale
             self.noise *= flux_rescale**2
+            if deconvolved is not None:
+                deconvolved *= flux_rescale
 
         # Calculate the PSF "deconvolution" kernel
         psf_inv = galsim.Deconvolve(self.original_psf, gsparams=gsparams)
 
         # Initialize the SBProfile attribute
-        GSObject.__init__(
-            self, galsim.Convolve([self.original_gal, psf_inv], gsparams=gsparams))
+        self._deconvolved = deconvolved
+        if deconvolved is None:
+            GSObject.__init__(
+                self, galsim.Convolve([self.original_gal, psf_inv], gsparams=gsparams))
+        else:
+            GSObject.__init__(self, deconvolved)
         if logger:
             logger.debug('RealGalaxy %d: Made gsobject',use_index)
 
@@ -286,6 +303,8 @@ class RealGalaxy(GSObject):
             s += 'pad_factor=%r, '%self._pad_factor
         if self._noise_pad_size != 0:
             s += 'noise_pad_size=%r, '%self._noise_pad_size
+        if self._cache_kimage:
+            s += 'cache_kimage=True, '
         if self._flux is not None:
             s += 'flux=%r, '%self._flux
         s += 'rng=%r, '%self._rng
@@ -305,9 +324,84 @@ class RealGalaxy(GSObject):
 
     def __setstate__(self, d):
         self.__dict__ = d
-        psf_inv = galsim.Deconvolve(self.original_psf, gsparams=self._gsparams)
-        GSObject.__init__(
-            self, galsim.Convolve([self.original_gal, psf_inv], gsparams=self._gsparams))
+        if self._deconvolved is not None:
+            GSObject.__init__(self, self._deconvolved)
+        else:
+            psf_inv = galsim.Deconvolve(self.original_psf, gsparams=self._gsparams)
+            GSObject.__init__(
+                self, galsim.Convolve([self.original_gal, psf_inv], gsparams=self._gsparams))
+
+
+def _build_original_profiles(gal_image, psf_image, x_interpolant, k_interpolant, pad_factor,
+                             noise_pad_size, noise_pad, rng, gsparams):
+    """Build the InterpolatedImages of the PSF and galaxy for a RealGalaxy.
+
+    @returns original_psf, original_gal
+    """
+    # Build the InterpolatedImage of the PSF.
+    original_psf = galsim.InterpolatedImage(
+        psf_image, x_interpolant=x_interpolant, k_interpolant=k_interpolant,
+        flux=1.0, gsparams=gsparams)
+
+    # Build the InterpolatedImage of the galaxy.
+    # Use the stepK() value of the PSF as a maximum value for stepK of the galaxy.
+    # (Otherwise, low surface brightness galaxies can get a spuriously high stepk, which
+    # leads to problems.)
+    original_gal = galsim.InterpolatedImage(
+            gal_image, x_interpolant=x_interpolant, k_interpolant=k_interpolant,
+            pad_factor=pad_factor, noise_pad_size=noise_pad_size,
+            calculate_stepk=original_psf.stepK(),
+            calculate_maxk=original_psf.maxK(),
+            noise_pad=noise_pad, rng=rng, gsparams=gsparams)
+    return original_psf, original_gal
+
+class _RealGalaxyCacheKey(object):
+    """The argument for _real_galaxy_cache.  Only `key` is used for comparisons.  The other
+    attributes are used to build the value when it is not already in the cache.
+    """
+    def __init__(self, catalog, index, x_interpolant, k_interpolant, pad_factor, gsparams):
+        # The images depend on image_dir and packed_file as well as the catalog file.
+        self.key = (catalog.getFileName(), catalog.image_dir, catalog.packed_file, index,
+                    repr(x_interpolant), repr(k_interpolant), pad_factor, repr(gsparams))
+        self.catalog = catalog
+        self.index = index
+        self.x_interpolant = x_interpolant
+        self.k_interpolant = k_interpolant
+        self.pad_factor = pad_factor
+        self.gsparams = gsparams
+    def __eq__(self, other):
+        return isinstance(other, _RealGalaxyCacheKey) and self.key == other.key
+    def __ne__(self, other): return not self.__eq__(other)
+    def __hash__(self): return hash(self.key)
+
+def _build_deconvolved(cache_key):
+    """Read the images for a RealGalaxy and build its profiles, including the deconvolved galaxy
+    as an InterpolatedKImage.
+
+    @returns gal_image, psf_image, original_psf, original_gal, deconvolved
+    """
+    import math
+    gal_image = cache_key.catalog.getGal(cache_key.index)
+    psf_image = cache_key.catalog.getPSF(cache_key.index)
+    original_psf, original_gal = _build_original_profiles(
+            gal_image, psf_image, cache_key.x_interpolant, cache_key.k_interpolant,
+            cache_key.pad_factor, 0, 0., None, cache_key.gsparams)
+
+    # Draw the k-space image of the deconvolved galaxy out to its maxk.  Use the same
+    # oversampling relative to stepk as the padding of the galaxy image gives its k-space table,
+    # so interpolating in this image is as accurate as interpolating in that table.
+    psf_inv = galsim.Deconvolve(original_psf, gsparams=cache_key.gsparams)
+    prof = galsim.Convolve([original_gal, psf_inv], gsparams=cache_key.gsparams)
+    stepk = prof.stepK()
+    dk = stepk / max(cache_key.pad_factor, 1.)
+    n = 2 * int(math.ceil(prof.maxK() / dk)) + 2
+    re, im = prof.drawKImage(nx=n, ny=n, scale=dk)
+    deconvolved = galsim.InterpolatedKImage(re, im, k_interpolant=cache_key.k_interpolant,
+                                            stepk=stepk, gsparams=cache_key.gsparams)
+    return gal_image, psf_image, original_psf, original_gal, deconvolved
+
+# The deconvolved profiles of RealGalaxy objects made with cache_kimage=True.
+_real_galaxy_cache = utilities.LRU_Cache(_build_deconvolved, maxsize=100)
 
 
 
@@ -378,10 +472,33 @@ class RealGalaxyCatalog(object):
     @param noise_dir  The directory of the noise files if different from the directory of the 
                       image files.  [default: image_dir]
     @param logger     An optional logger object to log progress. [default: None]
+    @param packed_file  The file with the packed galaxy and PSF images, as written by
+                      writePackedImages(), to use instead of the image files listed in the catalog.
+                      If the string contains '/', then it is an absolute path, else it is taken
+                      to be a relative path from the image directory.  [default: None]
+
+    Packed images
+    -------------
+
+    With the normal image files, each process that uses the catalog reads its own copy of the
+    images (all of them if `preload=True`), and access to the files is serialized with locks.
+    For runs with many processes, it is usually better to convert the images to a packed file
+    once with
+
+        >>> rgc.writePackedImages('real_galaxy_images_23.5.npy')
+
+    and then use
+
+        >>> rgc = galsim.RealGalaxyCatalog(..., packed_file='real_galaxy_images_23.5.npy')
+
+    The packed file holds all of the postage stamps as a single flat float32 array along with an
+    index of where each one starts.  It is memory mapped, so the processes share the pages through
+    the operating system's file cache, and getGal() and getPSF() return read-only Image views into
+    it without copying or locking.
     """
     _req_params = {}
     _opt_params = { 'file_name' : str, 'image_dir' : str , 'dir' : str,
-                    'preload' : bool, 'noise_dir' : str }
+                    'preload' : bool, 'noise_dir' : str, 'packed_file' : str }
     _single_params = []
     _takes_rng = False
     _takes_logger = True
@@ -390,11 +507,14 @@ class RealGalaxyCatalog(object):
     # the config structure.  It indicates that all we care about is the nobjects parameter.
     # So skip any other calculations that might normally be necessary on construction.
     def __init__(self, file_name=None, image_dir=None, dir=None, preload=False,
-                 noise_dir=None, logger=None, _nobjects_only=False):
+                 noise_dir=None, logger=None, packed_file=None, _nobjects_only=False):
 
         from galsim._pyfits import pyfits
         self.file_name, self.image_dir, self.noise_dir = \
             _parse_files_dirs(file_name, image_dir, dir, noise_dir)
+        if packed_file is not None and os.path.dirname(packed_file) == '':
+            packed_file = os.path.join(self.image_dir, packed_file)
+        self.packed_file = packed_file
 
         self.cat = pyfits.getdata(self.file_name)
         self.nobjects = len(self.cat) # number of objects in the catalog
@@ -435,6 +555,7 @@ class RealGalaxyCatalog(object):
         self.saved_noise_im = {}
         self.loaded_files = {}
         self.logger = logger
+        self._openPacked()
 
         # The pyfits commands aren't thread safe.  So we need to make sure the methods that
         # use pyfits are not run concurrently from multiple threads.
@@ -464,6 +585,23 @@ class RealGalaxyCatalog(object):
             for f in self.loaded_files.values():
                 f.close()
         self.loaded_files = {}
+        # The packed images are closed once there are no references left to the memmap.
+        self.packed_index = None
+        self.packed_data = None
+
+    def _openPacked(self):
+        """Open the packed image file, if any.
+        """
+        if self.packed_file is None:
+            self.packed_index = None
+            self.packed_data = None
+        else:
+            if self.logger:
+                self.logger.debug('RealGalaxyCatalog: open packed file %s',self.packed_file)
+            self.packed_index, self.packed_data = _read_packed_images(self.packed_file)
+            if len(self.packed_index) != self.nobjects:
+                raise ValueError("Packed file %s has %d objects, but the catalog has %d"%(
+                    self.packed_file, len(self.packed_index), self.nobjects))
 
     def getNObjects(self) : return self.nobjects
     def getFileName(self) : return self.file_name
@@ -486,10 +624,14 @@ class RealGalaxyCatalog(object):
         There are memory implications to this, so we don't do this by default.  However, it can be 
         a big speedup if memory isn't an issue.  Especially if many (or all) of the images are 
         stored in the same file as different HDUs.
+
+        If the catalog uses a packed image file, this does nothing, since the images are already
+        memory mapped.
         """
         import numpy
         from multiprocessing import Lock
         from galsim._pyfits import pyfits
+        if self.packed_data is not None: return
         if self.logger:
             self.logger.debug('RealGalaxyCatalog: start preload')
         for file_name in numpy.concatenate((self.gal_file_name , self.psf_file_name)):
@@ -538,6 +680,8 @@ class RealGalaxyCatalog(object):
         if i >= len(self.gal_file_name):
             raise IndexError(
                 'index %d given to getGal is out of range (0..%d)'%(i,len(self.gal_file_name)-1))
+        if self.packed_data is not None:
+            return self._getPacked(i, 'gal')
         f = self._getFile(self.gal_file_name[i])
         # For some reason the more elegant `with gal_lock:` syntax isn't working for me.
         # It gives an EOFError.  But doing an explicit acquire and release seems to work fine.
@@ -558,6 +702,8 @@ class RealGalaxyCatalog(object):
         if i >= len(self.psf_file_name):
             raise IndexError(
                 'index %d given to getPSF is out of range (0..%d)'%(i,len(self.psf_file_name)-1))
+        if self.packed_data is not None:
+            return self._getPacked(i, 'psf')
         f = self._getFile(self.psf_file_name[i])
         self.psf_lock.acquire()
         array = f[self.psf_hdu[i]].data
@@ -565,6 +711,75 @@ class RealGalaxyCatalog(object):
         return galsim.Image(numpy.ascontiguousarray(array.astype(numpy.float64)),
                             scale=self.pixel_scale[i])
 
+    def _getPacked(self, i, kind):
+        """Get the galaxy (`kind='gal'`) or PSF (`kind='psf'`) image at index `i` from the
+        packed image file.
+        """
+        row = self.packed_index[i]
+        start = int(row[kind+'_offset'])
+        nx = int(row[kind+'_nx'])
+        ny = int(row[kind+'_ny'])
+        array = self.packed_data[start:start+nx*ny].reshape(ny,nx)
+        return galsim.Image(array, scale=self.pixel_scale[i], make_const=True)
+
+    def writePackedImages(self, file_name):
+        """Write all of the galaxy and PSF images in the catalog to a single packed file, which
+        can then be used with the `packed_file` parameter of the RealGalaxyCatalog constructor.
+
+        The images are converted to float32.  Images that appear more than once in the catalog
+        (i.e. the same file and HDU) are only stored once.
+
+        @param file_name    The name of the file to write.  If the string contains '/', then it
+                            is an absolute path, else it is taken to be a relative path from the
+                            image directory.
+        """
+        import numpy
+        if os.path.dirname(file_name) == '':
+            file_name = os.path.join(self.image_dir, file_name)
+
+        # First find the shape of each image from the headers, so we can write the index first.
+        index = numpy.zeros(self.nobjects, dtype=_packed_index_dtype)
+        offsets = {}
+        images = []
+        ntot = 0
+        for i in range(self.nobjects):
+            for kind, names, hdus in [ ('gal', self.gal_file_name, self.gal_hdu),
+                                       ('psf', self.psf_file_name, self.psf_hdu) ]:
+                key = (names[i].strip(), int(hdus[i]))
+                if key not in offsets:
+                    header = self._getFile(key[0])[key[1]].header
+                    offsets[key] = (ntot, header['NAXIS1'], header['NAXIS2'])
+                    images.append(key)
+                    ntot += header['NAXIS1'] * header['NAXIS2']
+                start, nx, ny = offsets[key]
+                index[kind+'_offset'][i] = start
+                index[kind+'_nx'][i] = nx
+                index[kind+'_ny'][i] = ny
+        if self.logger:
+            self.logger.debug('RealGalaxyCatalog: writing %d images with %d pixels to %s',
+                              len(images), ntot, file_name)
+
+        # The header for the pixel data.  Versions of numpy before 1.9 do not write the magic
+        # string in write_array_header_1_0, so add it if it is missing.
+        import io
+        header = io.BytesIO()
+        numpy.lib.format.write_array_header_1_0(header, {
+            'descr' : numpy.lib.format.dtype_to_descr(numpy.dtype(_packed_dtype)),
+            'fortran_order' : False,
+            'shape' : (ntot,) })
+        header = header.getvalue()
+        magic = numpy.lib.format.magic(1,0)
+        if not header.startswith(magic):
+            header = magic + header
+
+        # Then write the images one at a time.
+        with open(file_name, 'wb') as fout:
+            numpy.lib.format.write_array(fout, index)
+            fout.write(header)
+            for key in images:
+                array = self._getFile(key[0])[key[1]].data
+                fout.write(numpy.ascontiguousarray(array, dtype=_packed_dtype).tostring())
+
     def getNoiseProperties(self, i):
         """Returns the components needed to make the noise correlation function at index `i`.
            Specifically, the noise image (or None), the pixel_scale, and the noise variance,
@@ -623,6 +838,7 @@ class RealGalaxyCatalog(object):
     def __repr__(self):
         s = 'galsim.RealGalaxyCatalog(%r,%r'%(self.file_name,self.image_dir)
         if self.noise_dir != self.image_dir: s += ',noise_dir=%r'%self.noise_dir
+        if self.packed_file is not None: s += ',packed_file=%r'%self.packed_file
         s += ')'
         return s
 
@@ -633,7 +849,8 @@ class RealGalaxyCatalog(object):
         return (isinstance(other, RealGalaxyCatalog) and
                 self.file_name == other.file_name and
                 self.image_dir == other.image_dir and
-                self.noise_dir == other.noise_dir)
+                self.noise_dir == other.noise_dir and
+                self.packed_file == other.packed_file)
     def __ne__(self, other): return not self.__eq__(other)
 
     def __hash__(self): return hash(repr(self))
@@ -642,6 +859,9 @@ class RealGalaxyCatalog(object):
         d = self.__dict__.copy()
         d['loaded_files'] = {}
         d['saved_noise_im'] = {}
+        # Each process maps the packed file itself.
+        d['packed_index'] = None
+        d['packed_data'] = None
         del d['gal_lock']
         del d['psf_lock']
         del d['loaded_lock']
@@ -655,7 +875,7 @@ class RealGalaxyCatalog(object):
         self.psf_lock = Lock()
         self.loaded_lock = Lock()
         self.noise_lock = Lock()
-        pass
+        self._openPacked()
 
 
 
@@ -744,6 +964,31 @@ def simReal(real_galaxy, target_PSF, target_pixel_scale, g1=0.0, g2=0.0, rotatio
     # return simulated image
     return image
 
+# The format of the packed image files written by RealGalaxyCatalog.writePackedImages().
+# The file holds two arrays in the NumPy .npy format, one after the other.  The first is the
+# index, with one row for each object in the catalog giving the start of the galaxy and PSF
+# images in the second array and their sizes.  The second is the flat array of all the pixel
+# values, which we memory map rather than read.
+_packed_dtype = '<f4'
+_packed_index_dtype = [ ('gal_offset', '<i8'), ('gal_nx', '<i4'), ('gal_ny', '<i4'),
+                        ('psf_offset', '<i8'), ('psf_nx', '<i4'), ('psf_ny', '<i4') ]
+
+def _read_packed_images(file_name):
+    """Read the index of a packed image file and memory map its pixel data.
+
+    @returns index, data
+    """
+    import numpy
+    with open(file_name, 'rb') as fin:
+        index = numpy.lib.format.read_array(fin)
+        numpy.lib.format.read_magic(fin)
+        shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(fin)
+        offset = fin.tell()
+    if fortran_order or len(shape) != 1:
+        raise IOError("%s is not a valid packed image file"%file_name)
+    data = numpy.memmap(file_name, dtype=dtype, mode='r', offset=offset, shape=shape)
+    return index, data
+
 def _parse_files_dirs(file_name, image_dir, dir, noise_dir):
     if file_name is None:
         if image_dir is not None:
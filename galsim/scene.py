@@ -120,6 +120,10 @@ class COSMOSCatalog(object):
                         and hlr > 1 arcsec, probably indicates poor sky subtraction. [default: True]
     @param max_hlr      Exclude galaxies whose fitted half-light-radius is larger than this value
                         (in arcsec).  [default: 0, meaning no limit]
+    @param packed_file  Keyword that is only used for real galaxies, not parametric ones.
+                        A packed image file written by RealGalaxyCatalog.writePackedImages() to
+                        use instead of the individual image files.  See the RealGalaxyCatalog
+                        docstring for details. [default: None]
 
     Attributes
     ----------
@@ -131,14 +135,15 @@ class COSMOSCatalog(object):
     _req_params = {}
     _opt_params = { 'file_name' : str, 'image_dir' : str , 'dir' : str, 'preload' : bool,
                     'noise_dir' : str, 'use_real' : bool,
-                    'exclude_fail' : bool, 'exclude_bad' : bool, 'max_hlr' : float  }
+                    'exclude_fail' : bool, 'exclude_bad' : bool, 'max_hlr' : float,
+                    'packed_file' : str }
     _single_params = []
     _takes_rng = False
     _takes_logger = False
 
     def __init__(self, file_name=None, image_dir=None, dir=None, preload=False, noise_dir=None,
                  use_real=True, exclude_fail=True, exclude_bad=True, max_hlr=0.,
-                 _nobjects_only=False):
+                 packed_file=None, _nobjects_only=False):
         from galsim._pyfits import pyfits
         self.use_real = use_real
 
@@ -148,7 +153,8 @@ class COSMOSCatalog(object):
                 # constructor do most of the work.  But note that we don't actually need to 
                 # bother with this if all we care about is the nobjects attribute.
                 self.real_cat = galsim.RealGalaxyCatalog(
-                    file_name, image_dir=image_dir, dir=dir, preload=preload, noise_dir=noise_dir)
+                    file_name, image_dir=image_dir, dir=dir, preload=preload, noise_dir=noise_dir,
+                    packed_file=packed_file)
 
             # The fits name has _fits inserted before the .fits ending.
             # Note: don't just use k = -5 in case it actually ends with .fits.fz
@@ -196,6 +202,10 @@ class COSMOSCatalog(object):
             self.orig_index = self.orig_index[mask]
         self.nobjects = len(self.orig_index)
 
+        # We'll set these up if and when we need them.
+        self._bandpass = None
+        self._sed = None
+
     # We need this method because the config apparatus will use this via a Proxy, and they cannot
     # access attributes directly -- just call methods.  So this is how we get nobjects there.
     def getNObjects(self) : return self.nobjects
@@ -267,10 +277,6 @@ class COSMOSCatalog(object):
         if gal_type not in ['real', 'parametric']:
             raise ValueError("Invalid galaxy type %r"%gal_type)
 
-        # We'll set these up if and when we need them.
-        self._bandpass = None
-        self._sed = None
-
         # Make rng if we will need it.
         if index is None or gal_type == 'real':
             if rng is None:
@@ -310,6 +316,212 @@ class COSMOSCatalog(object):
         else:
             return gal_list[0]
 
+    def makeParametricGalaxies(self, index=None, chromatic=False, deep=False, min_flux=0.,
+                               max_flux=0., min_hlr=0., max_hlr=0., gsparams=None):
+        """
+        Routine to construct parametric galaxies for many catalog entries at once.
+
+        This is equivalent to `makeGalaxy(index, gal_type='parametric', ...)`, but it is meant
+        for making a large number of galaxies.  The fit parameters of all the requested entries
+        are decoded up front using numpy arrays, including the choice between the 1- and
+        2-component fits and the check for failed fits, so any problem is raised before any
+        galaxies are made.  The galaxies themselves are only built as they are requested from
+        the returned generator, so the full list never needs to be held in memory.
+
+        The galaxies may also be selected by their flux and half-light radius.  These cuts are
+        applied to the decoded arrays, so galaxies that fail them are never built.  The flux
+        used for the cuts is the catalog F814W flux, 10**(-0.4*(mag_auto-25.94)), in the same
+        units as the galaxy fluxes (see makeGalaxy).  The half-light radius is that of the
+        1-component Sersic fit along the major axis, in arcsec, as for the `max_hlr` parameter of
+        the COSMOSCatalog constructor.  Both include the rescaling when `deep=True`.
+
+        When `chromatic=True`, all the galaxies share the same Bandpass, and all components with
+        the same SED type and redshift share the same SED object.  The normalization of each
+        component is then carried by the flux of its GSObject rather than by the SED, which gives
+        the same drawn images as makeGalaxy, but keeps galaxies at the same redshift eligible for
+        the fast drawing of profiles with a common SED.
+
+        @param index            The indices of the galaxies to make.  May be a list or array of
+                                indices.  [default: None, which means all the galaxies in the
+                                catalog]
+        @param chromatic        Make chromatic objects, or not?  [default: False]
+        @param deep             Modify fluxes and sizes of galaxies in order to roughly simulate
+                                an F814W<25 sample? [default: False]
+        @param min_flux         Skip galaxies with flux below this value. [default: 0, meaning no
+                                limit]
+        @param max_flux         Skip galaxies with flux above this value. [default: 0, meaning no
+                                limit]
+        @param min_hlr          Skip galaxies with half-light radius (in arcsec) below this value.
+                                [default: 0, meaning no limit]
+        @param max_hlr          Skip galaxies with half-light radius (in arcsec) above this value.
+                                [default: 0, meaning no limit]
+        @param gsparams         An optional GSParams argument.  See the docstring for GSParams for
+                                details. [default: None]
+
+        @returns a generator that yields tuples `(index, gal)` for each galaxy that passes the
+                 cuts, in the order given by `index`.  `gal` is a GSObject or a ChromaticObject
+                 depending on the value of `chromatic`.
+        """
+        if index is None:
+            indices = np.arange(self.nobjects)
+        else:
+            indices = np.asarray(index, dtype=int).ravel()
+        params = self._decodeParametric(self.param_cat[self.orig_index[indices]])
+
+        if np.any(params['fail']):
+            raise RuntimeError("Cannot make parametric model for galaxy %d!"%(
+                               indices[np.argmax(params['fail'])]))
+
+        # Apply the flux and size cuts.  The deep rescaling is the same as in makeGalaxy.
+        if deep:
+            flux_factor = 10.**(-0.4*1.5)
+            size_factor = 0.6
+        else:
+            flux_factor = 1.
+            size_factor = 1.
+        if min_flux > 0. or max_flux > 0. or min_hlr > 0. or max_hlr > 0.:
+            # 25.94 is the zeropoint for a 1 second exposure.  See _loadSEDs.
+            flux = 10.**(-0.4*(params['mag'] - 25.94)) * flux_factor
+            hlr = params['hlr'] * size_factor
+            mask = np.ones(len(indices), dtype=bool)
+            if min_flux > 0.: mask &= (flux >= min_flux)
+            if max_flux > 0.: mask &= (flux <= max_flux)
+            if min_hlr > 0.: mask &= (hlr >= min_hlr)
+            if max_hlr > 0.: mask &= (hlr <= max_hlr)
+            indices = indices[mask]
+            params = dict([ (key, params[key][mask]) for key in params ])
+
+        if chromatic:
+            self._loadSEDs()
+        return self._iterParametric(indices, params, chromatic, deep, flux_factor, size_factor,
+                                    gsparams)
+
+    def _iterParametric(self, indices, params, chromatic, deep, flux_factor, size_factor,
+                        gsparams):
+        # The SEDs at each redshift, along with their magnitudes in the bandpass, keyed by
+        # (sed type, z).
+        sed_cache = {}
+        def get_sed(k, z):
+            if (k,z) not in sed_cache:
+                sed = self._sed[k].atRedshift(z)
+                sed_cache[(k,z)] = (sed, sed.calculateMagnitude(self._bandpass))
+            return sed_cache[(k,z)]
+
+        for i in range(len(indices)):
+            z = params['z'][i]
+            mag = params['mag'][i]
+            if params['use_bulgefit'][i]:
+                bulge_hlr = params['bulge_hlr'][i]
+                disk_hlr = params['disk_hlr'][i]
+                if chromatic:
+                    # The same as SED.withMagnitude, but applied to the GSObject flux.
+                    bfrac = params['bfrac'][i]
+                    sed, sed_mag = get_sed(0, z)
+                    bulge_flux = 10**(-0.4*(mag - 2.5*math.log10(bfrac) - sed_mag))
+                    bulge = galsim.DeVaucouleurs(flux=bulge_flux, half_light_radius=bulge_hlr,
+                                                 gsparams=gsparams) * sed
+                    sed, sed_mag = get_sed(1, z)
+                    disk_flux = 10**(-0.4*(mag - 2.5*math.log10(1.-bfrac) - sed_mag))
+                    disk = galsim.Exponential(flux=disk_flux, half_light_radius=disk_hlr,
+                                              gsparams=gsparams) * sed
+                else:
+                    bulge = galsim.DeVaucouleurs(flux=params['bulge_flux'][i],
+                                                 half_light_radius=bulge_hlr, gsparams=gsparams)
+                    disk = galsim.Exponential(flux=params['disk_flux'][i],
+                                              half_light_radius=disk_hlr, gsparams=gsparams)
+                bulge_q = params['bulge_q'][i]
+                disk_q = params['disk_q'][i]
+                if bulge_q < 1.:
+                    bulge = bulge.shear(q=bulge_q, beta=params['bulge_beta'][i]*galsim.radians)
+                if disk_q < 1.:
+                    disk = disk.shear(q=disk_q, beta=params['disk_beta'][i]*galsim.radians)
+                gal = bulge + disk
+            else:
+                gal_n = params['n'][i]
+                gal_hlr = params['gal_hlr'][i]
+                if chromatic:
+                    if gal_n < 1.5:
+                        sed, sed_mag = get_sed(1, z) # disk
+                    elif gal_n < 3.0:
+                        sed, sed_mag = get_sed(2, z) # intermediate
+                    else:
+                        sed, sed_mag = get_sed(0, z) # bulge
+                    gal = galsim.Sersic(gal_n, flux=10**(-0.4*(mag - sed_mag)),
+                                        half_light_radius=gal_hlr, gsparams=gsparams) * sed
+                else:
+                    # The conversion from surface brightness at the half-light radius to flux
+                    # depends on n, so it is done here rather than in _decodeParametric.
+                    tmp_ser = galsim.Sersic(gal_n, half_light_radius=gal_hlr, gsparams=gsparams)
+                    gal_flux = params['gal_sb'][i] / tmp_ser.xValue(0,gal_hlr) / cosmos_pix_scale**2
+                    gal = galsim.Sersic(gal_n, flux=gal_flux, half_light_radius=gal_hlr,
+                                        gsparams=gsparams)
+                gal_q = params['gal_q'][i]
+                if gal_q < 1.:
+                    gal = gal.shear(q=gal_q, beta=params['gal_beta'][i]*galsim.radians)
+
+            if deep:
+                gal = gal.dilate(size_factor) * flux_factor
+
+            yield indices[i], gal
+
+    @staticmethod
+    def _decodeParametric(records):
+        # The vectorized version of the first part of _buildParametric.  Given an array of
+        # records from the parametric catalog, return a dict of arrays with the parameters of
+        # each galaxy.  See _buildParametric for the meaning of the columns and the reasons for
+        # the cuts used here.
+        bparams = records['bulgefit']
+        sparams = records['sersicfit']
+        bstat = records['fit_status'][:,0]
+        sstat = records['fit_status'][:,4]
+        dvc_btt = records['fit_dvc_btt']
+        bmad = records['fit_mad_b']
+        smad = records['fit_mad_s']
+
+        # The comparisons with NaN are False, so ignore the warnings about them.
+        with np.errstate(invalid='ignore'):
+            use_bulgefit = ~( (bstat < 1) | (bstat > 4) | (dvc_btt < 0.1) | (dvc_btt > 0.9) |
+                              np.isnan(dvc_btt) | (bparams[:,9] <= 0) |
+                              (bparams[:,1] <= 0) | (bparams[:,11] < 0.051) |
+                              (bparams[:,3] < 0.051) | (smad < bmad) )
+            fail = (sstat < 1) | (sstat > 4) | (sparams[:,1] <= 0) | (sparams[:,0] <= 0)
+
+            # 2-component fits.  These are only meaningful where use_bulgefit is True.
+            bulge_q = bparams[:,11]
+            bulge_hlr = cosmos_pix_scale*np.sqrt(bulge_q)*bparams[:,9]
+            bulge_flux = 2.0*np.pi*3.607*(bulge_hlr**2)*bparams[:,8]/cosmos_pix_scale**2
+            disk_q = bparams[:,3]
+            disk_hlr = cosmos_pix_scale*np.sqrt(disk_q)*bparams[:,1]
+            disk_flux = 2.0*np.pi*1.901*(disk_hlr**2)*bparams[:,0]/cosmos_pix_scale**2
+            bfrac = bulge_flux/(bulge_flux+disk_flux)
+            fail |= use_bulgefit & ( (bfrac < 0) | (bfrac > 1) | np.isnan(bfrac) )
+
+            # 1-component fits.
+            gal_q = sparams[:,3]
+            gal_hlr = cosmos_pix_scale*np.sqrt(gal_q)*sparams[:,1]
+
+        return {
+            'use_bulgefit' : use_bulgefit,
+            'fail' : fail,
+            'bulge_q' : bulge_q,
+            'bulge_beta' : bparams[:,15],
+            'bulge_hlr' : bulge_hlr,
+            'bulge_flux' : bulge_flux,
+            'disk_q' : disk_q,
+            'disk_beta' : bparams[:,7],
+            'disk_hlr' : disk_hlr,
+            'disk_flux' : disk_flux,
+            'bfrac' : bfrac,
+            'n' : np.clip(sparams[:,2], 0.3, 6.0),
+            'gal_q' : gal_q,
+            'gal_beta' : sparams[:,7],
+            'gal_hlr' : gal_hlr,
+            'gal_sb' : sparams[:,0],
+            'hlr' : cosmos_pix_scale*sparams[:,1],
+            'mag' : records['mag_auto'],
+            'z' : records['zphot'],
+        }
+
     def _makeReal(self, indices, noise_pad_size, rng, gsparams):
         return [ galsim.RealGalaxy(self.real_cat, index=self.orig_index[i],
                                    noise_pad_size=noise_pad_size, rng=rng, gsparams=gsparams)
@@ -317,31 +529,7 @@ class COSMOSCatalog(object):
 
     def _makeParametric(self, indices, chromatic, gsparams):
         if chromatic:
-            # Defer making the Bandpass and reading in SEDs until we actually are going to use them.
-            # It's not a huge calculation, but the thin() call especially isn't trivial.
-            if self._bandpass is None:
-                # We have to set an appropriate zeropoint.  This is slightly complicated: The
-                # nominal COSMOS zeropoint for single-orbit depth (2000s of usable exposure time,
-                # across 4 dithered exposures) is supposedly 25.94.  But the science images that we
-                # are using were normalized to count rate, not counts, meaning that an object with
-                # mag=25.94 has a count rate of 1 photon/sec, not 1 photon total.  Since we've
-                # declared our flux normalization for the outputs to be appropriate for a 1s
-                # exposure, we use this zeropoint directly.
-                zp = 25.94
-                self._bandpass = galsim.Bandpass(
-                    os.path.join(galsim.meta_data.share_dir, 'wfc_F814W.dat.gz'),
-                    wave_type='ang').thin().withZeropoint(zp)
-                # This means that when drawing chromatic parametric galaxies, the outputs will be
-                # properly normalized in terms of counts.
-
-                # Read in some SEDs.
-                self._sed = [
-                    # bulge
-                    galsim.SED(os.path.join(galsim.meta_data.share_dir,'CWW_E_ext.sed')),
-                    # disk
-                    galsim.SED(os.path.join(galsim.meta_data.share_dir,'CWW_Scd_ext.sed')),
-                    # intermediate
-                    galsim.SED(os.path.join(galsim.meta_data.share_dir,'CWW_Sbc_ext.sed'))]
+            self._loadSEDs()
 
         gal_list = []
         for index in indices:
@@ -351,6 +539,33 @@ class COSMOSCatalog(object):
 
         return gal_list
 
+    def _loadSEDs(self):
+        # Defer making the Bandpass and reading in SEDs until we actually are going to use them.
+        # It's not a huge calculation, but the thin() call especially isn't trivial.
+        if self._bandpass is None:
+            # We have to set an appropriate zeropoint.  This is slightly complicated: The
+            # nominal COSMOS zeropoint for single-orbit depth (2000s of usable exposure time,
+            # across 4 dithered exposures) is supposedly 25.94.  But the science images that we
+            # are using were normalized to count rate, not counts, meaning that an object with
+            # mag=25.94 has a count rate of 1 photon/sec, not 1 photon total.  Since we've
+            # declared our flux normalization for the outputs to be appropriate for a 1s
+            # exposure, we use this zeropoint directly.
+            zp = 25.94
+            self._bandpass = galsim.Bandpass(
+                os.path.join(galsim.meta_data.share_dir, 'wfc_F814W.dat.gz'),
+                wave_type='ang').thin().withZeropoint(zp)
+            # This means that when drawing chromatic parametric galaxies, the outputs will be
+            # properly normalized in terms of counts.
+
+            # Read in some SEDs.
+            self._sed = [
+                # bulge
+                galsim.SED(os.path.join(galsim.meta_data.share_dir,'CWW_E_ext.sed')),
+                # disk
+                galsim.SED(os.path.join(galsim.meta_data.share_dir,'CWW_Scd_ext.sed')),
+                # intermediate
+                galsim.SED(os.path.join(galsim.meta_data.share_dir,'CWW_Sbc_ext.sed'))]
+
     @staticmethod
     def _buildParametric(record, gsparams=None, chromatic=False, bandpass=None, sed=None):
         # Get fit parameters.  For 'sersicfit', the result is an array of 8 numbers for each
@@ -229,10 +229,9 @@ def rand_arr(shape, deviate):
     """
     if len(shape) is not 2:
         raise ValueError("Can only make a 2d array from this function!")
-    # note reversed indices due to NumPy vs. Image array indexing conventions!
-    tmp_img = galsim.ImageD(shape[1], shape[0])
-    tmp_img.addNoise(galsim.DeviateNoise(deviate))
-    return tmp_img.array
+    arr = np.empty(tuple(shape), dtype=float)
+    deviate.generate(arr)
+    return arr
 
 def convert_interpolant(interpolant):
     """Convert a given interpolant to an Interpolant if it is given as a string.
@@ -612,12 +611,16 @@ class LRU_Cache:
     >>> cache.resize(maxsize) # Resize the cache, either upwards or downwards.  Upwards resizing
                               # is non-destructive.  Downwards resizing will remove the least
                               # recently used items first.
+
+    The number of cache hits and misses so far are available as `cache.hits` and `cache.misses`.
     """
     def __init__(self, user_function, maxsize=1024):
         # Link layout:     [PREV, NEXT, KEY, RESULT]
         self.root = root = [None, None, None, None]
         self.user_function = user_function
         self.cache = cache = {}
+        self.hits = 0
+        self.misses = 0
 
         last = root
         for i in range(maxsize):
@@ -638,10 +641,12 @@ class LRU_Cache:
             last[1] = root[0] = link
             link[0] = last
             link[1] = root
+            self.hits += 1
             return result
         # Cache miss: evaluate and insert new key/value at root, then increment root
         #             so that just-evaluated value is in last position.
         result = self.user_function(*key)
+        self.misses += 1
         root[2] = key
         root[3] = result
         oldroot = root
@@ -135,6 +135,18 @@ class BaseWCS(object):
       be a CelestialCoord if the transformation is in terms of celestial coordinates
       (if `wcs.isCelestial() == True`).  Otherwise, it will be a PositionD as well.
 
+    - Convert many positions at once, given as numpy arrays (or anything that numpy can
+      convert to an array) of the coordinates:
+
+            >>> u, v = wcs.toWorld(x, y)                            # EuclideanWCS
+            >>> x, y = wcs.toImage(u, v)
+            >>> ra, dec = wcs.toWorld(x, y, units=galsim.degrees)   # CelestialWCS
+            >>> x, y = wcs.toImage(ra, dec, units=galsim.degrees)
+
+      These are equivalent to the methods xyTouv, uvToxy (for EuclideanWCS classes) and
+      xyToradec, radecToxy (for CelestialWCS classes).  They are much faster than converting
+      each position in turn for most WCS types.
+
     - Convert a GSObject that is defined in world coordinates to the equivalent profile defined
       in terms of image coordinates (or vice versa):
 
@@ -157,6 +169,12 @@ class BaseWCS(object):
       The returned `local_wcs` is usually a JacobianWCS instance, but see the doc string for 
       local() for more details.
 
+    - For non-uniform WCS types, precompute the local Jacobian on a coarse grid covering an
+      image, so later calls to local() for positions on that image just interpolate the grid:
+
+            >>> wcs = wcs.withLocalGrid(image.bounds)
+            >>> local_wcs = wcs.local(image_pos = image_pos)    # Now much faster.
+
     - Construct a full affine approximation of a WCS at a given location:
 
             >>> affine_wcs = wcs.affine(image_pos = image_pos)
@@ -188,10 +206,12 @@ class BaseWCS(object):
             >>> wcs.isCelestial()   # are the world coordinates on the celestial sphere?
             >>> wcs.isPixelScale()  # is this either a PixelScale or an OffsetWCS?
     """
-    def toWorld(self, arg, **kwargs):
+    # Set by withLocalGrid.  Otherwise, local() calculates the local wcs directly.
+    _local_grid = None
+    def toWorld(self, *args, **kwargs):
         """Convert from image coordinates to world coordinates.
 
-        There are essentially two overloaded versions of this function here.
+        There are essentially three overloaded versions of this function here.
 
         1. The first converts a position from image coordinates to world coordinates.
            The argument may be either a PositionD or PositionI argument.  It returns
@@ -207,11 +227,27 @@ class BaseWCS(object):
            transformation can be performed.
 
                >>> world_profile = wcs.toWorld(image_profile, image_pos=None, world_pos=None)
+
+        3. The third converts arrays of image coordinates x, y to world coordinates.  It returns
+           numpy arrays u, v if the WCS is a EuclideanWCS, or ra, dec if it is a CelestialWCS.
+           In the latter case, you may give the `units` to use for ra, dec.  See xyTouv() and
+           xyToradec() for details.
+
+               >>> u, v = wcs.toWorld(x, y)
+               >>> ra, dec = wcs.toWorld(x, y, units=galsim.radians)
         """
-        if isinstance(arg, galsim.GSObject):
-            return self.profileToWorld(arg, **kwargs)
+        if len(args) == 1:
+            if isinstance(args[0], galsim.GSObject):
+                return self.profileToWorld(*args, **kwargs)
+            else:
+                return self.posToWorld(*args, **kwargs)
+        elif len(args) == 2:
+            if self.isCelestial():
+                return self.xyToradec(*args, **kwargs)
+            else:
+                return self.xyTouv(*args, **kwargs)
         else:
-            return self.posToWorld(arg, **kwargs)
+            raise TypeError("toWorld takes either 1 or 2 positional arguments")
 
     def posToWorld(self, image_pos):
         """Convert a position from image coordinates to world coordinates.
@@ -231,10 +267,10 @@ class BaseWCS(object):
         """
         return self.local(image_pos, world_pos)._profileToWorld(image_profile)
 
-    def toImage(self, arg, **kwargs):
+    def toImage(self, *args, **kwargs):
         """Convert from world coordinates to image coordinates
 
-        There are essentially two overloaded versions of this function here.
+        There are essentially three overloaded versions of this function here.
 
         1. The first converts a position from world coordinates to image coordinates.
            If the WCS is a EuclideanWCS, the argument may be either a PositionD or PositionI
@@ -250,11 +286,27 @@ class BaseWCS(object):
            transformation can be performed.
 
                >>> image_profile = wcs.toImage(world_profile, image_pos=None, world_pos=None)
+
+        3. The third converts arrays of world coordinates to image coordinates x, y.  The
+           world coordinates are u, v if the WCS is a EuclideanWCS, or ra, dec if it is a
+           CelestialWCS.  In the latter case, you may give the `units` of ra, dec.  See uvToxy()
+           and radecToxy() for details.
+
+               >>> x, y = wcs.toImage(u, v)
+               >>> x, y = wcs.toImage(ra, dec, units=galsim.radians)
         """
-        if isinstance(arg, galsim.GSObject):
-            return self.profileToImage(arg, **kwargs)
+        if len(args) == 1:
+            if isinstance(args[0], galsim.GSObject):
+                return self.profileToImage(*args, **kwargs)
+            else:
+                return self.posToImage(*args, **kwargs)
+        elif len(args) == 2:
+            if self.isCelestial():
+                return self.radecToxy(*args, **kwargs)
+            else:
+                return self.uvToxy(*args, **kwargs)
         else:
-            return self.posToImage(arg, **kwargs)
+            raise TypeError("toImage takes either 1 or 2 positional arguments")
 
     def posToImage(self, world_pos):
         """Convert a position from world coordinates to image coordinates.
@@ -368,8 +420,67 @@ class BaseWCS(object):
         """
         if image_pos and world_pos:
             raise TypeError("Only one of image_pos or world_pos may be provided")
+        if self._local_grid is not None and image_pos is not None:
+            local_wcs = _interp_local_grid(self._local_grid, image_pos)
+            if local_wcs is not None:
+                return local_wcs
         return self._local(image_pos, world_pos)
 
+    def withLocalGrid(self, bounds, max_error=1.e-6, min_spacing=4.):
+        """Return a version of this WCS that calculates local() from a precomputed grid.
+
+        For non-uniform WCS types, finding the local Jacobian at a position requires several
+        calls to the full transformation, which can be the most expensive part of drawing a
+        small postage stamp.  This function computes the Jacobian once on a grid of positions
+        covering `bounds`.  Then the returned WCS calculates `wcs.local(image_pos)` by bilinear
+        interpolation of the grid when `image_pos` is within `bounds`.  Other positions, and
+        calls with `world_pos`, still use the direct calculation.
+
+        The grid starts coarse and is refined until the interpolation error is at most
+        `max_error`.  The error is estimated by comparing the interpolation of each grid with
+        the Jacobians calculated at the points halfway between its nodes.  It is measured
+        relative to the local linear scale of the pixels, i.e. it is the largest error in any
+        element of the Jacobian matrix divided by `sqrt(pixelArea)`.  The grid actually used
+        is the finer one used to estimate the error, so the true error is usually several times
+        smaller than this estimate.  The estimate is available as `wcs.local_grid_error`.
+
+        The grid moves along with the image positions if the WCS is later given a new origin
+        (e.g. by `image.setOrigin()`).  For uniform WCS types, this just returns the current WCS.
+
+        @param bounds       The region of the image to cover, as a BoundsI (typically
+                            `image.bounds`, in which case the grid covers the outer edges of the
+                            pixels) or a BoundsD.
+        @param max_error    The maximum allowed error in the interpolated Jacobians.
+                            [default: 1.e-6]
+        @param min_spacing  The minimum spacing of the grid in pixels.  If the grid needs to be
+                            finer than this to reach `max_error`, a RuntimeError is raised.
+                            [default: 4]
+
+        @returns the new WCS
+        """
+        if self.isUniform():
+            return self
+        if isinstance(bounds, galsim.BoundsI):
+            bounds = galsim.BoundsD(bounds.xmin-0.5, bounds.xmax+0.5,
+                                    bounds.ymin-0.5, bounds.ymax+0.5)
+        elif not isinstance(bounds, galsim.BoundsD):
+            raise TypeError("bounds must be a BoundsI or BoundsD argument")
+        if not bounds.isDefined() or bounds.xmax <= bounds.xmin or bounds.ymax <= bounds.ymin:
+            raise ValueError("bounds must have a non-zero area")
+        ret = self.copy()
+        ret._local_grid = _make_local_grid(self, bounds, max_error, min_spacing)
+        return ret
+
+    @property
+    def local_grid_error(self):
+        """The estimated error of the interpolated local Jacobians set up by withLocalGrid,
+        or None if there is no local grid.
+        """
+        if self._local_grid is None:
+            return None
+        else:
+            return self._local_grid[-1]
+
     def jacobian(self, image_pos=None, world_pos=None):
         """Return the local JacobianWCS of the WCS at a given point.
 
@@ -492,7 +603,13 @@ class BaseWCS(object):
             origin = galsim.PositionD(origin.x, origin.y)
         elif not isinstance(origin, galsim.PositionD):
             raise TypeError("origin must be a PositionD or PositionI argument")
-        return self._withOrigin(origin, world_origin)
+        ret = self._withOrigin(origin, world_origin)
+        if self._local_grid is not None:
+            # The new wcs at image_pos is the same as the current one at image_pos - origin,
+            # so the grid just needs to move by origin.
+            xmin, ymin, dx, dy, jac, error = self._local_grid
+            ret._local_grid = (xmin + origin.x, ymin + origin.y, dx, dy, jac, error)
+        return ret
 
     def writeToFitsHeader(self, header, bounds):
         """Write this WCS function to a FITS header.
@@ -641,6 +758,95 @@ def readFromFitsHeader(header):
 #########################################################################################
 
 
+def _apply_to_arrays(func, a, b, a0=0., b0=0., factor=1.):
+    """Apply func(a*factor + a0, b*factor + b0), which returns a tuple of two values, to the
+    (broadcast) arrays a, b.
+
+    Many of the WCS helper functions (_u, _v, _radec, _xy, etc.) work with numpy arrays, but
+    this is not guaranteed, so if the call with arrays fails, fall back to calling func for
+    each element.  The return value is a tuple of two arrays with the shape of the inputs, or
+    two floats if a and b are both scalars.
+    """
+    import numpy
+    a, b = numpy.broadcast_arrays(numpy.asarray(a, dtype=float), numpy.asarray(b, dtype=float))
+    shape = a.shape
+    a = a.ravel() * factor + a0
+    b = b.ravel() * factor + b0
+    try:
+        r1, r2 = func(a, b)
+        r1 = numpy.asarray(r1, dtype=float)
+        r2 = numpy.asarray(r2, dtype=float)
+        if r1.shape != a.shape or r2.shape != a.shape:
+            raise ValueError("func did not return arrays of the right shape")
+    except NotImplementedError:
+        raise
+    except Exception:
+        # Then do them one at a time.  If the problem was something other than func not
+        # working with arrays, this will raise the appropriate exception.
+        r = [ func(a1, b1) for a1, b1 in zip(a, b) ]
+        r1 = numpy.array([ r12[0] for r12 in r ], dtype=float)
+        r2 = numpy.array([ r12[1] for r12 in r ], dtype=float)
+    if shape == ():
+        return float(r1[0]), float(r2[0])
+    else:
+        return r1.reshape(shape), r2.reshape(shape)
+
+
+def _make_local_grid(wcs, bounds, max_error, min_spacing):
+    """Make the grid of local Jacobians used by wcs.withLocalGrid.
+
+    Each pass calculates the Jacobians on a grid with twice the resolution of the previous
+    one and compares them to the bilinear interpolation of every other node.  Once the
+    difference is small enough, the finer grid is returned as a tuple
+    (xmin, ymin, dx, dy, jac, error), where jac has shape (4, ny, nx) and holds dudx, dudy,
+    dvdx, dvdy at each node.
+    """
+    import numpy
+    n = 4   # The number of cells in each direction for the first coarse grid.
+    while True:
+        n *= 2
+        dx = (bounds.xmax - bounds.xmin) / n
+        dy = (bounds.ymax - bounds.ymin) / n
+        x, y = numpy.meshgrid(numpy.linspace(bounds.xmin, bounds.xmax, n+1),
+                              numpy.linspace(bounds.ymin, bounds.ymax, n+1))
+        jac = wcs._jacobianArrays(x, y)
+
+        # The interpolation of the coarse grid at each node of the fine grid.
+        approx = numpy.empty_like(jac)
+        approx[:,::2,::2] = jac[:,::2,::2]
+        approx[:,::2,1::2] = 0.5 * (jac[:,::2,0:-2:2] + jac[:,::2,2::2])
+        approx[:,1::2,:] = 0.5 * (approx[:,0:-2:2,:] + approx[:,2::2,:])
+        scale = numpy.sqrt(numpy.abs(jac[0]*jac[3] - jac[1]*jac[2]))
+        error = numpy.max(numpy.max(numpy.abs(approx - jac), axis=0) / scale)
+
+        if error <= max_error:
+            return (bounds.xmin, bounds.ymin, dx, dy, jac, error)
+        if min(dx,dy) <= min_spacing:
+            raise RuntimeError(
+                "Unable to reach max_error = %g for the local wcs grid with spacing >= %g. "%(
+                    max_error, min_spacing) + "Estimated error is %g"%error)
+
+
+def _interp_local_grid(grid, image_pos):
+    """Interpolate a grid made by _make_local_grid at image_pos.
+
+    Returns the JacobianWCS at that position, or None if image_pos is not inside the grid.
+    """
+    xmin, ymin, dx, dy, jac, error = grid
+    ny, nx = jac.shape[1:]
+    fx = (image_pos.x - xmin) / dx
+    fy = (image_pos.y - ymin) / dy
+    if not (0. <= fx <= nx-1 and 0. <= fy <= ny-1):
+        return None
+    i = min(int(fx), nx-2)
+    j = min(int(fy), ny-2)
+    fx -= i
+    fy -= j
+    j4 = ( (1.-fx) * (1.-fy) * jac[:,j,i] + fx * (1.-fy) * jac[:,j,i+1] +
+           (1.-fx) * fy * jac[:,j+1,i] + fx * fy * jac[:,j+1,i+1] )
+    return JacobianWCS(j4[0], j4[1], j4[2], j4[3])
+
+
 class EuclideanWCS(BaseWCS):
     """A EuclideanWCS is a BaseWCS whose world coordinates are on a Euclidean plane.
     We usually use the notation (u,v) to refer to positions in world coordinates, and 
@@ -658,6 +864,43 @@ class EuclideanWCS(BaseWCS):
     @property
     def v0(self): return self.world_origin.y
 
+    def xyTouv(self, x, y):
+        """Convert arrays of image coordinates to world coordinates.
+
+        This is equivalent to `wcs.toWorld(x, y)`.  The arrays are broadcast against each other
+        in the usual numpy way.  If the transformation functions do not work with numpy arrays
+        (e.g. a UVFunction with functions that only take scalars), the positions are converted
+        one at a time.
+
+        @param x        The x coordinates, as a numpy array or anything that can be converted
+                        to one (including a scalar).
+        @param y        The y coordinates.
+
+        @returns a tuple (u, v) of numpy arrays with the world coordinates, or of floats if the
+                 inputs were scalars.
+        """
+        u, v = _apply_to_arrays(lambda x,y: (self._u(x,y), self._v(x,y)),
+                                x, y, -self.x0, -self.y0)
+        return u + self.u0, v + self.v0
+
+    def uvToxy(self, u, v):
+        """Convert arrays of world coordinates to image coordinates.
+
+        This is equivalent to `wcs.toImage(u, v)`.  The arrays are broadcast against each other
+        in the usual numpy way.  If the transformation is not implemented for this WCS, a
+        NotImplementedError is raised.
+
+        @param u        The u coordinates, as a numpy array or anything that can be converted
+                        to one (including a scalar).
+        @param v        The v coordinates.
+
+        @returns a tuple (x, y) of numpy arrays with the image coordinates, or of floats if the
+                 inputs were scalars.
+        """
+        x, y = _apply_to_arrays(lambda u,v: (self._x(u,v), self._y(u,v)),
+                                u, v, -self.u0, -self.v0)
+        return x + self.x0, y + self.y0
+
     # Simple.  Just call _u, _v.
     def _posToWorld(self, image_pos):
         x = image_pos.x - self.x0
@@ -765,6 +1008,17 @@ class EuclideanWCS(BaseWCS):
 
         return JacobianWCS(dudx, dudy, dvdx, dvdy)
 
+    # The same finite differences as _local for arrays of image positions.  Returns an array
+    # with dudx, dudy, dvdx, dvdy along the first axis.  This is used by withLocalGrid.
+    def _jacobianArrays(self, x, y):
+        import numpy
+        x = x - self.x0
+        y = y - self.y0
+        xlist = numpy.array([ x+1, x-1, x,   x   ])
+        ylist = numpy.array([ y,   y,   y+1, y-1 ])
+        u, v = _apply_to_arrays(lambda x,y: (self._u(x,y), self._v(x,y)), xlist, ylist)
+        return 0.5 * numpy.array([ u[0]-u[1], u[2]-u[3], v[0]-v[1], v[2]-v[3] ])
+
     # The naive way to make the sky image is to loop over pixels and call pixelArea(pos)
     # for that position.  This is extremely slow.  Here, we use the fact that the _u and _v
     # functions might work with numpy arrays.  If they do, this function is quite fast.
@@ -889,6 +1143,46 @@ class CelestialWCS(BaseWCS):
     @property
     def y0(self): return self.origin.y
 
+    def xyToradec(self, x, y, units=galsim.radians):
+        """Convert arrays of image coordinates to celestial coordinates.
+
+        This is equivalent to `wcs.toWorld(x, y, units=units)`.  The arrays are broadcast against
+        each other in the usual numpy way.  The returned ra values are wrapped into the range
+        [-pi, pi) radians (or the equivalent in the given units), just as for the ra of the
+        CelestialCoord returned by `wcs.toWorld(image_pos)`.
+
+        @param x        The x coordinates, as a numpy array or anything that can be converted
+                        to one (including a scalar).
+        @param y        The y coordinates.
+        @param units    The units to use for the returned ra, dec. [default: galsim.radians]
+
+        @returns a tuple (ra, dec) of numpy arrays, or of floats if the inputs were scalars.
+        """
+        import numpy
+        ra, dec = _apply_to_arrays(self._radec, x, y, -self.x0, -self.y0)
+        ra = numpy.mod(ra + numpy.pi, 2.*numpy.pi) - numpy.pi
+        factor = galsim.radians / units
+        return ra * factor, dec * factor
+
+    def radecToxy(self, ra, dec, units=galsim.radians):
+        """Convert arrays of celestial coordinates to image coordinates.
+
+        This is equivalent to `wcs.toImage(ra, dec, units=units)`.  The arrays are broadcast
+        against each other in the usual numpy way.  If the transformation is not implemented for
+        this WCS, a NotImplementedError is raised.
+
+        @param ra       The right ascensions, as a numpy array or anything that can be converted
+                        to one (including a scalar).
+        @param dec      The declinations.
+        @param units    The units of the given ra, dec. [default: galsim.radians]
+
+        @returns a tuple (x, y) of numpy arrays with the image coordinates, or of floats if the
+                 inputs were scalars.
+        """
+        factor = units / galsim.radians
+        x, y = _apply_to_arrays(self._xy, ra, dec, 0., 0., factor)
+        return x + self.x0, y + self.y0
+
     # This is a bit simpler than the EuclideanWCS version, since there is no world_origin.
     def _withOrigin(self, origin, world_origin):
         # We want the new wcs to have wcs.toWorld(x2,y2) match the current wcs.toWorld(0,0).
@@ -948,6 +1242,23 @@ class CelestialWCS(BaseWCS):
         factor = galsim.radians / galsim.arcsec
         return JacobianWCS(dudx*factor, dudy*factor, dvdx*factor, dvdy*factor)
 
+    # The same finite differences as _local for arrays of image positions.  Returns an array
+    # with dudx, dudy, dvdx, dvdy along the first axis.  This is used by withLocalGrid.
+    def _jacobianArrays(self, x, y):
+        import numpy
+        x = x - self.x0
+        y = y - self.y0
+        xlist = numpy.array([ x, x+1, x-1, x,   x   ])
+        ylist = numpy.array([ y, y,   y,   y+1, y-1 ])
+        ra, dec = _apply_to_arrays(self._radec, xlist, ylist)
+        # Make sure the ra differences don't wrap around.
+        dra_x = numpy.mod(ra[1] - ra[2] + numpy.pi, 2.*numpy.pi) - numpy.pi
+        dra_y = numpy.mod(ra[3] - ra[4] + numpy.pi, 2.*numpy.pi) - numpy.pi
+        cosdec = numpy.cos(dec[0])
+        factor = 0.5 * galsim.radians / galsim.arcsec
+        return factor * numpy.array([ -dra_x * cosdec, -dra_y * cosdec,
+                                      dec[1] - dec[2], dec[3] - dec[4] ])
+
     # This is similar to the version for EuclideanWCS, but uses dra, ddec.
     # Again, it is much faster if the _radec function works with numpy arrays.
     def _makeSkyImage(self, image, sky_level):
@@ -59,6 +59,7 @@
 
 #include <stdexcept>
 #include <deque>
+#include <map>
 #include <complex>
 #define BOOST_NO_CXX11_SMART_PTR
 #include <boost/shared_ptr.hpp>
@@ -363,6 +364,9 @@ namespace galsim {
 
         int wrapKValue(double k) const;  // wrap floor(k) to be within [-N/2,N/2-1]
 
+        // Fill t_array with the scaled values to give to FFTW for a k -> x transform.
+        void fillTransformArray(FFTW_Array<std::complex<double> >& t_array) const;
+
         // Objects used to accelerate interpolation with separable interpolants:
         mutable std::deque<std::complex<double> > _cache;
         mutable std::vector<double> _xwt;
@@ -371,6 +375,7 @@ namespace galsim {
         mutable const InterpolantXY* _cacheInterp;
 
         friend class XTable; 
+        friend class KTableTransformer;
     };
 
     /**
@@ -515,6 +520,79 @@ namespace galsim {
         mutable const InterpolantXY* _cacheInterp;
 
         friend class KTable;
+        friend class KTableTransformer;
+    };
+
+    /**
+     * @brief A reusable FFTW plan (and work arrays) for transforming KTables of one size
+     * to real space.
+     *
+     * KTable::transform makes a new plan and allocates new arrays for every transform, which
+     * is a significant part of the time for the small transforms used to draw postage stamps.
+     * When many KTables of the same size need to be transformed, this lets them all share a
+     * single plan and set of arrays.
+     */
+    class KTableTransformer
+    {
+    public:
+        /// Make the plan for transforming KTables of size N.  N must be even.
+        KTableTransformer(int N);
+
+        ~KTableTransformer();
+
+        /// Get the size of the tables that this can transform.
+        int getN() const { return _N; }
+
+        /**
+         * @brief Fourier transform kt from (complex) k to x.
+         *
+         * The result is written to an XTable owned by this object, so it is only valid until
+         * the next call to transform.
+         */
+        const XTable& transform(const KTable& kt);
+
+    private:
+        int _N;
+        FFTW_Array<std::complex<double> > _t_array;
+        XTable _xt;
+        fftw_plan _plan;
+
+        // Not copyable, since we own the plan.
+        KTableTransformer(const KTableTransformer& rhs);
+        void operator=(const KTableTransformer& rhs);
+    };
+
+    /**
+     * @brief A set of KTables and KTableTransformers that can be reused when drawing many 
+     * profiles with FFTs.
+     *
+     * Tables larger than max_N are not kept, so they don't hold on to a lot of memory after
+     * the draw is finished.
+     */
+    class FFTWorkspace
+    {
+    public:
+        FFTWorkspace(int max_N=1024) : _max_N(max_N) {}
+
+        /// Whether tables of size N are kept in this work space.
+        bool keeps(int N) const { return N <= _max_N; }
+
+        /// Get a KTable with size N and spacing dk.  The values are not cleared.
+        KTable& getKTable(int N, double dk);
+
+        /// Get a KTableTransformer for KTables of size N.
+        KTableTransformer& getTransformer(int N);
+
+        /// Release all the tables and plans.
+        void clear();
+
+        /// Get the number of different sizes of transforms that are currently kept.
+        int getNSizes() const { return int(_transformers.size()); }
+
+    private:
+        int _max_N;
+        std::map<int, boost::shared_ptr<KTable> > _ktables;
+        std::map<int, boost::shared_ptr<KTableTransformer> > _transformers;
     };
 
     /// Fill table from a function class:
@@ -101,6 +101,14 @@ namespace galsim {
          *                                    extrema.
          * @param small_fraction_of_flux      Intervals with less than this fraction of probability
          *                                    are ok to use dominant-sampling method.
+         *
+         * The Sersic-specific params are:
+         *
+         * @param sersic_n_step       If > 0, Sersic profiles round n to the nearest multiple of
+         *                            this value, so the per-n lookup tables are shared by all
+         *                            profiles with nearby n.  Integer values of n
+         *                            (including DeVaucouleurs) are never rounded.
+         *                            0 means no rounding.
          */
         GSParams(int _minimum_fft_size,
                  int _maximum_fft_size,
@@ -117,7 +125,8 @@ namespace galsim {
                  double _shoot_accuracy,
                  double _allowed_flux_variation,
                  int _range_division_for_extrema,
-                 double _small_fraction_of_flux);
+                 double _small_fraction_of_flux,
+                 double _sersic_n_step);
 
         /**
          * A reasonable set of default values
@@ -141,7 +150,9 @@ namespace galsim {
             shoot_accuracy(1.e-5),
             allowed_flux_variation(0.81),
             range_division_for_extrema(32),
-            small_fraction_of_flux(1.e-4)
+            small_fraction_of_flux(1.e-4),
+
+            sersic_n_step(0.)
             {}
 
         bool operator==(const GSParams& rhs) const;
@@ -169,6 +180,8 @@ namespace galsim {
         int range_division_for_extrema;
         double small_fraction_of_flux;
 
+        double sersic_n_step;
+
     };
 
     std::ostream& operator<<(std::ostream& os, const GSParams& gsp);
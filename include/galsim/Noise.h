@@ -205,6 +205,192 @@ namespace galsim {
         double _sigma;
     };
 
+    /**
+     * @brief A table of the cumulative Poisson distribution for a particular mean.
+     *
+     * Drawing a value from the table takes a single uniform deviate and (on average) O(1)
+     * time, using a guide table to find the right entry.
+     */
+    class PoissonTable
+    {
+    public:
+        PoissonTable() : _mean(-1.) {}
+
+        double getMean() const { return _mean; }
+
+        void setMean(double mean)
+        {
+            _mean = mean;
+            // Tabulate the probabilities relative to the mode, going out in each direction until
+            // they are negligible.  The normalization is done at the end.
+            const double tiny = 1.e-17;
+            const int mode = int(mean);
+            std::vector<double> below;
+            double p = 1.;
+            for (int k=mode; k>0 && p >= tiny; --k) {
+                p *= k / mean;
+                below.push_back(p);
+            }
+            _kmin = mode - int(below.size());
+            _cdf.resize(below.size());
+            double sum = 0.;
+            for (size_t i=0; i<below.size(); ++i) {
+                sum += below[below.size()-1-i];
+                _cdf[i] = sum;
+            }
+            p = 1.;
+            for (int k=mode+1; p >= tiny; ++k) {
+                sum += p;
+                _cdf.push_back(sum);
+                p *= mean / k;
+            }
+            for (size_t i=0; i<_cdf.size(); ++i) _cdf[i] /= sum;
+            _cdf.back() = 1.;
+
+            // The guide table gives the first entry that could be the answer for each
+            // interval of u.
+            const int n = _cdf.size();
+            _guide.resize(n);
+            int i = 0;
+            for (int j=0; j<n; ++j) {
+                while (_cdf[i] <= double(j)/n) ++i;
+                _guide[j] = i;
+            }
+        }
+
+        /// @brief Return the Poisson value corresponding to the uniform deviate u in [0,1).
+        int operator()(double u) const
+        {
+            int i = _guide[int(u * _guide.size())];
+            while (_cdf[i] <= u) ++i;
+            return _kmin + i;
+        }
+
+    private:
+        double _mean;
+        int _kmin;                  // The value corresponding to _cdf[0]
+        std::vector<double> _cdf;   // The cumulative probabilities
+        std::vector<int> _guide;    // The first possible index for u in [j/n, (j+1)/n)
+    };
+
+    /**
+     * @brief Helper class that adds the Poisson noise to the pixels for PoissonNoise and CCDNoise.
+     *
+     * The values in the image are taken to be the expected number of electrons divided by
+     * the gain.  Each one is replaced by a Poisson deviate with that mean (divided by the gain).
+     * Above max_poisson electrons, the Gaussian approximation is used instead.
+     *
+     * If fast is true, then runs of pixels with the same mean (e.g. blank sky) are drawn from
+     * a PoissonTable, which is several times faster than the PoissonDeviate, but which gives
+     * different values.
+     */
+    class PoissonPixelNoise
+    {
+    public:
+        PoissonPixelNoise(const BaseDeviate& rng, double gain, double max_poisson, bool fast) :
+            _pd(rng, 1.), _gd(rng, 0., 1.), _ud(rng),
+            _gain(gain), _max_poisson(max_poisson), _fast(fast), _mean(1.)
+        {}
+
+        /**
+         * @brief Add the noise to the pixels in row y of data.
+         */
+        template <typename T>
+        void applyToRow(ImageView<T>& data, int y)
+        {
+            typedef typename ImageView<T>::iterator ImIter;
+            ImIter ee = data.rowEnd(y);
+            for (ImIter it = data.rowBegin(y); it != ee; ++it) {
+                if (*it <= 0.) continue;
+                double electrons = *it * _gain;
+                if (electrons < _max_poisson) {
+                    // Setting up the Poisson distribution for a new mean is a significant
+                    // fraction of the time, so only do it when the mean changes.  For
+                    // sky-dominated images, most pixels have the same mean as the last one.
+                    if (electrons != _mean) {
+                        _pd.setMean(electrons);
+                        _mean = electrons;
+                        *it = T(_pd() / _gain);
+                    } else if (_fast) {
+                        if (_table.getMean() != electrons) _table.setMean(electrons);
+                        *it = T(_table(_ud()) / _gain);
+                    } else {
+                        *it = T(_pd() / _gain);
+                    }
+                } else {
+                    // (Setting sigma clears the Gaussian deviate's cache, so we don't skip
+                    // this one, to keep the values the same as they have always been.)
+                    _gd.setSigma(sqrt(electrons)/_gain);
+                    *it = T(*it + _gd());
+                }
+            }
+        }
+
+    private:
+        PoissonDeviate _pd;
+        GaussianDeviate _gd;
+        UniformDeviate _ud;
+        PoissonTable _table;
+        double _gain;
+        double _max_poisson;
+        bool _fast;
+        double _mean;           // The current mean of _pd
+    };
+
+    /**
+     * @brief Helper function to add Poisson noise (and optionally Gaussian read noise) to data.
+     *
+     * If fast is false, the random values are all drawn from rng in order, and they are the
+     * same as they have always been for a given seed.
+     *
+     * If fast is true, PoissonPixelNoise uses its faster table lookups, and each row gets its
+     * own independent random number stream, made with BaseDeviate::split from a key drawn from
+     * rng.  Then the rows may be done in any order, so they are done in parallel if GalSim was
+     * compiled with OpenMP.  The results are the same for any number of threads.
+     */
+    template <typename T>
+    static void AddPoissonNoise(BaseDeviate& rng, ImageView<T>& data, double gain,
+                                double read_sigma, double max_poisson, bool fast)
+    {
+        typedef typename ImageView<T>::iterator ImIter;
+        const int ymin = data.getYMin();
+        const int ymax = data.getYMax();
+
+        if (!fast) {
+            // Add the Poisson noise first:
+            if (gain > 0.) {
+                PoissonPixelNoise ppn(rng, gain, max_poisson, false);
+                for (int y = ymin; y <= ymax; y++) ppn.applyToRow(data, y);
+            }
+            // Next add the Gaussian noise:
+            if (read_sigma > 0.) {
+                GaussianDeviate gd(rng, 0., read_sigma);
+                for (int y = ymin; y <= ymax; y++) {
+                    ImIter ee = data.rowEnd(y);
+                    for (ImIter it = data.rowBegin(y); it != ee; ++it) *it = T(*it + gd());
+                }
+            }
+        } else {
+            UniformDeviate ud(rng);
+            BaseDeviate base = rng.split(long(ud() * 4294967296.));
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+            for (int y = ymin; y <= ymax; y++) {
+                BaseDeviate row_rng = base.split(y - ymin);
+                if (gain > 0.) {
+                    PoissonPixelNoise ppn(row_rng, gain, max_poisson, true);
+                    ppn.applyToRow(data, y);
+                }
+                if (read_sigma > 0.) {
+                    GaussianDeviate gd(row_rng, 0., read_sigma);
+                    ImIter ee = data.rowEnd(y);
+                    for (ImIter it = data.rowBegin(y); it != ee; ++it) *it = T(*it + gd());
+                }
+            }
+        }
+    }
+
     /** 
      * @brief Class implementing simple Poisson noise.
      *
@@ -224,9 +410,14 @@ namespace galsim {
          * @param[in] sky_level  The sky level in counts per pixel that was originally in
          *                       the input image, but which is taken to have already been 
          *                       subtracted off.
-         */
-        PoissonNoise(boost::shared_ptr<BaseDeviate> rng, double sky_level) :
-            BaseNoise(rng), _sky_level(sky_level)
+         * @param[in] max_poisson  Above this many counts, use the Gaussian approximation.
+         * @param[in] fast       Whether to use the faster algorithm, which gives different
+         *                       values (see AddPoissonNoise).
+         */
+        PoissonNoise(boost::shared_ptr<BaseDeviate> rng, double sky_level,
+                     double max_poisson=1.e5, bool fast=false) :
+            BaseNoise(rng), _sky_level(sky_level), _max_poisson(max_poisson),
+            _fast(fast)
         {}
 
         /**
@@ -235,7 +426,8 @@ namespace galsim {
          * Note: the default constructed op= function will do the same thing.
          */
         PoissonNoise(const PoissonNoise& rhs) : 
-            BaseNoise(rhs), _sky_level(rhs._sky_level)
+            BaseNoise(rhs), _sky_level(rhs._sky_level), _max_poisson(rhs._max_poisson),
+            _fast(rhs._fast)
         {}
  
 
@@ -244,6 +436,16 @@ namespace galsim {
          */
         double getSkyLevel() const { return _sky_level; }
 
+        /**
+         * @brief Report the number of counts above which the Gaussian approximation is used
+         */
+        double getMaxPoisson() const { return _max_poisson; }
+
+        /**
+         * @brief Report whether the faster algorithm is used
+         */
+        bool getFast() const { return _fast; }
+
         /**
          * @brief Set sky level
          */
@@ -280,31 +482,8 @@ namespace galsim {
         template <typename T>
         void applyToView(ImageView<T> data) 
         {
-            // Above this many e's, assume Poisson distribution == Gaussian 
-            // The Gaussian deviate is about 20% faster than Poisson, and for high N
-            // they are virtually identical.
-            const double MAX_POISSON=1.e5;
-            // Typedef for image row iterable
-            typedef typename ImageView<T>::iterator ImIter;
-
             data += T(_sky_level);
-
-            PoissonDeviate pd(*_rng, 1.); // will reset the mean for each pixel below.
-            GaussianDeviate gd(*_rng, 0., 1.);
-            for (int y = data.getYMin(); y <= data.getYMax(); y++) {  // iterate over y
-                ImIter ee = data.rowEnd(y);
-                for (ImIter it = data.rowBegin(y); it != ee; ++it) {
-                    if (*it <= 0.) continue;
-                    if (*it < MAX_POISSON) {
-                        pd.setMean(*it);
-                        *it = T(pd());
-                    } else {
-                        gd.setSigma(sqrt(*it));
-                        *it = T(*it + gd());
-                    }
-                }
-            }
-
+            AddPoissonNoise(*_rng, data, 1., 0., _max_poisson, _fast);
             data -= T(_sky_level);
         }
 
@@ -318,6 +497,8 @@ namespace galsim {
 
     private: 
         double _sky_level;
+        double _max_poisson;
+        bool _fast;
     };
 
     /** 
@@ -349,11 +530,16 @@ namespace galsim {
          *                       subtracted off.
          * @param[in] gain       Electrons per ADU in the input Images, used for Poisson noise.
          * @param[in] read_noise RMS of Gaussian noise, in electrons (if gain>0.) or ADU (gain<=0.)
+         * @param[in] max_poisson  Above this many electrons, use the Gaussian approximation.
+         * @param[in] fast       Whether to use the faster algorithm, which gives different
+         *                       values (see AddPoissonNoise).
          */
         CCDNoise(boost::shared_ptr<BaseDeviate> rng,
-                 double sky_level, double gain, double read_noise) :
+                 double sky_level, double gain, double read_noise,
+                 double max_poisson=1.e5, bool fast=false) :
             BaseNoise(rng),
-            _sky_level(sky_level), _gain(gain), _read_noise(read_noise)
+            _sky_level(sky_level), _gain(gain), _read_noise(read_noise),
+            _max_poisson(max_poisson), _fast(fast)
         {}
 
         /**
@@ -363,7 +549,8 @@ namespace galsim {
          */
         CCDNoise(const CCDNoise& rhs) : 
             BaseNoise(rhs),
-            _sky_level(rhs._sky_level), _gain(rhs._gain), _read_noise(rhs._read_noise)
+            _sky_level(rhs._sky_level), _gain(rhs._gain), _read_noise(rhs._read_noise),
+            _max_poisson(rhs._max_poisson), _fast(rhs._fast)
         {}
  
 
@@ -382,6 +569,16 @@ namespace galsim {
          */
         double getReadNoise() const { return _read_noise; }
 
+        /**
+         * @brief Report the number of electrons above which the Gaussian approximation is used
+         */
+        double getMaxPoisson() const { return _max_poisson; }
+
+        /**
+         * @brief Report whether the faster algorithm is used
+         */
+        bool getFast() const { return _fast; }
+
         /**
          * @brief Set sky level
          */
@@ -445,46 +642,9 @@ namespace galsim {
         template <typename T>
         void applyToView(ImageView<T> data) 
         {
-            // Above this many e's, assume Poisson distribution == Gaussian 
-            // The Gaussian deviate is about 20% faster than Poisson, and for high N
-            // they are virtually identical.
-            const double MAX_POISSON=1.e5;
-            // Typedef for image row iterable
-            typedef typename ImageView<T>::iterator ImIter;
-
             data += T(_sky_level);
-
-            // Add the Poisson noise first:
-            if (_gain > 0.) {
-                PoissonDeviate pd(*_rng, 1.); // will reset the mean for each pixel below.
-                GaussianDeviate gd(*_rng, 0., 1.);
-                for (int y = data.getYMin(); y <= data.getYMax(); y++) {  // iterate over y
-                    ImIter ee = data.rowEnd(y);
-                    for (ImIter it = data.rowBegin(y); it != ee; ++it) {
-                        if (*it <= 0.) continue;
-                        double electrons = *it * _gain;
-                        if (electrons < MAX_POISSON) {
-                            pd.setMean(electrons);
-                            *it = T(pd() / _gain);
-                        } else {
-                            gd.setSigma(sqrt(electrons)/_gain);
-                            *it = T(*it + gd());
-                        }
-                    }
-                }
-            }
-
-            // Next add the Gaussian noise:
-            if (_read_noise > 0.) {
-                GaussianDeviate gd(*_rng, 0., _read_noise / (_gain > 0. ? _gain : 1.));
-                for (int y = data.getYMin(); y <= data.getYMax(); y++) {  // iterate over y
-                    ImIter ee = data.rowEnd(y);
-                    for (ImIter it = data.rowBegin(y); it != ee; ++it) {
-                        *it = T(*it + gd());
-                    }
-                }
-            }
-
+            double read_sigma = _read_noise / (_gain > 0. ? _gain : 1.);
+            AddPoissonNoise(*_rng, data, _gain, read_sigma, _max_poisson, _fast);
             data -= T(_sky_level);
         }
 
@@ -534,6 +694,8 @@ namespace galsim {
         double _sky_level;
         double _gain;
         double _read_noise;
+        double _max_poisson;
+        bool _fast;
     };
 
 
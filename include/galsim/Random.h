@@ -73,6 +73,7 @@
 #include "boost/random/chi_squared_distribution.hpp"
 #endif
 #include <sstream>
+#include <vector>
 
 #include "Image.h"
 
@@ -91,6 +92,191 @@ namespace galsim {
         }
     }
 
+    /**
+     * @brief A counter-based random number engine, using the Philox4x32-10 algorithm.
+     *
+     * See Salmon et al, 2011, "Parallel Random Numbers: As Easy as 1, 2, 3".  Each block of four
+     * 32-bit output values is a keyed hash of its position in the stream, so the n-th value only
+     * depends on the 64-bit key and n.  This means that skipping ahead any number of values
+     * takes O(1) time, and engines with different keys produce independent streams.
+     */
+    class PhiloxEngine
+    {
+    public:
+        typedef boost::uint32_t result_type;
+        typedef boost::uint64_t key_type;
+
+        /// @brief Construct an engine at the start of the stream for the given key.
+        explicit PhiloxEngine(key_type key=0) { seed(key); }
+
+        /// @brief Restart at the beginning of the stream for the given key.
+        void seed(key_type key) { _key = key; _n = 0; }
+
+        static result_type min BOOST_PREVENT_MACRO_SUBSTITUTION () { return 0; }
+        static result_type max BOOST_PREVENT_MACRO_SUBSTITUTION () { return 0xffffffff; }
+
+        /// @brief Produce the next value of the stream.
+        result_type operator()()
+        {
+            if ((_n & 3) == 0) Block(_key, _n >> 2, 0, _buf);
+            return _buf[_n++ & 3];
+        }
+
+        /// @brief Skip ahead z values in the stream.
+        void discard(boost::uintmax_t z)
+        {
+            _n += z;
+            if (_n & 3) Block(_key, _n >> 2, 0, _buf);
+        }
+
+        /// @brief Get the key for this stream.
+        key_type getKey() const { return _key; }
+
+        /**
+         * @brief Compute the four values in the block of a stream with the given 128-bit counter.
+         *
+         * The counter is given as two 64-bit words, ctr_lo and ctr_hi.  The normal stream uses
+         * ctr_hi = 0, so other values of ctr_hi are available for deriving new keys.
+         */
+        static void Block(key_type key, key_type ctr_lo, key_type ctr_hi, result_type* out)
+        {
+            const result_type M0 = 0xD2511F53;
+            const result_type M1 = 0xCD9E8D57;
+            const result_type W0 = 0x9E3779B9;
+            const result_type W1 = 0xBB67AE85;
+            result_type c0 = result_type(ctr_lo), c1 = result_type(ctr_lo >> 32);
+            result_type c2 = result_type(ctr_hi), c3 = result_type(ctr_hi >> 32);
+            result_type k0 = result_type(key), k1 = result_type(key >> 32);
+            for (int r=0; r<10; ++r) {
+                if (r > 0) { k0 += W0; k1 += W1; }
+                key_type p0 = key_type(M0) * c0;
+                key_type p1 = key_type(M1) * c2;
+                result_type hi0 = result_type(p0 >> 32), lo0 = result_type(p0);
+                result_type hi1 = result_type(p1 >> 32), lo1 = result_type(p1);
+                c0 = hi1 ^ c1 ^ k0;
+                c1 = lo1;
+                c2 = hi0 ^ c3 ^ k1;
+                c3 = lo0;
+            }
+            out[0] = c0; out[1] = c1; out[2] = c2; out[3] = c3;
+        }
+
+        /**
+         * @brief Derive the key of an independent stream from a parent key and a sub-key.
+         */
+        static key_type SplitKey(key_type key, key_type subkey)
+        {
+            // Use a counter that the normal streams never reach.
+            result_type out[4];
+            Block(key, subkey, 0x53504c4954ULL, out);  // "SPLIT"
+            return key_type(out[0]) | (key_type(out[1]) << 32);
+        }
+
+        template<class CharT, class Traits>
+        friend std::basic_ostream<CharT,Traits>&
+        operator<<(std::basic_ostream<CharT,Traits>& os, const PhiloxEngine& eng)
+        {
+            os << eng._key << ' ' << eng._n;
+            return os;
+        }
+
+        template<class CharT, class Traits>
+        friend std::basic_istream<CharT,Traits>&
+        operator>>(std::basic_istream<CharT,Traits>& is, PhiloxEngine& eng)
+        {
+            key_type key, n;
+            is >> key >> std::ws >> n;
+            eng.seed(key);
+            eng.discard(n);
+            return is;
+        }
+
+    private:
+        key_type _key;          // The key for this stream
+        key_type _n;            // The number of values produced so far
+        result_type _buf[4];    // The current block of values
+    };
+
+    /**
+     * @brief The random number engine used by the Deviates.
+     *
+     * This is normally a Mersenne Twister (boost::mt19937), but it can also be a counter-based
+     * PhiloxEngine.  The latter is what BaseDeviate::split() makes.  Either way, the engine
+     * keeps a 64-bit key (the seed for a Mersenne Twister), from which split() derives the keys
+     * of the new streams.
+     */
+    class RandomEngine
+    {
+    public:
+        typedef boost::uint32_t result_type;
+        typedef PhiloxEngine::key_type key_type;
+
+        RandomEngine() : _counter(false), _key(0) {}
+
+        static result_type min BOOST_PREVENT_MACRO_SUBSTITUTION () { return 0; }
+        static result_type max BOOST_PREVENT_MACRO_SUBSTITUTION () { return 0xffffffff; }
+
+        result_type operator()() { return _counter ? _philox() : _mt(); }
+
+        /**
+         * @brief Reseed the engine, keeping the same kind of engine.
+         *
+         * @param[in] mt_seed   The value to seed a Mersenne Twister with.
+         * @param[in] key       The key for the stream.  This is the key for a PhiloxEngine, and
+         *                      is used to derive the keys for split() either way.
+         */
+        void seed(result_type mt_seed, key_type key)
+        {
+            _key = key;
+            if (_counter) _philox.seed(key);
+            else _mt.seed(mt_seed);
+        }
+
+        /// @brief Switch to a counter-based engine at the start of the stream for key.
+        void seedCounter(key_type key) { _counter = true; _key = key; _philox.seed(key); }
+
+        /// @brief Skip ahead z values.  This is O(1) for a counter-based engine.
+        void discard(boost::uintmax_t z)
+        { if (_counter) _philox.discard(z); else _mt.discard(z); }
+
+        bool isCounterBased() const { return _counter; }
+        key_type getKey() const { return _key; }
+
+        template<class CharT, class Traits>
+        friend std::basic_ostream<CharT,Traits>&
+        operator<<(std::basic_ostream<CharT,Traits>& os, const RandomEngine& eng)
+        {
+            if (eng._counter) os << "philox " << eng._philox;
+            else os << eng._mt << ' ' << eng._key;
+            return os;
+        }
+
+        template<class CharT, class Traits>
+        friend std::basic_istream<CharT,Traits>&
+        operator>>(std::basic_istream<CharT,Traits>& is, RandomEngine& eng)
+        {
+            is >> std::ws;
+            if (is.peek() == 'p') {
+                std::string tag;
+                is >> tag >> eng._philox;
+                eng._counter = true;
+                eng._key = eng._philox.getKey();
+            } else {
+                is >> eng._mt;
+                eng._counter = false;
+                // Serializations from before the key was added don't have it.
+                if (!(is >> eng._key)) eng._key = 0;
+            }
+            return is;
+        }
+
+    private:
+        bool _counter;
+        key_type _key;
+        boost::mt19937 _mt;
+        PhiloxEngine _philox;
+    };
+
     /**
      * @brief Base class for all the various Deviates.
      *
@@ -121,9 +307,8 @@ namespace galsim {
      */
     class BaseDeviate
     {
-        // Note that this class could be templated with the type of Boost.Random generator that
-        // you want to use instead of mt19937
-        typedef boost::mt19937 rng_type;
+        // This is normally a Mersenne Twister, but split() makes counter-based streams.
+        typedef RandomEngine rng_type;
 
     public:
         /**
@@ -242,8 +427,55 @@ namespace galsim {
          */
         double operator()() { return _val(); }
 
+        /**
+         * @brief Draw N new random numbers from the distribution and save them in an array
+         *
+         * This is equivalent to calling operator() N times, so both the values and the
+         * subsequent state of the RNG are the same as for the repeated single calls.
+         *
+         * @param[in] N     The number of values to draw
+         * @param[out] data The array into which to write the values
+         */
+        void generate(int N, double* data);
+
+        /**
+         * @brief Make a new BaseDeviate with an independent counter-based random number stream.
+         *
+         * The new stream is a function only of the key of this BaseDeviate's stream (e.g. its
+         * seed) and the given key, not of how many values have been drawn so far.  So each
+         * combination of keys (e.g. from file, image and object numbers) gets its own stream,
+         * regardless of the order in which they are made.  Calling split on the result gives
+         * further independent streams.
+         *
+         * @param[in] key   The key to use for the new stream.
+         */
+        BaseDeviate split(long key)
+        {
+            boost::shared_ptr<rng_type> rng(new rng_type());
+            rng->seedCounter(PhiloxEngine::SplitKey(_rng->getKey(), key));
+            return BaseDeviate(rng);
+        }
+
+        /**
+         * @brief Skip ahead in the random number stream.
+         *
+         * This skips n values of the underlying 32-bit generator.  For a UniformDeviate, this is
+         * the same as drawing n values, but other Deviates may use more than one of these per
+         * value.  This takes O(1) time for a counter-based stream (see split()), but O(n) time
+         * for the default Mersenne Twister.
+         *
+         * @param[in] n     The number of values to skip.
+         */
+        void discard(long n) { clearCache(); _rng->discard(n); }
+
+        /// @brief Return whether this uses a counter-based stream, as made by split().
+        bool isCounterBased() const { return _rng->isCounterBased(); }
+
    protected:
 
+        /// @brief Construct a new BaseDeviate using the given random number engine.
+        BaseDeviate(boost::shared_ptr<rng_type> rng) : _rng(rng) {}
+
         boost::shared_ptr<rng_type> _rng;
 
         // This is the virtual function that is actually overridden.  This is because 
@@ -341,7 +573,7 @@ namespace galsim {
          * @param[in] sigma Standard deviation of the distribution
          */
         GaussianDeviate(long lseed, double mean, double sigma) : 
-            BaseDeviate(lseed), _normal(mean,sigma) {}
+            BaseDeviate(lseed), _normal(0.,1.), _mean(mean), _sigma(sigma) {}
 
         /**
          * @brief Construct a new Gaussian-distributed RNG, sharing the random number 
@@ -352,18 +584,19 @@ namespace galsim {
          * @param[in] sigma Standard deviation of the distribution
          */
         GaussianDeviate(const BaseDeviate& rhs, double mean, double sigma) :
-            BaseDeviate(rhs), _normal(mean,sigma) {}
+            BaseDeviate(rhs), _normal(0.,1.), _mean(mean), _sigma(sigma) {}
 
         /**
          * @brief Construct a copy that shares the RNG with rhs.
          *
          * Note: the default constructed op= function will do the same thing.
          */
-        GaussianDeviate(const GaussianDeviate& rhs) : BaseDeviate(rhs), _normal(rhs._normal) {}
+        GaussianDeviate(const GaussianDeviate& rhs) :
+            BaseDeviate(rhs), _normal(rhs._normal), _mean(rhs._mean), _sigma(rhs._sigma) {}
  
         /// @brief Construct a new GaussianDeviate from a serialization string
         GaussianDeviate(const std::string& str, double mean, double sigma) : 
-            BaseDeviate(str), _normal(mean,sigma) {}
+            BaseDeviate(str), _normal(0.,1.), _mean(mean), _sigma(sigma) {}
 
         /**
          * @brief Construct a duplicate of this GaussianDeviate object.
@@ -378,29 +611,28 @@ namespace galsim {
          *
          * @return A Gaussian deviate with current mean and sigma
          */
-        double operator()() { return _normal(*this->_rng); }
+        double operator()() { return _normal(*this->_rng) * _sigma + _mean; }
 
         /**
          * @brief Get current distribution mean
          *
          * @return Mean of distribution
          */
-        double getMean() { return _normal.mean(); }
+        double getMean() { return _mean; }
 
         /**
          * @brief Get current distribution standard deviation
          *
          * @return Standard deviation of distribution
          */
-        double getSigma() { return _normal.sigma(); }
+        double getSigma() { return _sigma; }
 
         /**
          * @brief Set current distribution mean
          *
          * @param[in] mean New mean for distribution
          */
-        void setMean(double mean) 
-        { _normal.param(boost::random::normal_distribution<>::param_type(mean,_normal.sigma())); }
+        void setMean(double mean) { _mean = mean; _normal.reset(); }
 
         /**
          * @brief Set current distribution standard deviation
@@ -408,8 +640,7 @@ namespace galsim {
          * @param[in] sigma New standard deviation for distribution.  Behavior for non-positive
          * value is undefined. 
          */
-        void setSigma(double sigma) 
-        { _normal.param(boost::random::normal_distribution<>::param_type(_normal.mean(),sigma)); }
+        void setSigma(double sigma) { _sigma = sigma; _normal.reset(); }
 
         /**
          * @brief Clear the internal cache
@@ -419,12 +650,32 @@ namespace galsim {
          */
         void clearCache() { _normal.reset(); }
 
+        /**
+         * @brief Fill an array with Gaussian deviates whose variances are the input values.
+         *
+         * Each element is replaced by a value drawn from a Gaussian with mean 0 and variance
+         * equal to the value that was there.  The current mean and sigma of the deviate are
+         * not used.  The underlying unit Gaussian values are the same ones that operator()
+         * would use (including any value that is cached from a previous call), so mixing
+         * the two kinds of calls consumes the random number stream in the same way as
+         * calling operator() for each value.
+         *
+         * @param[in] N         The number of values in the array
+         * @param[in,out] data  The variances on input; the random values on output
+         */
+        void generateFromVariance(int N, double* data);
+
     protected:
         double _val() { return operator()(); }
         std::string make_repr(bool incl_seed);
 
     private:
+        // _normal is a unit normal, which we scale by _sigma and shift by _mean.  This
+        // lets generateFromVariance use the same distribution object, and thus its cached
+        // second value, as operator().
         boost::random::normal_distribution<> _normal;
+        double _mean;
+        double _sigma;
     };
 
 
@@ -924,6 +1175,74 @@ namespace galsim {
         boost::random::chi_squared_distribution<> _chi_squared;
     };
 
+    /**
+     * @brief A table of the inverse of a cumulative distribution function, used by the
+     * python DistDeviate class to draw values from an arbitrary distribution.
+     *
+     * The distribution is given by tabulated values of x and the CDF at x, which must be
+     * increasing and go from 0 to 1.  Between the tabulated points, the inverse CDF is
+     * linearly interpolated, so the probability is constant within each interval.
+     *
+     * There are two ways to turn a uniform deviate u into a value:
+     *
+     * 1) The default is to invert the CDF, i.e. x such that CDF(x) = u.  This uses a guide
+     *    table to find the right interval, so it takes O(1) time on average, and gives the 
+     *    same values as a linear LookupTable of x as a function of CDF.
+     *
+     * 2) With use_alias = true, the interval is chosen with Walker's alias method, which takes
+     *    O(1) time even in the worst case.  The values have the same distribution, but each
+     *    value does not come from the same u as with the inverse CDF.
+     *
+     * Either way, each value uses exactly one uniform deviate.
+     */
+    class DistDeviateTable
+    {
+    public:
+        /**
+         * @brief Construct the table from tabulated x and CDF(x) values.
+         *
+         * @param[in] x         The x values.
+         * @param[in] cdf       The cumulative probability at each x.
+         * @param[in] use_alias Whether to use the alias method to choose the interval.
+         */
+        DistDeviateTable(const std::vector<double>& x, const std::vector<double>& cdf,
+                         bool use_alias);
+
+        /**
+         * @brief Return the value x such that CDF(x) = p.
+         */
+        double val(double p) const;
+
+        /**
+         * @brief Draw a value from the distribution, using one value from ud.
+         */
+        double operator()(UniformDeviate& ud) const { return draw(ud()); }
+
+        /**
+         * @brief Draw N values from the distribution and save them in an array.
+         *
+         * This is equivalent to calling operator()(ud) N times.
+         */
+        void generate(UniformDeviate& ud, int N, double* data) const;
+
+        bool usesAlias() const { return _use_alias; }
+
+    private:
+        double draw(double u) const { return _use_alias ? aliasVal(u) : val(u); }
+        double aliasVal(double u) const;
+
+        std::vector<double> _x;
+        std::vector<double> _cdf;
+        bool _use_alias;
+
+        // _guide[k] is the first index i with _cdf[i] >= k/_guide.size()
+        std::vector<int> _guide;
+
+        // The alias table has one entry for each interval.
+        std::vector<double> _prob;
+        std::vector<int> _alias;
+    };
+
 }  // namespace galsim
 
 #endif
@@ -121,8 +121,39 @@ namespace galsim {
          */
         void calculateMaxK(double max_maxk=0.) const;
 
+        /**
+         * @brief A faster, approximate version of calculateMaxK.
+         *
+         * Rather than scanning the full (padded) k-space table, this uses the Fourier transform
+         * of the unpadded image, which samples the same function more coarsely, and then
+         * multiplies the result by a safety factor.  The result is generally somewhat larger
+         * than what calculateMaxK would find, but it avoids the FFT of the padded image.
+         *
+         * @param[in] max_maxk  Optional maximum value of maxk if you have some a priori
+         *                      knowledge about an appropriate maximum.
+         */
+        void estimateMaxK(double max_maxk=0.) const;
+
         ConstImageView<double> getImage() const;
 
+        /// @brief Return whether the k-space table has been calculated yet.
+        bool hasKData() const;
+
+        /**
+         * @brief Get the k-space table, calculating it first if necessary.
+         *
+         * The returned view is only valid as long as this object exists.  The values are the
+         * 2*N*(N/2+1) doubles of the KTable, in the same layout as SBInterpolatedKImage::getKData.
+         */
+        ConstImageView<double> getKData() const;
+
+        /**
+         * @brief Set the k-space table from the values returned by getKData() for an
+         * SBInterpolatedImage made from the same image with the same pad_factor, so it does not
+         * need to be calculated again.
+         */
+        void setKData(const BaseImage<double>& data) const;
+
     protected:
 
         class SBInterpolatedImageImpl;
@@ -112,9 +112,14 @@ namespace galsim {
 
         void calculateMaxK(double max_stepk) const;
         void calculateStepK(double max_maxk) const;
+        void estimateMaxK(double max_maxk) const;
 
         double calculateFlux() const;
 
+        bool hasKData() const { return _ktab.get() != 0; }
+        ConstImageView<double> getKData() const;
+        void setKData(const BaseImage<double>& data) const;
+
     private:
 
         int _Ninitial;
@@ -61,6 +61,7 @@ namespace galsim {
     //! @endcond
 
     class SBTransform;
+    class FFTWorkspace;
 
     /** 
      * @brief A base class representing all of the 2D surface brightness profiles that we know how
@@ -419,6 +420,25 @@ namespace galsim {
         template <typename T>
         double draw(ImageView<T> image, double gain, double wmult) const; 
 
+        /** 
+         * @brief Draw the SBProfile in real space returning the summed flux, reusing the
+         * KTables and FFT plans in the provided work space if an FFT is needed.
+         *
+         * This is otherwise the same as the above draw() method.  When drawing many profiles
+         * in a row, using the same workspace for all of them saves making a new FFT plan and
+         * allocating new tables for each one.
+         *
+         * @param[in,out]    image (any of ImageViewF, ImageViewD, ImageViewS, ImageViewI)
+         * @param[in] gain   Number of photons per ADU.
+         * @param[in] wmult  If desired, a scaling to make intermediate images larger than normal.
+         * @param[in,out] workspace  The FFTWorkspace to use.
+         *
+         * @returns summed flux.
+         */
+        template <typename T>
+        double draw(ImageView<T> image, double gain, double wmult,
+                    FFTWorkspace& workspace) const; 
+
         /** 
          * @brief Draw an image of the SBProfile in real space forcing the use of real methods 
          * where we have a formula for x values.
@@ -456,6 +476,11 @@ namespace galsim {
         template <typename T>
         double fourierDraw(ImageView<T> image, double gain, double wmult) const; 
 
+        /// @brief The same as the above fourierDraw(), but using the given FFTWorkspace.
+        template <typename T>
+        double fourierDraw(ImageView<T> image, double gain, double wmult,
+                           FFTWorkspace& workspace) const; 
+
         /** 
          * @brief Draw an image of the SBProfile in k space.
          *
@@ -38,6 +38,12 @@ namespace galsim {
         // How many Sersic profiles to save in the cache
         const int max_sersic_cache = 100;
 
+        // How many untruncated Sersic profiles with n rounded to GSParams::sersic_n_step to save.
+        // These are kept separately from the above cache, so that a full grid of n values
+        // (e.g. 591 values for sersic_n_step = 0.01) can be kept without being pushed out by
+        // other profiles.
+        const int max_sersic_bank = 1000;
+
     }
 
     /**
@@ -226,6 +226,15 @@ namespace galsim {
         void operator=(const SBSersicImpl& rhs);
 
         static LRUCache<boost::tuple< double, double, GSParamsPtr >, SersicInfo> cache;
+        static LRUCache<boost::tuple< double, double, GSParamsPtr >, SersicInfo> bank;
+
+        /// Round n to the nearest multiple of gsparams->sersic_n_step, if that is > 0.
+        /// Integer values of n are not rounded.
+        static double RoundN(double n, const GSParamsPtr& gsparams);
+
+        /// Get the SersicInfo for the given n and trunc/r0 from the cache or the bank.
+        static boost::shared_ptr<SersicInfo> GetInfo(double n, double trunc,
+                                                     const GSParamsPtr& gsparams);
 
     };
 }
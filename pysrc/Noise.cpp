@@ -143,12 +143,17 @@ namespace galsim {
             // Note that class docstrings are now added in galsim/random.py
 
             bp::class_<PoissonNoise, bp::bases<BaseNoise> > pyPoissonNoise(
-                "PoissonNoise", bp::init<boost::shared_ptr<BaseDeviate>, double>(
-                    (bp::arg("rng")=bp::object(), bp::arg("sky_level")=0.))
+                "PoissonNoise", bp::init<boost::shared_ptr<BaseDeviate>, double, double, bool>(
+                    (bp::arg("rng")=bp::object(), bp::arg("sky_level")=0.,
+                     bp::arg("max_poisson")=1.e5, bp::arg("fast")=false))
             );
             pyPoissonNoise
                 .def("getSkyLevel", &PoissonNoise::getSkyLevel)
+                .def("getMaxPoisson", &PoissonNoise::getMaxPoisson)
+                .def("getFast", &PoissonNoise::getFast)
                 .add_property("sky_level", &PoissonNoise::getSkyLevel)
+                .add_property("max_poisson", &PoissonNoise::getMaxPoisson)
+                .add_property("fast", &PoissonNoise::getFast)
                 .def("_setSkyLevel", &PoissonNoise::setSkyLevel)
                 .enable_pickling()
                 ;
@@ -163,16 +168,22 @@ namespace galsim {
 
             bp::class_<CCDNoise, bp::bases<BaseNoise> > pyCCDNoise("CCDNoise", bp::no_init);
             pyCCDNoise
-                .def(bp::init<boost::shared_ptr<BaseDeviate>, double, double, double>(
+                .def(bp::init<boost::shared_ptr<BaseDeviate>, double, double, double,
+                              double, bool>(
                         (bp::arg("rng")=bp::object(),
-                         bp::arg("sky_level")=0.,  bp::arg("gain")=1., bp::arg("read_noise")=0.)
+                         bp::arg("sky_level")=0.,  bp::arg("gain")=1., bp::arg("read_noise")=0.,
+                         bp::arg("max_poisson")=1.e5, bp::arg("fast")=false)
                 ))
                 .def("getSkyLevel", &CCDNoise::getSkyLevel)
                 .def("getGain", &CCDNoise::getGain)
                 .def("getReadNoise", &CCDNoise::getReadNoise)
+                .def("getMaxPoisson", &CCDNoise::getMaxPoisson)
+                .def("getFast", &CCDNoise::getFast)
                 .add_property("sky_level", &CCDNoise::getSkyLevel)
                 .add_property("gain", &CCDNoise::getGain)
                 .add_property("read_noise", &CCDNoise::getReadNoise)
+                .add_property("max_poisson", &CCDNoise::getMaxPoisson)
+                .add_property("fast", &CCDNoise::getFast)
                 .def("_setSkyLevel", &CCDNoise::setSkyLevel)
                 .def("_setGain", &CCDNoise::setGain)
                 .def("_setReadNoise", &CCDNoise::setReadNoise)
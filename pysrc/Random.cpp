@@ -24,6 +24,8 @@
 
 #define BOOST_NO_CXX11_SMART_PTR
 #include "boost/python.hpp"
+#include "boost/python/stl_iterator.hpp"
+#include "NumpyHelper.h"
 #include "Random.h"
 
 namespace bp = boost::python;
@@ -57,8 +59,30 @@ namespace galsim {
         }
     };
 
+    // Get the data pointer and size of a contiguous 1-d numpy array of doubles.
+    static double* GetGenerateArray(const bp::object& array, int& N)
+    {
+        double* data;
+        boost::shared_ptr<double> owner;
+        int stride;
+        CheckNumpyArray(array, 1, false, data, owner, stride);
+        if (stride != 1) {
+            PyErr_SetString(PyExc_ValueError, "numpy.ndarray argument must be contiguous");
+            bp::throw_error_already_set();
+        }
+        N = GetNumpyArrayDim(array.ptr(), 0);
+        return data;
+    }
+
     struct PyBaseDeviate {
 
+        static void Generate(BaseDeviate& self, const bp::object& array)
+        {
+            int N;
+            double* data = GetGenerateArray(array, N);
+            self.generate(N, data);
+        }
+
         static void wrap() {
             bp::class_<BaseDeviateCallBack>
                 pyBaseDeviate("BaseDeviate", "", bp::no_init);
@@ -73,8 +97,12 @@ namespace galsim {
                 .def("reset", (void (BaseDeviate::*) (const BaseDeviate&) )&BaseDeviate::reset, 
                      (bp::arg("seed")))
                 .def("clearCache", &BaseDeviate::clearCache)
+                .def("_generate", &Generate)
                 .def("serialize", &BaseDeviate::serialize)
                 .def("duplicate", &BaseDeviate::duplicate)
+                .def("_split", &BaseDeviate::split, bp::arg("key"))
+                .def("discard", &BaseDeviate::discard, bp::arg("n"))
+                .def("isCounterBased", &BaseDeviate::isCounterBased)
                 .def("__repr__", &BaseDeviate::repr)
                 .def("__str__", &BaseDeviate::str)
                 .enable_pickling()
@@ -126,6 +154,13 @@ namespace galsim {
 
     struct PyGaussianDeviate {
 
+        static void GenerateFromVariance(GaussianDeviate& self, const bp::object& array)
+        {
+            int N;
+            double* data = GetGenerateArray(array, N);
+            self.generateFromVariance(N, data);
+        }
+
         static void wrap() {
             bp::class_<GaussianDeviate, bp::bases<BaseDeviate> >
                 pyGaussianDeviate("GaussianDeviate", "", bp::no_init);
@@ -145,6 +180,7 @@ namespace galsim {
                 .def("getSigma", &GaussianDeviate::getSigma)
                 .def("_setMean", &GaussianDeviate::setMean)
                 .def("_setSigma", &GaussianDeviate::setSigma)
+                .def("_generate_from_variance", &GenerateFromVariance)
                 .enable_pickling()
                 ;
         }
@@ -284,6 +320,58 @@ namespace galsim {
     };
 
 
+    struct PyDistDeviateTable {
+
+        static DistDeviateTable* makeTable(
+            const bp::object& x, const bp::object& cdf, bool use_alias)
+        {
+            std::vector<double> vx, vcdf;
+            try {
+                bp::stl_input_iterator<double> x_it(x);
+                bp::stl_input_iterator<double> end;
+                vx.insert(vx.end(),x_it,end);
+                bp::stl_input_iterator<double> cdf_it(cdf);
+                vcdf.insert(vcdf.end(),cdf_it,end);
+            } catch (std::exception& e) {
+                PyErr_SetString(PyExc_ValueError, "Unable to convert x, cdf to C++ vectors");
+                bp::throw_error_already_set();
+            }
+            if (vx.size() != vcdf.size() || vx.size() < 2) {
+                PyErr_SetString(PyExc_ValueError,
+                                "x and cdf must be the same size, with at least 2 values");
+                bp::throw_error_already_set();
+            }
+            return new DistDeviateTable(vx,vcdf,use_alias);
+        }
+
+        static void Generate(const DistDeviateTable& self, UniformDeviate& ud,
+                             const bp::object& array)
+        {
+            int N;
+            double* data = GetGenerateArray(array, N);
+            self.generate(ud, N, data);
+        }
+
+        static void wrap() {
+            // This is only used by the python DistDeviate class, so there are no docstrings.
+            bp::class_<DistDeviateTable> pyDistDeviateTable("_DistDeviateTable", bp::no_init);
+            pyDistDeviateTable
+                .def("__init__",
+                     bp::make_constructor(
+                         &makeTable, bp::default_call_policies(),
+                         (bp::arg("x"), bp::arg("cdf"), bp::arg("use_alias")=false)
+                     )
+                )
+                .def("val", &DistDeviateTable::val, bp::arg("p"))
+                .def("__call__", &DistDeviateTable::operator(), bp::arg("ud"))
+                .def("_generate", &Generate, (bp::arg("ud"), bp::arg("array")))
+                .def("usesAlias", &DistDeviateTable::usesAlias)
+                ;
+        }
+
+    };
+
+
     void pyExportRandom() {
         PyBaseDeviate::wrap();
         PyUniformDeviate::wrap();
@@ -293,6 +381,7 @@ namespace galsim {
         PyWeibullDeviate::wrap();
         PyGammaDeviate::wrap();
         PyChi2Deviate::wrap();
+        PyDistDeviateTable::wrap();
     }
 
 } // namespace galsim
@@ -59,9 +59,13 @@ namespace galsim {
                 .def("calculateStepK", &SBInterpolatedImage::calculateStepK,
                      bp::arg("max_stepk")=0.)
                 .def("calculateMaxK", &SBInterpolatedImage::calculateMaxK, bp::arg("max_maxk")=0.)
+                .def("estimateMaxK", &SBInterpolatedImage::estimateMaxK, bp::arg("max_maxk")=0.)
                 .def("getImage", &SBInterpolatedImage::getImage)
                 .def("getXInterp", &SBInterpolatedImage::getXInterp)
                 .def("getKInterp", &SBInterpolatedImage::getKInterp)
+                .def("_hasKData", &SBInterpolatedImage::hasKData)
+                .def("_getKData", &SBInterpolatedImage::getKData)
+                .def("_setKData", &SBInterpolatedImage::setKData)
                 ;
             wrapTemplates<float>(pySBInterpolatedImage);
             wrapTemplates<double>(pySBInterpolatedImage);
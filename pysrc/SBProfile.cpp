@@ -43,7 +43,7 @@ namespace galsim {
             bp::class_<GSParams, boost::shared_ptr<GSParams> > ("GSParams", bp::no_init)
                 .def(bp::init<
                     int, int, double, double, double, double, double, double, double, double,
-                    double, double, double, double, int, double>((
+                    double, double, double, double, int, double, double>((
                         bp::arg("minimum_fft_size")=128, 
                         bp::arg("maximum_fft_size")=4096,
                         bp::arg("folding_threshold")=5.e-3,
@@ -59,7 +59,8 @@ namespace galsim {
                         bp::arg("shoot_accuracy")=1.e-5,
                         bp::arg("allowed_flux_variation")=0.81,
                         bp::arg("range_division_for_extrema")=32,
-                        bp::arg("small_fraction_of_flux")=1.e-4)
+                        bp::arg("small_fraction_of_flux")=1.e-4,
+                        bp::arg("sersic_n_step")=0.)
                     )
                 )
                 .def_readonly("minimum_fft_size", &GSParams::minimum_fft_size)
@@ -78,6 +79,7 @@ namespace galsim {
                 .def_readonly("allowed_flux_variation", &GSParams::allowed_flux_variation)
                 .def_readonly("range_division_for_extrema", &GSParams::range_division_for_extrema)
                 .def_readonly("small_fraction_of_flux", &GSParams::small_fraction_of_flux)
+                .def_readonly("sersic_n_step", &GSParams::sersic_n_step)
                 .def(bp::self == bp::other<GSParams>())
                 .enable_pickling()
                 ;
@@ -112,6 +114,12 @@ namespace galsim {
                      (double (SBProfile::*)(ImageView<U>, double, double) const)&SBProfile::draw,
                      (bp::arg("image"), bp::arg("gain")=1., bp::arg("wmult")=1.),
                      "Draw in-place and return the summed flux.")
+                .def("draw", 
+                     (double (SBProfile::*)(ImageView<U>, double, double, FFTWorkspace&)
+                      const)&SBProfile::draw,
+                     (bp::arg("image"), bp::arg("gain"), bp::arg("wmult"), bp::arg("workspace")),
+                     "Draw in-place, reusing the FFT tables and plans in workspace, and return\n"
+                     "the summed flux.")
                 .def("drawK", 
                      (void (SBProfile::*)(ImageView<U>, ImageView<U>, 
                                           double, double) const)&SBProfile::drawK,
@@ -200,10 +208,28 @@ namespace galsim {
     };
 
 
+    struct PyFFTWorkspace {
+
+        static void wrap() {
+            static char const * doc = 
+                "\n"
+                "A set of KTables and FFT plans that can be reused when drawing many\n"
+                "SBProfiles with FFTs.  Tables larger than max_N are not kept.\n"
+                ;
+            bp::class_<FFTWorkspace, boost::noncopyable>("FFTWorkspace", doc, bp::no_init)
+                .def(bp::init<int>((bp::arg("max_N")=1024)))
+                .def("keeps", &FFTWorkspace::keeps, bp::args("N"))
+                .def("clear", &FFTWorkspace::clear)
+                .def("getNSizes", &FFTWorkspace::getNSizes)
+                ;
+        }
+    };
+
     void pyExportSBProfile() 
     {
         PySBProfile::wrap();
         PyGSParams::wrap();
+        PyFFTWorkspace::wrap();
 
         bp::def("goodFFTSize", &goodFFTSize, (bp::arg("input_size")),
                 "Round up to the next larger 2^n or 3x2^n.");
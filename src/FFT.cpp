@@ -1025,6 +1025,21 @@ namespace galsim {
         fftw_destroy_plan(plan);
     }
 
+    // Scale the k array and flip every other sign to put x=0 in center of the array.
+    void KTable::fillTransformArray(FFTW_Array<std::complex<double> >& t_array) const
+    {
+        double fac = _dk * _dk / (4*M_PI*M_PI);
+        long int ind=0;
+        dbg<<"t_array.size = "<<t_array.size()<<std::endl;
+        for (int iy=0; iy<_N; ++iy) {
+            for (int ix=0; ix<=_No2; ++ix) {
+                if ( (ix+iy)%2==0) t_array[ind]=fac * _array[ind];
+                else t_array[ind] = -fac* _array[ind];
+                ++ind;
+            }
+        }
+    }
+
     // Fourier transform from (complex) k to x:
     // This version takes XTable reference as argument 
     void KTable::transform(XTable& xt) const 
@@ -1040,17 +1055,7 @@ namespace galsim {
         dbg<<"Before make t_array"<<std::endl;
         FFTW_Array<std::complex<double> > t_array(_N*(_No2+1));
         dbg<<"After make t_array"<<std::endl;
-        double fac = _dk * _dk / (4*M_PI*M_PI);
-        long int ind=0;
-        dbg<<"t_array.size = "<<t_array.size()<<std::endl;
-        for (int iy=0; iy<_N; ++iy) {
-            dbg<<"ind = "<<ind<<std::endl;
-            for (int ix=0; ix<=_No2; ++ix) {
-                if ( (ix+iy)%2==0) t_array[ind]=fac * _array[ind];
-                else t_array[ind] = -fac* _array[ind];
-                ++ind;
-            }
-        }
+        fillTransformArray(t_array);
         dbg<<"After fill t_array"<<std::endl;
 
         fftw_plan plan = fftw_plan_dft_c2r_2d(
@@ -1127,5 +1132,53 @@ namespace galsim {
         return kt;
     }
 
+    KTableTransformer::KTableTransformer(int N) :
+        _N(N), _t_array(N*(N/2+1)), _xt(N, 1.)
+    {
+        assert(N%2 == 0);
+        // FFTW_ESTIMATE doesn't touch the arrays, so they don't need to be initialized.
+        _plan = fftw_plan_dft_c2r_2d(
+            _N, _N, _t_array.get_fftw(), _xt._array.get_fftw(), FFTW_ESTIMATE);
+        if (_plan==NULL) throw FFTInvalid();
+    }
+
+    KTableTransformer::~KTableTransformer()
+    { fftw_destroy_plan(_plan); }
+
+    const XTable& KTableTransformer::transform(const KTable& kt)
+    {
+        kt.check_array();
+        assert(kt.getN() == _N);
+
+        // The c2r transform destroys its input, but we refill _t_array each time anyway.
+        kt.fillTransformArray(_t_array);
+        fftw_execute(_plan);
+
+        _xt.clearCache();
+        _xt._dx = 2.*M_PI*kt._invNd*kt._invdk;
+        _xt._invdx = 1./_xt._dx;
+        return _xt;
+    }
+
+    KTable& FFTWorkspace::getKTable(int N, double dk)
+    {
+        boost::shared_ptr<KTable>& kt = _ktables[N];
+        if (!kt || kt->getDk() != dk) kt.reset(new KTable(N, dk));
+        return *kt;
+    }
+
+    KTableTransformer& FFTWorkspace::getTransformer(int N)
+    {
+        boost::shared_ptr<KTableTransformer>& transformer = _transformers[N];
+        if (!transformer) transformer.reset(new KTableTransformer(N));
+        return *transformer;
+    }
+
+    void FFTWorkspace::clear()
+    {
+        _ktables.clear();
+        _transformers.clear();
+    }
+
 
 }
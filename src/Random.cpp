@@ -20,6 +20,7 @@
 #include <sys/time.h>
 #include "Random.h"
 #include <fcntl.h>
+#include <cmath>
 
 namespace galsim {
 
@@ -39,14 +40,14 @@ namespace galsim {
             randomDataLen += result;
         }
         close(randomData);
-        _rng->seed(myRandomInteger);
+        _rng->seed(myRandomInteger, myRandomInteger);
     }
 
     void BaseDeviate::seedtime() 
     {
         struct timeval tp;
         gettimeofday(&tp,NULL);
-        _rng->seed(tp.tv_usec);
+        _rng->seed(tp.tv_usec, tp.tv_usec);
     }
 
     void BaseDeviate::seed(long lseed)
@@ -80,11 +81,103 @@ namespace galsim {
 
             boost::random::mt11213b alt_rng(lseed);
             alt_rng.discard(2);
-            _rng->seed(alt_rng());
+            _rng->seed(alt_rng(), lseed);
         }
         clearCache();
     }
 
+    void BaseDeviate::generate(int N, double* data)
+    {
+        for (int i=0; i<N; ++i) data[i] = _val();
+    }
+
+    void GaussianDeviate::generateFromVariance(int N, double* data)
+    {
+        for (int i=0; i<N; ++i) data[i] = _normal(*this->_rng) * std::sqrt(data[i]);
+    }
+
+    DistDeviateTable::DistDeviateTable(
+        const std::vector<double>& x, const std::vector<double>& cdf, bool use_alias) :
+        _x(x), _cdf(cdf), _use_alias(use_alias)
+    {
+        if (_x.size() != _cdf.size())
+            throw std::runtime_error("DistDeviateTable x and cdf must be the same size");
+        if (_x.size() < 2)
+            throw std::runtime_error("DistDeviateTable requires at least 2 points");
+        const int n = _x.size()-1;  // The number of intervals
+
+        // Build the guide table for the inverse CDF lookups.
+        _guide.resize(n);
+        int i = 1;
+        for (int k=0; k<n; ++k) {
+            double p = double(k)/n;
+            while (i < n && _cdf[i] < p) ++i;
+            _guide[k] = i;
+        }
+
+        if (_use_alias) {
+            // Set up the alias table with Vose's algorithm.
+            _prob.resize(n);
+            _alias.resize(n);
+            std::vector<int> small, large;
+            for (int k=0; k<n; ++k) {
+                _prob[k] = (_cdf[k+1] - _cdf[k]) * n;
+                _alias[k] = k;
+                if (_prob[k] < 1.) small.push_back(k);
+                else large.push_back(k);
+            }
+            while (!small.empty() && !large.empty()) {
+                int s = small.back(); small.pop_back();
+                int l = large.back(); large.pop_back();
+                _alias[s] = l;
+                _prob[l] -= 1. - _prob[s];
+                if (_prob[l] < 1.) small.push_back(l);
+                else large.push_back(l);
+            }
+            // Anything left is only off from 1 by rounding errors.
+            for (size_t j=0; j<small.size(); ++j) _prob[small[j]] = 1.;
+            for (size_t j=0; j<large.size(); ++j) _prob[large[j]] = 1.;
+        }
+    }
+
+    double DistDeviateTable::val(double p) const
+    {
+        const int n = _guide.size();
+        int k = int(p * n);
+        if (k >= n) k = n-1;
+        else if (k < 0) k = 0;
+        int i = _guide[k];
+        while (i < n && _cdf[i] < p) ++i;
+        // Same formula as the linear interpolation in Table.
+        double h = _cdf[i] - _cdf[i-1];
+        double aa = (_cdf[i] - p) / h;
+        double bb = 1. - aa;
+        return aa*_x[i-1] + bb*_x[i];
+    }
+
+    double DistDeviateTable::aliasVal(double u) const
+    {
+        const int n = _prob.size();
+        double v = u * n;
+        int k = int(v);
+        if (k >= n) k = n-1;
+        double f = v - k;
+        // Use the rest of u for the position within the chosen interval.
+        double t;
+        if (f < _prob[k]) {
+            t = f / _prob[k];
+        } else {
+            t = (f - _prob[k]) / (1. - _prob[k]);
+            k = _alias[k];
+        }
+        return _x[k] + t * (_x[k+1] - _x[k]);
+    }
+
+    void DistDeviateTable::generate(UniformDeviate& ud, int N, double* data) const
+    {
+        for (int i=0; i<N; ++i) data[i] = draw(ud());
+    }
+
     std::string BaseDeviate::make_repr(bool incl_seed)
     {
         // Remember: Don't start with nothing!  See discussion in FormatAndThrow in Std.h
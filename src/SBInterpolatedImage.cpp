@@ -85,12 +85,36 @@ namespace galsim {
         return static_cast<const SBInterpolatedImageImpl&>(*_pimpl).calculateMaxK(max_maxk);
     }
 
+    void SBInterpolatedImage::estimateMaxK(double max_maxk) const
+    {
+        assert(dynamic_cast<const SBInterpolatedImageImpl*>(_pimpl.get()));
+        return static_cast<const SBInterpolatedImageImpl&>(*_pimpl).estimateMaxK(max_maxk);
+    }
+
     ConstImageView<double> SBInterpolatedImage::getImage() const
     {
         assert(dynamic_cast<const SBInterpolatedImageImpl*>(_pimpl.get()));
         return static_cast<const SBInterpolatedImageImpl&>(*_pimpl).getImage();
     }
 
+    bool SBInterpolatedImage::hasKData() const
+    {
+        assert(dynamic_cast<const SBInterpolatedImageImpl*>(_pimpl.get()));
+        return static_cast<const SBInterpolatedImageImpl&>(*_pimpl).hasKData();
+    }
+
+    ConstImageView<double> SBInterpolatedImage::getKData() const
+    {
+        assert(dynamic_cast<const SBInterpolatedImageImpl*>(_pimpl.get()));
+        return static_cast<const SBInterpolatedImageImpl&>(*_pimpl).getKData();
+    }
+
+    void SBInterpolatedImage::setKData(const BaseImage<double>& data) const
+    {
+        assert(dynamic_cast<const SBInterpolatedImageImpl*>(_pimpl.get()));
+        static_cast<const SBInterpolatedImageImpl&>(*_pimpl).setKData(data);
+    }
+
     ///////////////////////////////////////////////////////////////////////////////////////////////
     // SBInterpolatedImageImpl methods
 
@@ -219,6 +243,35 @@ namespace galsim {
         dbg<<"ktab size = "<<_ktab->getN()<<", scale = "<<_ktab->getDk()<<std::endl;
     }
 
+    ConstImageView<double> SBInterpolatedImage::SBInterpolatedImageImpl::getKData() const
+    {
+        checkK();
+        int N = _ktab->getN();
+        double *data = reinterpret_cast<double*>(_ktab->getArray());
+        // Same layout as SBInterpolatedKImage::getKData: the 2N * (N/2+1) memory-contiguous
+        // numbers of the KTable.
+        return ConstImageView<double>(data, boost::shared_ptr<double>(), 2*N,
+                                      Bounds<int>(0,2*N-1,0,N/2));
+    }
+
+    void SBInterpolatedImage::SBInterpolatedImageImpl::setKData(
+        const BaseImage<double>& data) const
+    {
+        int N = _xtab->getN();
+        const Bounds<int>& b = data.getBounds();
+        if (b.getXMax()-b.getXMin()+1 != 2*N || b.getYMax()-b.getYMin()+1 != N/2+1)
+            throw std::runtime_error(
+                "SBInterpolatedImage::setKData: data has the wrong size for this image");
+        boost::shared_ptr<KTable> ktab(new KTable(N, 2.*M_PI/(N*_xtab->getDx())));
+        double *kptr = reinterpret_cast<double*>(ktab->getArray());
+        for (int y=b.getYMin(); y<=b.getYMax(); ++y) {
+            BaseImage<double>::const_iterator it = data.rowBegin(y);
+            for (; it != data.rowEnd(y); ++it) *kptr++ = *it;
+        }
+        _ktab = ktab;
+        dbg<<"Set ktab: size = "<<_ktab->getN()<<", scale = "<<_ktab->getDk()<<std::endl;
+    }
+
     void SBInterpolatedImage::SBInterpolatedImageImpl::fillXValue(
         tmv::MatrixView<double> val,
         double x0, double dx, int izero,
@@ -591,29 +644,14 @@ namespace galsim {
     inline double fast_norm(const std::complex<double>& z)
     { return real(z)*real(z) + imag(z)*imag(z); }
 
-    void SBInterpolatedImage::SBInterpolatedImageImpl::calculateMaxK(double max_maxk) const
+    // Find the last row of ktab (in units of its dk) that has any |kval|^2 > thresh.
+    // The rows are the squares with max(|kx|,|ky|) = ix, which are checked out to max_ix,
+    // stopping early once nstop rows in a row are all below thresh.
+    static int FindMaxKRow(const KTable& ktab, double thresh, int max_ix, int nstop)
     {
-        dbg<<"Start SBInterpolatedImage calculateMaxK()\n";
-        dbg<<"Current value of maxk = "<<_maxk<<std::endl;
-        dbg<<"max_maxk = "<<max_maxk<<std::endl;
-        dbg<<"Find the smallest k such that all values outside of this are less than "
-            <<this->gsparams->maxk_threshold<<std::endl;
-        checkK();
-        dbg<<"ktab size = "<<_ktab->getN()<<", scale = "<<_ktab->getDk()<<std::endl;
-
-        double dk = _ktab->getDk();
-
-        // Among the elements with kval > thresh, find the one with the maximum ksq
-        double thresh = this->gsparams->maxk_threshold * getFlux();
-        thresh *= thresh; // Since values will be |kval|^2.
-        double maxk_ix = 0.;
-        // When we get 5 rows in a row all below thresh, stop.
+        int maxk_ix = 0;
         int n_below_thresh = 0;
-        int N = _ktab->getN();
-        // Don't go past the current value of maxk
-        if (max_maxk == 0.) max_maxk = _maxk;
-        int max_ix = int(std::ceil(max_maxk / dk));
-        if (max_ix > N/2) max_ix = N/2;
+        int N = ktab.getN();
 
         // We take the k value to be maximum of kx and ky.  This is appropriate, because
         // this is how maxK() is eventually used -- it sets the size in k-space for both
@@ -625,23 +663,23 @@ namespace galsim {
             // Search along the two sides with either kx = ix or ky = ix.
             for(int iy=0; iy<=ix; ++iy) {
                 // The right side of the square in the upper-right quadrant.
-                double norm_kval = fast_norm(_ktab->kval2(ix,iy));
+                double norm_kval = fast_norm(ktab.kval2(ix,iy));
                 xdbg<<"norm_kval at "<<ix<<','<<iy<<" = "<<norm_kval<<std::endl;
                 if (norm_kval <= thresh && iy != ix) {
                     // The top side of the square in the upper-right quadrant.
-                    norm_kval = fast_norm(_ktab->kval2(iy,ix));
+                    norm_kval = fast_norm(ktab.kval2(iy,ix));
                     xdbg<<"norm_kval at "<<iy<<','<<ix<<" = "<<norm_kval<<std::endl;
                 }
                 if (norm_kval <= thresh && iy > 0) {
                     // The right side of the square in the lower-right quadrant.
                     // The ky argument is wrapped to positive values.
-                    norm_kval = fast_norm(_ktab->kval2(ix,N-iy));
+                    norm_kval = fast_norm(ktab.kval2(ix,N-iy));
                     xdbg<<"norm_kval at "<<ix<<','<<-iy<<" = "<<norm_kval<<std::endl;
                 }
                 if (norm_kval <= thresh && ix > 0) {
                     // The bottom side of the square in the lower-right quadrant.
                     // The ky argument is wrapped to positive values.
-                    norm_kval = fast_norm(_ktab->kval2(iy,N-ix));
+                    norm_kval = fast_norm(ktab.kval2(iy,N-ix));
                     xdbg<<"norm_kval at "<<iy<<','<<-ix<<" = "<<norm_kval<<std::endl;
                 }
                 if (norm_kval > thresh) {
@@ -655,10 +693,36 @@ namespace galsim {
                 }
             }
             xdbg<<"Done ix = "<<ix<<".  Current count = "<<n_below_thresh<<std::endl;
-            // If we get through 5 rows with nothing above the threshold, stop looking.
-            if (++n_below_thresh == 5) break;
+            // If we get through nstop rows with nothing above the threshold, stop looking.
+            if (++n_below_thresh == nstop) break;
         }
         xdbg<<"Finished.  maxk_ix = "<<maxk_ix<<std::endl;
+        return maxk_ix;
+    }
+
+    void SBInterpolatedImage::SBInterpolatedImageImpl::calculateMaxK(double max_maxk) const
+    {
+        dbg<<"Start SBInterpolatedImage calculateMaxK()\n";
+        dbg<<"Current value of maxk = "<<_maxk<<std::endl;
+        dbg<<"max_maxk = "<<max_maxk<<std::endl;
+        dbg<<"Find the smallest k such that all values outside of this are less than "
+            <<this->gsparams->maxk_threshold<<std::endl;
+        checkK();
+        dbg<<"ktab size = "<<_ktab->getN()<<", scale = "<<_ktab->getDk()<<std::endl;
+
+        double dk = _ktab->getDk();
+
+        // Among the elements with kval > thresh, find the one with the maximum ksq
+        double thresh = this->gsparams->maxk_threshold * getFlux();
+        thresh *= thresh; // Since values will be |kval|^2.
+        int N = _ktab->getN();
+        // Don't go past the current value of maxk
+        if (max_maxk == 0.) max_maxk = _maxk;
+        int max_ix = int(std::ceil(max_maxk / dk));
+        if (max_ix > N/2) max_ix = N/2;
+
+        // When we get 5 rows in a row all below thresh, stop.
+        int maxk_ix = FindMaxKRow(*_ktab, thresh, max_ix, 5);
         // Add 1 to get the first row that is below the threshold.
         ++maxk_ix;
         // Scale by dk
@@ -666,6 +730,45 @@ namespace galsim {
         dbg<<"new maxk = "<<_maxk<<std::endl;
     }
 
+    // The factor by which we increase the maxk found by estimateMaxK to allow for
+    // peaks in the k-space table that fall between the coarser samples.
+    static const double estimate_maxk_safety = 1.1;
+
+    void SBInterpolatedImage::SBInterpolatedImageImpl::estimateMaxK(double max_maxk) const
+    {
+        dbg<<"Start SBInterpolatedImage estimateMaxK()\n";
+        dbg<<"Current value of maxk = "<<_maxk<<std::endl;
+        dbg<<"max_maxk = "<<max_maxk<<std::endl;
+
+        // The FFT of the original image (without the padding) samples the same function as
+        // the full k-space table, but with a dk that is larger by about pad_factor.  So it
+        // is a sparse sample of _ktab that is much cheaper to calculate.
+        int Ns = goodFFTSize(_Ninitial);
+        XTable xsmall(Ns, 1.);
+        const Bounds<int> b = _init_bounds;
+        int xStart = -((b.getXMax()-b.getXMin()+1)/2);
+        int yStart = -((b.getYMax()-b.getYMin()+1)/2);
+        for (int y = yStart; y <= yStart + b.getYMax()-b.getYMin(); ++y)
+            for (int x = xStart; x <= xStart + b.getXMax()-b.getXMin(); ++x)
+                xsmall.xSet(x, y, _xtab->xval(x,y));
+        boost::shared_ptr<KTable> ksmall = xsmall.transform();
+        dbg<<"ksmall size = "<<ksmall->getN()<<", scale = "<<ksmall->getDk()<<std::endl;
+
+        double dk = ksmall->getDk();
+        double thresh = this->gsparams->maxk_threshold * getFlux();
+        thresh *= thresh; // Since values will be |kval|^2.
+        if (max_maxk == 0.) max_maxk = _maxk;
+        int max_ix = int(std::ceil(max_maxk / dk));
+        if (max_ix > Ns/2) max_ix = Ns/2;
+
+        // Stop after the same range of k as calculateMaxK's 5 rows, but at least 2 rows.
+        int nstop = std::max(2, int(std::ceil(5. * Ns / _Nk)));
+        int maxk_ix = FindMaxKRow(*ksmall, thresh, max_ix, nstop);
+        ++maxk_ix;
+        _maxk = std::min(estimate_maxk_safety * maxk_ix * dk, max_maxk);
+        dbg<<"new maxk = "<<_maxk<<std::endl;
+    }
+
     void SBInterpolatedImage::SBInterpolatedImageImpl::checkReadyToShoot() const
     {
         if (_readyToShoot) return;
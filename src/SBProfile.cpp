@@ -215,6 +215,17 @@ namespace galsim {
             return fourierDraw(img, gain, wmult);
     }
 
+    template <typename T>
+    double SBProfile::draw(ImageView<T> img, double gain, double wmult,
+                           FFTWorkspace& workspace) const
+    {
+        dbg<<"Start draw ImageView with workspace"<<std::endl;
+        if (isAnalyticX())
+            return plainDraw(img, gain);
+        else
+            return fourierDraw(img, gain, wmult, workspace);
+    }
+
     int SBProfile::getGoodImageSize(double dx, double wmult) const
     {
         dbg<<"Start getGoodImageSize\n";
@@ -392,6 +403,15 @@ namespace galsim {
     // And enforce no image folding
     template <typename T>
     double SBProfile::fourierDraw(ImageView<T> I, double gain, double wmult) const
+    {
+        // A work space that doesn't keep anything, so everything is made fresh for this draw.
+        FFTWorkspace workspace(0);
+        return fourierDraw(I, gain, wmult, workspace);
+    }
+
+    template <typename T>
+    double SBProfile::fourierDraw(ImageView<T> I, double gain, double wmult,
+                                  FFTWorkspace& workspace) const
     {
         dbg<<"Start fourierDraw"<<std::endl;
         Bounds<int> imgBounds; // Bounds for output image
@@ -422,7 +442,9 @@ namespace galsim {
             " maxK " << dk*NFT/2 << std::endl;
         xdbg<<"dk - stepK() = "<<dk-(stepK()*(1.+1.e-8))<<std::endl;
         xassert(dk <= stepK()*(1. + 1.e-8)); // Add a little slop in case of rounding errors.
-        boost::shared_ptr<XTable> xt;
+        // xt points either to a new XTable owned by xt_ptr or to the one in the workspace.
+        boost::shared_ptr<XTable> xt_ptr;
+        const XTable* xt;
         if (NFT*dk/2 > maxK()) {
             dbg<<"NFT*dk/2 = "<<NFT*dk/2<<" > maxK() = "<<maxK()<<std::endl;
             dbg<<"Use NFT = "<<NFT<<std::endl;
@@ -431,10 +453,17 @@ namespace galsim {
                     "fourierDraw() requires an FFT that is too large, " << NFT <<
                     "\nIf you can handle the large FFT, you may update gsparams.maximum_fft_size.";
             // No aliasing: build KTable and transform
-            KTable kt(NFT,dk);
             assert(_pimpl.get());
-            _pimpl->fillKGrid(kt);
-            xt = kt.transform();
+            if (workspace.keeps(NFT)) {
+                KTable& kt = workspace.getKTable(NFT,dk);
+                _pimpl->fillKGrid(kt);
+                xt = &workspace.getTransformer(NFT).transform(kt);
+            } else {
+                KTable kt(NFT,dk);
+                _pimpl->fillKGrid(kt);
+                xt_ptr = kt.transform();
+                xt = xt_ptr.get();
+            }
         } else {
             dbg<<"NFT*dk/2 = "<<NFT*dk/2<<" <= maxK() = "<<maxK()<<std::endl;
             // There will be aliasing.  Construct a KTable out to maxK() and
@@ -445,17 +474,24 @@ namespace galsim {
                 FormatAndThrow<SBError>() <<
                     "fourierDraw() requires an FFT that is too large, " << Nk <<
                     "\nIf you can handle the large FFT, you may update gsparams.maximum_fft_size.";
-            KTable kt(Nk, dk);
             assert(_pimpl.get());
-            _pimpl->fillKGrid(kt);
-            xt = kt.wrap(NFT)->transform();
+            if (workspace.keeps(Nk)) {
+                KTable& kt = workspace.getKTable(Nk,dk);
+                _pimpl->fillKGrid(kt);
+                xt = &workspace.getTransformer(NFT).transform(*kt.wrap(NFT));
+            } else {
+                KTable kt(Nk, dk);
+                _pimpl->fillKGrid(kt);
+                xt_ptr = kt.wrap(NFT)->transform();
+                xt = xt_ptr.get();
+            }
         }
         int Nxt = xt->getN();
         dbg<<"Nxt = "<<Nxt<<std::endl;
 
 #ifdef OUTPUT_FFT
         std::ofstream fout("xt.dat");
-        tmv::MatrixView<double> mxt(xt->getArray(),Nxt,Nxt,1,Nxt,tmv::NonConj);
+        tmv::ConstMatrixView<double> mxt(xt->getArray(),Nxt,Nxt,1,Nxt,tmv::NonConj);
         fout << tmv::EigenIO() << mxt << std::endl;
         fout.close();
 #endif
@@ -1062,6 +1098,14 @@ namespace galsim {
 
     template double SBProfile::fourierDraw(ImageView<float> I, double gain, double wmult) const;
     template double SBProfile::fourierDraw(ImageView<double> I, double gain, double wmult) const;
+    template double SBProfile::draw(
+        ImageView<float> img, double gain, double wmult, FFTWorkspace& workspace) const;
+    template double SBProfile::draw(
+        ImageView<double> img, double gain, double wmult, FFTWorkspace& workspace) const;
+    template double SBProfile::fourierDraw(
+        ImageView<float> I, double gain, double wmult, FFTWorkspace& workspace) const;
+    template double SBProfile::fourierDraw(
+        ImageView<double> I, double gain, double wmult, FFTWorkspace& workspace) const;
 
     template void SBProfile::drawK(
         ImageView<float> Re, ImageView<float> Im, double gain, double wmult) const;
@@ -107,13 +107,41 @@ namespace galsim {
     LRUCache< boost::tuple<double, double, GSParamsPtr >, SersicInfo >
         SBSersic::SBSersicImpl::cache(sbp::max_sersic_cache);
 
+    LRUCache< boost::tuple<double, double, GSParamsPtr >, SersicInfo >
+        SBSersic::SBSersicImpl::bank(sbp::max_sersic_bank);
+
+    double SBSersic::SBSersicImpl::RoundN(double n, const GSParamsPtr& gsparams)
+    {
+        double step = gsparams->sersic_n_step;
+        // Leave values outside the allowed range alone, so SersicInfo still reports them.
+        if (step <= 0. || n < sbp::minimum_sersic_n || n > sbp::maximum_sersic_n) return n;
+        // Integer n (e.g. DeVaucouleurs, n=4) is also left alone, since such values are almost
+        // always chosen exactly rather than drawn from a continuous distribution.
+        if (n == std::floor(n)) return n;
+        double nq = step * std::floor(n/step + 0.5);
+        if (nq < sbp::minimum_sersic_n) nq = sbp::minimum_sersic_n;
+        if (nq > sbp::maximum_sersic_n) nq = sbp::maximum_sersic_n;
+        return nq;
+    }
+
+    boost::shared_ptr<SersicInfo> SBSersic::SBSersicImpl::GetInfo(
+        double n, double trunc, const GSParamsPtr& gsparams)
+    {
+        // With rounded n, there are only a fixed number of untruncated profiles, which we
+        // keep in the bank rather than the main cache.
+        if (gsparams->sersic_n_step > 0. && trunc == 0.)
+            return bank.get(boost::make_tuple(n, trunc, gsparams.duplicate()));
+        else
+            return cache.get(boost::make_tuple(n, trunc, gsparams.duplicate()));
+    }
+
     SBSersic::SBSersicImpl::SBSersicImpl(double n,  double size, RadiusType rType, double flux,
                                          double trunc, bool flux_untruncated,
                                          const GSParamsPtr& gsparams) :
         SBProfileImpl(gsparams),
-        _n(n), _flux(flux), _trunc(trunc), _trunc_sq(trunc*trunc),
+        _n(RoundN(n, this->gsparams)), _flux(flux), _trunc(trunc), _trunc_sq(trunc*trunc),
         // Start with untruncated SersicInfo regardless of value of trunc
-        _info(cache.get(boost::make_tuple(_n, 0., this->gsparams.duplicate())))
+        _info(GetInfo(_n, 0., this->gsparams))
     {
         dbg<<"Start SBSersic constructor:\n";
         dbg<<"n = "<<_n<<std::endl;
@@ -140,8 +168,7 @@ namespace galsim {
                        }
 
                        // Update _info with the correct truncated version.
-                       _info = cache.get(boost::make_tuple(_n,_trunc/_r0,
-                                                           this->gsparams.duplicate()));
+                       _info = GetInfo(_n, _trunc/_r0, this->gsparams);
 
                        if (flux_untruncated) {
                            // Update the stored _flux and _re with the correct values
@@ -159,8 +186,7 @@ namespace galsim {
                    _r0 = size;
                    if (_truncated) {
                        // Update _info with the correct truncated version.
-                       _info = cache.get(boost::make_tuple(_n,_trunc/_r0,
-                                                           this->gsparams.duplicate()));
+                       _info = GetInfo(_n, _trunc/_r0, this->gsparams);
 
                        if (flux_untruncated) {
                            // Update the stored _flux with the correct value
@@ -2158,6 +2158,66 @@ def test_spergel_05():
     t2 = time.time()
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
+def test_sersic_n_step():
+    """Test the sersic_n_step option of GSParams, which rounds n to a grid of values.
+    """
+    import time
+    t1 = time.time()
+
+    gsp = galsim.GSParams(sersic_n_step=0.05)
+    do_pickle(gsp)
+    sersic = galsim.Sersic(n=2.33, flux=1.7, half_light_radius=1.3, gsparams=gsp)
+    np.testing.assert_almost_equal(sersic.getN(), 2.35, decimal=12)
+    # The flux and half-light radius are not changed by the rounding.
+    np.testing.assert_almost_equal(sersic.getFlux(), 1.7, decimal=12)
+    np.testing.assert_almost_equal(sersic.getHalfLightRadius(), 1.3, decimal=12)
+
+    # The profile is the same as one made with the rounded n.
+    sersic_q = galsim.Sersic(n=2.35, flux=1.7, half_light_radius=1.3)
+    im1 = sersic.drawImage(nx=64, ny=64, scale=0.1, method='no_pixel')
+    im2 = sersic_q.drawImage(nx=64, ny=64, scale=0.1, method='no_pixel')
+    np.testing.assert_array_almost_equal(
+            im1.array, im2.array, 6,
+            err_msg="Sersic with sersic_n_step does not match Sersic with rounded n")
+
+    # And close to the one with the original n.
+    sersic_n = galsim.Sersic(n=2.33, flux=1.7, half_light_radius=1.3)
+    im3 = sersic_n.drawImage(nx=64, ny=64, scale=0.1, method='no_pixel')
+    np.testing.assert_allclose(
+            im1.array, im3.array, rtol=0, atol=0.02*im3.array.max(),
+            err_msg="Sersic with sersic_n_step is too different from Sersic with original n")
+
+    # Values near the edges of the allowed range are kept inside the range.
+    gsp2 = galsim.GSParams(sersic_n_step=0.25)
+    np.testing.assert_almost_equal(
+            galsim.Sersic(n=0.31, half_light_radius=1, gsparams=gsp2).getN(), 0.3, decimal=12)
+    np.testing.assert_almost_equal(
+            galsim.Sersic(n=6.15, half_light_radius=1, gsparams=gsp2).getN(), 6.2, decimal=12)
+    # But values outside the range are still invalid.
+    try:
+        np.testing.assert_raises(RuntimeError, galsim.Sersic, n=6.3, half_light_radius=1,
+                                 gsparams=gsp2)
+    except ImportError:
+        print 'The assert_raises tests require nose'
+
+    # Integer n is not rounded, even if it is not a multiple of the step.  In particular,
+    # DeVaucouleurs profiles stay at n=4.
+    gsp3 = galsim.GSParams(sersic_n_step=0.03)
+    np.testing.assert_equal(
+            galsim.Sersic(n=4, half_light_radius=1, gsparams=gsp3).getN(), 4.)
+    np.testing.assert_equal(
+            galsim.Sersic(n=1, half_light_radius=1, gsparams=gsp3).getN(), 1.)
+    dev1 = galsim.DeVaucouleurs(flux=1.7, half_light_radius=1.3, gsparams=gsp3)
+    dev2 = galsim.DeVaucouleurs(flux=1.7, half_light_radius=1.3)
+    im1 = dev1.drawImage(nx=64, ny=64, scale=0.1, method='no_pixel')
+    im2 = dev2.drawImage(nx=64, ny=64, scale=0.1, method='no_pixel')
+    np.testing.assert_array_almost_equal(
+            im1.array, im2.array, 6,
+            err_msg="DeVaucouleurs with sersic_n_step does not match default DeVaucouleurs")
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
 if __name__ == "__main__":
     test_gaussian()
     test_gaussian_properties()
@@ -2190,3 +2250,4 @@ if __name__ == "__main__":
     test_spergel_radii()
     test_spergel_flux_scaling()
     test_spergel_05()
+    test_sersic_n_step()
@@ -1184,6 +1184,95 @@ def test_ring():
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
 
+def test_scope():
+    """Test that objects that only depend on the file or image number are reused.
+    """
+    import time
+    t1 = time.time()
+
+    config = {
+        'rng' : galsim.BaseDeviate(1234),
+        'file_num' : 0,
+        'image_num' : 0,
+        'psf' : { 'type' : 'Moffat', 'beta' : 3,
+                  'fwhm' : { 'type' : 'Sequence', 'first' : 0.6, 'step' : 0.1,
+                             'index_key' : 'image_num' } },
+        'psf2' : { 'type' : 'Convolve',
+                   'items' : [
+                       { 'type' : 'Gaussian',
+                         'sigma' : { 'type' : 'Eval', 'str' : '0.3 + 0.1 * file_num' } },
+                       { 'type' : 'Airy', 'lam_over_diam' : 0.4 } ] },
+        'gal' : { 'type' : 'Exponential', 'half_light_radius' : 1.2,
+                  'flux' : { 'type' : 'Random', 'min' : 100, 'max' : 200 } },
+        # obj_num is only used inside a generator expression here.
+        'gal2' : { 'type' : 'Gaussian', 'sigma' : 1.1,
+                   'flux' : { 'type' : 'Eval', 'str' : 'sum(obj_num*k for k in range(3))' } },
+    }
+
+    obj_num = 0
+    for file_num in range(2):
+        config['file_num'] = file_num
+        for image_num in range(2):
+            config['image_num'] = 2*file_num + image_num
+            psf_list = []
+            psf2_list = []
+            gal_list = []
+            for k in range(3):
+                config['obj_num'] = obj_num
+                psf_list.append(galsim.config.BuildGSObject(config, 'psf')[0])
+                psf2_list.append(galsim.config.BuildGSObject(config, 'psf2')[0])
+                gal_list.append(galsim.config.BuildGSObject(config, 'gal')[0])
+                gal2 = galsim.config.BuildGSObject(config, 'gal2')[0]
+                np.testing.assert_almost_equal(gal2.getFlux(), 3*obj_num)
+                obj_num += 1
+            np.testing.assert_equal(config['psf']['current_scope'], 'image')
+            np.testing.assert_equal(config['psf2']['current_scope'], 'file')
+            np.testing.assert_equal(config['gal']['current_scope'], 'obj')
+            np.testing.assert_equal(config['gal2']['current_scope'], 'obj')
+            # The psf is only built once per image.
+            assert psf_list[1] is psf_list[0]
+            assert psf_list[2] is psf_list[0]
+            gsobject_compare(psf_list[0], galsim.Moffat(beta=3, fwhm=0.6+0.1*config['image_num']))
+            if image_num == 0:
+                first_psf2 = psf2_list[0]
+            # psf2 is only built once per file.
+            assert psf2_list[0] is first_psf2
+            assert psf2_list[2] is first_psf2
+            gsobject_compare(
+                psf2_list[0],
+                galsim.Convolve(galsim.Gaussian(sigma=0.3+0.1*file_num),
+                                galsim.Airy(lam_over_diam=0.4)))
+            # The galaxy gets a new random flux for each object.
+            assert gal_list[1] is not gal_list[0]
+            assert gal_list[1].getFlux() != gal_list[0].getFlux()
+
+    # If the parameters are changed, the objects are rebuilt, even within the same file.
+    config['obj_num'] = obj_num
+    psf2 = galsim.config.BuildGSObject(config, 'psf2')[0]
+    assert psf2 is first_psf2
+    config['psf2']['items'][1]['lam_over_diam'] = 0.5
+    psf2 = galsim.config.BuildGSObject(config, 'psf2')[0]
+    gsobject_compare(
+        psf2, galsim.Convolve(galsim.Gaussian(sigma=0.3+0.1*file_num),
+                              galsim.Airy(lam_over_diam=0.5)))
+
+    # Removing the current values (e.g. when an input object changes) rebuilds the objects.
+    psf1 = galsim.config.BuildGSObject(config, 'psf')[0]
+    galsim.config.RemoveCurrent(config)
+    psf2 = galsim.config.BuildGSObject(config, 'psf')[0]
+    assert psf2 is not psf1
+    gsobject_compare(psf1, psf2)
+
+    # So does building with different gsparams.
+    psf3 = galsim.config.BuildGSObject(config, 'psf', gsparams={'folding_threshold' : 1.e-2})[0]
+    assert psf3 is not psf2
+    psf4 = galsim.config.BuildGSObject(config, 'psf', gsparams={'folding_threshold' : 1.e-2})[0]
+    assert psf4 is psf3
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+
 if __name__ == "__main__":
     test_gaussian()
     test_moffat()
@@ -1200,5 +1289,4 @@ if __name__ == "__main__":
     test_convolve()
     test_list()
     test_ring()
-
-
+    test_scope()
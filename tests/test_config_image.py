@@ -141,7 +141,152 @@ def test_scattered():
     t2 = time.time()
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
-if __name__ == "__main__":
-    test_scattered()
+def test_job_backend():
+    """Test that the different job backends for Process produce identical output files
+    """
+    import copy
+    import time
+    t1 = time.time()
+
+    config = {
+        'gal' : { 'type' : 'Gaussian',
+                  'sigma' : { 'type' : 'Random', 'min' : 0.5, 'max' : 1.5 },
+                  'flux' : 100 },
+        'image' : { 'type' : 'Tiled', 'nx_tiles' : 3, 'ny_tiles' : 2, 'stamp_size' : 16,
+                    'pixel_scale' : 0.3, 'random_seed' : 1234,
+                    'noise' : { 'type' : 'Gaussian', 'sigma' : 0.1 } },
+        'output' : { 'nfiles' : 4, 'dir' : 'output',
+                     'file_name' : { 'type' : 'NumberedFile', 'root' : 'backend_serial_' } },
+    }
+    galsim.config.Process(copy.deepcopy(config))
 
+    for backend in [ 'Local', { 'type' : 'FileQueue', 'nworkers' : 2 } ]:
+        config2 = copy.deepcopy(config)
+        config2['output']['nproc'] = 2
+        config2['output']['backend'] = backend
+        config2['output']['file_name']['root'] = 'backend_test_'
+        galsim.config.Process(config2)
+        for k in range(4):
+            im1 = galsim.fits.read(os.path.join('output','backend_serial_%d.fits'%k))
+            im2 = galsim.fits.read(os.path.join('output','backend_test_%d.fits'%k))
+            np.testing.assert_array_equal(
+                im2.array, im1.array,
+                err_msg="Job backend %s gave a different file %d"%(backend,k))
 
+    # A reused queue directory with stale results and a bad job from some other run.
+    queue_dir = os.path.join('output','job_queue')
+    for sub in [ 'pending', 'done' ]:
+        if not os.path.isdir(os.path.join(queue_dir,sub)):
+            os.makedirs(os.path.join(queue_dir,sub))
+    with open(os.path.join(queue_dir,'done','job_stale_000000.pkl'), 'w') as fout:
+        fout.write('Not a valid result')
+    with open(os.path.join(queue_dir,'pending','job_bad.pkl'), 'w') as fout:
+        fout.write('Not a valid job')
+    config2 = copy.deepcopy(config)
+    config2['output']['nproc'] = 2
+    config2['output']['backend'] = { 'type' : 'FileQueue', 'dir' : queue_dir }
+    config2['output']['file_name']['root'] = 'backend_test_'
+    galsim.config.Process(config2)
+    for k in range(4):
+        im1 = galsim.fits.read(os.path.join('output','backend_serial_%d.fits'%k))
+        im2 = galsim.fits.read(os.path.join('output','backend_test_%d.fits'%k))
+        np.testing.assert_array_equal(
+            im2.array, im1.array,
+            err_msg="FileQueue backend with a reused dir gave a different file %d"%k)
+    # The worker that got the bad job should have reported the error and carried on.
+    import cPickle
+    bad_result = os.path.join(queue_dir,'done','job_bad.pkl')
+    with open(bad_result, 'rb') as fin:
+        assert isinstance(cPickle.load(fin)[0], Exception)
+    os.remove(bad_result)
+
+    # If a job kills its worker, it is tried once more, and then reported as failed rather
+    # than waiting forever.  Here both workers die, so the other jobs fail too.
+    config2 = copy.deepcopy(config)
+    config2['gal']['flux'] = '$100 if file_num != 1 else os._exit(1)'
+    config2['output']['nproc'] = 2
+    config2['output']['backend'] = { 'type' : 'FileQueue' }
+    config2['output']['file_name']['root'] = 'backend_dead_'
+    for k in range(4):
+        file_name = os.path.join('output','backend_dead_%d.fits'%k)
+        if os.path.isfile(file_name): os.remove(file_name)
+    galsim.config.Process(config2)
+    assert os.path.isfile(os.path.join('output','backend_dead_0.fits'))
+    assert not os.path.isfile(os.path.join('output','backend_dead_1.fits'))
+
+    # A job that takes longer than the timeout is reported as failed.
+    config2 = copy.deepcopy(config)
+    config2['gal']['flux'] = '$100 + (file_num == 1 and os.system("sleep 3"))'
+    config2['output']['nproc'] = 2
+    config2['output']['backend'] = { 'type' : 'FileQueue', 'timeout' : 1 }
+    config2['output']['file_name']['root'] = 'backend_slow_'
+    for k in range(4):
+        file_name = os.path.join('output','backend_slow_%d.fits'%k)
+        if os.path.isfile(file_name): os.remove(file_name)
+    galsim.config.Process(config2)
+    for k in [0,2,3]:
+        assert os.path.isfile(os.path.join('output','backend_slow_%d.fits'%k))
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+def test_timing():
+    """Test the per-stage timing summary written when output.timing = True
+    """
+    import copy
+    import json
+    import time
+    t1 = time.time()
+
+    config = {
+        'root' : 'timing_test',
+        'gal' : { 'type' : 'Gaussian',
+                  'sigma' : { 'type' : 'Random', 'min' : 0.5, 'max' : 1.5 },
+                  'flux' : 100 },
+        'image' : { 'type' : 'Tiled', 'nx_tiles' : 3, 'ny_tiles' : 2, 'stamp_size' : 16,
+                    'pixel_scale' : 0.3, 'random_seed' : 1234,
+                    'noise' : { 'type' : 'Gaussian', 'sigma' : 0.1 } },
+        'output' : { 'nfiles' : 2, 'dir' : 'output',
+                     'file_name' : { 'type' : 'NumberedFile', 'root' : 'timing_serial_' } },
+    }
+    galsim.config.Process(copy.deepcopy(config))
+
+    timing_file = os.path.join('output','timing_test_timing.json')
+    for nproc in [ 1, 2 ]:
+        if os.path.isfile(timing_file):
+            os.remove(timing_file)
+        config2 = copy.deepcopy(config)
+        config2['output']['nproc'] = nproc
+        config2['output']['timing'] = True
+        config2['output']['file_name']['root'] = 'timing_test_'
+        galsim.config.Process(config2)
+
+        # The timing should not change the output files.
+        for k in range(2):
+            im1 = galsim.fits.read(os.path.join('output','timing_serial_%d.fits'%k))
+            im2 = galsim.fits.read(os.path.join('output','timing_test_%d.fits'%k))
+            np.testing.assert_array_equal(
+                im2.array, im1.array,
+                err_msg="Turning on timing changed file %d with nproc = %d"%(k,nproc))
+
+        # The counts should include the work done by all of the processes.
+        with open(timing_file) as fin:
+            summary = json.load(fin)
+        stages = summary['stages']
+        np.testing.assert_equal(summary['nfiles'], 2)
+        np.testing.assert_equal(stages['build']['ncalls'], 12)
+        np.testing.assert_equal(stages['draw']['ncalls'], 12)
+        np.testing.assert_equal(stages['wcs']['ncalls'], 2)
+        np.testing.assert_equal(stages['write']['ncalls'], 2)
+        assert 'noise' in stages
+        for stage in stages:
+            assert stages[stage]['wall'] >= 0.
+            assert stages[stage]['cpu'] >= 0.
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+if __name__ == "__main__":
+    test_scattered()
+    test_job_backend()
+    test_timing()
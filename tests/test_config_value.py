@@ -1076,6 +1076,81 @@ def test_pos_value():
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
 
+def test_eval_value():
+    """Test Eval values and the reuse of values that are safe to keep from one object to the next
+    """
+    import time
+    t1 = time.time()
+
+    config = {
+        'eval_variables' : { 'fpixel_scale' : 0.3, 'ik' : 4 },
+        'eval1' : { 'type' : 'Eval', 'str' : 'math.sqrt(x**2 + 1)', 'fx' : 3. },
+        'eval2' : { 'type' : 'Eval', 'str' : 'k * pixel_scale' },
+        'eval3' : { 'type' : 'Eval', 'str' : 'obj_num * 2' },
+        'eval4' : { 'type' : 'Eval', 'str' : 'x * 1.5', 'fx' : { 'type' : 'Sequence' } },
+        'str1' : { 'type' : 'FormattedStr', 'format' : 'obj%02d_%s.fits',
+                   'items' : [ { 'type' : 'Sequence' }, 'a' ] },
+    }
+
+    for k in range(4):
+        config['obj_num'] = k
+        eval1, safe1 = galsim.config.ParseValue(config,'eval1',config, float)
+        np.testing.assert_almost_equal(eval1, math.sqrt(10.))
+        assert safe1
+        eval2, safe2 = galsim.config.ParseValue(config,'eval2',config, float)
+        np.testing.assert_almost_equal(eval2, 1.2)
+        assert safe2
+        eval3, safe3 = galsim.config.ParseValue(config,'eval3',config, int)
+        np.testing.assert_equal(eval3, 2*k)
+        assert not safe3
+        eval4, safe4 = galsim.config.ParseValue(config,'eval4',config, float)
+        np.testing.assert_almost_equal(eval4, 1.5*k)
+        assert not safe4
+        str1 = galsim.config.ParseValue(config,'str1',config, str)[0]
+        np.testing.assert_equal(str1, 'obj%02d_a.fits'%k)
+
+    # Safe values are kept from one object to the next, but if the parameters are changed,
+    # the new values are used.
+    config['eval1']['fx'] = 2.
+    config['obj_num'] = 10
+    eval1 = galsim.config.ParseValue(config,'eval1',config, float)[0]
+    np.testing.assert_almost_equal(eval1, math.sqrt(5.))
+    config['eval_variables']['ik'] = 5
+    config['obj_num'] = 11
+    eval2 = galsim.config.ParseValue(config,'eval2',config, float)[0]
+    np.testing.assert_almost_equal(eval2, 1.5)
+    config['str1']['items'][1] = 'b'
+    str1 = galsim.config.ParseValue(config,'str1',config, str)[0]
+    np.testing.assert_equal(str1, 'obj11_b.fits')
+
+    # Removing the current values (as ProcessInput does) recomputes them.
+    galsim.config.RemoveCurrent(config)
+    eval1 = galsim.config.ParseValue(config,'eval1',config, float)[0]
+    np.testing.assert_almost_equal(eval1, math.sqrt(5.))
+
+    # An Eval that does not use any of the per-object variables is safe, but if it uses names
+    # that may not give the same value each time, it is still evaluated again for each object.
+    config['eval6'] = { 'type' : 'Eval', 'str' : 'numpy.random.random()' }
+    eval6_list = []
+    for k in range(3):
+        config['obj_num'] = 20 + k
+        eval6_list.append(galsim.config.ParseValue(config,'eval6',config, float)[0])
+    np.testing.assert_equal(len(set(eval6_list)), 3)
+    np.testing.assert_equal(config['eval6']['current_scope'], 'obj')
+    np.testing.assert_equal(config['eval1']['current_scope'], None)
+
+    # A string that cannot be evaluated raises a ValueError
+    config['eval5'] = { 'type' : 'Eval', 'str' : 'not a valid (expression' }
+    try:
+        np.testing.assert_raises(ValueError, galsim.config.ParseValue, config, 'eval5', config,
+                                 float)
+    except ImportError:
+        print 'The assert_raises tests require nose'
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+
 if __name__ == "__main__":
     test_float_value()
     test_int_value()
@@ -1084,5 +1159,4 @@ if __name__ == "__main__":
     test_angle_value()
     test_shear_value()
     test_pos_value()
-
-
+    test_eval_value()
@@ -1225,6 +1225,147 @@ def test_cosmos_wcs():
     t2 = time.time()
     print 'time for %s = %.2f'%(funcname(), t2 - t1)
 
+def test_apply_to_images():
+    """Test that applyToImages() gives the same noise as applyTo() on each image in turn, and that
+    copies and rescaled versions of a correlated noise object use the stored power spectra.
+    """
+    t1 = time.time()
+
+    ud = galsim.UniformDeviate(rseed)
+    noise_image = make_xcorr_from_uncorr(setup_uncorrelated_noise(ud, largeim_size))
+    cn = galsim.CorrelatedNoise(noise_image, ud, scale=0.1)
+
+    # A mix of shapes (odd and even) and wcs's, with some runs of the same shape and wcs.
+    shapes = [ (smallim_size, smallim_size) ] * 3 + [ (smallim_size_odd, smallim_size) ] * 2 + \
+             [ (smallim_size, smallim_size_odd), (smallim_size_odd, smallim_size_odd) ] + \
+             [ (smallim_size, smallim_size) ] * 2
+    images1 = []
+    images2 = []
+    for k, (nx, ny) in enumerate(shapes):
+        scale = 0.1 if k != 4 else 0.2
+        images1.append(galsim.ImageD(nx, ny, scale=scale))
+        images2.append(galsim.ImageD(nx, ny, scale=scale))
+    cn1 = cn.copy(rng=galsim.BaseDeviate(rseed))
+    cn2 = cn.copy(rng=galsim.BaseDeviate(rseed))
+    for im in images1:
+        im.addNoise(cn1)
+    cn2.applyToImages(images2)
+    for im1, im2 in zip(images1, images2):
+        np.testing.assert_array_almost_equal(
+            im2.array, im1.array, decimal=12,
+            err_msg="applyToImages() gives different noise than applyTo() on each image.")
+    # The rngs should also be left in the same state.
+    np.testing.assert_equal(cn1.rng.serialize(), cn2.rng.serialize(),
+                            err_msg="applyToImages() used a different number of random values.")
+
+    # The copies share the stored power spectra of the original.
+    for shape in shapes:
+        half_shape = (shape[1], shape[0]//2+1)
+        assert any(rootps.shape == half_shape for rootps, wcs in cn._generator._rootps_store)
+
+    # A noise object with a scaled variance uses the scaled power spectra, so with the same rng,
+    # it makes the same noise fields scaled by sqrt(variance_ratio).
+    cn3 = (cn * 2.).copy(rng=galsim.BaseDeviate(rseed))
+    images3 = [ galsim.ImageD(nx, ny, scale=0.1) for (nx, ny) in shapes[:3] ]
+    cn3.applyToImages(images3)
+    for im1, im3 in zip(images1[:3], images3):
+        np.testing.assert_array_almost_equal(
+            im3.array, np.sqrt(2.) * im1.array, decimal=12,
+            err_msg="Scaled correlated noise does not scale the noise fields.")
+    np.testing.assert_almost_equal(
+        cn3.getVariance(), 2. * cn.getVariance(), decimal=12,
+        err_msg="Scaled correlated noise has the wrong variance.")
+
+    # And the fields should be the same as those made from the scaled profile directly.
+    cn4 = galsim.correlatednoise._BaseCorrelatedNoise(
+        galsim.BaseDeviate(rseed), cn._profile * 2., cn.wcs)
+    images4 = [ galsim.ImageD(nx, ny, scale=0.1) for (nx, ny) in shapes[:3] ]
+    cn4.applyToImages(images4)
+    for im3, im4 in zip(images3, images4):
+        np.testing.assert_array_almost_equal(
+            im4.array, im3.array, decimal=7,
+            err_msg="Scaled correlated noise differs from noise made with the scaled profile.")
+
+    # Check invalid inputs
+    try:
+        np.testing.assert_raises(TypeError, cn.applyToImages, [ noise_image, noise_image.array ])
+        np.testing.assert_raises(ValueError, cn.applyToImages, [ galsim.ImageD() ])
+        # None of the images are changed if any of them is invalid.
+        good_image = noise_image.copy()
+        np.testing.assert_raises(TypeError, cn.applyToImages,
+                                 [ good_image, noise_image.array ])
+        np.testing.assert_array_equal(
+            good_image.array, noise_image.array,
+            err_msg="applyToImages() changed an image before finding an invalid one.")
+    except ImportError:
+        print 'The assert_raises tests require nose'
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(), t2 - t1)
+
+def test_kernel_cache():
+    """Test that the whitening and symmetrizing power spectra are reused for noise with the same
+    correlation function up to a scaling of the variance.
+    """
+    t1 = time.time()
+
+    ud = galsim.UniformDeviate(rseed)
+    noise_image = make_xcorr_from_uncorr(setup_uncorrelated_noise(ud, largeim_size))
+    cn = galsim.CorrelatedNoise(noise_image, ud, scale=0.1)
+    psf = galsim.Gaussian(sigma=0.3)
+    shape = (smallim_size, smallim_size)
+    wcs = galsim.PixelScale(0.1)
+
+    # Use a different set of noise objects than any other tests may have used.
+    stats0 = galsim.correlatednoise.getKernelCacheStats()
+    noise1 = cn.withVariance(1.7).convolvedWith(psf).shear(g1=0.1, g2=0.2)
+    rootps1, var1 = noise1._get_update_rootps_whitening(shape, wcs)
+    stats1 = galsim.correlatednoise.getKernelCacheStats()
+    assert stats1['misses'] == stats0['misses'] + 1
+
+    # Built separately, with a different variance.  This should be a cache hit.
+    noise2 = (cn * 2.3).withVariance(4.1).convolvedWith(psf).shear(g1=0.1, g2=0.2)
+    rootps2, var2 = noise2._get_update_rootps_whitening(shape, wcs)
+    stats2 = galsim.correlatednoise.getKernelCacheStats()
+    assert stats2['misses'] == stats1['misses']
+    assert stats2['hits'] == stats1['hits'] + 1
+    np.testing.assert_almost_equal(var2 / var1, 4.1 / 1.7, decimal=10,
+                                   err_msg="Cached whitening variance not scaled correctly.")
+    # And the result should match the direct calculation.
+    rootps2_direct, var2_direct = noise2._calculate_rootps_whitening(shape, wcs)
+    np.testing.assert_almost_equal(var2 / var2_direct, 1., decimal=7,
+                                   err_msg="Cached whitening variance is wrong.")
+    np.testing.assert_array_almost_equal(
+        rootps2 / rootps2_direct.max(), rootps2_direct / rootps2_direct.max(), decimal=7,
+        err_msg="Cached whitening power spectrum is wrong.")
+
+    # So whitening images gives the same noise, scaled by the sqrt of the variance ratio.
+    im1 = galsim.ImageD(shape[1], shape[0], wcs=wcs)
+    im2 = galsim.ImageD(shape[1], shape[0], wcs=wcs)
+    var1 = noise1.copy(rng=galsim.BaseDeviate(rseed)).whitenImage(im1)
+    var2 = noise2.copy(rng=galsim.BaseDeviate(rseed)).whitenImage(im2)
+    np.testing.assert_array_almost_equal(
+        im2.array, np.sqrt(4.1 / 1.7) * im1.array, decimal=10,
+        err_msg="Whitening noise from cached power spectrum not scaled correctly.")
+
+    # A different PSF or a different shape is a different kernel.
+    noise3 = cn.withVariance(1.7).convolvedWith(galsim.Gaussian(sigma=0.35))
+    noise3._get_update_rootps_whitening(shape, wcs)
+    noise1._get_update_rootps_whitening((smallim_size_odd, smallim_size), wcs)
+    stats3 = galsim.correlatednoise.getKernelCacheStats()
+    assert stats3['misses'] == stats2['misses'] + 2
+
+    # Likewise for symmetrizing, which is cached separately for each order.
+    noise1._get_update_rootps_symmetrizing(shape, wcs, 4)
+    noise2._get_update_rootps_symmetrizing(shape, wcs, 4)
+    noise2._get_update_rootps_symmetrizing(shape, wcs, 8)
+    stats4 = galsim.correlatednoise.getKernelCacheStats()
+    assert stats4['misses'] == stats3['misses'] + 2
+    assert stats4['hits'] == stats3['hits'] + 1
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(), t2 - t1)
+
 if __name__ == "__main__":
     test_uncorrelated_noise_zero_lag()
     test_uncorrelated_noise_nonzero_lag()
@@ -1246,4 +1387,6 @@ if __name__ == "__main__":
     test_uncorrelated_noise_tracking()
     test_variance_changes()
     test_cosmos_wcs()
+    test_apply_to_images()
+    test_kernel_cache()
 
@@ -1035,6 +1035,65 @@ def test_offset():
     t2 = time.time()
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
+def test_drawImages():
+    """Test that drawImages gives the same results as drawing each object separately.
+    """
+    import time
+    t1 = time.time()
+
+    psf = galsim.Moffat(beta=3, fwhm=0.7)
+    obj_list = []
+    size_list = []
+    for k in range(6):
+        gal = galsim.Sersic(n=1.5, half_light_radius=0.5+0.1*k).shear(e1=0.1*k, e2=-0.05*k)
+        obj_list.append(galsim.Convolve(gal, psf))
+        # Use a mix of stamp sizes, not in order.
+        size_list.append([32, 48, 32, 64, 48, 32][k])
+    # Also include one object that doesn't need an FFT with method='no_pixel'.
+    obj_list.append(galsim.Gaussian(sigma=1.3))
+    size_list.append(32)
+
+    image_list = [ galsim.ImageD(n, n, scale=0.2) for n in size_list ]
+    workspace = galsim.FFTWorkspace()
+    images = galsim.drawImages(obj_list, image_list, workspace=workspace)
+    assert workspace.getNSizes() > 0
+    for obj, n, im in zip(obj_list, size_list, images):
+        im2 = obj.drawImage(nx=n, ny=n, scale=0.2, dtype=np.float64)
+        np.testing.assert_array_almost_equal(
+                im.array, im2.array, 12,
+                "drawImages gave a different image than drawImage")
+    for im, im1 in zip(images, image_list):
+        assert im is im1
+
+    # Reusing the workspace for another set of draws.
+    images = galsim.drawImages(obj_list, image_list, workspace=workspace, method='no_pixel')
+    for obj, n, im in zip(obj_list, size_list, images):
+        im2 = obj.drawImage(nx=n, ny=n, scale=0.2, dtype=np.float64, method='no_pixel')
+        np.testing.assert_array_almost_equal(
+                im.array, im2.array, 12,
+                "drawImages with method=no_pixel gave a different image than drawImage")
+
+    # Without images, drawImage makes new ones.
+    images = galsim.drawImages(obj_list[:2], scale=0.2)
+    for obj, im in zip(obj_list[:2], images):
+        im2 = obj.drawImage(scale=0.2)
+        np.testing.assert_array_almost_equal(im.array, im2.array, 6)
+
+    # A workspace with max_N = 0 doesn't keep anything.
+    workspace = galsim.FFTWorkspace(max_N=0)
+    im = obj_list[0].drawImage(nx=32, ny=32, scale=0.2, workspace=workspace)
+    np.testing.assert_equal(workspace.getNSizes(), 0)
+    np.testing.assert_array_almost_equal(
+            im.array, obj_list[0].drawImage(nx=32, ny=32, scale=0.2).array, 6)
+
+    try:
+        np.testing.assert_raises(ValueError, galsim.drawImages, obj_list, image_list[:2])
+    except ImportError:
+        print 'The assert_raises tests require nose'
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
 if __name__ == "__main__":
     test_drawImage()
     test_draw_methods()
@@ -1042,3 +1101,4 @@ if __name__ == "__main__":
     test_drawKImage_Gaussian()
     test_drawKImage_Exponential_Moffat()
     test_offset()
+    test_drawImages()
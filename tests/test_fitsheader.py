@@ -217,7 +217,58 @@ def test_dict():
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
 
+def test_header_only():
+    """Test reading just the header of a file and the cache of the headers read from files.
+    """
+    import time
+    t1 = time.time()
+
+    # Write a multi-extension file with a different image size in each hdu.
+    image_list = [ galsim.ImageF(10+k, 20+k, scale=0.1*(k+1)) for k in range(3) ]
+    for ext in [ '', '.gz', '.bz2' ]:
+        file_name = os.path.join('fits_files', 'test_header_only.fits' + ext)
+        galsim.fits.writeMulti(image_list, file_name)
+        for k in range(3):
+            header = galsim.FitsHeader(file_name, hdu=k)
+            assert header['NAXIS1'] == 10+k
+            assert header['NAXIS2'] == 20+k
+
+            hdu_list = pyfits.open(file_name)
+            assert header.keys() == hdu_list[k].header.keys()
+            hdu_list.close()
+
+    # Reading the same header again uses the cache.
+    file_name = os.path.join('fits_files', 'tpv.fits')
+    header1 = galsim.FitsHeader(file_name)
+    hits = galsim.fits._header_cache.hits
+    header2 = galsim.FitsHeader(file_name)
+    assert galsim.fits._header_cache.hits == hits + 1
+    assert header1.items() == header2.items()
+    # But each FitsHeader has its own copy.
+    header2['AIRMASS'] = 2.0
+    header3 = galsim.FitsHeader(file_name)
+    assert header3['AIRMASS'] == 1.185
+
+    # If the file changes, the header is read again.
+    file_name = os.path.join('fits_files', 'test_header_only.fits')
+    galsim.fits.writeMulti(image_list, file_name)
+    header1 = galsim.FitsHeader(file_name)
+    assert header1['NAXIS1'] == 10
+    galsim.fits.write(galsim.ImageF(30, 40), file_name)
+    header2 = galsim.FitsHeader(file_name)
+    assert header2['NAXIS1'] == 30
+
+    try:
+        np.testing.assert_raises(IOError, galsim.FitsHeader, file_name, hdu=1)
+        np.testing.assert_raises(IOError, galsim.FitsHeader, 'not_a_file.fits')
+    except ImportError:
+        print 'The assert_raises tests require nose'
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
 if __name__ == "__main__":
     test_read()
     test_scamp()
     test_dict()
+    test_header_only()
@@ -1794,11 +1794,236 @@ def test_Image_writeheader():
     t2 = time.time()
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
+def test_Image_FITS_bounds():
+    """Test reading only part of an image with the bounds parameter of fits.read, readMulti and
+    readCube.
+    """
+    import time
+    t1 = time.time()
+
+    # The reference images have (xmin,ymin) = (1,1), so pixel (x,y) is ref_array[y-1,x-1].
+    bounds = galsim.BoundsI(2,5,3,4)
+    sub_array = ref_array[2:4,1:5]
+    for ext, compression in [ ('', None), ('', 'none'), ('.gz', 'gzip'), ('.bz2', 'bzip2'),
+                              ('.fz', 'rice') ]:
+        test_file = os.path.join(datadir, "testS.fits" + ext)
+        test_image = galsim.fits.read(test_file, bounds=bounds)
+        np.testing.assert_array_equal(sub_array, test_image.array,
+                err_msg="read with bounds failed for compression = %s"%compression)
+        assert test_image.bounds == bounds
+        test_image = galsim.fits.read(test_file, bounds=bounds, compression=compression)
+        np.testing.assert_array_equal(sub_array, test_image.array,
+                err_msg="read with bounds failed for explicit compression = %s"%compression)
+
+        # The same as the subImage of the full image, including the wcs.
+        full_image = galsim.fits.read(test_file)
+        np.testing.assert_array_equal(full_image[bounds].array, test_image.array)
+        assert test_image.wcs == full_image.wcs
+
+    test_file = os.path.join(datadir, "testS.fits")
+    test_image = galsim.fits.read(test_file, bounds=bounds, memmap=True)
+    np.testing.assert_array_equal(sub_array, test_image.array,
+                                  err_msg="read with bounds and memmap failed")
+    with pyfits.open(test_file) as hdu:
+        test_image = galsim.fits.read(hdu_list=hdu, bounds=bounds)
+    np.testing.assert_array_equal(sub_array, test_image.array,
+                                  err_msg="read with bounds from hdu_list failed")
+
+    # The bounds are in the coordinates of the image in the file.
+    ref_image = galsim.Image(ref_array.astype(np.float32), xmin=-3, ymin=10)
+    test_file = os.path.join(datadir, "test_bounds_internal.fits")
+    ref_image.write(test_file)
+    test_image = galsim.fits.read(test_file, bounds=galsim.BoundsI(-2,1,12,13))
+    np.testing.assert_array_equal(sub_array, test_image.array,
+                                  err_msg="read with bounds failed for non-trivial origin")
+    assert test_image.bounds == galsim.BoundsI(-2,1,12,13)
+
+    # Multi-extension files and cubes
+    for ext in [ '', '.gz', '.fz' ]:
+        test_list = galsim.fits.readMulti(
+                os.path.join(datadir, "test_multiS.fits" + ext), bounds=bounds)
+        test_cube = galsim.fits.readCube(
+                os.path.join(datadir, "test_cubeS.fits" + ext), bounds=bounds)
+        for k in range(nimages):
+            np.testing.assert_array_equal(sub_array+k, test_list[k].array,
+                    err_msg="readMulti with bounds failed for %s"%ext)
+            np.testing.assert_array_equal(sub_array+k, test_cube[k].array,
+                    err_msg="readCube with bounds failed for %s"%ext)
+            assert test_list[k].bounds == bounds
+            assert test_cube[k].bounds == bounds
+
+    # Check invalid bounds
+    try:
+        test_file = os.path.join(datadir, "testS.fits")
+        np.testing.assert_raises(ValueError, galsim.fits.read, test_file,
+                                 bounds=galsim.BoundsI(0,5,3,4))
+        np.testing.assert_raises(ValueError, galsim.fits.read, test_file,
+                                 bounds=galsim.BoundsI(2,8,3,4))
+        np.testing.assert_raises(TypeError, galsim.fits.read, test_file,
+                                 bounds=galsim.BoundsD(2,5,3,4))
+    except ImportError:
+        print 'The assert_raises tests require nose'
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+def test_Image_FITS_nthreads():
+    """Test writing gzip files with several compression threads and the streaming compression
+    methods.
+    """
+    import time
+    t1 = time.time()
+
+    # Make the image big enough that it is compressed in several chunks.
+    big_image = galsim.ImageD(1200, 1000)
+    big_image.array[:,:] = np.arange(1200*1000).reshape(1000,1200) % 1013
+    image_list = [ big_image, big_image * 2. ]
+
+    test_file = os.path.join(datadir, "test_nthreads.fits.gz")
+    galsim.fits.write(big_image, test_file, nthreads=4)
+    test_image = galsim.fits.read(test_file)
+    np.testing.assert_array_equal(big_image.array, test_image.array,
+                                  err_msg="write with nthreads=4 failed")
+
+    galsim.fits.writeMulti(image_list, test_file, compression='gzip', nthreads=3)
+    test_list = galsim.fits.readMulti(test_file, compression='gzip')
+    for k in range(len(image_list)):
+        np.testing.assert_array_equal(image_list[k].array, test_list[k].array,
+                                      err_msg="writeMulti with nthreads=3 failed")
+
+    galsim.fits.writeCube(image_list, test_file, nthreads=2)
+    test_list = galsim.fits.readCube(test_file)
+    for k in range(len(image_list)):
+        np.testing.assert_array_equal(image_list[k].array, test_list[k].array,
+                                      err_msg="writeCube with nthreads=2 failed")
+
+    # Check that the streaming methods give valid files directly.
+    hdu_list = pyfits.HDUList()
+    galsim.fits.writeMulti(image_list, hdu_list=hdu_list)
+    for method, ext in [ (galsim.fits._write_file.gzip_stream, '.gz'),
+                         (galsim.fits._write_file.bz2_stream, '.bz2') ]:
+        test_file = os.path.join(datadir, "test_stream.fits" + ext)
+        if os.path.isfile(test_file):
+            os.remove(test_file)
+        method(hdu_list, test_file)
+        test_list = galsim.fits.readMulti(test_file)
+        for k in range(len(image_list)):
+            np.testing.assert_array_equal(image_list[k].array, test_list[k].array,
+                                          err_msg="%s failed"%method.__name__)
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+def test_Image_FITS_writers():
+    """Test writing multi-extension files and data cubes one image at a time with MultiWriter
+    and CubeWriter.
+    """
+    import time
+    t1 = time.time()
+
+    for i in range(ntypes):
+        array_type = types[i]
+        image_list = []
+        for k in range(nimages):
+            image_list.append(galsim.Image((ref_array+k).astype(array_type), scale=0.3,
+                                           xmin=3, ymin=-2))
+
+        for ext in [ '', '.gz', '.bz2', '.fz' ]:
+            test_multi_file = os.path.join(datadir, "test_writer_multi"+tchar[i]+".fits"+ext)
+            with galsim.fits.MultiWriter(test_multi_file) as writer:
+                for image in image_list:
+                    writer.write(image)
+            test_image_list = galsim.fits.readMulti(test_multi_file)
+            assert len(test_image_list) == nimages
+            for k in range(nimages):
+                np.testing.assert_array_equal(image_list[k].array, test_image_list[k].array,
+                        err_msg="Image"+tchar[i]+" MultiWriter failed for %r"%ext)
+                assert test_image_list[k].bounds == image_list[k].bounds
+                assert test_image_list[k].wcs == image_list[k].wcs
+
+            test_cube_file = os.path.join(datadir, "test_writer_cube"+tchar[i]+".fits"+ext)
+            writer = galsim.fits.CubeWriter(test_cube_file, nimages)
+            for image in image_list:
+                writer.write(image)
+            writer.close()
+            test_image_list = galsim.fits.readCube(test_cube_file)
+            assert len(test_image_list) == nimages
+            for k in range(nimages):
+                np.testing.assert_array_equal(image_list[k].array, test_image_list[k].array,
+                        err_msg="Image"+tchar[i]+" CubeWriter failed for %r"%ext)
+                assert test_image_list[k].bounds == image_list[0].bounds
+
+    # The files should match what writeMulti and writeCube write.
+    galsim.fits.writeCube(image_list, os.path.join(datadir, "test_writer_cube_ref.fits"))
+    with pyfits.open(os.path.join(datadir, "test_writer_cube_ref.fits")) as ref_hdu_list:
+        with pyfits.open(os.path.join(datadir, "test_writer_cube"+tchar[i]+".fits")) as hdu_list:
+            assert hdu_list[0].header['NAXIS3'] == nimages
+            np.testing.assert_array_equal(ref_hdu_list[0].data, hdu_list[0].data)
+
+    # A cube writer that is closed early raises an exception and removes the partial file.
+    try:
+        test_cube_file = os.path.join(datadir, "test_writer_cube_bad.fits")
+        writer = galsim.fits.CubeWriter(test_cube_file, nimages)
+        writer.write(image_list[0])
+        np.testing.assert_raises(IndexError, writer.close)
+        assert not os.path.isfile(test_cube_file)
+        writer = galsim.fits.CubeWriter(test_cube_file, nimages)
+        writer.write(image_list[0])
+        np.testing.assert_raises(IndexError, writer.write, image_list[0][galsim.BoundsI(3,5,-2,0)])
+        writer.abort()
+        assert not os.path.isfile(test_cube_file)
+        np.testing.assert_raises(ValueError, galsim.fits.CubeWriter, test_cube_file, 0)
+
+        # Likewise for a multi-extension writer with no images.
+        test_multi_file = os.path.join(datadir, "test_writer_multi_bad.fits")
+        writer = galsim.fits.MultiWriter(test_multi_file)
+        np.testing.assert_raises(IndexError, writer.close)
+        assert not os.path.isfile(test_multi_file)
+
+        # An IOError while writing an image leaves the file as it was, so the write can be
+        # tried again.
+        def bad_write(image):
+            writer.fout.write('junk')
+            raise IOError('Simulated write error')
+        test_multi_file = os.path.join(datadir, "test_writer_multi_retry.fits")
+        writer = galsim.fits.MultiWriter(test_multi_file)
+        writer.write(image_list[0])
+        writer._write = bad_write
+        np.testing.assert_raises(IOError, writer.write, image_list[1])
+        del writer._write
+        for image in image_list[1:]:
+            writer.write(image)
+        writer.close()
+        test_image_list = galsim.fits.readMulti(test_multi_file)
+        assert len(test_image_list) == nimages
+        for k in range(nimages):
+            np.testing.assert_array_equal(image_list[k].array, test_image_list[k].array,
+                                          err_msg="MultiWriter failed after a retried write")
+
+        # But a compressed file cannot be rewound, so the writer cannot continue.
+        test_multi_file = os.path.join(datadir, "test_writer_multi_retry.fits.gz")
+        writer = galsim.fits.MultiWriter(test_multi_file)
+        writer.write(image_list[0])
+        writer._write = bad_write
+        np.testing.assert_raises(IOError, writer.write, image_list[1])
+        del writer._write
+        np.testing.assert_raises(RuntimeError, writer.write, image_list[1])
+        writer.abort()
+        assert not os.path.isfile(test_multi_file)
+    except ImportError:
+        print 'The assert_raises tests require nose'
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
 if __name__ == "__main__":
     test_Image_basic()
     test_Image_FITS_IO()
     test_Image_MultiFITS_IO()
     test_Image_CubeFITS_IO()
+    test_Image_FITS_bounds()
+    test_Image_FITS_nthreads()
+    test_Image_FITS_writers()
     test_Image_array_view()
     test_Image_binary_add()
     test_Image_binary_subtract()
@@ -1114,6 +1114,203 @@ def test_kround_trip():
     np.testing.assert_array_almost_equal(a_conv_c_img.array, b_conv_c_img.array, 5,
                                          "Convolution of InterpolatedKImage drawn incorrectly.")
 
+def test_table_cache():
+    """Test that InterpolatedImages made from the same image share their tables.
+    """
+    import time
+    t1 = time.time()
+    import cPickle
+
+    scale = 0.18
+    n = 101
+    obj = galsim.Exponential(half_light_radius=2.*scale)
+    im = obj.drawImage(nx=n, ny=n, scale=scale)
+
+    galsim.interpolatedimage.setTableCacheSize(200*1024**2)
+    int_im1 = galsim.InterpolatedImage(im)
+    stats1 = galsim.interpolatedimage.getTableCacheStats()
+
+    # The same image data with a different wcs and flux still uses the same tables.
+    im2 = im.copy()
+    int_im2 = galsim.InterpolatedImage(im2, scale=2.*scale, flux=17.)
+    stats2 = galsim.interpolatedimage.getTableCacheStats()
+    assert stats2['hits'] == stats1['hits'] + 1
+    assert stats2['size'] == stats1['size']
+    assert int_im2._sbii is int_im1._sbii
+    np.testing.assert_almost_equal(int_im2.stepK(), int_im1.stepK() / 2.)
+    np.testing.assert_almost_equal(int_im2.maxK(), int_im1.maxK() / 2.)
+
+    # The drawn images are the same as without the cache.
+    int_im3 = galsim.InterpolatedImage(im2, scale=2.*scale, flux=17., use_cache=False)
+    assert int_im3._sbii is not int_im1._sbii
+    np.testing.assert_almost_equal(int_im3.stepK(), int_im2.stepK())
+    np.testing.assert_almost_equal(int_im3.maxK(), int_im2.maxK())
+    np.testing.assert_array_almost_equal(int_im3.drawImage(method='no_pixel').array,
+                                         int_im2.drawImage(method='no_pixel').array, 10)
+
+    # Different image data, pad_factor, interpolants or gsparams don't.
+    im2 += 1.e-4
+    int_im4 = galsim.InterpolatedImage(im2, scale=2.*scale, flux=17.)
+    int_im5 = galsim.InterpolatedImage(im, pad_factor=2.)
+    int_im6 = galsim.InterpolatedImage(im, x_interpolant='linear')
+    int_im7 = galsim.InterpolatedImage(im, gsparams=galsim.GSParams(maxk_threshold=1.e-4))
+    stats3 = galsim.interpolatedimage.getTableCacheStats()
+    assert stats3['hits'] == stats2['hits']
+    assert stats3['misses'] == stats2['misses'] + 4
+
+    # Pickling carries the Fourier-space table along, so it doesn't need to be recalculated
+    # after unpickling.
+    do_pickle(int_im1, lambda x: x.drawImage(method='no_pixel'))
+    galsim.interpolatedimage.setTableCacheSize(0)
+    assert galsim.interpolatedimage.getTableCacheStats()['size'] == 0
+    int_im8 = cPickle.loads(cPickle.dumps(int_im1))
+    assert int_im8._sbii._hasKData()
+    np.testing.assert_array_equal(int_im8._sbii._getKData().array,
+                                  int_im1._sbii._getKData().array)
+    np.testing.assert_array_almost_equal(int_im8.drawKImage()[0].array,
+                                         int_im1.drawKImage()[0].array, 10)
+    galsim.interpolatedimage.setTableCacheSize(200*1024**2)
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+def test_approximate_maxk():
+    """Test that the approximate maxk calculation is close to the exact one, but not smaller.
+    """
+    import time
+    t1 = time.time()
+
+    scale = 0.18
+    n = 101
+    for obj in [ galsim.Gaussian(sigma=3.*scale),
+                 galsim.Exponential(half_light_radius=2.*scale),
+                 galsim.Exponential(half_light_radius=3.*scale).shear(e1=0.3, e2=-0.2),
+                 galsim.Sersic(n=2.5, half_light_radius=2.5*scale).shift(0.5*scale, 0.3*scale) ]:
+        im = obj.drawImage(nx=n, ny=n, scale=scale)
+        int_im = galsim.InterpolatedImage(im)
+        fast_im = galsim.InterpolatedImage(im, approximate_maxk=True, use_cache=False)
+        assert fast_im._sbii is not int_im._sbii
+        assert not fast_im._sbii._hasKData()
+        # The approximate calculation should be conservative, but not by too much.
+        assert fast_im.maxK() >= int_im.maxK()
+        assert fast_im.maxK() <= 1.3 * int_im.maxK()
+        np.testing.assert_almost_equal(fast_im.stepK(), int_im.stepK())
+
+        # If given a maximum value, it doesn't go above that.
+        max_maxk = 0.5 * int_im.maxK() * scale
+        fast_im2 = galsim.InterpolatedImage(im, approximate_maxk=True, calculate_maxk=max_maxk)
+        assert fast_im2.maxK() <= 0.5 * int_im.maxK() * (1. + 1.e-10)
+
+        # Drawing with the approximate maxk matches drawing with the exact one.
+        psf = galsim.Moffat(beta=3., fwhm=3.*scale)
+        im1 = galsim.Convolve(int_im, psf).drawImage(nx=n, ny=n, scale=scale)
+        im2 = galsim.Convolve(fast_im, psf).drawImage(nx=n, ny=n, scale=scale)
+        np.testing.assert_array_almost_equal(
+            im2.array/im1.array.max(), im1.array/im1.array.max(), 3,
+            err_msg='Image drawn with approximate maxk does not match exact maxk version.')
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+def test_noise_pad_pool():
+    """Test the pool of noise padding fields.
+    """
+    import time
+    t1 = time.time()
+
+    imgfile = 'fits_files/blankimg.fits'
+    im = 1.e2*galsim.fits.read(imgfile)
+    cn = galsim.CorrelatedNoise(im, galsim.BaseDeviate(8675309))
+    var = cn.getVariance()
+    orig_img = galsim.ImageF(40, 40, scale=1.)
+    orig_img.addNoise(cn)
+    pad_size = 256
+
+    galsim.interpolatedimage.setNoisePadPoolSize(4)
+    stats0 = galsim.interpolatedimage.getNoisePadPoolStats()
+    assert stats0['size'] == 0
+    assert stats0['ntiles'] == 4
+
+    # The first one makes the fields, and the rest use them.
+    rng = galsim.BaseDeviate(1234)
+    pads = []
+    for i in range(6):
+        int_im = galsim.InterpolatedImage(orig_img, rng=rng, noise_pad=cn, noise_pad_size=pad_size)
+        pads.append(int_im._pad_image.array.copy())
+    stats1 = galsim.interpolatedimage.getNoisePadPoolStats()
+    assert stats1['size'] == 1
+    assert stats1['misses'] == stats0['misses'] + 1
+    assert stats1['hits'] == stats0['hits'] + 5
+
+    # The objects are still padded with noise of the right variance, and differ from each other.
+    for pad in pads:
+        assert pad.shape == (pad_size, pad_size)
+        np.testing.assert_almost_equal(np.var(pad)/var, 1., decimal=1,
+                                       err_msg='Wrong variance of pooled noise padding')
+    for i in range(1,len(pads)):
+        assert np.any(pads[i] != pads[0])
+
+    # The fields are reused for the same noise with a different variance, scaled to match.
+    cn2 = cn.withVariance(4.*var)
+    int_im = galsim.InterpolatedImage(orig_img, rng=rng, noise_pad=cn2, noise_pad_size=pad_size)
+    stats2 = galsim.interpolatedimage.getNoisePadPoolStats()
+    assert stats2['hits'] == stats1['hits'] + 1
+    np.testing.assert_almost_equal(np.var(int_im._pad_image.array)/(4.*var), 1., decimal=1,
+                                   err_msg='Wrong variance of rescaled pooled noise padding')
+
+    # Using the same rng seed gives the same padding.
+    int_im1 = galsim.InterpolatedImage(orig_img, rng=galsim.BaseDeviate(5), noise_pad=cn,
+                                       noise_pad_size=pad_size)
+    int_im2 = galsim.InterpolatedImage(orig_img, rng=galsim.BaseDeviate(5), noise_pad=cn,
+                                       noise_pad_size=pad_size)
+    np.testing.assert_array_equal(int_im1._pad_image.array, int_im2._pad_image.array)
+
+    # Uncorrelated Gaussian padding also works.
+    int_im = galsim.InterpolatedImage(orig_img, rng=rng, noise_pad=2., noise_pad_size=pad_size)
+    np.testing.assert_almost_equal(np.var(int_im._pad_image.array)/2., 1., decimal=1,
+                                   err_msg='Wrong variance of pooled Gaussian noise padding')
+    assert galsim.interpolatedimage.getNoisePadPoolStats()['size'] == 2
+    assert galsim.interpolatedimage.getNoisePadPoolStats()['nbytes'] == 2 * 4 * pad_size**2 * 8
+
+    # The fields can be removed without turning off the pool.
+    galsim.interpolatedimage.clearNoisePadPool()
+    stats5 = galsim.interpolatedimage.getNoisePadPoolStats()
+    assert stats5['size'] == 0
+    assert stats5['nbytes'] == 0
+    assert stats5['ntiles'] == 4
+
+    # The memory of the stored fields is limited, and the least recently used ones are removed.
+    galsim.interpolatedimage.setNoisePadPoolSize(4, max_bytes=4 * pad_size**2 * 8)
+    int_im = galsim.InterpolatedImage(orig_img, rng=rng, noise_pad=cn, noise_pad_size=pad_size)
+    int_im = galsim.InterpolatedImage(orig_img, rng=rng, noise_pad=2., noise_pad_size=pad_size)
+    stats6 = galsim.interpolatedimage.getNoisePadPoolStats()
+    assert stats6['size'] == 1
+    assert stats6['nbytes'] == 4 * pad_size**2 * 8
+    assert stats6['max_bytes'] == 4 * pad_size**2 * 8
+
+    # Pads that are too large for the pool are made in the normal way.
+    int_im = galsim.InterpolatedImage(orig_img, rng=rng, noise_pad=2.,
+                                      noise_pad_size=2*pad_size)
+    np.testing.assert_almost_equal(np.var(int_im._pad_image.array)/2., 1., decimal=1,
+                                   err_msg='Wrong variance of noise padding too large for pool')
+    stats7 = galsim.interpolatedimage.getNoisePadPoolStats()
+    assert stats7['hits'] == stats6['hits']
+    assert stats7['misses'] == stats6['misses']
+    assert stats7['size'] == 1
+    galsim.interpolatedimage.setNoisePadPoolSize(4, max_bytes=200*1024**2)
+
+    # Setting the size to 0 turns it off.
+    galsim.interpolatedimage.setNoisePadPoolSize(0)
+    assert galsim.interpolatedimage.getNoisePadPoolStats()['size'] == 0
+    stats3 = galsim.interpolatedimage.getNoisePadPoolStats()
+    int_im = galsim.InterpolatedImage(orig_img, rng=rng, noise_pad=cn, noise_pad_size=pad_size)
+    stats4 = galsim.interpolatedimage.getNoisePadPoolStats()
+    assert stats4['hits'] == stats3['hits']
+    assert stats4['misses'] == stats3['misses']
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
 if __name__ == "__main__":
     test_roundtrip()
     test_fluxnorm()
@@ -1131,3 +1328,6 @@ if __name__ == "__main__":
     test_conserve_dc()
     test_stepk_maxk()
     test_kround_trip()
+    test_table_cache()
+    test_approximate_maxk()
+    test_noise_pad_pool()
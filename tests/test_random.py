@@ -1652,6 +1652,281 @@ def test_permute():
     t2 = time.time()
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
+def test_generate():
+    """Test that generate() gives the same values as repeated single calls."""
+    import time
+    t1 = time.time()
+
+    deviates = [
+        galsim.UniformDeviate(testseed),
+        galsim.GaussianDeviate(testseed, mean=gMean, sigma=gSigma),
+        galsim.BinomialDeviate(testseed, N=bN, p=bp),
+        galsim.PoissonDeviate(testseed, mean=pMean),
+        galsim.WeibullDeviate(testseed, a=1.3, b=4.0),
+        galsim.GammaDeviate(testseed, k=1.5, theta=4.5),
+        galsim.Chi2Deviate(testseed, n=30),
+    ]
+    for dev in deviates:
+        dev2 = dev.duplicate()
+        # Use an odd length to check that the GaussianDeviate cache is handled correctly.
+        a1 = np.empty(7)
+        dev.generate(a1)
+        a2 = np.array([ dev2() for i in range(7) ])
+        np.testing.assert_array_equal(
+            a1, a2, err_msg="%s.generate gave different values than repeated calls"%dev)
+        # The next values should also match.
+        np.testing.assert_equal(
+            dev(), dev2(), err_msg="%s.generate left the rng in a different state"%dev)
+
+        # 2-d arrays are filled in C order, and other types are converted.
+        a3 = np.empty((3,4))
+        dev.generate(a3)
+        a4 = np.array([ dev2() for i in range(12) ]).reshape(3,4)
+        np.testing.assert_array_equal(
+            a3, a4, err_msg="%s.generate gave different values for a 2-d array"%dev)
+        a5 = np.empty((4,3), dtype=np.float32).T
+        dev.generate(a5)
+        a6 = np.array([ dev2() for i in range(12) ]).reshape(3,4).astype(np.float32)
+        np.testing.assert_array_equal(
+            a5, a6, err_msg="%s.generate gave different values for a float32 array"%dev)
+
+    # generate_from_variance uses a unit Gaussian scaled by the sqrt of each variance.
+    gd = galsim.GaussianDeviate(testseed, mean=gMean, sigma=gSigma)
+    gd2 = galsim.GaussianDeviate(gd.duplicate())
+    var = np.array([ 0.1, 1., 4., 9., 16., 0. ])
+    a7 = var.copy()
+    gd.generate_from_variance(a7)
+    a8 = np.array([ gd2() for i in range(len(var)) ]) * np.sqrt(var)
+    np.testing.assert_array_almost_equal(
+        a7, a8, precision, err_msg="GaussianDeviate.generate_from_variance gave wrong values")
+
+    # With an odd number of values, and with a cached second value pending from a single call,
+    # generate_from_variance should still use the same stream as the single calls.
+    gd = galsim.GaussianDeviate(testseed)
+    gd2 = gd.duplicate()
+    var = np.array([ 0.3, 2., 5., 1.7, 0.9 ])
+    for k in range(4):
+        np.testing.assert_equal(gd(), gd2(), err_msg="GaussianDeviate calls got out of sync")
+        a11 = var.copy()
+        gd.generate_from_variance(a11)
+        a12 = np.array([ gd2() for i in range(len(var)) ]) * np.sqrt(var)
+        np.testing.assert_array_almost_equal(
+            a11, a12, precision,
+            err_msg="GaussianDeviate.generate_from_variance with odd N gave wrong values")
+        a13 = np.empty(3)
+        gd.generate(a13)
+        a14 = np.array([ gd2() for i in range(3) ])
+        np.testing.assert_array_equal(
+            a13, a14, err_msg="GaussianDeviate.generate interleaved with single calls failed")
+    np.testing.assert_equal(
+        gd(), gd2(), err_msg="generate_from_variance left the rng in a different state")
+
+    # rand_arr should give the same values as generate.
+    gd = galsim.GaussianDeviate(testseed)
+    a9 = galsim.utilities.rand_arr((3,4), gd)
+    gd.seed(testseed)
+    a10 = np.empty((3,4))
+    gd.generate(a10)
+    np.testing.assert_array_equal(a9, a10, err_msg="rand_arr disagrees with generate")
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+def test_dist_generate():
+    """Test DistDeviate.generate and the alias method option."""
+    import time
+    t1 = time.time()
+
+    for function in [ dLookupTable, dLookupTableFile ]:
+        d = galsim.DistDeviate(testseed, function=function)
+        d2 = d.duplicate()
+        a1 = np.empty(3)
+        d.generate(a1)
+        np.testing.assert_array_almost_equal(
+                a1, np.array(dLookupTableResult), precision,
+                err_msg='Wrong DistDeviate random number sequence from generate')
+        a2 = np.empty((5,7))
+        d.generate(a2)
+        a3 = np.array([ d2() for i in range(3+35) ])
+        np.testing.assert_array_equal(
+                a2.flatten(), a3[3:],
+                err_msg='DistDeviate.generate does not match repeated calls')
+        np.testing.assert_equal(d(), d2(), err_msg='DistDeviate.generate left a different state')
+
+    # The alias method draws from the same distribution, but gives different values.
+    d = galsim.DistDeviate(testseed, function=dfunction, x_min=dmin, x_max=dmax)
+    da = galsim.DistDeviate(testseed, function=dfunction, x_min=dmin, x_max=dmax, use_alias=True)
+    vals = np.empty(nvals)
+    da.generate(vals)
+    mean = np.mean(vals)
+    var = np.var(vals)
+    mu = 3./2.
+    v = 3./20.
+    print 'alias: mean = ',mean,'  true mean = ',mu
+    print 'alias: var = ',var,'   true var = ',v
+    np.testing.assert_almost_equal(mean, mu, 1,
+            err_msg='Wrong mean from DistDeviate random numbers using alias method')
+    np.testing.assert_almost_equal(var, v, 1,
+            err_msg='Wrong variance from DistDeviate random numbers using alias method')
+    assert np.all(vals >= dmin) and np.all(vals <= dmax)
+    d.seed(testseed)
+    da.seed(testseed)
+    assert (da(), da(), da()) != (d(), d(), d())
+
+    # val(p) is the same either way.
+    for p in [ 0., 0.1, 0.5, 0.77, 1. ]:
+        np.testing.assert_almost_equal(da.val(p), d.val(p), precision,
+                err_msg='DistDeviate.val(%f) differs with use_alias=True'%p)
+
+    # Check picklability
+    do_pickle(da, lambda x: (x(), x(), x(), x()))
+    do_pickle(da)
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+def test_split():
+    """Test the split and discard methods of the deviates.
+    """
+    import time
+    t1 = time.time()
+
+    rng = galsim.BaseDeviate(testseed)
+    assert not rng.isCounterBased()
+    u1 = galsim.UniformDeviate(rng.split(7))
+    assert u1.isCounterBased()
+    v1 = [ u1() for i in range(10) ]
+
+    # The split stream doesn't depend on the state of the parent.
+    ud = galsim.UniformDeviate(rng)
+    ud(); ud()
+    u2 = galsim.UniformDeviate(rng.split(7))
+    v2 = [ u2() for i in range(10) ]
+    np.testing.assert_array_equal(v1, v2, err_msg='split stream depends on the parent state')
+    u3 = galsim.UniformDeviate(galsim.BaseDeviate(testseed).split(7))
+    v3 = [ u3() for i in range(10) ]
+    np.testing.assert_array_equal(v1, v3, err_msg='split stream differs for the same seed')
+
+    # Different keys or seeds give different streams.
+    for dev in [ rng.split(8), rng.split(-7), galsim.BaseDeviate(testseed+1).split(7),
+                 rng.split('psf'), rng.split(7, 0) ]:
+        u4 = galsim.UniformDeviate(dev)
+        v4 = [ u4() for i in range(10) ]
+        assert not np.any(np.array(v1) == np.array(v4))
+
+    # Multiple keys are the same as repeated splits.  String keys work too.
+    u5 = galsim.UniformDeviate(rng.split(1, 2, 'gal'))
+    u6 = galsim.UniformDeviate(rng.split(1).split(2).split('gal'))
+    np.testing.assert_array_equal([ u5() for i in range(10) ], [ u6() for i in range(10) ],
+                                  err_msg='split with several keys differs from repeated splits')
+    np.testing.assert_raises(TypeError, rng.split)
+
+    # discard is the same as drawing values.  For a UniformDeviate, one value each.
+    for dev in [ rng.split(3), galsim.BaseDeviate(testseed) ]:
+        u7 = galsim.UniformDeviate(dev.duplicate())
+        u8 = galsim.UniformDeviate(dev.duplicate())
+        for i in range(10): u7()
+        u8.discard(10)
+        np.testing.assert_equal(u7(), u8(), err_msg='discard not equivalent to drawing values')
+    u9 = galsim.UniformDeviate(rng.split(3))
+    u9.discard(2**40)
+    assert 0. <= u9() < 1.
+
+    # The split streams have the right statistics.
+    gd = galsim.GaussianDeviate(rng.split(99), mean=3., sigma=2.)
+    vals = np.empty(nvals)
+    gd.generate(vals)
+    np.testing.assert_almost_equal(np.mean(vals), 3., 1,
+            err_msg='Wrong mean from GaussianDeviate using split stream')
+    np.testing.assert_almost_equal(np.std(vals), 2., 1,
+            err_msg='Wrong sigma from GaussianDeviate using split stream')
+
+    # Reseeding a split stream keeps it counter-based.
+    u10 = galsim.UniformDeviate(rng.split(5))
+    u10.seed(testseed)
+    assert u10.isCounterBased()
+    assert u10() != galsim.UniformDeviate(testseed)()
+
+    # Check that the state is preserved in duplicates and pickles.
+    u11 = galsim.UniformDeviate(rng.split(11))
+    u11(); u11(); u11()
+    u12 = u11.duplicate()
+    u13 = galsim.UniformDeviate(u11.serialize())
+    np.testing.assert_array_equal([ u11() for i in range(10) ], [ u12() for i in range(10) ],
+                                  err_msg='Duplicate of split stream gives different values')
+    np.testing.assert_array_equal([ u13() for i in range(10) ], [ u12() for i in range(10) ],
+                                  err_msg='Serialized split stream gives different values')
+    do_pickle(u11, lambda x: (x(), x(), x(), x()))
+    do_pickle(u11)
+    do_pickle(rng.split(12))
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+def test_fast_poisson_noise():
+    """Test the fast option of PoissonNoise and CCDNoise
+    """
+    import time
+    t1 = time.time()
+
+    sky_level = 100.
+    gain = 1.7
+    read_noise = 3.
+    image = galsim.ImageD(200, 200)
+    image.array[90:110, 90:110] = 5.e3   # A bright object to use the non-sky pixels too.
+
+    for noise_class, kwargs, var in [
+            (galsim.PoissonNoise, {}, sky_level),
+            (galsim.CCDNoise, { 'gain' : gain, 'read_noise' : read_noise },
+             (sky_level + read_noise**2) / gain) ]:
+        rng = galsim.BaseDeviate(testseed)
+        noise = noise_class(rng, sky_level=sky_level, fast=True, **kwargs)
+        assert noise.fast
+        im1 = image.copy()
+        im1.addNoise(noise)
+        sky_pix = np.ones(im1.array.shape, dtype=bool)
+        sky_pix[90:110, 90:110] = False
+        np.testing.assert_almost_equal(
+                np.mean(im1.array[sky_pix]) / var, 0., 1,
+                err_msg='Wrong mean with %s fast=True'%noise_class.__name__)
+        np.testing.assert_almost_equal(
+                np.var(im1.array[sky_pix]) / var, 1., 1,
+                err_msg='Wrong variance with %s fast=True'%noise_class.__name__)
+        np.testing.assert_almost_equal(
+                np.mean(im1.array[~sky_pix]) / 5.e3, 1., 1,
+                err_msg='Wrong mean of object with %s fast=True'%noise_class.__name__)
+
+        # The results are deterministic for a given seed, but different from the normal ones.
+        im2 = image.copy()
+        rng.seed(testseed)
+        im2.addNoise(noise)
+        np.testing.assert_array_equal(im1.array, im2.array,
+                err_msg='%s fast=True not deterministic'%noise_class.__name__)
+        im3 = image.copy()
+        rng.seed(testseed)
+        im3.addNoise(noise_class(rng, sky_level=sky_level, **kwargs))
+        assert np.any(im1.array != im3.array)
+
+        # With a low max_poisson, the bright pixels use the Gaussian approximation.
+        rng.seed(testseed)
+        noise = noise_class(rng, sky_level=sky_level, max_poisson=1000., **kwargs)
+        np.testing.assert_equal(noise.max_poisson, 1000.)
+        im4 = image.copy()
+        im4.addNoise(noise)
+        np.testing.assert_almost_equal(
+                np.mean(im4.array[~sky_pix]) / 5.e3, 1., 1,
+                err_msg='Wrong mean of object with %s max_poisson'%noise_class.__name__)
+
+        # Check that the new parameters are kept by copy, withVariance and pickling.
+        noise = noise_class(rng, sky_level=sky_level, max_poisson=1000., fast=True, **kwargs)
+        for noise2 in [ noise.copy(), noise.withScaledVariance(2.) ]:
+            np.testing.assert_equal(noise2.max_poisson, 1000.)
+            assert noise2.fast
+        do_pickle(noise)
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
 if __name__ == "__main__":
     test_uniform()
     test_gaussian()
@@ -1666,3 +1941,7 @@ if __name__ == "__main__":
     test_multiprocess()
     test_addnoisesnr()
     test_permute()
+    test_generate()
+    test_dist_generate()
+    test_split()
+    test_fast_poisson_noise()
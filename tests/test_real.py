@@ -202,6 +202,118 @@ def test_real_galaxy_saved():
     t2 = time.time()
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
+def test_packed_catalog():
+    """Test that a RealGalaxyCatalog with a packed image file gives the same images.
+    """
+    import time
+    t1 = time.time()
+
+    rgc = galsim.RealGalaxyCatalog(catalog_file, image_dir)
+    packed_file = os.path.join(image_dir, 'test_packed_images.npy')
+    rgc.writePackedImages(packed_file)
+    packed_rgc = galsim.RealGalaxyCatalog(catalog_file, image_dir, packed_file=packed_file)
+    assert packed_rgc != rgc
+
+    # The pixel data after the index has its own header, which starts with the magic string.
+    with open(packed_file, 'rb') as fin:
+        np.lib.format.read_array(fin)
+        assert fin.read(6) == '\x93NUMPY'
+
+    for i in range(rgc.getNObjects()):
+        gal = rgc.getGal(i)
+        packed_gal = packed_rgc.getGal(i)
+        assert packed_gal.bounds == gal.bounds
+        assert packed_gal.scale == gal.scale
+        np.testing.assert_array_equal(packed_gal.array, gal.array.astype(np.float32),
+                                      err_msg='Packed galaxy image does not match original')
+        psf = rgc.getPSF(i)
+        packed_psf = packed_rgc.getPSF(i)
+        assert packed_psf.bounds == psf.bounds
+        np.testing.assert_array_equal(packed_psf.array, psf.array.astype(np.float32),
+                                      err_msg='Packed PSF image does not match original')
+
+    # The images are read-only views into the memory mapped file.
+    assert not packed_gal.array.flags.writeable
+
+    # A relative name is taken to be in the image directory.
+    packed_rgc2 = galsim.RealGalaxyCatalog(catalog_file, image_dir,
+                                           packed_file='test_packed_images.npy')
+    assert packed_rgc2 == packed_rgc
+
+    # RealGalaxy objects are the same either way.
+    rg = galsim.RealGalaxy(rgc, index=ind_real)
+    packed_rg = galsim.RealGalaxy(packed_rgc, index=ind_real)
+    psf = galsim.Gaussian(sigma=1.7)
+    im = galsim.Convolve([rg,psf]).drawImage(nx=20, ny=20, scale=0.7)
+    packed_im = galsim.Convolve([packed_rg,psf]).drawImage(nx=20, ny=20, scale=0.7)
+    np.testing.assert_array_almost_equal(packed_im.array/im.array.max(), im.array/im.array.max(),
+                                         5, err_msg='RealGalaxy from packed images does not match')
+
+    do_pickle(packed_rgc, lambda x: [ x.getGal(ind_real), x.getPSF(ind_real) ])
+    do_pickle(packed_rgc)
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+def test_real_galaxy_kimage_cache():
+    """Test RealGalaxy with cache_kimage=True against the normal RealGalaxy.
+    """
+    import time
+    t1 = time.time()
+
+    rgc = galsim.RealGalaxyCatalog(catalog_file, image_dir)
+    rg = galsim.RealGalaxy(rgc, index=ind_real)
+    rg1 = galsim.RealGalaxy(rgc, index=ind_real, cache_kimage=True)
+    hits = galsim.real._real_galaxy_cache.hits
+    rg2 = galsim.RealGalaxy(rgc, index=ind_real, cache_kimage=True)
+    assert galsim.real._real_galaxy_cache.hits == hits + 1
+    assert rg2._deconvolved is rg1._deconvolved
+    assert rg2.original_gal is rg1.original_gal
+    assert rg._deconvolved is None
+
+    # A different flux rescales the stored profile.
+    rg3 = galsim.RealGalaxy(rgc, index=ind_real, flux=17., cache_kimage=True)
+    assert galsim.real._real_galaxy_cache.hits == hits + 2
+    np.testing.assert_almost_equal(rg3.getFlux(), 17., 5)
+    np.testing.assert_almost_equal(rg1.getFlux(), rg.getFlux(), 5)
+
+    # The drawn images match the normal RealGalaxy, including after shearing and rotating.
+    psf = galsim.Gaussian(sigma=1.7)
+    for g1, g2, theta in [ (0., 0., 0.), (0.05, -0.03, 0.), (0.02, 0.04, 90.), (0., 0., 37.) ]:
+        gal = rg.shear(g1=g1, g2=g2).rotate(theta * galsim.degrees)
+        gal1 = rg1.shear(g1=g1, g2=g2).rotate(theta * galsim.degrees)
+        im = galsim.Convolve([gal, psf]).drawImage(nx=20, ny=20, scale=0.7)
+        im1 = galsim.Convolve([gal1, psf]).drawImage(nx=20, ny=20, scale=0.7)
+        np.testing.assert_array_almost_equal(
+            im1.array/im.array.max(), im.array/im.array.max(), 3,
+            err_msg='RealGalaxy with cache_kimage does not match the normal RealGalaxy')
+
+    # A catalog that only differs in its image_dir doesn't use the same cached profile.
+    image_dir2 = os.path.join('output','real_images_x2')
+    if not os.path.isdir(image_dir2): os.makedirs(image_dir2)
+    for file_name in set(rgc.gal_file_name + rgc.psf_file_name):
+        images = [ im * 2. for im in galsim.fits.readMulti(file_name) ]
+        galsim.fits.writeMulti(images, os.path.join(image_dir2, os.path.basename(file_name)))
+    rgc2 = galsim.RealGalaxyCatalog(catalog_file, image_dir2)
+    misses = galsim.real._real_galaxy_cache.misses
+    rg5 = galsim.RealGalaxy(rgc2, index=ind_real, cache_kimage=True)
+    assert galsim.real._real_galaxy_cache.misses == misses + 1
+    assert rg5._deconvolved is not rg1._deconvolved
+    np.testing.assert_almost_equal(rg5.getFlux() / rg1.getFlux(), 2., 5)
+
+    # Noise-padded galaxies don't use the cache.
+    rg4 = galsim.RealGalaxy(rgc, index=ind_real, noise_pad_size=5., cache_kimage=True,
+                            rng=galsim.BaseDeviate(1234))
+    assert rg4._deconvolved is None
+
+    do_pickle(rg1, lambda x: galsim.Convolve([x,psf]).drawImage(nx=20, ny=20, scale=0.7))
+    do_pickle(rg1)
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
 if __name__ == "__main__":
     test_real_galaxy_ideal()
     test_real_galaxy_saved()
+    test_packed_catalog()
+    test_real_galaxy_kimage_cache()
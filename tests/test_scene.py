@@ -100,6 +100,55 @@ def test_cosmos_fluxnorm():
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
 
+def test_cosmos_bulk_parametric():
+    """Check that makeParametricGalaxies matches makeGalaxy for parametric galaxies."""
+    import time
+    t1 = time.time()
+
+    cat = galsim.COSMOSCatalog(file_name='real_galaxy_catalog_example.fits',
+                               dir=datapath)
+    indices = np.arange(min(cat.nobjects, 20))
+    psf = galsim.Airy(diam=1.2, lam=800.)
+    bp_file = os.path.join(galsim.meta_data.share_dir, 'wfc_F814W.dat.gz')
+    bandpass = galsim.Bandpass(bp_file, wave_type='ang').thin().withZeropoint(25.94)
+
+    for chromatic in [False, True]:
+        for deep in [False, True]:
+            gal_list = cat.makeGalaxy(indices, gal_type='parametric', chromatic=chromatic,
+                                      deep=deep)
+            gen = cat.makeParametricGalaxies(indices, chromatic=chromatic, deep=deep)
+            bulk_list = list(gen)
+            np.testing.assert_array_equal([ i for i, gal in bulk_list ], indices)
+            for gal1, (i, gal2) in zip(gal_list, bulk_list):
+                if chromatic:
+                    im1 = galsim.Convolve(gal1, psf).drawImage(bandpass, nx=32, ny=32, scale=0.1)
+                    im2 = galsim.Convolve(gal2, psf).drawImage(bandpass, nx=32, ny=32, scale=0.1)
+                else:
+                    im1 = galsim.Convolve(gal1, psf).drawImage(nx=32, ny=32, scale=0.1)
+                    im2 = galsim.Convolve(gal2, psf).drawImage(nx=32, ny=32, scale=0.1)
+                np.testing.assert_allclose(
+                    im2.array, im1.array, rtol=1.e-5, atol=1.e-8*im1.array.max(),
+                    err_msg='makeParametricGalaxies does not match makeGalaxy for index %d'%i)
+
+    # The default is all the galaxies in the catalog.
+    all_gals = list(cat.makeParametricGalaxies())
+    assert len(all_gals) == cat.nobjects
+
+    # Check the flux and size cuts.
+    records = cat.param_cat[cat.orig_index]
+    flux = 10.**(-0.4*(records['mag_auto'] - 25.94))
+    hlr = records['sersicfit'][:,1] * galsim.scene.cosmos_pix_scale
+    min_flux = np.median(flux)
+    max_hlr = np.median(hlr)
+    cut_gals = list(cat.makeParametricGalaxies(min_flux=min_flux, max_hlr=max_hlr))
+    expected = np.arange(cat.nobjects)[(flux >= min_flux) & (hlr <= max_hlr)]
+    np.testing.assert_array_equal([ i for i, gal in cut_gals ], expected)
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+
 if __name__ == "__main__":
     test_cosmos_basic()
     test_cosmos_fluxnorm()
+    test_cosmos_bulk_parametric()
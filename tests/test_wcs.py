@@ -200,6 +200,32 @@ def do_wcs_pos(wcs, ufunc, vfunc, name, x0=0, y0=0):
         except NotImplementedError:
             pass
 
+    # Check the versions that take arrays of positions.
+    x_array = np.array(x_list) + x0
+    y_array = np.array(y_list) + y0
+    u_array, v_array = wcs.toWorld(x_array, y_array)
+    np.testing.assert_array_almost_equal(
+            u_array, u_list, digits2, 'wcs.toWorld(x,y) returned wrong u values for '+name)
+    np.testing.assert_array_almost_equal(
+            v_array, v_list, digits2, 'wcs.toWorld(x,y) returned wrong v values for '+name)
+    u2, v2 = wcs.xyTouv(x_array[0], y_array[0])
+    np.testing.assert_almost_equal(
+            u2, u_array[0], 12, 'wcs.xyTouv returned wrong value for scalar x,y for '+name)
+    np.testing.assert_almost_equal(
+            v2, v_array[0], 12, 'wcs.xyTouv returned wrong value for scalar x,y for '+name)
+    try:
+        x2, y2 = wcs.toImage(u_array, v_array)
+        scale = np.array([ wcs.maxLinearScale(galsim.PositionD(x,y))
+                           for x,y in zip(x_array, y_array) ])
+        np.testing.assert_array_almost_equal(
+                x2*scale, x_array*scale, digits2,
+                'wcs.toImage(u,v) returned wrong x values for '+name)
+        np.testing.assert_array_almost_equal(
+                y2*scale, y_array*scale, digits2,
+                'wcs.toImage(u,v) returned wrong y values for '+name)
+    except NotImplementedError:
+        pass
+
     if x0 == 0 and y0 == 0:
         # The last item in list should also work as a PositionI
         image_pos = galsim.PositionI(x,y)
@@ -700,6 +726,15 @@ def do_celestial_wcs(wcs, name, test_pickle=True):
     # Check picklability
     if test_pickle: do_pickle(wcs)
 
+    # Check that the array version of toWorld matches the single position version.
+    ra, dec = wcs.toWorld(np.array(all_x_list), np.array(all_y_list), units=galsim.degrees)
+    for x0,y0,ra0,dec0 in zip(all_x_list, all_y_list, ra, dec):
+        world_pos = wcs.toWorld(galsim.PositionD(x0,y0))
+        world_pos2 = galsim.CelestialCoord(ra0*galsim.degrees, dec0*galsim.degrees)
+        np.testing.assert_almost_equal(
+                world_pos2.distanceTo(world_pos) / galsim.arcsec, 0, digits2,
+                'wcs.toWorld(x,y) returned wrong world position for '+name)
+
     for x0,y0 in zip(near_x_list, near_y_list):
         #print 'x0,y0 = ',x0,y0
         image_pos = galsim.PositionD(x0,y0)
@@ -1551,6 +1586,29 @@ def do_ref(wcs, ref_list, name, approx=False, image=None):
             np.testing.assert_almost_equal(image(x,y), val, digits,
                                            'image(x,y) differed from reference value')
 
+    # Check the versions that take arrays of positions.
+    ref_ra = np.array([ galsim.HMS_Angle(ref[0]) / galsim.degrees for ref in ref_list ])
+    ref_dec = np.array([ galsim.DMS_Angle(ref[1]) / galsim.degrees for ref in ref_list ])
+    ref_x = np.array([ ref[2] for ref in ref_list ])
+    ref_y = np.array([ ref[3] for ref in ref_list ])
+    ra, dec = wcs.toWorld(ref_x, ref_y, units=galsim.degrees)
+    # Wrap the differences in ra, in case the reference values are on the other side of 0.
+    dra = (ra - ref_ra + 180.) % 360. - 180.
+    np.testing.assert_array_almost_equal(
+            dra * np.cos(ref_dec * galsim.degrees / galsim.radians) * 3600., 0., digits2,
+            'wcs.toWorld(x,y) returned wrong ra values for '+name)
+    np.testing.assert_array_almost_equal(
+            (dec - ref_dec) * 3600., 0., digits2,
+            'wcs.toWorld(x,y) returned wrong dec values for '+name)
+
+    x, y = wcs.toImage(ref_ra, ref_dec, units=galsim.degrees)
+    pixel_scale = np.array([ wcs.minLinearScale(galsim.PositionD(x1,y1))
+                             for x1,y1 in zip(ref_x, ref_y) ])
+    np.testing.assert_array_almost_equal((x-ref_x)*pixel_scale, 0., digits2,
+                                         'wcs.toImage(ra,dec) returned wrong x values')
+    np.testing.assert_array_almost_equal((y-ref_y)*pixel_scale, 0., digits2,
+                                         'wcs.toImage(ra,dec) returned wrong y values')
+
 def test_astropywcs():
     """Test the AstropyWCS class
     """
@@ -1695,6 +1753,27 @@ def test_gsfitswcs():
 
         do_ref(wcs, ref_list, 'GSFitsWCS '+tag)
 
+        # Check the round trip for a large array of positions, which uses the vectorized
+        # inverse of the distortions.
+        ref_x = [ ref[2] for ref in ref_list ]
+        ref_y = [ ref[3] for ref in ref_list ]
+        x, y = np.meshgrid(np.linspace(min(ref_x), max(ref_x), 40),
+                           np.linspace(min(ref_y), max(ref_y), 40))
+        ra, dec = wcs.toWorld(x, y)
+        x2, y2 = wcs.toImage(ra, dec)
+        np.testing.assert_array_almost_equal(x2, x, 6, 'GSFitsWCS toImage(ra,dec) failed for '+tag)
+        np.testing.assert_array_almost_equal(y2, y, 6, 'GSFitsWCS toImage(ra,dec) failed for '+tag)
+        # The second time uses the stored approximate inverse for the initial guess.
+        x3, y3 = wcs.toImage(ra[::3,::3], dec[::3,::3])
+        np.testing.assert_array_almost_equal(x3, x[::3,::3], 6,
+                                             'GSFitsWCS toImage(ra,dec) failed for '+tag)
+        np.testing.assert_array_almost_equal(y3, y[::3,::3], 6,
+                                             'GSFitsWCS toImage(ra,dec) failed for '+tag)
+        # And the single position version should agree.
+        pos = wcs.toImage(galsim.CelestialCoord(ra[3,5]*galsim.radians, dec[3,5]*galsim.radians))
+        np.testing.assert_almost_equal(pos.x, x2[3,5], 8, 'GSFitsWCS toImage failed for '+tag)
+        np.testing.assert_almost_equal(pos.y, y2[3,5], 8, 'GSFitsWCS toImage failed for '+tag)
+
         do_celestial_wcs(wcs, 'GSFitsWCS '+file_name)
 
         do_wcs_image(wcs, 'GSFitsWCS_'+tag)
@@ -1819,6 +1898,92 @@ def test_scamp():
     print 'time for %s = %.2f'%(funcname(),t2-t1)
 
 
+def test_local_grid():
+    """Test the withLocalGrid option for non-uniform WCS types.
+    """
+    import time
+    t1 = time.time()
+
+    ufunc = lambda x,y: 0.2*x - 0.01*y + 3.e-5*x*x - 2.e-5*x*y + 1.e-8*y*y*y
+    vfunc = lambda x,y: 0.01*x + 0.2*y - 1.e-5*y*y + 4.e-5*x*y - 2.e-8*x*x*y
+    uv_wcs = galsim.UVFunction(ufunc, vfunc, origin=galsim.PositionD(23,45))
+    fits_wcs = galsim.GSFitsWCS('tpv.fits', dir='fits_files')
+    bounds = galsim.BoundsI(-20, 500, 30, 800)
+
+    ud = galsim.UniformDeviate(1234)
+    for wcs, name in [ (uv_wcs, 'UVFunction'), (fits_wcs, 'GSFitsWCS') ]:
+        for max_error in [ 1.e-4, 1.e-6 ]:
+            grid_wcs = wcs.withLocalGrid(bounds, max_error=max_error)
+            print name,'max_error = ',max_error,'estimated error = ',grid_wcs.local_grid_error
+            assert grid_wcs.local_grid_error <= max_error
+            assert wcs.local_grid_error is None
+            assert grid_wcs == wcs
+
+            for k in range(20):
+                image_pos = galsim.PositionD(bounds.xmin - 0.5 + ud() * (bounds.xmax-bounds.xmin+1),
+                                             bounds.ymin - 0.5 + ud() * (bounds.ymax-bounds.ymin+1))
+                jac1 = wcs.jacobian(image_pos)
+                jac2 = grid_wcs.jacobian(image_pos)
+                scale = np.sqrt(jac1.pixelArea())
+                np.testing.assert_array_less(
+                    np.abs(jac2.getMatrix() - jac1.getMatrix()).max(), max_error * scale,
+                    'withLocalGrid jacobian is not accurate enough for %s'%name)
+
+            # Outside of the bounds, or with world_pos, local is calculated directly.
+            image_pos = galsim.PositionD(bounds.xmax + 3.7, bounds.ymin + 13.2)
+            np.testing.assert_array_equal(
+                grid_wcs.jacobian(image_pos).getMatrix(), wcs.jacobian(image_pos).getMatrix(),
+                'withLocalGrid jacobian outside bounds does not match for %s'%name)
+            world_pos = wcs.toWorld(galsim.PositionD(100.3, 213.6))
+            np.testing.assert_array_equal(
+                grid_wcs.jacobian(world_pos=world_pos).getMatrix(),
+                wcs.jacobian(world_pos=world_pos).getMatrix(),
+                'withLocalGrid jacobian with world_pos does not match for %s'%name)
+
+        # Drawing with the grid should give essentially the same image.
+        obj = galsim.Gaussian(sigma=2.3, flux=100).shear(g1=0.2, g2=-0.1)
+        stamp_bounds = galsim.BoundsI(215,246,366,397)
+        im1 = galsim.ImageD(bounds, wcs=wcs)[stamp_bounds]
+        im2 = galsim.ImageD(bounds, wcs=grid_wcs)[stamp_bounds]
+        obj.drawImage(im1)
+        obj.drawImage(im2)
+        np.testing.assert_array_almost_equal(
+            im2.array / im1.array.max(), im1.array / im1.array.max(), 5,
+            'Drawing with withLocalGrid does not match for %s'%name)
+
+        # Shifting the image (which calls withOrigin) keeps the grid at the right place.
+        im1.setCenter(17,-9)
+        im2.setCenter(17,-9)
+        assert im2.wcs.local_grid_error == grid_wcs.local_grid_error
+        np.testing.assert_array_almost_equal(
+            im2.wcs.jacobian(im2.trueCenter()).getMatrix(),
+            grid_wcs.jacobian(stamp_bounds.trueCenter()).getMatrix(), 10,
+            'withLocalGrid jacobian after withOrigin does not match for %s'%name)
+        obj.drawImage(im1)
+        obj.drawImage(im2)
+        np.testing.assert_array_almost_equal(
+            im2.array / im1.array.max(), im1.array / im1.array.max(), 5,
+            'Drawing with withLocalGrid after setCenter does not match for %s'%name)
+
+    # Uniform wcs types don't need a grid.
+    wcs = galsim.OffsetShearWCS(0.23, galsim.Shear(g1=0.1, g2=0.3), galsim.PositionD(12,4))
+    assert wcs.withLocalGrid(bounds) is wcs
+
+    # If the wcs varies too quickly for the grid to reach max_error, it raises an exception.
+    ufunc = lambda x,y: 0.2*x + 0.3*np.sin(x/3.)
+    vfunc = lambda x,y: 0.2*y
+    wcs = galsim.UVFunction(ufunc, vfunc)
+    try:
+        np.testing.assert_raises(RuntimeError, wcs.withLocalGrid, bounds)
+        np.testing.assert_raises(ValueError, wcs.withLocalGrid, galsim.BoundsD(3,3,4,9))
+        np.testing.assert_raises(TypeError, wcs.withLocalGrid, (1,32,1,32))
+    except ImportError:
+        print 'The assert_raises tests require nose'
+
+    t2 = time.time()
+    print 'time for %s = %.2f'%(funcname(),t2-t1)
+
+
 if __name__ == "__main__":
     test_pixelscale()
     test_shearwcs()
@@ -1831,3 +1996,4 @@ if __name__ == "__main__":
     test_gsfitswcs()
     test_fitswcs()
     test_scamp()
+    test_local_grid()